@@ -0,0 +1,36 @@
+"""add teaching unit offering and session to result_teaching_unit
+
+Revision ID: 3a9f6d2c8e41
+Revises: 7c1e4b9d2a3f
+Create Date: 2026-10-18 10:02:17.530961
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9f6d2c8e41'
+down_revision = '7c1e4b9d2a3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('result_teaching_unit', sa.Column('id_teaching_unit_offering', sa.Integer(), nullable=True))
+    op.add_column('result_teaching_unit', sa.Column('session', sa.Enum('SN', 'SR', name='sessiontypeenum'), nullable=True))
+    op.create_foreign_key(
+        'result_teaching_unit_ibfk_teaching_unit_offering', 'result_teaching_unit', 'teaching_unit_offering',
+        ['id_teaching_unit_offering'], ['id']
+    )
+    op.create_unique_constraint(
+        'uq_register_semester_teaching_unit_session_result', 'result_teaching_unit',
+        ['id_register_semester', 'id_teaching_unit_offering', 'session']
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_register_semester_teaching_unit_session_result', 'result_teaching_unit', type_='unique')
+    op.drop_constraint('result_teaching_unit_ibfk_teaching_unit_offering', 'result_teaching_unit', type_='foreignkey')
+    op.drop_column('result_teaching_unit', 'session')
+    op.drop_column('result_teaching_unit', 'id_teaching_unit_offering')
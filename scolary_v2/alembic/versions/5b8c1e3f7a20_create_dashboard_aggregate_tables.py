@@ -0,0 +1,117 @@
+"""create dashboard_member and dashboard_aggregate tables
+
+Revision ID: 5b8c1e3f7a20
+Revises: 9d4e2f7a1b6c
+Create Date: 2026-10-18 15:02:47.531960
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8c1e3f7a20'
+down_revision = '9d4e2f7a1b6c'
+branch_labels = None
+depends_on = None
+
+DIMENSIONS = ('id_academic_year', 'id_journey', 'id_mention', 'sex', 'birth_year', 'id_nationality', 'id_enter_year')
+
+
+def _dimension_columns():
+    return [
+        sa.Column('id_academic_year', sa.Integer(), nullable=False),
+        sa.Column('id_journey', sa.Integer(), nullable=False),
+        sa.Column('id_mention', sa.Integer(), nullable=False),
+        sa.Column('sex', sa.String(length=20), nullable=False),
+        sa.Column('birth_year', sa.Integer(), nullable=False),
+        sa.Column('id_nationality', sa.Integer(), nullable=False),
+        sa.Column('id_enter_year', sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade():
+    op.create_table('dashboard_member',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('id_student', sa.Integer(), nullable=False),
+    *_dimension_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_dashboard_member_id'), 'dashboard_member', ['id'], unique=True)
+    op.create_index(op.f('ix_dashboard_member_id_student'), 'dashboard_member', ['id_student'], unique=False)
+    op.create_table('dashboard_aggregate',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    *_dimension_columns(),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint(*DIMENSIONS, name='uq_dashboard_aggregate_cell')
+    )
+    op.create_index(op.f('ix_dashboard_aggregate_id'), 'dashboard_aggregate', ['id'], unique=True)
+
+    # Remplissage initial, figé à cette révision (le modèle pourra évoluer) ;
+    # scripts/rebuild_dashboard_aggregates.py reconstruit avec le code courant.
+    student = sa.table(
+        'student',
+        sa.column('id', sa.Integer), sa.column('num_carte', sa.String), sa.column('id_mention', sa.Integer),
+        sa.column('sex', sa.String), sa.column('date_of_birth', sa.Date),
+        sa.column('id_nationality', sa.Integer), sa.column('id_enter_year', sa.Integer),
+    )
+    annual_register = sa.table(
+        'annual_register',
+        sa.column('id', sa.Integer), sa.column('num_carte', sa.String), sa.column('id_academic_year', sa.Integer),
+    )
+    register_semester = sa.table(
+        'register_semester', sa.column('id_annual_register', sa.Integer), sa.column('id_journey', sa.Integer),
+    )
+    dashboard_member = sa.table(
+        'dashboard_member', sa.column('id_student', sa.Integer), *[sa.column(name) for name in DIMENSIONS],
+    )
+    dashboard_aggregate = sa.table(
+        'dashboard_aggregate', *[sa.column(name) for name in DIMENSIONS], sa.column('count', sa.Integer),
+    )
+    # (étudiant, année) et (étudiant, année, parcours) des inscriptions.
+    years = sa.select(student.c.id.label('id_student'), annual_register.c.id_academic_year).distinct().join(
+        annual_register, annual_register.c.num_carte == student.c.num_carte
+    ).where(annual_register.c.id_academic_year.isnot(None)).subquery()
+    journeys = sa.select(
+        student.c.id.label('id_student'), annual_register.c.id_academic_year, register_semester.c.id_journey
+    ).distinct().join(
+        annual_register, annual_register.c.num_carte == student.c.num_carte
+    ).join(
+        register_semester, register_semester.c.id_annual_register == annual_register.c.id
+    ).where(annual_register.c.id_academic_year.isnot(None), register_semester.c.id_journey.isnot(None)).subquery()
+
+    all_, unregistered = sa.literal(0), sa.literal(-1)
+    # Une ligne par cellule : « toutes années » / « tous parcours » valent 0, sans inscription -1.
+    cells = sa.union(
+        sa.select(
+            student.c.id.label('id_student'), unregistered.label('id_academic_year'), all_.label('id_journey')
+        ).where(~sa.exists().where(years.c.id_student == student.c.id)),
+        sa.select(years.c.id_student, all_, all_),
+        sa.select(journeys.c.id_student, all_, journeys.c.id_journey),
+        sa.select(years.c.id_student, years.c.id_academic_year, all_),
+        sa.select(journeys.c.id_student, journeys.c.id_academic_year, journeys.c.id_journey),
+    ).subquery()
+    # Enum SexEnum stocké par nom ; le cube garde sa valeur.
+    sex = sa.case((student.c.sex == 'MALE', 'Masculin'), (student.c.sex == 'FEMALE', 'Féminin'), else_='')
+    op.execute(dashboard_member.insert().from_select(
+        ['id_student', *DIMENSIONS],
+        sa.select(
+            cells.c.id_student, cells.c.id_academic_year, cells.c.id_journey,
+            sa.func.coalesce(student.c.id_mention, 0), sex,
+            sa.func.coalesce(sa.extract('year', student.c.date_of_birth), 0),
+            sa.func.coalesce(student.c.id_nationality, 0), sa.func.coalesce(student.c.id_enter_year, 0),
+        ).join(student, student.c.id == cells.c.id_student),
+    ))
+    dimensions = [dashboard_member.c[name] for name in DIMENSIONS]
+    op.execute(dashboard_aggregate.insert().from_select(
+        [*DIMENSIONS, 'count'], sa.select(*dimensions, sa.func.count()).group_by(*dimensions),
+    ))
+
+
+def downgrade():
+    op.drop_index(op.f('ix_dashboard_aggregate_id'), table_name='dashboard_aggregate')
+    op.drop_table('dashboard_aggregate')
+    op.drop_index(op.f('ix_dashboard_member_id_student'), table_name='dashboard_member')
+    op.drop_index(op.f('ix_dashboard_member_id'), table_name='dashboard_member')
+    op.drop_table('dashboard_member')
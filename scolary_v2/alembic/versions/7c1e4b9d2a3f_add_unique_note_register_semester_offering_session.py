@@ -0,0 +1,45 @@
+"""add unique register semester, offering and session on note
+
+Revision ID: 7c1e4b9d2a3f
+Revises: 05c3cfeab74a
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b9d2a3f'
+down_revision = '05c3cfeab74a'
+branch_labels = None
+depends_on = None
+
+# n2 ranks above n1 (a strict order, so exactly one row per key survives).
+DUPLICATE_RANKS_ABOVE = (
+    "(n1.deleted_at IS NOT NULL AND n2.deleted_at IS NULL) "
+    "OR ((n1.deleted_at IS NULL) = (n2.deleted_at IS NULL) AND ("
+    "COALESCE(n2.updated_at, n2.created_at) > COALESCE(n1.updated_at, n1.created_at) "
+    "OR (COALESCE(n2.updated_at, n2.created_at) = COALESCE(n1.updated_at, n1.created_at) AND n2.id > n1.id)))"
+)
+
+
+def upgrade():
+    # When the same grade was entered twice, keep one row per key: a live row
+    # (deleted_at IS NULL) before a soft-deleted one, then the latest update,
+    # then the highest id. n1 is deleted when some duplicate n2 ranks above it.
+    op.execute(
+        "DELETE n1 FROM note n1 JOIN note n2 "
+        "ON n1.id_register_semester = n2.id_register_semester "
+        "AND n1.id_constituent_element_offering = n2.id_constituent_element_offering "
+        "AND n1.session = n2.session AND n1.id <> n2.id "
+        f"WHERE {DUPLICATE_RANKS_ABOVE}"
+    )
+    op.create_unique_constraint(
+        'uq_register_semester_offering_session_note', 'note',
+        ['id_register_semester', 'id_constituent_element_offering', 'session']
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_register_semester_offering_session_note', 'note', type_='unique')
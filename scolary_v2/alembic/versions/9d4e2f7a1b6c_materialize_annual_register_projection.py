@@ -0,0 +1,111 @@
+"""materialize payment status and level projection of annual_register
+
+Revision ID: 9d4e2f7a1b6c
+Revises: 3a9f6d2c8e41
+Create Date: 2026-10-18 14:21:09.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4e2f7a1b6c'
+down_revision = '3a9f6d2c8e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('annual_register', sa.Column('max_semester_number', sa.Integer(), nullable=True))
+    op.add_column('annual_register', sa.Column('level_from_semester', sa.String(length=10), nullable=True))
+    op.add_column('annual_register', sa.Column('total_payment', sa.Float(), nullable=True))
+    op.add_column('annual_register', sa.Column('max_semester_journey_id', sa.Integer(), nullable=True))
+    op.add_column('annual_register', sa.Column('mention_id_from_max_semester', sa.Integer(), nullable=True))
+    op.add_column('annual_register', sa.Column('enrollment_fee_amount', sa.Float(), nullable=True))
+    op.add_column('annual_register', sa.Column('payment_status', sa.String(length=20), nullable=True))
+    op.create_index(
+        'ix_annual_register_year_payment_status', 'annual_register', ['id_academic_year', 'payment_status']
+    )
+
+    # Remplissage initial, figé à cette révision (le modèle pourra évoluer) ;
+    # scripts/rebuild_annual_register_projection.py recalcule avec le modèle courant.
+    # Une étape par colonne dérivée : chacune lit les colonnes déjà remplies.
+    annual_register = sa.table(
+        'annual_register',
+        sa.column('id', sa.Integer), sa.column('id_academic_year', sa.Integer),
+        sa.column('updated_at', sa.DateTime),
+        sa.column('max_semester_number', sa.Integer), sa.column('level_from_semester', sa.String),
+        sa.column('total_payment', sa.Float), sa.column('max_semester_journey_id', sa.Integer),
+        sa.column('mention_id_from_max_semester', sa.Integer), sa.column('enrollment_fee_amount', sa.Float),
+        sa.column('payment_status', sa.String),
+    )
+    register_semester = sa.table(
+        'register_semester',
+        sa.column('id_annual_register', sa.Integer), sa.column('semester', sa.String),
+        sa.column('id_journey', sa.Integer),
+    )
+    payment = sa.table('payment', sa.column('id_annual_register', sa.Integer), sa.column('payed', sa.Float))
+    journey = sa.table('journey', sa.column('id', sa.Integer), sa.column('id_mention', sa.Integer))
+    enrollment_fee = sa.table(
+        'enrollment_fee',
+        sa.column('level', sa.String), sa.column('id_academic_year', sa.Integer),
+        sa.column('id_mention', sa.Integer), sa.column('price', sa.Float),
+    )
+    ar = annual_register.c
+    semester_number = sa.cast(sa.func.replace(register_semester.c.semester, 'S', ''), sa.Integer)
+
+    steps = [
+        {
+            'max_semester_number': sa.select(sa.func.max(semester_number))
+            .where(register_semester.c.id_annual_register == ar.id).scalar_subquery(),
+            'total_payment': sa.select(sa.func.coalesce(sa.func.sum(payment.c.payed), 0.0))
+            .where(payment.c.id_annual_register == ar.id).scalar_subquery(),
+        },
+        {
+            'level_from_semester': sa.case(
+                (ar.max_semester_number <= 2, 'L1'),
+                (ar.max_semester_number <= 4, 'L2'),
+                (ar.max_semester_number <= 6, 'L3'),
+                (ar.max_semester_number <= 8, 'M1'),
+                (ar.max_semester_number <= 10, 'M2'),
+                else_='',
+            ),
+            'max_semester_journey_id': sa.select(register_semester.c.id_journey)
+            .where(register_semester.c.id_annual_register == ar.id, semester_number == ar.max_semester_number)
+            .limit(1).scalar_subquery(),
+        },
+        {
+            'mention_id_from_max_semester': sa.select(journey.c.id_mention)
+            .where(journey.c.id == ar.max_semester_journey_id).scalar_subquery(),
+        },
+        {
+            'enrollment_fee_amount': sa.select(enrollment_fee.c.price).where(
+                enrollment_fee.c.level == ar.level_from_semester,
+                enrollment_fee.c.id_academic_year == ar.id_academic_year,
+                enrollment_fee.c.id_mention == ar.mention_id_from_max_semester,
+            ).limit(1).scalar_subquery(),
+        },
+        {
+            'payment_status': sa.case(
+                (ar.enrollment_fee_amount.is_(None), 'not_applicable'),
+                (ar.total_payment >= ar.enrollment_fee_amount, 'complete'),
+                (ar.total_payment == 0, 'none'),
+                else_='partial',
+            ),
+        },
+    ]
+    for values in steps:
+        # updated_at inchangé : le remplissage ne modifie pas les inscriptions.
+        op.execute(annual_register.update().values(updated_at=ar.updated_at, **values))
+
+
+def downgrade():
+    op.drop_index('ix_annual_register_year_payment_status', table_name='annual_register')
+    op.drop_column('annual_register', 'payment_status')
+    op.drop_column('annual_register', 'enrollment_fee_amount')
+    op.drop_column('annual_register', 'mention_id_from_max_semester')
+    op.drop_column('annual_register', 'max_semester_journey_id')
+    op.drop_column('annual_register', 'total_payment')
+    op.drop_column('annual_register', 'level_from_semester')
+    op.drop_column('annual_register', 'max_semester_number')
@@ -42,7 +42,9 @@ from app.api.api_v1.endpoints import files
 from app.api.api_v1.endpoints import pdfs
 from app.api.api_v1.endpoints import liste
 from app.api.api_v1.endpoints import carte
+from app.api.api_v1.endpoints import pdf_jobs
 from app.api.api_v1.endpoints import notifications
+from app.api.api_v1.endpoints import metrics
 from app.api.api_v1.endpoints import notification_templates
 from app.api.api_v1.endpoints import required_documents
 from app.api.api_v1.endpoints import available_services
@@ -111,7 +113,9 @@ api_router.include_router(students.router, prefix="/students", tags=["students"]
 api_router.include_router(pdfs.router, prefix="/pdf", tags=["pdf"])
 api_router.include_router(liste.router, prefix="/liste", tags=["liste"])
 api_router.include_router(carte.router, prefix="/carte", tags=["carte"])
+api_router.include_router(pdf_jobs.router, prefix="/pdf_jobs", tags=["pdf"])
 api_router.include_router(notifications.router, prefix="/ws", tags=["notifications"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(notification_templates.router, prefix="/notification_templates", tags=["notification_templates"])
 
 api_router.include_router(constituent_element_optional_groups.router, prefix="/constituent_element_optional_groups",
@@ -4,8 +4,10 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
+from app.enum.loading_profile import LoadingProfileEnum
 from app.core.notifications import schedule_notification
-import ast
 
 router = APIRouter()
 from app.api import deps
@@ -16,6 +18,9 @@ def read_annual_registers(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
+        profile: LoadingProfileEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -24,18 +29,14 @@ def read_annual_registers(
     """
     Retrieve annual_registers.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.annual_register.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.annual_register.model)
 
     annual_registers = crud.annual_register.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.annual_register.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseAnnualRegister(**{'count': count, 'data': jsonable_encoder(annual_registers)})
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres, profile=profile)
+    count = crud.annual_register.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseAnnualRegister(**{'count': count, 'data': jsonable_encoder(annual_registers), 'next_cursor': crud.annual_register.next_cursor(annual_registers, limit=limit)})
     return response
 
 
@@ -99,13 +100,9 @@ def read_annual_register(
     """
     Get annual_register by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.annual_register.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.annual_register.model)
 
     annual_register = crud.annual_register.get(db=db, id=annual_register_id, relations=relations, where=wheres)
     if not annual_register:
@@ -1,11 +1,12 @@
 from typing import Any
-import ast
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 from app.api import deps
 
 router = APIRouter()
@@ -16,6 +17,8 @@ def read_available_models(
     *,
     offset: int = 0,
     limit: int = 20,
+    cursor: str = None,
+    count_strategy: CountStrategyEnum = None,
     relation: str = "[]",
     where: str = "[]",
     db: Session = Depends(deps.get_db),
@@ -23,20 +26,16 @@ def read_available_models(
     """
     Retrieve available models.
     """
-    relations = []
-    if relation not in (None, "", [], "[]"):
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.available_model.model)
 
-    wheres = []
-    if where not in (None, "", []):
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.available_model.model)
 
     available_models = crud.available_model.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres
     )
-    count = crud.available_model.get_count_where_array(db=db, where=wheres)
+    count = crud.available_model.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
     response = schemas.ResponseAvailableModel(
-        **{'count': count, 'data': jsonable_encoder(available_models)}
+        **{'count': count, 'data': jsonable_encoder(available_models), 'next_cursor': crud.available_model.next_cursor(available_models, limit=limit)}
     )
     return response
 
@@ -87,13 +86,9 @@ def read_available_model(
     """
     Get available model by ID.
     """
-    relations = []
-    if relation not in (None, "", [], "[]"):
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.available_model.model)
 
-    wheres = []
-    if where not in (None, "", []):
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.available_model.model)
 
     available_model = crud.available_model.get(
         db=db, id=available_model_id, relations=relations, where=wheres
@@ -1,11 +1,12 @@
 from typing import Any
-import ast
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 from app.api import deps
 
 router = APIRouter()
@@ -16,6 +17,8 @@ def read_available_service_required_documents(
     *,
     offset: int = 0,
     limit: int = 20,
+    cursor: str = None,
+    count_strategy: CountStrategyEnum = None,
     relation: str = "[]",
     where: str = "[]",
     db: Session = Depends(deps.get_db),
@@ -24,20 +27,16 @@ def read_available_service_required_documents(
     """
     Retrieve available_service_required_documents.
     """
-    relations = []
-    if relation not in (None, "", [], "[]"):
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.available_service_required_document.model)
 
-    wheres = []
-    if where not in (None, "", []):
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.available_service_required_document.model)
 
     available_service_required_documents = crud.available_service_required_document.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres
     )
-    count = crud.available_service_required_document.get_count_where_array(db=db, where=wheres)
+    count = crud.available_service_required_document.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
     response = schemas.ResponseAvailableServiceRequiredDocument(
-        **{'count': count, 'data': jsonable_encoder(available_service_required_documents)}
+        **{'count': count, 'data': jsonable_encoder(available_service_required_documents), 'next_cursor': crud.available_service_required_document.next_cursor(available_service_required_documents, limit=limit)}
     )
     return response
 
@@ -94,13 +93,9 @@ def read_available_service_required_document(
     """
     Get available_service_required_document by ID.
     """
-    relations = []
-    if relation not in (None, "", [], "[]"):
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.available_service_required_document.model)
 
-    wheres = []
-    if where not in (None, "", []):
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.available_service_required_document.model)
 
     available_service_required_document = crud.available_service_required_document.get(
         db=db,
@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -13,6 +14,8 @@ def read_baccalaureate_series(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -21,18 +24,14 @@ def read_baccalaureate_series(
     """
     Retrieve baccalaureate_series.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.baccalaureate_serie.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.baccalaureate_serie.model)
 
     baccalaureate_series = crud.baccalaureate_serie.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.baccalaureate_serie.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseBaccalaureateSerie(**{'count': count, 'data': jsonable_encoder(baccalaureate_series)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.baccalaureate_serie.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseBaccalaureateSerie(**{'count': count, 'data': jsonable_encoder(baccalaureate_series), 'next_cursor': crud.baccalaureate_serie.next_cursor(baccalaureate_series, limit=limit)})
     return response
 
 
@@ -80,13 +79,9 @@ def read_baccalaureate_serie(
     """
     Get baccalaureate_serie by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.baccalaureate_serie.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.baccalaureate_serie.model)
 
     baccalaureate_serie = crud.baccalaureate_serie.get(db=db, id=baccalaureate_serie_id, relations=relations, where=wheres)
     if not baccalaureate_serie:
@@ -1,4 +1,3 @@
-import ast
 from pathlib import Path
 from typing import Any, List, Union
 
@@ -7,7 +6,9 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.crud import filter_dsl
 from app.api import deps
+from app.core.pdf_jobs import job_manager, snapshot
 from app.utils import get_level, get_semester
 from app.utils_sco import tails_card, heads_card, badge_tails_user, badge_head_user
 from app.utils_sco.special import special_heads_card, special_tails_card
@@ -34,18 +35,9 @@ def _build_pdf_response(result: Union[dict, str]) -> schemas.PdfFileResponse:
     return schemas.PdfFileResponse(path=path, filename=filename, url=url)
 
 
-@router.get("/carte_student/", response_model=List[schemas.PdfFileResponse])
-def create_carte_student(
-        id_year: str,
-        id_mention: str,
-        id_journey: str,
-        level: str = "M2",
-        db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_active_user),
-) -> List[schemas.PdfFileResponse]:
-    """
-    create carte
-    """
+def _carte_student_payload(
+        db: Session, id_year: str, id_mention: str, id_journey: str, level: str
+) -> dict:
     mention = crud.mention.get(db=db, id=id_mention)
     if not mention:
         raise HTTPException(
@@ -89,21 +81,46 @@ def create_carte_student(
     data["key"] = year.code
     data["level"] = level
     data["img_carte"] = mention.background
-    heads = heads_card.parcourir_et(students, data, university)
-    tails = tails_card.parcourir_et(students, data)
+    return {"students": students, "data": data, "university": university}
+
+
+@router.get("/carte_student/", response_model=List[schemas.PdfFileResponse])
+def create_carte_student(
+        id_year: str,
+        id_mention: str,
+        id_journey: str,
+        level: str = "M2",
+        db: Session = Depends(deps.get_db),
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> List[schemas.PdfFileResponse]:
+    """
+    create carte
+    """
+    payload = _carte_student_payload(db, id_year, id_mention, id_journey, level)
+    heads = heads_card.parcourir_et(payload["students"], payload["data"], payload["university"])
+    tails = tails_card.parcourir_et(payload["students"], payload["data"])
 
     return [_build_pdf_response(heads), _build_pdf_response(tails)]
 
 
-@router.get("/badge_user/", response_model=List[schemas.PdfFileResponse])
-def create_badge_user(
+@router.post("/carte_student/jobs", response_model=schemas.PdfJob)
+def create_carte_student_job(
+        id_year: str,
+        id_mention: str,
+        id_journey: str,
+        level: str = "M2",
         db: Session = Depends(deps.get_db),
-        id_user: int = None,
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    create carte
+    create carte in background, poll /pdf_jobs/{id} for the files
     """
+    payload = _carte_student_payload(db, id_year, id_mention, id_journey, level)
+    payload["university"] = snapshot(payload["university"])
+    return job_manager.submit("carte_student", payload, id_user=current_user.id)
+
+
+def _badge_users(db: Session, id_user: int = None) -> list:
     wheres = [
         {
             "key": "is_active",
@@ -111,7 +128,6 @@ def create_badge_user(
             "value": True
         }
     ]
-    university = crud.university_info.get_university(db=db)
     all_user = []
     if id_user:
         user = crud.user.get(db=db, id=id_user, relations=["role"])
@@ -120,12 +136,39 @@ def create_badge_user(
     else:
         all_user = crud.user.get_multi(db=db, limit=2000, skip=0, relations=["role"], order_by="id", order="DESC",
                                        where=wheres)
-    all_user = jsonable_encoder(all_user)
+    return jsonable_encoder(all_user)
+
+
+@router.get("/badge_user/", response_model=List[schemas.PdfFileResponse])
+def create_badge_user(
+        db: Session = Depends(deps.get_db),
+        id_user: int = None,
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    create carte
+    """
+    university = crud.university.get_info(db=db)
+    all_user = _badge_users(db, id_user)
     tails_badge = badge_tails_user.print_badge(all_user, university)
     head_badge = badge_head_user.print_badge(all_user, university)
     return [_build_pdf_response(head_badge), _build_pdf_response(tails_badge)]
 
 
+@router.post("/badge_user/jobs", response_model=schemas.PdfJob)
+def create_badge_user_job(
+        db: Session = Depends(deps.get_db),
+        id_user: int = None,
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    create badges in background, poll /pdf_jobs/{id} for the files
+    """
+    university = crud.university.get_info(db=db)
+    payload = {"users": _badge_users(db, id_user), "university": snapshot(university)}
+    return job_manager.submit("badge_user", payload, id_user=current_user.id)
+
+
 @router.post("/special", response_model=List[schemas.PdfFileResponse])
 def create_special_carte(
         *,
@@ -140,21 +183,13 @@ def create_special_carte(
     """
     create carte
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.student.model)
 
-    wheres_relations = []
-    if where_relation is not None and where_relation != "" and where_relation != []:
-        wheres_relations += ast.literal_eval(where_relation)
+    wheres_relations = filter_dsl.parse_where_relation(where_relation, crud.student.model)
 
-    base_columns = []
-    if base_column is not None and base_column != "" and base_column != []:
-        base_columns += ast.literal_eval(base_column)
+    base_columns = filter_dsl.parse_base_columns(base_column, crud.student.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.student.model)
 
     students = crud.student.get_multi_where_array(
         db=db,
@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -15,6 +16,8 @@ def read_classrooms(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -23,18 +26,14 @@ def read_classrooms(
     """
     Retrieve classrooms.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.classroom.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.classroom.model)
 
     classrooms = crud.classroom.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.classroom.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseClassroom(**{'count': count, 'data': jsonable_encoder(classrooms)})
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.classroom.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseClassroom(**{'count': count, 'data': jsonable_encoder(classrooms), 'next_cursor': crud.classroom.next_cursor(classrooms, limit=limit)})
     return response
 
 
@@ -82,13 +81,9 @@ def read_classroom(
     """
     Get classroom by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.classroom.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.classroom.model)
 
     classroom = crud.classroom.get(db=db, id=classroom_id, relations=relations, where=wheres)
     if not classroom:
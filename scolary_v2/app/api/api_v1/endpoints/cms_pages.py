@@ -1,11 +1,12 @@
 from typing import Any
-import ast
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 from app.api import deps
 
 router = APIRouter()
@@ -16,6 +17,8 @@ def read_cms_pages(
     *,
     offset: int = 0,
     limit: int = 20,
+    cursor: str = None,
+    count_strategy: CountStrategyEnum = None,
     relation: str = "[]",
     where: str = "[]",
     db: Session = Depends(deps.get_db),
@@ -24,20 +27,16 @@ def read_cms_pages(
     """
     Retrieve CMS pages.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.cms_page.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.cms_page.model)
 
     cms_pages = crud.cms_page.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres
     )
-    count = crud.cms_page.get_count_where_array(db=db, where=wheres)
+    count = crud.cms_page.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
     response = schemas.ResponseCmsPage(
-        **{"count": count, "data": jsonable_encoder(cms_pages)}
+        **{"count": count, "data": jsonable_encoder(cms_pages), "next_cursor": crud.cms_page.next_cursor(cms_pages, limit=limit)}
     )
     return response
 
@@ -47,6 +46,8 @@ def read_public_cms_pages(
     *,
     offset: int = 0,
     limit: int = 200,
+    cursor: str = None,
+    count_strategy: CountStrategyEnum = None,
     relation: str = "[]",
     where: str = "[]",
     db: Session = Depends(deps.get_db),
@@ -54,22 +55,19 @@ def read_public_cms_pages(
     """
     Retrieve CMS pages for public navigation.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.cms_page.model)
 
     wheres = [
         {"key": "status", "operator": "=", "value": "published"}
     ]
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres += filter_dsl.parse_where(where, crud.cms_page.model)
 
     cms_pages = crud.cms_page.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres
     )
-    count = crud.cms_page.get_count_where_array(db=db, where=wheres)
+    count = crud.cms_page.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
     response = schemas.ResponseCmsPage(
-        **{"count": count, "data": jsonable_encoder(cms_pages)}
+        **{"count": count, "data": jsonable_encoder(cms_pages), "next_cursor": crud.cms_page.next_cursor(cms_pages, limit=limit)}
     )
     return response
 
@@ -118,13 +116,9 @@ def read_cms_page(
     """
     Get CMS page by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.cms_page.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.cms_page.model)
 
     cms_page = crud.cms_page.get(db=db, id=cms_page_id, relations=relations, where=wheres)
     if not cms_page:
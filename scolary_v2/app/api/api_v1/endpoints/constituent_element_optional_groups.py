@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -13,6 +14,8 @@ def read_constituent_element_optional_groups(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -21,18 +24,14 @@ def read_constituent_element_optional_groups(
     """
     Retrieve constituent_element_optional_groups.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.constituent_element_optional_group.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.constituent_element_optional_group.model)
 
     constituent_element_optional_groups = crud.constituent_element_optional_group.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.constituent_element_optional_group.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseConstituentElementOptionalGroup(**{'count': count, 'data': jsonable_encoder(constituent_element_optional_groups)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.constituent_element_optional_group.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseConstituentElementOptionalGroup(**{'count': count, 'data': jsonable_encoder(constituent_element_optional_groups), 'next_cursor': crud.constituent_element_optional_group.next_cursor(constituent_element_optional_groups, limit=limit)})
     return response
 
 
@@ -80,13 +79,9 @@ def read_constituent_element_optional_group(
     """
     Get constituent_element_optional_group by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.constituent_element_optional_group.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.constituent_element_optional_group.model)
 
     constituent_element_optional_group = crud.constituent_element_optional_group.get(db=db, id=constituent_element_optional_group_id, relations=relations, where=wheres)
     if not constituent_element_optional_group:
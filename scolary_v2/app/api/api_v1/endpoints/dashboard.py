@@ -1,27 +1,44 @@
-from typing import Any
+from typing import Any, Awaitable, Callable, Dict
 from datetime import datetime, date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, literal_column, and_, select
+from sqlalchemy import func
 
 from app.api import deps
 from app import crud, models, schemas
+from app.crud import dashboard_store
+from app.crud.dashboard_cache import dashboard_cache
+from app.crud.query_fanout import run_queries_async
 
 router = APIRouter()
 
+Queries = Dict[str, Callable[[Session], Any]]
 
-def compute_summary(db: Session, academic_year_id: int | None = None) -> schemas.DashboardSummary:
-    if academic_year_id:
-        total_students = (
+
+def _count_created(model, start: date, end: date) -> Callable[[Session], int]:
+    def query(db: Session) -> int:
+        return (
+            db.query(func.count(model.id))
+            .filter(model.created_at >= start, model.created_at < end)
+            .scalar()
+            or 0
+        )
+    return query
+
+
+def _summary_queries(academic_year_id: int | None) -> Queries:
+    def total_students(db: Session) -> int:
+        if not academic_year_id:
+            return crud.student.get_count_where_array(db=db)
+        return (
             db.query(func.count(func.distinct(models.Student.id)))
             .join(models.AnnualRegister, models.AnnualRegister.num_carte == models.Student.num_carte)
             .filter(models.AnnualRegister.id_academic_year == academic_year_id)
             .scalar()
             or 0
         )
-    else:
-        total_students = crud.student.get_count_where_array(db=db)
 
     today = date.today()
     start_of_current_year = date(today.year, 1, 1)
@@ -40,58 +57,27 @@ def compute_summary(db: Session, academic_year_id: int | None = None) -> schemas
         else date(today.year, today.month - 1, 1)
     )
 
-    students_this_year = (
-        db.query(func.count(models.Student.id))
-        .filter(
-            models.Student.created_at >= start_of_current_year,
-            models.Student.created_at < start_of_next_year,
-        )
-        .scalar()
-        or 0
-    )
-    students_previous_year = (
-        db.query(func.count(models.Student.id))
-        .filter(
-            models.Student.created_at >= start_of_previous_year,
-            models.Student.created_at < start_of_current_year,
-        )
-        .scalar()
-        or 0
-    )
+    return {
+        "total_students": total_students,
+        "total_mentions": lambda db: crud.mention.get_count_where_array(db=db),
+        "total_journeys": lambda db: crud.journey.get_count_where_array(db=db),
+        "total_users": lambda db: crud.user.get_count_where_array(db=db),
+        "total_teachers": lambda db: crud.teacher.get_count_where_array(db=db),
+        "students_this_year": _count_created(models.Student, start_of_current_year, start_of_next_year),
+        "students_previous_year": _count_created(models.Student, start_of_previous_year, start_of_current_year),
+        "teachers_this_month": _count_created(models.Teacher, start_of_current_month, start_of_next_month),
+        "teachers_previous_month": _count_created(models.Teacher, start_of_previous_month, start_of_current_month),
+    }
 
-    teachers_this_month = (
-        db.query(func.count(models.Teacher.id))
-        .filter(
-            models.Teacher.created_at >= start_of_current_month,
-            models.Teacher.created_at < start_of_next_month,
-        )
-        .scalar()
-        or 0
-    )
-    teachers_previous_month = (
-        db.query(func.count(models.Teacher.id))
-        .filter(
-            models.Teacher.created_at >= start_of_previous_month,
-            models.Teacher.created_at < start_of_current_month,
-        )
-        .scalar()
-        or 0
-    )
 
-    return schemas.DashboardSummary(
-        total_students=total_students,
-        total_mentions=crud.mention.get_count_where_array(db=db),
-        total_journeys=crud.journey.get_count_where_array(db=db),
-        total_users=crud.user.get_count_where_array(db=db),
-        total_teachers=crud.teacher.get_count_where_array(db=db),
-        students_this_year=students_this_year,
-        students_previous_year=students_previous_year,
-        teachers_this_month=teachers_this_month,
-        teachers_previous_month=teachers_previous_month,
-    )
+def _names(db: Session, model, ids) -> dict:
+    ids = {value for value in ids if value}
+    if not ids:
+        return {}
+    return dict(db.query(model.id, model.name).filter(model.id.in_(ids)).all())
 
 
-def compute_chart_data(
+def _chart_queries(
         db: Session,
         *,
         min_age: int,
@@ -99,347 +85,286 @@ def compute_chart_data(
         mention_id: int | None,
         academic_year_id: int | None,
         journey_id: int | None,
-) -> schemas.DashboardCharts:
-    latest_academic_year_ids = (
-        select(models.AcademicYear.id)
-        .order_by(models.AcademicYear.name.desc())
-        .limit(5)
-        .subquery()
-    )
-    latest_academic_year_ids_select = select(latest_academic_year_ids.c.id)
-
-    mention_rows = (
-        db.query(
-            models.Mention.id.label("id"),
-            models.Mention.name.label("name"),
-            func.count(func.distinct(models.Student.id)).label("count"),
-        )
-        .outerjoin(models.Student, models.Student.id_mention == models.Mention.id)
-        .outerjoin(models.AnnualRegister, models.AnnualRegister.num_carte == models.Student.num_carte)
-        .filter(*([] if not academic_year_id else [models.AnnualRegister.id_academic_year == academic_year_id]))
-        .group_by(models.Mention.id, models.Mention.name)
-        .all()
-    )
+) -> Queries:
+    """
+    Les comptages d'étudiants sont lus dans le cube `dashboard_aggregate`
+    (voir app/crud/dashboard_store.py) : le coût ne dépend plus du nombre
+    d'étudiants. L'âge est calculé à partir de l'année de naissance.
 
-    nationality_rows = (
-        db.query(
-            models.Nationality.id.label("id"),
-            models.Nationality.name.label("name"),
-            func.count(models.Student.id).label("count"),
-        )
-        .outerjoin(models.Student, models.Student.id_nationality == models.Nationality.id)
-        .outerjoin(models.AnnualRegister, models.AnnualRegister.num_carte == models.Student.num_carte)
-        .filter(*([] if not academic_year_id else [models.AnnualRegister.id_academic_year == academic_year_id]))
-        .group_by(models.Nationality.id, models.Nationality.name)
-        .order_by(func.count(models.Student.id).desc())
-        .all()
-    )
+    Les années récentes et les noms des mentions, partagés par plusieurs
+    graphes, sont lus une fois sur `db` ; chaque requête retournée est
+    ensuite indépendante des autres.
+    """
+    ALL, UNREGISTERED = dashboard_store.ALL, dashboard_store.UNREGISTERED
 
-    role_rows = (
-        db.query(
-            models.Role.name.label("role"),
-            func.count(func.distinct(models.User.id)).label("count"),
-        )
-        .select_from(models.User)
-        .join(models.UserRole, models.UserRole.id_user == models.User.id)
-        .join(models.Role, models.Role.id == models.UserRole.id_role)
-        .group_by(models.Role.name)
+    latest_academic_years = (
+        db.query(models.AcademicYear.id, models.AcademicYear.name)
+        .order_by(models.AcademicYear.name.desc())
+        .limit(5)
         .all()
     )
+    latest_academic_year_ids = [row.id for row in latest_academic_years]
+    academic_year_names = {row.id: row.name for row in latest_academic_years}
+    if academic_year_id and academic_year_id not in academic_year_names:
+        academic_year_names.update(_names(db, models.AcademicYear, [academic_year_id]))
+    mention_names = dict(db.query(models.Mention.id, models.Mention.name).all())
 
-    year_rows = (
-        db.query(
-            models.AcademicYear.id.label("id"),
-            models.AcademicYear.name.label("name"),
-            func.count(func.distinct(models.AnnualRegister.num_carte)).label("count"),
-        )
-        .select_from(models.RegisterSemester)
-        .join(
-            models.AnnualRegister,
-            models.AnnualRegister.id == models.RegisterSemester.id_annual_register,
-        )
-        .join(
-            models.AcademicYear,
-            models.AcademicYear.id == models.AnnualRegister.id_academic_year,
-        )
-        .filter(
-            models.AcademicYear.id.in_(latest_academic_year_ids_select)
-            if not academic_year_id
-            else models.AcademicYear.id == academic_year_id
-        )
-        .group_by(models.AcademicYear.id, models.AcademicYear.name)
-        .order_by(models.AcademicYear.name.asc())
-        .all()
-    )
+    # Filtres du graphe des âges, des sexes et de mention × sexe
+    scope = {"id_academic_year": academic_year_id or ALL, "id_journey": journey_id or ALL}
+    if mention_id:
+        scope["id_mention"] = mention_id
 
-    new_student_year_rows = (
-        db.query(
-            models.AcademicYear.id.label("id"),
-            models.AcademicYear.name.label("name"),
-            func.count(func.distinct(models.AnnualRegister.num_carte)).label("count"),
-        )
-        .select_from(models.RegisterSemester)
-        .join(
-            models.AnnualRegister,
-            models.AnnualRegister.id == models.RegisterSemester.id_annual_register,
-        )
-        .join(
-            models.AcademicYear,
-            models.AcademicYear.id == models.AnnualRegister.id_academic_year,
-        )
-        .join(models.Student, models.Student.num_carte == models.AnnualRegister.num_carte)
-        .filter(
-            models.AcademicYear.id.in_(latest_academic_year_ids_select),
-            models.Student.id_enter_year.in_(latest_academic_year_ids_select),
-        )
-        .group_by(models.AcademicYear.id, models.AcademicYear.name)
-        .order_by(models.AcademicYear.name.asc())
-        .all()
-    )
+    def mention_counts(db: Session) -> list:
+        counts = {
+            row.id_mention: row.count
+            for row in dashboard_store.cells(
+                db, ["id_mention"], id_academic_year=academic_year_id or [ALL, UNREGISTERED]
+            )
+        }
+        return [
+            schemas.MentionCount(id=id_mention, name=name or "", count=counts.get(id_mention, 0))
+            for id_mention, name in mention_names.items()
+        ]
 
-    mention_rows_by_year = (
-        db.query(
-            models.AcademicYear.id.label("academic_year_id"),
-            models.AcademicYear.name.label("academic_year_name"),
-            models.Mention.id.label("mention_id"),
-            models.Mention.name.label("mention_name"),
-            func.count(func.distinct(models.AnnualRegister.num_carte)).label("count"),
-        )
-        .select_from(models.RegisterSemester)
-        .join(
-            models.AnnualRegister,
-            models.AnnualRegister.id == models.RegisterSemester.id_annual_register,
-        )
-        .join(
-            models.AcademicYear,
-            models.AcademicYear.id == models.AnnualRegister.id_academic_year,
-        )
-        .join(models.Student, models.Student.num_carte == models.AnnualRegister.num_carte)
-        .join(models.Mention, models.Mention.id == models.Student.id_mention)
-        .filter(models.AcademicYear.id.in_(latest_academic_year_ids_select))
-        .group_by(
-            models.AcademicYear.id,
-            models.AcademicYear.name,
-            models.Mention.id,
-            models.Mention.name,
+    def nationality_counts(db: Session) -> list:
+        counts = {
+            row.id_nationality: row.count
+            for row in dashboard_store.cells(
+                db, ["id_nationality"], id_academic_year=academic_year_id or [ALL, UNREGISTERED]
+            )
+        }
+        rows = sorted(
+            db.query(models.Nationality.id, models.Nationality.name).all(),
+            key=lambda row: counts.get(row.id, 0),
+            reverse=True,
         )
-        .order_by(models.AcademicYear.name.asc(), models.Mention.name)
-        .all()
-    )
+        return [
+            schemas.NationalityCount(id=row.id, name=row.name or "", count=counts.get(row.id, 0))
+            for row in rows
+        ]
 
-    new_student_mention_rows_by_year = (
-        db.query(
-            models.AcademicYear.id.label("academic_year_id"),
-            models.AcademicYear.name.label("academic_year_name"),
-            models.Mention.id.label("mention_id"),
-            models.Mention.name.label("mention_name"),
-            func.count(func.distinct(models.AnnualRegister.num_carte)).label("count"),
-        )
-        .select_from(models.RegisterSemester)
-        .join(
-            models.AnnualRegister,
-            models.AnnualRegister.id == models.RegisterSemester.id_annual_register,
-        )
-        .join(
-            models.AcademicYear,
-            models.AcademicYear.id == models.AnnualRegister.id_academic_year,
-        )
-        .join(models.Student, models.Student.num_carte == models.AnnualRegister.num_carte)
-        .join(models.Mention, models.Mention.id == models.Student.id_mention)
-        .filter(
-            and_(
-                models.AcademicYear.id.in_(latest_academic_year_ids_select),
-                models.Student.id_enter_year.in_(latest_academic_year_ids_select),
+    def role_counts(db: Session) -> list:
+        rows = (
+            db.query(
+                models.Role.name.label("role"),
+                func.count(func.distinct(models.User.id)).label("count"),
             )
+            .select_from(models.User)
+            .join(models.UserRole, models.UserRole.id_user == models.User.id)
+            .join(models.Role, models.Role.id == models.UserRole.id_role)
+            .group_by(models.Role.name)
+            .all()
         )
-        .group_by(
-            models.AcademicYear.id,
-            models.AcademicYear.name,
-            models.Mention.id,
-            models.Mention.name,
-        )
-        .order_by(models.AcademicYear.name.asc(), models.Mention.name)
-        .all()
-    )
+        return [schemas.RoleCount(role=row.role or "", count=row.count) for row in rows]
 
-    age_expr = func.timestampdiff(literal_column("YEAR"), models.Student.date_of_birth, func.current_date())
-    age_query = (
-        db.query(age_expr.label("age"), func.count(func.distinct(models.Student.id)).label("count"))
-        .join(models.AnnualRegister, models.AnnualRegister.num_carte == models.Student.num_carte)
-        .join(models.RegisterSemester, models.RegisterSemester.id_annual_register == models.AnnualRegister.id, isouter=True)
-    )
-
-    if mention_id:
-        age_query = age_query.filter(models.Student.id_mention == mention_id)
-    if academic_year_id:
-        age_query = age_query.filter(models.AnnualRegister.id_academic_year == academic_year_id)
-    if journey_id:
-        age_query = age_query.filter(models.RegisterSemester.id_journey == journey_id)
-
-    age_rows = (
-        age_query.filter(age_expr >= min_age, age_expr <= max_age)
-        .group_by("age")
-        .order_by("age")
-        .all()
-    )
-    age_map = {row.age: row.count for row in age_rows}
-    age_distribution = [
-        schemas.AgeBucket(age=age, count=age_map.get(age, 0))
-        for age in range(min_age, max_age + 1)
-    ]
-
-    sex_query = (
-        db.query(
-            models.Student.sex.label("sex"),
-            func.count(func.distinct(models.Student.id)).label("count"),
+    def academic_year_counts(db: Session) -> list:
+        year_ids = [academic_year_id] if academic_year_id else latest_academic_year_ids
+        rows = sorted(
+            dashboard_store.cells(db, ["id_academic_year"], id_academic_year=year_ids),
+            key=lambda row: academic_year_names.get(row.id_academic_year) or "",
         )
-        .join(models.AnnualRegister, models.AnnualRegister.num_carte == models.Student.num_carte)
-        .join(models.RegisterSemester, models.RegisterSemester.id_annual_register == models.AnnualRegister.id, isouter=True)
-    )
-    if mention_id:
-        sex_query = sex_query.filter(models.Student.id_mention == mention_id)
-    if academic_year_id:
-        sex_query = sex_query.filter(models.AnnualRegister.id_academic_year == academic_year_id)
-    if journey_id:
-        sex_query = sex_query.filter(models.RegisterSemester.id_journey == journey_id)
-    sex_rows = sex_query.group_by(models.Student.sex).all()
-
-    mention_sex_query = (
-        db.query(
-            models.Mention.id.label("mention_id"),
-            models.Mention.name.label("mention_name"),
-            models.Student.sex.label("sex"),
-            func.count(func.distinct(models.Student.id)).label("count"),
-        )
-        .join(models.Student, models.Student.id_mention == models.Mention.id)
-        .join(models.AnnualRegister, models.AnnualRegister.num_carte == models.Student.num_carte)
-        .join(models.RegisterSemester, models.RegisterSemester.id_annual_register == models.AnnualRegister.id, isouter=True)
-    )
-    if mention_id:
-        mention_sex_query = mention_sex_query.filter(models.Mention.id == mention_id)
-    if academic_year_id:
-        mention_sex_query = mention_sex_query.filter(models.AnnualRegister.id_academic_year == academic_year_id)
-    if journey_id:
-        mention_sex_query = mention_sex_query.filter(models.RegisterSemester.id_journey == journey_id)
-    mention_sex_rows = mention_sex_query.group_by(
-        models.Mention.id, models.Mention.name, models.Student.sex
-    ).all()
-
-    return schemas.DashboardCharts(
-        mention_counts=[
-            schemas.MentionCount(id=row.id, name=row.name or "", count=row.count)
-            for row in mention_rows
-        ],
-        academic_year_counts=[
-            schemas.AcademicYearCount(id=row.id, name=row.name or "", count=row.count)
-            for row in year_rows
-        ],
-        mention_enrollments=[
-            schemas.MentionEnrollment(
-                academic_year_id=row.academic_year_id,
-                academic_year_name=row.academic_year_name or "",
-                mention_id=row.mention_id,
-                mention_name=row.mention_name or "",
+        return [
+            schemas.AcademicYearCount(
+                id=row.id_academic_year,
+                name=academic_year_names.get(row.id_academic_year) or "",
                 count=row.count,
             )
-            for row in mention_rows_by_year
-        ],
-        new_student_mention_enrollments=[
+            for row in rows
+        ]
+
+    def _enrollments(db: Session, **filters) -> list:
+        rows = sorted(
+            (
+                row
+                for row in dashboard_store.cells(
+                    db, ["id_academic_year", "id_mention"], id_academic_year=latest_academic_year_ids, **filters
+                )
+                if row.id_mention
+            ),
+            key=lambda row: (
+                academic_year_names.get(row.id_academic_year) or "",
+                mention_names.get(row.id_mention) or "",
+            ),
+        )
+        return [
             schemas.MentionEnrollment(
-                academic_year_id=row.academic_year_id,
-                academic_year_name=row.academic_year_name or "",
-                mention_id=row.mention_id,
-                mention_name=row.mention_name or "",
+                academic_year_id=row.id_academic_year,
+                academic_year_name=academic_year_names.get(row.id_academic_year) or "",
+                mention_id=row.id_mention,
+                mention_name=mention_names.get(row.id_mention) or "",
                 count=row.count,
             )
-            for row in new_student_mention_rows_by_year
-        ],
-        age_distribution=age_distribution,
-        sex_counts=[
-            schemas.SexCount(
-                sex=row.sex.value if hasattr(row.sex, "value") else str(row.sex or ""),
-                count=row.count,
-            )
-            for row in sex_rows
-        ],
-        mention_sex_counts=[
+            for row in rows
+        ]
+
+    def age_distribution(db: Session) -> list:
+        current_year = date.today().year
+        birth_years = list(range(current_year - max_age, current_year - min_age + 1))
+        age_map = {
+            current_year - row.birth_year: row.count
+            for row in dashboard_store.cells(db, ["birth_year"], birth_year=birth_years, **scope)
+        }
+        return [
+            schemas.AgeBucket(age=age, count=age_map.get(age, 0))
+            for age in range(min_age, max_age + 1)
+        ]
+
+    def sex_counts(db: Session) -> list:
+        return [
+            schemas.SexCount(sex=row.sex, count=row.count)
+            for row in dashboard_store.cells(db, ["sex"], **scope)
+        ]
+
+    def mention_sex_counts(db: Session) -> list:
+        return [
             schemas.MentionSexCount(
-                mention_id=row.mention_id,
-                mention_name=row.mention_name or "",
-                sex=row.sex.value if hasattr(row.sex, "value") else str(row.sex or ""),
+                mention_id=row.id_mention,
+                mention_name=mention_names.get(row.id_mention) or "",
+                sex=row.sex,
                 count=row.count,
             )
-            for row in mention_sex_rows
-        ],
-        nationality_counts=[
-            schemas.NationalityCount(id=row.id, name=row.name or "", count=row.count)
-            for row in nationality_rows
-        ],
-        role_counts=[
-            schemas.RoleCount(role=row.role or "", count=row.count)
-            for row in role_rows
-        ],
+            for row in dashboard_store.cells(db, ["id_mention", "sex"], **scope)
+            if row.id_mention
+        ]
+
+    return {
+        "mention_counts": mention_counts,
+        "academic_year_counts": academic_year_counts,
+        "mention_enrollments": lambda db: _enrollments(db),
+        "new_student_mention_enrollments": lambda db: _enrollments(db, id_enter_year=latest_academic_year_ids),
+        "age_distribution": age_distribution,
+        "sex_counts": sex_counts,
+        "mention_sex_counts": mention_sex_counts,
+        "nationality_counts": nationality_counts,
+        "role_counts": role_counts,
+    }
+
+
+async def compute_summary(
+        db: AsyncSession, academic_year_id: int | None = None, timings: Dict[str, float] | None = None
+) -> schemas.DashboardSummary:
+    results, query_timings = await run_queries_async(db, _summary_queries(academic_year_id))
+    if timings is not None:
+        timings.update(query_timings)
+    return schemas.DashboardSummary(**results)
+
+
+async def compute_chart_data(
+        db: AsyncSession,
+        *,
+        min_age: int,
+        max_age: int,
+        mention_id: int | None,
+        academic_year_id: int | None,
+        journey_id: int | None,
+        timings: Dict[str, float] | None = None,
+) -> schemas.DashboardCharts:
+    queries = await db.run_sync(lambda session: _chart_queries(
+        session,
+        min_age=min_age,
+        max_age=max_age,
+        mention_id=mention_id,
+        academic_year_id=academic_year_id,
+        journey_id=journey_id,
+    ))
+    results, query_timings = await run_queries_async(db, queries)
+    if timings is not None:
+        timings.update(query_timings)
+    return schemas.DashboardCharts(**results)
+
+
+async def _cached(response: Response, key: tuple, compute: Callable[[Dict[str, float]], Awaitable[Any]]) -> Any:
+    """
+    Sert `key` depuis le cache du tableau de bord, sinon attend
+    `compute(timings)`. Les durées des requêtes (celles du calcul mis en
+    cache en cas de hit) sont renvoyées dans l'en-tête `Server-Timing`.
+    """
+    cached = dashboard_cache.get(key)
+    if cached is not None:
+        value, timings = cached
+        response.headers["X-Dashboard-Cache"] = "hit"
+    else:
+        version = dashboard_cache.version()
+        timings = {}
+        value = await compute(timings)
+        dashboard_cache.put(key, value, timings, version)
+        response.headers["X-Dashboard-Cache"] = "miss"
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={duration:.1f}" for name, duration in sorted(timings.items(), key=lambda item: -item[1])
     )
+    return value
 
 
 @router.get("/", response_model=schemas.DashboardStats)
-def get_dashboard_all(
+async def get_dashboard_all(
         *,
+        response: Response,
         min_age: int = 16,
         max_age: int = 32,
         mention_id: int | None = None,
         academic_year_id: int | None = None,
         journey_id: int | None = None,
-        db: Session = Depends(deps.get_db),
+        db: AsyncSession = Depends(deps.get_async_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Aggregate full dashboard (backward compatibility).
     """
-    summary = compute_summary(db, academic_year_id)
-    charts = compute_chart_data(
-        db,
-        min_age=min_age,
-        max_age=max_age,
-        mention_id=mention_id,
-        academic_year_id=academic_year_id,
-        journey_id=journey_id,
-    )
-    return schemas.DashboardStats(**summary.dict(), **charts.dict())
+    async def compute(timings: Dict[str, float]) -> schemas.DashboardStats:
+        queries = _summary_queries(academic_year_id)
+        queries.update(await db.run_sync(lambda session: _chart_queries(
+            session,
+            min_age=min_age,
+            max_age=max_age,
+            mention_id=mention_id,
+            academic_year_id=academic_year_id,
+            journey_id=journey_id,
+        )))
+        results, query_timings = await run_queries_async(db, queries)
+        timings.update(query_timings)
+        return schemas.DashboardStats(**results)
+
+    key = ("all", academic_year_id, mention_id, journey_id, min_age, max_age)
+    return await _cached(response, key, compute)
 
 
 @router.get("/summary", response_model=schemas.DashboardSummary)
-def get_dashboard_summary_only(
+async def get_dashboard_summary_only(
         *,
+        response: Response,
         academic_year_id: int | None = None,
-        db: Session = Depends(deps.get_db),
+        db: AsyncSession = Depends(deps.get_async_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Lightweight endpoint for summary KPIs.
     """
-    return compute_summary(db, academic_year_id)
+    key = ("summary", academic_year_id)
+    return await _cached(response, key, lambda timings: compute_summary(db, academic_year_id, timings))
 
 
 @router.get("/charts", response_model=schemas.DashboardCharts)
-def get_dashboard_charts(
+async def get_dashboard_charts(
         *,
+        response: Response,
         min_age: int = 16,
         max_age: int = 32,
         mention_id: int | None = None,
         academic_year_id: int | None = None,
         journey_id: int | None = None,
-        db: Session = Depends(deps.get_db),
+        db: AsyncSession = Depends(deps.get_async_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Endpoint for heavy chart data.
     """
-    return compute_chart_data(
+    key = ("charts", academic_year_id, mention_id, journey_id, min_age, max_age)
+    return await _cached(response, key, lambda timings: compute_chart_data(
         db,
         min_age=min_age,
         max_age=max_age,
         mention_id=mention_id,
         academic_year_id=academic_year_id,
         journey_id=journey_id,
-    )
+        timings=timings,
+    ))
@@ -1,4 +1,3 @@
-import ast
 import shutil
 from pathlib import Path
 from typing import Any, Optional
@@ -10,6 +9,8 @@ from sqlalchemy.orm import Session
 
 from app.api import deps
 from app import crud, models, schemas
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 FILES_ROOT = Path("files")
@@ -29,30 +30,21 @@ def read_documents(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
-    relations = []
-    if relation:
-        try:
-            relations += ast.literal_eval(relation)
-        except (ValueError, SyntaxError):
-            pass
-
-    wheres = []
-    if where:
-        try:
-            wheres += ast.literal_eval(where)
-        except (ValueError, SyntaxError):
-            pass
+    relations = filter_dsl.parse_relations(relation, crud.document.model)
+    wheres = filter_dsl.parse_where(where, crud.document.model)
 
     documents = crud.document.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres
     )
-    count = crud.document.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseDocument(**{'count': count, 'data': jsonable_encoder(documents)})
+    count = crud.document.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseDocument(**{'count': count, 'data': jsonable_encoder(documents), 'next_cursor': crud.document.next_cursor(documents, limit=limit)})
     return response
 
 
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, Q
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.enum.count_strategy import CountStrategyEnum
 from app.api import deps
 from app.enum.file_type import FileTypeEnum
 
@@ -43,6 +44,8 @@ def list_files(
   *,
   offset: int = 0,
   limit: int = 20,
+  cursor: str = None,
+  count_strategy: CountStrategyEnum = None,
   q: Optional[str] = Query(None, description="Filter by partial name match"),
   file_type: Optional[FileTypeEnum] = Query(None, description="Filter by file type"),
   db: Session = Depends(deps.get_db),
@@ -58,13 +61,15 @@ def list_files(
     db=db,
     skip=offset,
     limit=limit,
+    cursor=cursor,
     where=wheres,
   )
-  count = crud.file_asset.get_count_where_array(db=db, where=wheres)
+  count = crud.file_asset.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
 
   return schemas.ResponseFileAsset(
     count=count,
     data=[_serialize_file_asset(file_asset) for file_asset in files],
+    next_cursor=crud.file_asset.next_cursor(files, limit=limit),
   )
 
 
@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -13,6 +14,8 @@ def read_journey_semesters(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -21,18 +24,14 @@ def read_journey_semesters(
     """
     Retrieve journey_semesters.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.journey_semester.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.journey_semester.model)
 
     journey_semesters = crud.journey_semester.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.journey_semester.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseJourneySemester(**{'count': count, 'data': jsonable_encoder(journey_semesters)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.journey_semester.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseJourneySemester(**{'count': count, 'data': jsonable_encoder(journey_semesters), 'next_cursor': crud.journey_semester.next_cursor(journey_semesters, limit=limit)})
     return response
 
 
@@ -80,13 +79,9 @@ def read_journey_semester(
     """
     Get journey_semester by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.journey_semester.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.journey_semester.model)
 
     journey_semester = crud.journey_semester.get(db=db, id=journey_semester_id, relations=relations, where=wheres)
     if not journey_semester:
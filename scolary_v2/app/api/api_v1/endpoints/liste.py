@@ -1,8 +1,6 @@
 import ast
 from pathlib import Path
 from typing import Any, List, Union
-import os
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
@@ -11,9 +9,9 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
-from app.utils_sco.list import list_bourse, list_exams, list_select
-from app.utils_sco.list.list_by_group import create_list_group
-from app.utils_sco.list.list_inscrit import create_list_registered
+from app.utils_sco.list import list_bourse, list_exams, list_inscrit, list_select
+from app.utils_sco.list.list_by_group import TEMPLATE_VERSION as GROUP_TEMPLATE_VERSION, create_list_group
+from app.utils_sco.list.header import university_context
 from app.utils import (
     create_model,
     find_in_list,
@@ -22,50 +20,12 @@ from app.utils import (
 )
 
 from app.pdf.PDFMark import PDFMark as FPDF
+from app.pdf.generation_cache import pdf_cache
+from app.pdf.output_store import file_reference, stream_response
 
 router = APIRouter()
 
 
-def _cleanup_old_pdfs(base_dir: str) -> None:
-    """Remove PDFs (or dated folders) older than today in base_dir."""
-    try:
-        today = datetime.now().date()
-        if not os.path.isdir(base_dir):
-            return
-        for name in os.listdir(base_dir):
-            path = os.path.join(base_dir, name)
-            try:
-                stat = os.stat(path)
-            except OSError:
-                continue
-            mdate = datetime.fromtimestamp(stat.st_mtime).date()
-            if mdate < today:
-                try:
-                    if os.path.isdir(path):
-                        for root, _, files in os.walk(path, topdown=False):
-                            for f in files:
-                                os.remove(os.path.join(root, f))
-                        os.rmdir(path)
-                    else:
-                        os.remove(path)
-                except OSError:
-                    continue
-    except Exception:
-        # Best effort cleanup; do not fail the request
-        pass
-
-
-def _prepare_pdf_path(base_dir: str, filename: str) -> tuple[str, str]:
-    """Ensure date-based directory exists and return full + relative paths."""
-    _cleanup_old_pdfs(base_dir)
-    today_dir = datetime.now().strftime("%Y-%m-%d")
-    dated_dir = os.path.join(base_dir, today_dir)
-    os.makedirs(dated_dir, exist_ok=True)
-    full_path = os.path.join(dated_dir, filename)
-    rel_path = f"pdf/list/{today_dir}/{filename}"
-    return full_path, rel_path
-
-
 def _build_pdf_response(result: Union[dict, str], request: Request | None = None) -> schemas.PdfFileResponse:
     if isinstance(result, dict):
         path = str(result.get("path", "")).lstrip("/")
@@ -210,11 +170,12 @@ def list_registered(
         id_year: int,
         semester: str,
         id_journey: str,
+        stream: bool = False,
         db: Session = Depends(deps.get_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    create list registered
+    create list registered (stream=true : le PDF est renvoyé directement)
     """
     accademic_years = crud.academic_year.get(db=db, id=id_year)
     if not accademic_years:
@@ -271,15 +232,20 @@ def list_registered(
         "journey": journey.name,
         "anne": accademic_years.name,
     }
-    lists = create_list_registered(
-        semester,
-        journey.abbreviation,
-        data,
-        all_student,
-        university,
-        start_number=int(start_number)
+    filename = f"list_register_{semester}_{journey.abbreviation}.pdf"
+    # Mêmes lignes, même en-tête, même gabarit : le PDF déjà rendu est réutilisé.
+    cached = (
+        "list_registered",
+        list_inscrit.TEMPLATE_VERSION,
+        [semester, data, all_student, int(start_number), university_context(db)],
+        filename,
+        lambda: bytes(list_inscrit.build_list_registered(
+            semester, data, all_student, university, start_number=int(start_number)
+        ).output()),
     )
-    return _build_pdf_response(lists)
+    if stream:
+        return stream_response(pdf_cache.open(*cached), filename)
+    return _build_pdf_response(file_reference(pdf_cache.render(*cached)))
 
 
 @router.get("/list_by_group/", response_model=schemas.PdfFileResponse)
@@ -288,11 +254,12 @@ def list_by_group(
         id_year: int,
         semester: str,
         id_journey: int,
+        stream: bool = False,
         db: Session = Depends(deps.get_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    create list registered
+    create list registered (stream=true : le PDF est renvoyé directement)
     """
     academic_year = crud.academic_year.get(db=db, id=id_year)
     if not academic_year:
@@ -338,7 +305,8 @@ def list_by_group(
     )
     skip = 0
     group = 1
-    pdf = FPDF("P", "mm", "a4")
+    # (numéro du groupe, étudiants, premier numéro) : lignes d'entrée du PDF.
+    group_rows = []
 
     data = {
         "mention": mention.name if mention else "",
@@ -403,26 +371,25 @@ def list_by_group(
             for on_student in students
         ]
 
-        create_list_group(
-            pdf,
-            semester,
-            data,
-            all_student,
-            group,
-            university,
-            start_number=int(grp.start_number or (skip + 1))
-        )
+        group_rows.append([group, all_student, int(grp.start_number or (skip + 1))])
         group += 1
         skip += len(students)
     safe_abbr = (journey.abbreviation or journey.name or "journey").replace(" ", "_")
     safe_year = (academic_year.name or str(id_year)).replace(" ", "_") if academic_year else "annee"
     filename = f"groupe_{group_template.group_number or 1}_{semester}_{safe_abbr}_{safe_year}.pdf"
-    base_dir = "files/pdf/list"
-    full_path, rel_path = _prepare_pdf_path(base_dir, filename)
-    pdf.output(full_path, "F")
-    return _build_pdf_response(
-        {"path": rel_path, "filename": filename}
-    , request=request)
+
+    def render() -> bytes:
+        pdf = FPDF("P", "mm", "a4")
+        for number, all_student, start_number in group_rows:
+            create_list_group(pdf, semester, data, all_student, number, university, start_number=start_number)
+        return bytes(pdf.output())
+
+    cached = (
+        "list_by_group", GROUP_TEMPLATE_VERSION, [semester, data, group_rows, university_context(db)], filename, render,
+    )
+    if stream:
+        return stream_response(pdf_cache.open(*cached), filename)
+    return _build_pdf_response(file_reference(pdf_cache.render(*cached)), request=request)
 
 
 @router.get("/list_selection/", response_model=schemas.PdfFileResponse)
@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -15,6 +16,8 @@ def read_mentions(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -24,13 +27,9 @@ def read_mentions(
     """
     Retrieve mentions.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.mention.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.mention.model)
     if user_only and current_user.is_superuser == False:
         mention_ids = [
             assignment.id_mention
@@ -46,9 +45,9 @@ def read_mentions(
         )
 
     mentions = crud.mention.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.mention.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseMention(**{'count': count, 'data': jsonable_encoder(mentions)})
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.mention.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseMention(**{'count': count, 'data': jsonable_encoder(mentions), 'next_cursor': crud.mention.next_cursor(mentions, limit=limit)})
     return response
 
 
@@ -96,13 +95,9 @@ def read_mention(
     """
     Get mention by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.mention.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.mention.model)
 
     mention = crud.mention.get(db=db, id=mention_id, relations=relations, where=wheres)
     if not mention:
@@ -0,0 +1,20 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends
+
+from app import models, schemas
+from app.api import deps
+from app.db.pool_metrics import all_pool_metrics
+
+router = APIRouter()
+
+
+@router.get('/pool', response_model=List[schemas.PoolMetrics])
+def read_pool_metrics(
+        *,
+        current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Connection pool usage of this worker: checkout wait histogram, in-use and overflow gauges, timeouts.
+    """
+    return all_pool_metrics()
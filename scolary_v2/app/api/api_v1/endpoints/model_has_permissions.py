@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -15,6 +16,8 @@ def read_model_has_permissions(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -23,18 +26,14 @@ def read_model_has_permissions(
     """
     Retrieve model_has_permissions.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.model_has_permission.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.model_has_permission.model)
 
     model_has_permissions = crud.model_has_permission.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.model_has_permission.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseModelHasPermission(**{'count': count, 'data': jsonable_encoder(model_has_permissions)})
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.model_has_permission.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseModelHasPermission(**{'count': count, 'data': jsonable_encoder(model_has_permissions), 'next_cursor': crud.model_has_permission.next_cursor(model_has_permissions, limit=limit)})
     return response
 
 
@@ -83,13 +82,9 @@ def read_model_has_permission(
     """
     Get model_has_permission by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.model_has_permission.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.model_has_permission.model)
 
     model_has_permission = crud.model_has_permission.get(db=db, id=model_has_permission_id, relations=relations,
                                                          where=wheres)
@@ -1,38 +1,41 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
+
+NOTE_CONFLICT_DETAIL = "Note already exists for this register semester, offering and session."
 from app.api import deps
 @router.get('/', response_model=schemas.ResponseNote)
-def read_notes(
+async def read_notes(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
-        db: Session = Depends(deps.get_db),
+        db: AsyncSession = Depends(deps.get_async_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve notes.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
-
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
-
-    notes = crud.note.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.note.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseNote(**{'count': count, 'data': jsonable_encoder(notes)})
+    relations = filter_dsl.parse_relations(relation, crud.note.model)
+
+    wheres = filter_dsl.parse_where(where, crud.note.model)
+
+    notes = await crud.note.get_multi_where_array_async(
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = await crud.note.get_count_where_array_async(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseNote(**{'count': count, 'data': jsonable_encoder(notes), 'next_cursor': crud.note.next_cursor(notes, limit=limit)})
     return response
 
 
@@ -46,8 +49,46 @@ def create_note(
     """
     Create new note.
     """
-    note = crud.note.create(db=db, obj_in=note_in)
-    return note
+    existing = None
+    if note_in.id_register_semester is not None:
+        existing = crud.note.get_by_key(
+            db=db,
+            id_register_semester=note_in.id_register_semester,
+            id_constituent_element_offering=note_in.id_constituent_element_offering,
+            session=note_in.session,
+        )
+    if existing is not None and existing.deleted_at is None:
+        raise HTTPException(status_code=409, detail=NOTE_CONFLICT_DETAIL)
+    try:
+        if existing is not None:
+            # La contrainte unique couvre aussi les notes supprimées : la ligne est restaurée.
+            return crud.note.update(db=db, db_obj=existing, obj_in={**note_in.model_dump(), "deleted_at": None})
+        return crud.note.create(db=db, obj_in=note_in)
+    except IntegrityError:
+        # Saisie concurrente de la même note.
+        db.rollback()
+        raise HTTPException(status_code=409, detail=NOTE_CONFLICT_DETAIL)
+
+
+@router.post('/bulk', response_model=schemas.ResponseNoteBulk)
+def create_notes_bulk(
+        *,
+        db: Session = Depends(deps.get_db),
+        notes_in: schemas.NoteBulkCreate,
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Create or update a whole grade sheet in a single statement.
+    """
+    results = crud.note.upsert_many(db=db, notes=notes_in.notes, id_user=current_user.id)
+    statuses = [result["status"] for result in results]
+    return schemas.ResponseNoteBulk(
+        created=statuses.count("created"),
+        updated=statuses.count("updated"),
+        unchanged=statuses.count("unchanged"),
+        errors=statuses.count("error"),
+        data=results,
+    )
 
 
 @router.put('/{note_id}', response_model=schemas.Note)
@@ -80,13 +121,9 @@ def read_note(
     """
     Get note by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.note.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.note.model)
 
     note = crud.note.get(db=db, id=note_id, relations=relations, where=wheres)
     if not note:
@@ -24,6 +24,11 @@ def _get_roles_from_user(user: models.User) -> list[str]:
     return roles or ["user"]
 
 
+def _user_filter(user: models.User) -> dict:
+    # Notifications personnelles (target_users) : visibles de leurs seuls destinataires.
+    return {"$or": [{"target_users": {"$exists": False}}, {"target_users": user.id}]}
+
+
 @router.get("/notifications")
 def list_notifications(
     limit: int = 50,
@@ -42,10 +47,13 @@ def list_notifications(
         if normalized:
             roles.append(normalized)
     query = {
-        "$or": [
-            {"target_roles": {"$exists": False}},
-            {"target_roles": {"$size": 0}},
-            {"target_roles": {"$in": roles}}
+        "$and": [
+            {"$or": [
+                {"target_roles": {"$exists": False}},
+                {"target_roles": {"$size": 0}},
+                {"target_roles": {"$in": roles}}
+            ]},
+            _user_filter(current_user),
         ]
     }
     docs = coll.find(query).sort("created_at", -1).limit(limit)
@@ -74,10 +82,13 @@ def mark_notification_read(
     result = coll.update_one(
         {
             "_id": _id,
-            "$or": [
-                {"target_roles": {"$exists": False}},
-                {"target_roles": {"$size": 0}},
-                {"target_roles": {"$in": roles}}
+            "$and": [
+                {"$or": [
+                    {"target_roles": {"$exists": False}},
+                    {"target_roles": {"$size": 0}},
+                    {"target_roles": {"$in": roles}}
+                ]},
+                _user_filter(current_user),
             ]
         },
         {"$addToSet": {"read_by": current_user.id}}
@@ -91,6 +102,7 @@ def mark_notification_read(
 async def websocket_notifications(websocket: WebSocket):
     token = websocket.query_params.get("token") or websocket.headers.get("Authorization", "").replace("Bearer ", "")
     roles: list[str] = []
+    user_id = None
     if token:
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[deps.security.ALGORITHM])
@@ -104,6 +116,7 @@ async def websocket_notifications(websocket: WebSocket):
                     .all()
                 )
                 if user:
+                    user_id = user[0].id
                     roles = []
                     try:
                         for ur in getattr(user[0], "user_role", []) or []:
@@ -115,7 +128,7 @@ async def websocket_notifications(websocket: WebSocket):
             # If token is invalid, continue without user context (best effort)
             pass
 
-    await manager.connect(websocket, roles)
+    await manager.connect(websocket, roles, user_id=user_id)
     try:
         while True:
             # We don't expect messages from clients yet; just keep connection alive.
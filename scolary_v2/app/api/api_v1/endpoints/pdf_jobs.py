@@ -0,0 +1,25 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app import crud, models, schemas
+from app.api import deps
+from app.core.pdf_jobs import job_manager
+
+router = APIRouter()
+
+
+@router.get('/{job_id}', response_model=schemas.PdfJob)
+def read_pdf_job(
+        *,
+        job_id: str,
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get the status of a background PDF job and its files once done.
+    """
+    job = job_manager.get(job_id)
+    # Le job d'un autre utilisateur est traité comme inexistant.
+    if not job or (job["id_user"] != current_user.id and not crud.user.is_superuser(current_user)):
+        raise HTTPException(status_code=404, detail='PDF job not found')
+    return job
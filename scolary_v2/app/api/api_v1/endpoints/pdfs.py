@@ -1,3 +1,4 @@
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -6,10 +7,19 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.pdf_jobs import job_manager, snapshot
+from app.enum.loading_profile import LoadingProfileEnum
+from app.enum.session_type import SessionTypeEnum
 from app.utils import generateOnlyValue
 from app.utils_sco.heads_card import parcourir_et as generate_head_cards
-from app.utils_sco.list.list_by_year import create_list_registered_by_year
+from app.pdf.generation_cache import pdf_cache
+from app.pdf.output_store import file_reference, spooled_file, stream_response
+from app.utils_sco.list import list_by_year
+from app.utils_sco.list.header import university_context
 from app.utils_sco.tails_card import parcourir_et as generate_tail_cards
+from app.utils_sco.transcript_renderer import (
+    print_transcripts, render_transcripts, transcripts_filename, write_zip,
+)
 
 router = APIRouter()
 
@@ -35,18 +45,14 @@ def _build_pdf_response(result: dict) -> schemas.PdfFileResponse:
     return schemas.PdfFileResponse(path=f"{path}", filename=filename, url=url)
 
 
-@router.get('/students/list', response_model=schemas.PdfFileResponse)
-def print_students_list(
-        *,
-        id_year: int = Query(..., description="Academic year id"),
-        db: Session = Depends(deps.get_db),
-        current_user: models.User = Depends(deps.get_current_active_user),
-) -> Any:
+def _students_list_payload(db: Session, id_year: int) -> Dict[str, Any]:
     academic_year = crud.academic_year.get(db=db, id=id_year)
     if not academic_year:
         raise HTTPException(status_code=404, detail="Academic year not found")
 
-    annual_registers = db.query(models.AnnualRegister).filter(
+    annual_registers = db.query(models.AnnualRegister).options(
+        *crud.annual_register.profile_options(LoadingProfileEnum.minimal)
+    ).filter(
         models.AnnualRegister.id_academic_year == id_year
     ).all()
 
@@ -82,20 +88,41 @@ def print_students_list(
     )
     if not students:
         raise HTTPException(status_code=404, detail="No students found for this year")
+    return {"year_name": academic_year.name or str(id_year), "students": students}
 
-    result = create_list_registered_by_year(academic_year.name or str(id_year), students)
-    return _build_pdf_response(result)
 
+@router.get('/students/list', response_model=schemas.PdfFileResponse)
+def print_students_list(
+        *,
+        id_year: int = Query(..., description="Academic year id"),
+        stream: bool = Query(False, description="Send the PDF in the response instead of a download link"),
+        db: Session = Depends(deps.get_db),
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    payload = _students_list_payload(db, id_year)
+    year_name, students = payload["year_name"], payload["students"]
+    filename = list_by_year.list_registered_by_year_filename(year_name)
+    cached = (
+        "students_list", list_by_year.TEMPLATE_VERSION, [year_name, students, university_context(db)], filename,
+        lambda: bytes(list_by_year.build_list_registered_by_year(year_name, students).output()),
+    )
+    if stream:
+        return stream_response(pdf_cache.open(*cached), filename)
+    return _build_pdf_response(file_reference(pdf_cache.render(*cached)))
 
-@router.get('/students/cards', response_model=schemas.PdfFileResponse)
-def print_student_cards(
+
+@router.post('/students/list/jobs', response_model=schemas.PdfJob)
+def print_students_list_job(
         *,
-        id_mention: int = Query(..., description="Mention id"),
-        id_year: Optional[int] = Query(None, description="Academic year id"),
-        side: str = Query("heads", description="heads or tails"),
+        id_year: int = Query(..., description="Academic year id"),
         db: Session = Depends(deps.get_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
+    payload = _students_list_payload(db, id_year)
+    return job_manager.submit("students_list", payload, id_user=current_user.id)
+
+
+def _student_cards_payload(db: Session, id_mention: int, id_year: Optional[int]) -> Dict[str, Any]:
     mention = crud.mention.get(db=db, id=id_mention)
     if not mention:
         raise HTTPException(status_code=404, detail="Mention not found")
@@ -115,7 +142,9 @@ def print_student_cards(
 
     student_rows: List[Dict[str, Any]] = []
     for student in students:
-        annual_query = db.query(models.AnnualRegister).filter(
+        annual_query = db.query(models.AnnualRegister).options(
+            *crud.annual_register.profile_options(LoadingProfileEnum.minimal)
+        ).filter(
             models.AnnualRegister.num_carte == student.num_carte
         )
         if id_year is not None:
@@ -160,13 +189,106 @@ def print_student_cards(
         "supperadmin": getattr(university, "admin_signature", "") if university else "",
         "key": generateOnlyValue()
     }
+    return {"students": student_rows, "data": data, "university": university}
+
 
+@router.get('/students/cards', response_model=schemas.PdfFileResponse)
+def print_student_cards(
+        *,
+        id_mention: int = Query(..., description="Mention id"),
+        id_year: Optional[int] = Query(None, description="Academic year id"),
+        side: str = Query("heads", description="heads or tails"),
+        db: Session = Depends(deps.get_db),
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
     side_normalized = side.strip().lower()
+    if side_normalized not in ("heads", "tails"):
+        raise HTTPException(status_code=400, detail="Invalid card side")
+    payload = _student_cards_payload(db, id_mention, id_year)
     if side_normalized == "heads":
-        result = generate_head_cards(student_rows, data, university)
-    elif side_normalized == "tails":
-        result = generate_tail_cards(student_rows, data)
+        result = generate_head_cards(payload["students"], payload["data"], payload["university"])
     else:
-        raise HTTPException(status_code=400, detail="Invalid card side")
+        result = generate_tail_cards(payload["students"], payload["data"])
 
     return _build_pdf_response(result)
+
+
+@router.post('/students/cards/jobs', response_model=schemas.PdfJob)
+def print_student_cards_job(
+        *,
+        id_mention: int = Query(..., description="Mention id"),
+        id_year: Optional[int] = Query(None, description="Academic year id"),
+        side: str = Query("heads", description="heads or tails"),
+        db: Session = Depends(deps.get_db),
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    side_normalized = side.strip().lower()
+    if side_normalized not in ("heads", "tails"):
+        raise HTTPException(status_code=400, detail="Invalid card side")
+    payload = _student_cards_payload(db, id_mention, id_year)
+    payload["university"] = snapshot(payload["university"])
+    payload["side"] = side_normalized
+    return job_manager.submit("student_cards", payload, id_user=current_user.id)
+
+
+def _transcripts_payload(
+        db: Session, id_journey: int, semester: str, id_year: int, session: SessionTypeEnum,
+        output: str, date: Optional[str],
+) -> Dict[str, Any]:
+    if output not in ("pdf", "zip"):
+        raise HTTPException(status_code=400, detail="Invalid output, expected pdf or zip")
+    cohort = crud.result_teaching_unit.transcripts(
+        db=db, id_journey=id_journey, semester=semester, id_academic_year=id_year, session=session
+    )
+    if not cohort["students"]:
+        raise HTTPException(status_code=404, detail="No students found for this journey semester")
+    university = db.query(models.University).first()
+    if not university:
+        raise HTTPException(status_code=404, detail="University not found")
+    return {
+        "cohort": cohort,
+        "date": date or str(datetime.now().year),
+        "university": snapshot(university),
+        "output": output,
+    }
+
+
+@router.get('/transcripts', response_model=schemas.PdfFileResponse)
+def print_cohort_transcripts(
+        *,
+        id_journey: int = Query(..., description="Journey id"),
+        semester: str = Query(..., description="Semester, e.g. S1"),
+        id_year: int = Query(..., description="Academic year id"),
+        session: SessionTypeEnum = Query(SessionTypeEnum.SN, description="Exam session"),
+        output: str = Query("pdf", description="pdf (one merged document) or zip (one file per student)"),
+        date: Optional[str] = Query(None, description="Year printed in the transcript number"),
+        stream: bool = Query(False, description="Send the document in the response instead of a download link"),
+        db: Session = Depends(deps.get_db),
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    payload = _transcripts_payload(db, id_journey, semester, id_year, session, output, date)
+    cohort, date, university = payload["cohort"], payload["date"], payload["university"]
+    if not stream:
+        return _build_pdf_response(print_transcripts(cohort, date, university, output))
+    filename = transcripts_filename(cohort, output)
+    if output == "zip":
+        file = spooled_file()
+        write_zip(cohort, date, university, file)
+        return stream_response(file, filename)
+    return stream_response(render_transcripts(cohort, date, university), filename)
+
+
+@router.post('/transcripts/jobs', response_model=schemas.PdfJob)
+def print_cohort_transcripts_job(
+        *,
+        id_journey: int = Query(..., description="Journey id"),
+        semester: str = Query(..., description="Semester, e.g. S1"),
+        id_year: int = Query(..., description="Academic year id"),
+        session: SessionTypeEnum = Query(SessionTypeEnum.SN, description="Exam session"),
+        output: str = Query("pdf", description="pdf (one merged document) or zip (one file per student)"),
+        date: Optional[str] = Query(None, description="Year printed in the transcript number"),
+        db: Session = Depends(deps.get_db),
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    payload = _transcripts_payload(db, id_journey, semester, id_year, session, output, date)
+    return job_manager.submit("transcripts", payload, id_user=current_user.id)
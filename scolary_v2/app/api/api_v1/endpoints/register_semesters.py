@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 from app.core.notifications import schedule_notification
 
@@ -15,6 +16,8 @@ def read_register_semesters(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -23,18 +26,14 @@ def read_register_semesters(
     """
     Retrieve register_semesters.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.register_semester.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.register_semester.model)
 
     register_semesters = crud.register_semester.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.register_semester.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseRegisterSemester(**{'count': count, 'data': jsonable_encoder(register_semesters)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.register_semester.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseRegisterSemester(**{'count': count, 'data': jsonable_encoder(register_semesters), 'next_cursor': crud.register_semester.next_cursor(register_semesters, limit=limit)})
     return response
 
 
@@ -122,13 +121,9 @@ def read_register_semester(
     """
     Get register_semester by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.register_semester.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.register_semester.model)
 
     register_semester = crud.register_semester.get(db=db, id=register_semester_id, relations=relations, where=wheres)
     if not register_semester:
@@ -1,11 +1,12 @@
 from typing import Any
-import ast
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 from app.api import deps
 
 router = APIRouter()
@@ -16,6 +17,8 @@ def read_required_documents(
     *,
     offset: int = 0,
     limit: int = 20,
+    cursor: str = None,
+    count_strategy: CountStrategyEnum = None,
     relation: str = "[]",
     where: str = "[]",
     db: Session = Depends(deps.get_db),
@@ -24,20 +27,16 @@ def read_required_documents(
     """
     Retrieve required documents.
     """
-    relations = []
-    if relation not in (None, "", [], "[]"):
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.required_document.model)
 
-    wheres = []
-    if where not in (None, "", []):
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.required_document.model)
 
     required_documents = crud.required_document.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres
     )
-    count = crud.required_document.get_count_where_array(db=db, where=wheres)
+    count = crud.required_document.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
     response = schemas.ResponseRequiredDocument(
-        **{'count': count, 'data': jsonable_encoder(required_documents)}
+        **{'count': count, 'data': jsonable_encoder(required_documents), 'next_cursor': crud.required_document.next_cursor(required_documents, limit=limit)}
     )
     return response
 
@@ -88,13 +87,9 @@ def read_required_document(
     """
     Get required document by ID.
     """
-    relations = []
-    if relation not in (None, "", [], "[]"):
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.required_document.model)
 
-    wheres = []
-    if where not in (None, "", []):
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.required_document.model)
 
     required_document = crud.required_document.get(
         db=db, id=required_document_id, relations=relations, where=wheres
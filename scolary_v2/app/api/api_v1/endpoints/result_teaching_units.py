@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -13,6 +14,8 @@ def read_result_teaching_units(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -21,18 +24,14 @@ def read_result_teaching_units(
     """
     Retrieve result_teaching_units.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.result_teaching_unit.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.result_teaching_unit.model)
 
     result_teaching_units = crud.result_teaching_unit.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.result_teaching_unit.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseResultTeachingUnit(**{'count': count, 'data': jsonable_encoder(result_teaching_units)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.result_teaching_unit.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseResultTeachingUnit(**{'count': count, 'data': jsonable_encoder(result_teaching_units), 'next_cursor': crud.result_teaching_unit.next_cursor(result_teaching_units, limit=limit)})
     return response
 
 
@@ -50,6 +49,25 @@ def create_result_teaching_unit(
     return result_teaching_unit
 
 
+@router.post('/deliberation', response_model=schemas.ResponseDeliberation)
+def deliberate_result_teaching_units(
+        *,
+        db: Session = Depends(deps.get_db),
+        deliberation_in: schemas.DeliberationCreate,
+        current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Compute and store the teaching unit results of a whole journey semester.
+    """
+    return crud.result_teaching_unit.deliberate(
+        db=db,
+        id_journey=deliberation_in.id_journey,
+        semester=deliberation_in.semester,
+        id_academic_year=deliberation_in.id_academic_year,
+        session=deliberation_in.session,
+    )
+
+
 @router.put('/{result_teaching_unit_id}', response_model=schemas.ResultTeachingUnit)
 def update_result_teaching_unit(
         *,
@@ -80,13 +98,9 @@ def read_result_teaching_unit(
     """
     Get result_teaching_unit by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.result_teaching_unit.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.result_teaching_unit.model)
 
     result_teaching_unit = crud.result_teaching_unit.get(db=db, id=result_teaching_unit_id, relations=relations, where=wheres)
     if not result_teaching_unit:
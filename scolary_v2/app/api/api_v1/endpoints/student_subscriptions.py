@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -13,6 +14,8 @@ def read_student_subscriptions(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -21,18 +24,14 @@ def read_student_subscriptions(
     """
     Retrieve student_subscriptions.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.student_subscription.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.student_subscription.model)
 
     student_subscriptions = crud.student_subscription.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.student_subscription.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseStudentSubscription(**{'count': count, 'data': jsonable_encoder(student_subscriptions)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.student_subscription.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseStudentSubscription(**{'count': count, 'data': jsonable_encoder(student_subscriptions), 'next_cursor': crud.student_subscription.next_cursor(student_subscriptions, limit=limit)})
     return response
 
 
@@ -80,13 +79,9 @@ def read_student_subscription(
     """
     Get student_subscription by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.student_subscription.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.student_subscription.model)
 
     student_subscription = crud.student_subscription.get(db=db, id=student_subscription_id, relations=relations, where=wheres)
     if not student_subscription:
@@ -5,10 +5,13 @@ import shutil
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
+from app.enum.loading_profile import LoadingProfileEnum
 from datetime import date
 import re
 
@@ -58,53 +61,50 @@ def generate_num_select(db: Session, id_mention: int) -> str:
 
 
 @router.get('/', response_model=schemas.ResponseStudent)
-def read_students(
+async def read_students(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where_relation: str = "[]",
         base_column: str = "[]",
         where: str = "[]",
         include_deleted: bool = False,
-        db: Session = Depends(deps.get_db),
+        db: AsyncSession = Depends(deps.get_async_db),
         current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve students.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.student.model)
 
-    wheres_relations = []
-    if where_relation is not None and where_relation != "" and where_relation != []:
-        wheres_relations += ast.literal_eval(where_relation)
+    wheres_relations = filter_dsl.parse_where_relation(where_relation, crud.student.model)
 
-    base_columns = []
-    if base_column is not None and base_column != "" and base_column != []:
-        base_columns += ast.literal_eval(base_column)
+    base_columns = filter_dsl.parse_base_columns(base_column, crud.student.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.student.model)
 
-    students = crud.student.get_multi_where_array(
+    students = await crud.student.get_multi_where_array_async(
         db=db,
         relations=relations,
         skip=offset,
         limit=limit,
+        cursor=cursor,
         where=wheres,
         base_columns=base_columns,
         where_relation=wheres_relations,
         include_deleted=include_deleted
     )
-    count = crud.student.get_count_where_array(
+    count = await crud.student.get_count_where_array_async(
         db=db,
         where=wheres,
-        include_deleted=include_deleted
+        include_deleted=include_deleted,
+        strategy=count_strategy,
+        cursor=cursor,
     )
-    response = schemas.ResponseStudent(**{'count': count, 'data': jsonable_encoder(students)})
+    response = schemas.ResponseStudent(**{'count': count, 'data': jsonable_encoder(students), 'next_cursor': crud.student.next_cursor(students, limit=limit)})
     return response
 
 
@@ -123,21 +123,13 @@ def read_one_student(
     """
     Retrieve students.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.student.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.student.model)
 
-    wheres_relations = []
-    if where_relation is not None and where_relation != "" and where_relation != []:
-        wheres_relations += ast.literal_eval(where_relation)
+    wheres_relations = filter_dsl.parse_where_relation(where_relation, crud.student.model)
 
-    base_columns = []
-    if base_column is not None and base_column != "" and base_column != []:
-        base_columns += ast.literal_eval(base_column)
+    base_columns = filter_dsl.parse_base_columns(base_column, crud.student.model)
 
     student = crud.student.get_first_where_array(
         db=db, relations=relations, where=wheres, base_columns=base_columns, where_relation=wheres_relations)
@@ -206,11 +198,11 @@ def read_one_student(
         # We deliberately swallow errors here to avoid breaking the endpoint
         document_status = None
 
-    wheres_customs = []
-    if where_custom is not None and where_custom != "" and where_custom != []:
-        wheres_customs += ast.literal_eval(where_custom)
+    wheres_customs = filter_dsl.parse_where(where_custom, crud.annual_register.model)
 
-    annual_register = crud.annual_register.get_first_where_array(db=db, where=wheres_customs)
+    annual_register = crud.annual_register.get_first_where_array(
+        db=db, where=wheres_customs, profile=LoadingProfileEnum.minimal
+    )
     if annual_register:
         max_semester_value = crud.register_semester.get_max_semester(db=db, id_annual_register=annual_register.id)
         if max_semester_value != (None,):
@@ -319,13 +311,9 @@ def read_student(
     """
     Get student by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.student.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.student.model)
 
     student = crud.student.get(db=db, id=student_id, relations=relations, where=wheres)
     if not student:
@@ -458,7 +446,8 @@ def hard_delete_student(
                 {"key": "num_carte", "operator": "==", "value": student.num_select}
             ]
         ],
-        limit=10
+        limit=10,
+        profile=LoadingProfileEnum.minimal,
     )
     annual_ids = [annual.id for annual in annual_registers if annual.id]
     if annual_ids:
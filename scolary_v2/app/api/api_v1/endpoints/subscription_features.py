@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -13,6 +14,8 @@ def read_subscription_features(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -21,18 +24,14 @@ def read_subscription_features(
     """
     Retrieve subscription_features.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.subscription_feature.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.subscription_feature.model)
 
     subscription_features = crud.subscription_feature.get_multi_where_array(
-      db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.subscription_feature.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseSubscriptionFeature(**{'count': count, 'data': jsonable_encoder(subscription_features)})
+      db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.subscription_feature.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseSubscriptionFeature(**{'count': count, 'data': jsonable_encoder(subscription_features), 'next_cursor': crud.subscription_feature.next_cursor(subscription_features, limit=limit)})
     return response
 
 
@@ -80,13 +79,9 @@ def read_subscription_feature(
     """
     Get subscription_feature by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-       relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.subscription_feature.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-       wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.subscription_feature.model)
 
     subscription_feature = crud.subscription_feature.get(db=db, id=subscription_feature_id, relations=relations, where=wheres)
     if not subscription_feature:
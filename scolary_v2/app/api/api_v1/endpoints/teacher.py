@@ -4,7 +4,8 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
 from app import crud, models, schemas
-import ast
+from app.crud import filter_dsl
+from app.enum.count_strategy import CountStrategyEnum
 
 router = APIRouter()
 from app.api import deps
@@ -15,6 +16,8 @@ def read_teachers(
         *,
         offset: int = 0,
         limit: int = 20,
+        cursor: str = None,
+        count_strategy: CountStrategyEnum = None,
         relation: str = "[]",
         where: str = "[]",
         db: Session = Depends(deps.get_db),
@@ -23,18 +26,14 @@ def read_teachers(
     """
     Retrieve teachers.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != []:
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.teacher.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.teacher.model)
 
     teachers = crud.teacher.get_multi_where_array(
-        db=db, relations=relations, skip=offset, limit=limit, where=wheres)
-    count = crud.teacher.get_count_where_array(db=db, where=wheres)
-    response = schemas.ResponseTeacher(**{'count': count, 'data': jsonable_encoder(teachers)})
+        db=db, relations=relations, skip=offset, limit=limit, cursor=cursor, where=wheres)
+    count = crud.teacher.get_count_where_array(db=db, where=wheres, strategy=count_strategy, cursor=cursor)
+    response = schemas.ResponseTeacher(**{'count': count, 'data': jsonable_encoder(teachers), 'next_cursor': crud.teacher.next_cursor(teachers, limit=limit)})
     return response
 
 
@@ -86,13 +85,9 @@ def read_teacher(
     """
     Get teacher by ID.
     """
-    relations = []
-    if relation is not None and relation != "" and relation != [] and relation != "[]":
-        relations += ast.literal_eval(relation)
+    relations = filter_dsl.parse_relations(relation, crud.teacher.model)
 
-    wheres = []
-    if where is not None and where != "" and where != []:
-        wheres += ast.literal_eval(where)
+    wheres = filter_dsl.parse_where(where, crud.teacher.model)
 
     teacher = crud.teacher.get(db=db, id=teacher_id, relations=relations, where=wheres)
     if not teacher:
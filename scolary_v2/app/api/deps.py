@@ -2,17 +2,22 @@
 # ---write your code here--- #
 # end #
 
-from typing import Generator
+import threading
+import time
+from typing import AsyncGenerator, Generator
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
+from app.db.change_tracking import table_version
+from app.db import async_session
 from app.db.session import SessionLocal
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -28,8 +33,114 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session.AsyncSessionLocal() as db:
+        yield db
+
+
+# Tables dont une écriture change les permissions effectives d'un utilisateur.
+PERMISSION_TABLES = (
+    "available_model",
+    "model_has_permission",
+    "permission",
+    "role",
+    "role_permission",
+    "user_role",
+)
+
+def _normalize(value) -> str:
+    return (value or "unknown").strip().lower()
+
+
+class _RouteTrie:
+    """Arbre de préfixes des `route_api` par segment de chemin."""
+
+    __slots__ = ("children", "route")
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.route = None
+
+    def insert(self, route_api: str) -> None:
+        node = self
+        for part in [part for part in route_api.split("/") if part]:
+            node = node.children.setdefault(part, _RouteTrie())
+        node.route = route_api.lstrip("/").lower()
+
+    def longest_match(self, path: str):
+        node = self
+        found = None
+        for part in [part for part in path.split("/") if part]:
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.route is not None:
+                found = node.route
+        return found
+
+
+class _RouteTable:
+    def __init__(self, available_models) -> None:
+        self.route_by_id = {
+            model.id: (model.route_api or "").strip().lower()
+            for model in available_models
+            if (model.route_api or "").strip()
+        }
+        self.name_by_id = {model.id: (model.name or "").strip() for model in available_models}
+        self.route_by_name = {
+            _normalize(model.name): (model.route_api or "").strip().lower()
+            for model in available_models
+            if _normalize(model.name) and (model.route_api or "").strip()
+        }
+        self.trie = _RouteTrie()
+        for model in available_models:
+            route_api = (model.route_api or "").strip()
+            if route_api:
+                self.trie.insert("/" + route_api.lstrip("/"))
+
+
+# Invalidés par les écritures de ce processus (table_version) et, pour celles des
+# autres workers ou faites en SQL direct, après PERMISSION_CACHE_TTL secondes.
+_cache_lock = threading.Lock()
+_route_table_cache = {"version": None, "expires_at": 0.0, "table": None}
+_permission_map_cache = {}
+
+
+def permissions_version() -> int:
+    """Version des permissions, incrémentée par toute écriture sur PERMISSION_TABLES."""
+    return table_version(*PERMISSION_TABLES)
+
+
+def _get_route_table(db: Session) -> _RouteTable:
+    version = table_version("available_model")
+    now = time.monotonic()
+    cached = _route_table_cache
+    if cached["table"] is not None and cached["version"] == version and cached["expires_at"] > now:
+        return cached["table"]
+    available_models = crud.available_model.get_multi_where_array(
+        db=db, skip=0, limit=1000
+    )
+    table = _RouteTable(available_models)
+    with _cache_lock:
+        _route_table_cache.update(
+            {"version": version, "expires_at": now + settings.PERMISSION_CACHE_TTL, "table": table}
+        )
+    return table
+
+
+def clear_auth_caches() -> None:
+    with _cache_lock:
+        _route_table_cache.update({"version": None, "expires_at": 0.0, "table": None})
+        _permission_map_cache.clear()
+
+
 def _build_permission_map(db: Session, user_id: int) -> dict:
-    normalize = lambda value: (value or "unknown").strip().lower()
+    version = permissions_version()
+    now = time.monotonic()
+    cached = _permission_map_cache.get(user_id)
+    if cached is not None and cached[0] == version and cached[1] > now:
+        return cached[2]
+
     entries = (
         db.query(models.ModelHasPermission)
         .join(
@@ -47,20 +158,10 @@ def _build_permission_map(db: Session, user_id: int) -> dict:
         .filter(models.UserRole.id_user == user_id)
         .all()
     )
-    available_models = crud.available_model.get_multi_where_array(
-        db=db, skip=0, limit=1000
-    )
-    route_by_id = {
-        model.id: (model.route_api or "").strip().lower()
-        for model in available_models
-        if (model.route_api or "").strip()
-    }
-    name_by_id = {model.id: (model.name or "").strip() for model in available_models}
-    route_by_name = {
-        normalize(model.name): (model.route_api or "").strip().lower()
-        for model in available_models
-        if normalize(model.name) and (model.route_api or "").strip()
-    }
+    route_table = _get_route_table(db)
+    route_by_id = route_table.route_by_id
+    name_by_id = route_table.name_by_id
+    route_by_name = route_table.route_by_name
 
     permission_map = {}
     for row in entries:
@@ -74,7 +175,7 @@ def _build_permission_map(db: Session, user_id: int) -> dict:
         elif hasattr(row, "model_name"):
             model_name = getattr(row, "model_name", None)
 
-        normalized_name = normalize(model_name)
+        normalized_name = _normalize(model_name)
         route_api = route_by_id.get(model_id) or route_by_name.get(normalized_name, normalized_name)
         route_api = route_api.lstrip("/")
         entry = permission_map.setdefault(
@@ -85,6 +186,9 @@ def _build_permission_map(db: Session, user_id: int) -> dict:
         entry["post"] = entry["post"] or bool(row.method_post)
         entry["put"] = entry["put"] or bool(row.method_put)
         entry["delete"] = entry["delete"] or bool(row.method_delete)
+
+    with _cache_lock:
+        _permission_map_cache[user_id] = (version, now + settings.PERMISSION_CACHE_TTL, permission_map)
     return permission_map
 
 
@@ -95,21 +199,9 @@ def _resolve_model_from_path(db: Session, path: str) -> str:
         trimmed = trimmed[len(api_prefix):]
     trimmed = "/" + trimmed.lstrip("/")
 
-    available_models = crud.available_model.get_multi_where_array(
-        db=db, skip=0, limit=1000
-    )
-    sorted_models = sorted(
-        available_models,
-        key=lambda model: len((model.route_api or "").strip()),
-        reverse=True
-    )
-    for model in sorted_models:
-        route_api = (model.route_api or "").strip()
-        if not route_api:
-            continue
-        route_api = "/" + route_api.lstrip("/")
-        if trimmed == route_api or trimmed.startswith(f"{route_api}/"):
-            return route_api.lstrip("/").lower()
+    route = _get_route_table(db).trie.longest_match(trimmed)
+    if route:
+        return route
 
     parts = [part for part in trimmed.split("/") if part]
     return parts[0].lower() if parts else ""
@@ -33,6 +33,24 @@ class Settings(BaseSettings):
     MYSQL_DATABASE: str = os.getenv("MYSQL_DATABASE")
 
     SQLALCHEMY_DATABASE_URI: Any = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+    ASYNC_SQLALCHEMY_DATABASE_URI: Any = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+
+    # Connection pools (per engine: sync and async)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    # Log and notify when a checkout waits longer than DB_POOL_WAIT_ALERT_MS
+    DB_POOL_ADAPTIVE: bool = os.getenv("DB_POOL_ADAPTIVE", "false").lower() in ("1", "true", "yes")
+    DB_POOL_WAIT_ALERT_MS: float = float(os.getenv("DB_POOL_WAIT_ALERT_MS", "1000"))
+
+    # Per-request SQL statement counter (X-DB-Queries header) and N+1 detection
+    QUERY_STATS_ENABLED: bool = os.getenv("QUERY_STATS_ENABLED", "true").lower() in ("1", "true", "yes")
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+    # Prometheus endpoint (/metrics): scrapers send "Authorization: Bearer <token>"; without a token
+    # configured, only superusers (with their access token) can read it
+    METRICS_TOKEN: str | None = os.getenv("METRICS_TOKEN")
 
     # Authentication settings
     SECRET_KEY: str = secrets.token_urlsafe(32)
@@ -51,6 +69,25 @@ class Settings(BaseSettings):
     MONGO_PASSWORD: str | None = os.getenv("MONGO_PASSWORD")
     MONGO_DATABASE: str = os.getenv("MONGO_DATABASE", "scolary")
 
+    # Background PDF jobs (0 = one worker process per CPU)
+    PDF_JOB_WORKERS: int = int(os.getenv("PDF_JOB_WORKERS", "0"))
+    PDF_JOB_DB: str = os.getenv("PDF_JOB_DB", "pdf_jobs.sqlite3")
+    # University letterhead used by the PDF headers, reloaded after this many seconds (0 = every document)
+    PDF_UNIVERSITY_CACHE_TTL: float = float(os.getenv("PDF_UNIVERSITY_CACHE_TTL", "300"))
+    # Generated documents under files/pdf: kept this many seconds after their last use, swept every interval
+    PDF_OUTPUT_MAX_AGE: float = float(os.getenv("PDF_OUTPUT_MAX_AGE", "86400"))
+    PDF_OUTPUT_JANITOR_INTERVAL: float = float(os.getenv("PDF_OUTPUT_JANITOR_INTERVAL", "3600"))
+    # Lists rendered from unchanged rows are reused from files/pdf/cache, bounded to this many bytes
+    PDF_CACHE_MAX_BYTES: int = int(os.getenv("PDF_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+    # Route table and per-user permission maps: reloaded after this many seconds at the latest,
+    # for changes made by other workers or directly in the database (0 = every request)
+    PERMISSION_CACHE_TTL: float = float(os.getenv("PERMISSION_CACHE_TTL", "30"))
+
+    # Dashboard: concurrent aggregate queries (<= 1 = serial) and response cache TTL (0 = disabled)
+    DASHBOARD_QUERY_WORKERS: int = int(os.getenv("DASHBOARD_QUERY_WORKERS", "4"))
+    DASHBOARD_CACHE_TTL: float = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+
     @property
     def mongo_uri(self) -> str | None:
         if self.MONGO_URI:
@@ -0,0 +1,253 @@
+"""
+Métriques de l'application au format texte Prometheus.
+
+Pas de dépendance externe : compteurs, jauges et histogrammes minimalistes,
+chacun protégé par son verrou. `MetricsMiddleware` (ASGI pur) mesure chaque
+requête HTTP par route (gabarit de chemin, pas l'URL) : le coût par requête
+se limite à deux `perf_counter`, un `bisect` et une prise de verrou.
+
+Les valeurs qui existent déjà ailleurs (pools de connexions, websockets
+ouverts) sont lues au moment du scrape par des collecteurs plutôt que
+maintenues en double. Les métriques sont propres à chaque worker.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [compte par classe..., +Inf, somme]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(labels, list(series)) for labels, series in self._values.items()]
+        lines = self.header()
+        for labels, series in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series[:-1]):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, function: Callable[[], List[str]]) -> Callable[[], List[str]]:
+        """Enregistre une fonction qui produit des lignes au moment du scrape."""
+        self._collectors.append(function)
+        return function
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            try:
+                lines += collector()
+            except Exception:
+                # Un collecteur en échec ne doit pas masquer les autres métriques.
+                pass
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route, method and status.", ("method", "route", "status"),
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and method.", ("method", "route"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+))
+pdf_generation_duration = registry.register(Histogram(
+    "pdf_generation_duration_seconds", "Background PDF job durations by kind and status.", ("kind", "status"),
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+))
+notification_fanout = registry.register(Histogram(
+    "notification_broadcast_recipients", "Websocket connections reached per notification broadcast.",
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000),
+))
+
+
+@registry.collector
+def _collect_pools() -> List[str]:
+    from app.db.pool_metrics import CHECKOUT_BUCKETS_MS, all_pool_metrics
+
+    gauges = {
+        "db_pool_size": ("size", "Configured pool size."),
+        "db_pool_in_use": ("in_use", "Connections currently checked out."),
+        "db_pool_overflow": ("overflow", "Overflow connections currently open."),
+        "db_pool_peak_in_use": ("peak_in_use", "Highest number of connections checked out at once."),
+    }
+    snapshots = all_pool_metrics()
+    lines: List[str] = []
+    for name, (key, documentation) in gauges.items():
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{pool="{s["name"]}"}} {s[key]}' for s in snapshots]
+    lines += ["# HELP db_pool_timeouts_total Checkouts that hit pool_timeout.", "# TYPE db_pool_timeouts_total counter"]
+    lines += [f'db_pool_timeouts_total{{pool="{s["name"]}"}} {s["timeouts"]}' for s in snapshots]
+    name = "db_pool_checkout_wait_seconds"
+    lines += [f"# HELP {name} Time spent waiting for a pooled connection.", f"# TYPE {name} histogram"]
+    for s in snapshots:
+        for bound, bucket in zip((*CHECKOUT_BUCKETS_MS, None), s["wait_ms_histogram"]):
+            le = _number(bound / 1000) if bound is not None else "+Inf"
+            lines.append(f'{name}_bucket{{pool="{s["name"]}",le="{le}"}} {bucket["count"]}')
+        lines.append(f'{name}_sum{{pool="{s["name"]}"}} {_number(s["wait_ms_sum"] / 1000)}')
+        lines.append(f'{name}_count{{pool="{s["name"]}"}} {s["checkouts"]}')
+    return lines
+
+
+@registry.collector
+def _collect_websockets() -> List[str]:
+    from app.core.notifications import manager
+
+    return [
+        "# HELP websocket_connections Open notification websocket connections.",
+        "# TYPE websocket_connections gauge",
+        f"websocket_connections {len(manager.active_connections)}",
+    ]
+
+
+@registry.collector
+def _collect_pdf_cache() -> List[str]:
+    from app.pdf.generation_cache import pdf_cache
+
+    stats = pdf_cache.stats()
+    lines: List[str] = []
+    for key, kind, documentation in (
+            ("hits", "counter", "Generated documents served from the cache."),
+            ("misses", "counter", "Generated documents rendered because no cached entry matched."),
+            ("evictions", "counter", "Cached documents removed to stay under PDF_CACHE_MAX_BYTES."),
+            ("entries", "gauge", "Documents currently cached."),
+            ("bytes", "gauge", "Size of the cached documents."),
+    ):
+        name = f"pdf_cache_{key}_total" if kind == "counter" else f"pdf_cache_{key}"
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+    return lines
+
+
+class MetricsMiddleware:
+    """Latence, débit et erreurs par route ; requêtes en cours."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            # Gabarit de la route (/students/{student_id}) : cardinalité bornée.
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration.observe(duration, method, path)
+            http_requests.inc(method, path, status)
@@ -5,6 +5,7 @@ from contextlib import contextmanager
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from app.core.metrics import notification_fanout
 from app.core.mongo import get_notifications_collection
 from app.db.session import SessionLocal
 from app.crud.crud_notification_template import notification_template
@@ -23,8 +24,9 @@ class NotificationManager:
     def __init__(self) -> None:
         self.active_connections: List[WebSocket] = []
         self.connection_roles: dict[WebSocket, List[str]] = {}
+        self.connection_users: dict[WebSocket, int | None] = {}
 
-    async def connect(self, websocket: WebSocket, roles: List[str] | None = None) -> None:
+    async def connect(self, websocket: WebSocket, roles: List[str] | None = None, user_id: int | None = None) -> None:
         await websocket.accept()
         normalized_roles = []
         if roles:
@@ -39,39 +41,57 @@ class NotificationManager:
                     normalized_roles.append(normalized)
         self.active_connections.append(websocket)
         self.connection_roles[websocket] = normalized_roles
+        self.connection_users[websocket] = user_id
 
     def disconnect(self, websocket: WebSocket) -> None:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
         if websocket in self.connection_roles:
             self.connection_roles.pop(websocket, None)
+        self.connection_users.pop(websocket, None)
 
     async def broadcast(self, message: Any) -> None:
         disconnected: List[WebSocket] = []
         target_roles = []
+        # Notification personnelle (ex. job PDF) : seules les connexions de ces utilisateurs la reçoivent.
+        target_users = None
         if isinstance(message, dict):
+            if message.get("target_users") is not None:
+                target_users = set(message["target_users"])
             target_roles = message.get("target_roles") or []
             target_roles = [
                 str(r).strip().lower()
                 for r in target_roles
                 if str(r).strip()
             ]
+        recipients = 0
         for connection in self.active_connections:
             roles = self.connection_roles.get(connection) or []
             allowed = True
+            if target_users is not None and self.connection_users.get(connection) not in target_users:
+                continue
             if target_roles:
                 allowed = any(r in target_roles for r in roles)
             if not allowed:
                 continue
             try:
                 await connection.send_json(message)
+                recipients += 1
             except Exception:
                 disconnected.append(connection)
         for ws in disconnected:
             self.disconnect(ws)
+        notification_fanout.observe(recipients)
 
 
 manager = NotificationManager()
+_event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def bind_event_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Loop of the application, used to broadcast from worker threads."""
+    global _event_loop
+    _event_loop = loop
 
 
 def _render_from_template(template_key: str | None, variables: dict | None):
@@ -157,6 +177,14 @@ def schedule_notification(message: Any) -> None:
     except Exception:
         pass
 
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is None and _event_loop is not None and _event_loop.is_running():
+        # Sync endpoints and background jobs run outside the loop owning the websockets.
+        asyncio.run_coroutine_threadsafe(manager.broadcast(prepared), _event_loop)
+        return
     try:
         loop = asyncio.get_event_loop()
         if loop.is_running():
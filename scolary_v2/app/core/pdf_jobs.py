@@ -0,0 +1,276 @@
+"""
+Génération des PDF (cartes, listes, relevés) en arrière-plan.
+
+Un endpoint soumet un job (type + données déjà chargées depuis la base) et
+reçoit aussitôt son identifiant ; le rendu s'exécute dans un pool de
+processus, ce qui permet de générer plusieurs promotions en parallèle sans
+bloquer les workers HTTP. L'état des jobs est conservé dans une petite base
+SQLite locale (aucun broker externe) : tous les workers uvicorn peuvent
+ainsi répondre au polling. À la fin d'un job, une notification est diffusée
+via le NotificationManager.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.core.metrics import pdf_generation_duration
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_job (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    id_user INTEGER,
+    pid INTEGER,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+)
+"""
+
+
+def snapshot(obj: Any) -> Optional[SimpleNamespace]:
+    """Copie picklable des colonnes d'un objet ORM (ex. University) pour les workers."""
+    if obj is None:
+        return None
+    return SimpleNamespace(**{
+        column.key: getattr(obj, column.key) for column in inspect(obj).mapper.column_attrs
+    })
+
+
+# Handlers exécutés dans les processus du pool : fonctions de module
+# (picklables par référence) qui importent leur générateur à la demande.
+
+def _render_carte_student(students, data, university):
+    from app.utils_sco import heads_card, tails_card
+
+    # Déjà dans un processus du pool : pas de second niveau de parallélisme.
+    return [
+        heads_card.parcourir_et(students, data, university, max_workers=1),
+        tails_card.parcourir_et(students, data, max_workers=1),
+    ]
+
+
+def _render_student_cards(students, data, university, side):
+    from app.utils_sco import heads_card, tails_card
+
+    if side == "tails":
+        return [tails_card.parcourir_et(students, data, max_workers=1)]
+    return [heads_card.parcourir_et(students, data, university, max_workers=1)]
+
+
+def _render_students_list(year_name, students):
+    from app.utils_sco.list.list_by_year import create_list_registered_by_year
+
+    return [create_list_registered_by_year(year_name, students)]
+
+
+def _render_badges(users, university):
+    from app.utils_sco import badge_head_user, badge_tails_user
+
+    return [badge_head_user.print_badge(users, university), badge_tails_user.print_badge(users, university)]
+
+
+def _render_transcripts(cohort, date, university, output):
+    from app.utils_sco.transcript_renderer import print_transcripts
+
+    return [print_transcripts(cohort, date, university, output, max_workers=1)]
+
+
+JOB_HANDLERS: Dict[str, Callable[..., List[Any]]] = {
+    "carte_student": _render_carte_student,
+    "student_cards": _render_student_cards,
+    "students_list": _render_students_list,
+    "badge_user": _render_badges,
+    "transcripts": _render_transcripts,
+}
+
+
+def file_response(result: Any) -> Dict[str, str]:
+    """Normalise le retour d'un générateur ({path, filename} ou chemin) en PdfFileResponse."""
+    if isinstance(result, dict):
+        path = str(result.get("path", "")).lstrip("/")
+        filename = str(result.get("filename", ""))
+    else:
+        remainder = Path(Path(str(result)).as_posix().lstrip("/"))
+        filename = remainder.name
+        parts = remainder.parts[1:-1] if remainder.parts and remainder.parts[0] == "files" else remainder.parts[:-1]
+        path = Path(*parts).as_posix() if parts else ""
+    if path and not path.endswith("/"):
+        path = f"{path}/"
+    return {"path": path, "filename": filename, "url": f"/files/{path}{filename}" if filename else ""}
+
+
+def _run_job(store_path: str, job_id: str, kind: str,
+             payload: Dict[str, Any]) -> Tuple[float, Optional[List[Dict[str, str]]], Optional[str]]:
+    # Le job reste "queued" tant qu'il attend un processus libre du pool ;
+    # l'heure de début (horloge murale, commune aux processus) exclut cette attente.
+    started = time.time()
+    PdfJobStore(store_path).update(job_id, status=JOB_RUNNING)
+    try:
+        return started, [file_response(result) for result in JOB_HANDLERS[kind](**payload)], None
+    except Exception as exc:
+        return started, None, str(exc) or type(exc).__name__
+
+
+class PdfJobStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                connection.execute(_SCHEMA)
+                connection.commit()
+                self._ready = True
+        return connection
+
+    def insert(self, job_id: str, kind: str, id_user: Optional[int]) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO pdf_job (id, kind, status, id_user, pid, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, JOB_QUEUED, id_user, os.getpid(), datetime.now().isoformat()),
+            )
+
+    def update(self, job_id: str, **values: Any) -> None:
+        if "result" in values:
+            values["result"] = json.dumps(values["result"], default=str)
+        columns = ", ".join(f"{name} = ?" for name in values)
+        with self._connect() as connection:
+            connection.execute(f"UPDATE pdf_job SET {columns} WHERE id = ?", (*values.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM pdf_job WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+class PdfJobManager:
+    def __init__(
+            self,
+            store: PdfJobStore,
+            *,
+            max_workers: Optional[int] = None,
+            executor_factory: Optional[Callable[[], Executor]] = None,
+    ) -> None:
+        self.store = store
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor_factory = executor_factory or (lambda: ProcessPoolExecutor(max_workers=self.max_workers))
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._local_jobs = set()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self._executor_factory()
+        return self._executor
+
+    def submit(self, kind: str, payload: Dict[str, Any], *, id_user: Optional[int] = None) -> Dict[str, Any]:
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown PDF job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        self.store.insert(job_id, kind, id_user)
+        self._local_jobs.add(job_id)
+        future = self.executor.submit(_run_job, self.store.path, job_id, kind, payload)
+        future.add_done_callback(lambda done: self._finish(job_id, done, kind))
+        return self.get(job_id)
+
+    def _finish(self, job_id: str, future, kind: str) -> None:
+        finished_at = datetime.now().isoformat()
+        try:
+            started, result, error = future.result()
+        except Exception as exc:
+            # Pool cassé ou payload non picklable : le rendu n'a pas démarré, pas de durée.
+            started, result, error = None, None, str(exc) or type(exc).__name__
+        if error is None:
+            status = JOB_DONE
+            self.store.update(job_id, status=JOB_DONE, result=result, finished_at=finished_at)
+        else:
+            status = JOB_FAILED
+            self.store.update(job_id, status=JOB_FAILED, error=error, finished_at=finished_at)
+        if started is not None:
+            pdf_generation_duration.observe(time.time() - started, kind, status)
+        self._local_jobs.discard(job_id)
+        self._notify(self.get(job_id))
+
+    def _notify(self, job: Dict[str, Any]) -> None:
+        from app.core.notifications import schedule_notification
+
+        if job["id_user"] is None:
+            return
+        try:
+            # Simple signal pour le seul demandeur : les fichiers se récupèrent via GET /pdf_jobs/{id},
+            # qui vérifie le propriétaire. Rien de privé dans le journal des notifications.
+            schedule_notification({
+                "type": "pdf_job",
+                "title": "Document prêt" if job["status"] == JOB_DONE else "Échec de la génération",
+                "message": f"PDF {job['kind']} {job['status']}",
+                "job_id": job["id"],
+                "status": job["status"],
+                "target_users": [job["id_user"]],
+            })
+        except Exception:
+            # La notification est un confort : le polling reste la référence.
+            pass
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        # Job d'un processus disparu (redémarrage) : il ne terminera jamais.
+        if job["status"] in (JOB_QUEUED, JOB_RUNNING) and job["id"] not in self._local_jobs \
+                and not _pid_alive(job["pid"]):
+            self.store.update(job_id, status=JOB_FAILED, error="Worker stopped before completion")
+            job = self.store.get(job_id)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+job_manager = PdfJobManager(
+    PdfJobStore(settings.PDF_JOB_DB), max_workers=settings.PDF_JOB_WORKERS or None
+)
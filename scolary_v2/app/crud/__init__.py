@@ -45,3 +45,4 @@ from .crud_teacher import teacher
 from .crud_plugged import plugged
 from .crud_notification_template import notification_template
 from .crud_model_has_permission import model_has_permission
+from . import dashboard_store  # noqa: F401
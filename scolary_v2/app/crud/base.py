@@ -1,21 +1,30 @@
 import ast
+import base64
 import json
 from datetime import datetime, timedelta, date
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 import re
 import regex
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import and_, asc, delete, desc, extract, func, inspect, or_, case
+from sqlalchemy import and_, asc, delete, desc, extract, func, inspect, or_, case, tuple_, literal, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import (
     Session,
-    joinedload,
-    load_only,
+    defer,
     with_loader_criteria,
-    selectinload,
 )
+from app.crud.count_cache import count_cache
+from app.crud.filter_plan import compile_where, fingerprint, get_plan_cache
+from app.crud.relation_plan import describe, loader_options
+from app.db.change_tracking import table_version
+from app.db.query_stats import collect_queries
 from app.db.base_class import Base
+from app.enum.count_strategy import CountStrategyEnum
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -23,6 +32,9 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Profils de chargement : nom -> colonnes différées (voir profile_options)
+    loading_profiles: Dict[str, Sequence[str]] = {}
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -38,6 +50,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     # Helpers pour les relations & filtres
     # -------------------------------------------------------------------------
 
+    def profile_options(self, profile: Optional[str]) -> list:
+        """Options `defer()` du profil de chargement `profile` (aucune si None)."""
+        if not profile:
+            return []
+        if profile not in self.loading_profiles:
+            raise HTTPException(status_code=400, detail=f"Unknown loading profile '{profile}'")
+        return [defer(getattr(self.model, column)) for column in self.loading_profiles[profile]]
+
     def build_filter_condition(self, attribute, operator: str, value: Any):
         """
         Factorise toute la logique des opérateurs pour pouvoir la réutiliser
@@ -205,46 +225,31 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         # Wrapper simple pour garder la compatibilité avec le reste du code
         return self.get_joined_load(relations)
 
-    def get_joined_load(self, relations: List[str]):
-        def process_relation(relation: str):
-            parts = relation.split(".")
-            previous_model = self.model
-            result = None
-
-            for i in range(len(parts)):
-                part = parts[i]
-
-                if "{" in part and "}" in part:
-                    relationship, columns = part.split("{")
-                    columns = columns.rstrip("}").split(",")
-                else:
-                    relationship = part
-                    columns = []
-
-                attr = getattr(previous_model, relationship)
-
-                if result:
-                    result = result.selectinload(attr)
-                else:
-                    result = selectinload(attr)
-
-                # Use current model BEFORE updating previous_model
-                current_model = attr.property.mapper.class_
-
-                if columns:
-                    result = result.load_only(*[getattr(current_model, col) for col in columns])
-                else:
-                    result = result.load_only(getattr(current_model, "id"))
-
-                previous_model = current_model
-
-            return result
-
-        options = []
-        for relation in relations:
-            options.append(process_relation(relation))
+    def get_joined_load(self, relations: List[str], base_columns: Optional[List[str]] = None):
+        """
+        Options de chargement des relations (voir app.crud.relation_plan) :
+        joinedload pour les many-to-one, selectinload pour les collections,
+        préfixes communs fusionnés.
+        """
+        return loader_options(self.model, relations, base_columns)
 
-        return options
+    def explain_relations(
+            self, db: Session, relations: List[str], *, where: Any = None,
+            base_columns: Optional[List[str]] = None, limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Plan de chargement de `relations` et requêtes SQL réellement émises
+        par un get_multi_where_array équivalent (débogage, façon EXPLAIN).
+        """
+        with collect_queries() as stats:
+            self.get_multi_where_array(
+                db, relations=relations, where=where, base_columns=base_columns, limit=limit
+            )
+        return {
+            "plan": describe(self.model, relations, base_columns),
+            "round_trips": stats.count,
+            "statements": [{"count": count, "statement": shape} for shape, count in stats.shapes.items()],
+        }
 
     # -------------------------------------------------------------------------
     # Parsing des clés/conditions
@@ -400,16 +405,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             where_relation: Any = None,
             relations=None,
             include_deleted=False,
+            profile: Optional[str] = None,
     ) -> Optional[ModelType]:
         query = db.query(self.model).filter(self.model.id == id)
+        query = query.options(*self.profile_options(profile))
 
         if where is not None and isinstance(where, list):
-            conditions = self.get_full_condition(
+            query = self.apply_full_condition(
+                query,
                 where=where,
                 include_deleted=include_deleted,
             )
-            if conditions is not None:
-                query = query.filter(conditions)
 
         # Nouveau : filtres sur les relations qui ne touchent pas le parent
         if where_relation is not None and isinstance(where_relation, list):
@@ -422,24 +428,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     def get_first_where_array(
             self, db: Session, *, where: Any = None, where_relation: Any = None,
-            relations=None, base_columns=None
+            relations=None, base_columns=None, profile: Optional[str] = None
     ) -> List[ModelType]:
         query = db.query(self.model)
-        conditions = self.get_full_condition(
-            where=where
-        )
-        if conditions is not None:
-            query = query.filter(conditions)
+        query = self.apply_full_condition(query, where=where)
+        query = query.options(*self.profile_options(profile))
 
         if where_relation is not None and isinstance(where_relation, list):
             query = self.apply_where_relation(query, where_relation)
 
-        if base_columns is not None and len(base_columns) > 0:
-            query = query.options(load_only(*[getattr(self.model, col) for col in base_columns]))
-
-        if relations is not None and len(relations) > 0:
-            load_options = self.get_joined_load(relations)
-            query = query.options(*load_options)
+        if relations or base_columns:
+            query = query.options(*self.get_joined_load(relations, base_columns))
 
         result = query.first()
 
@@ -460,19 +459,34 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             include_deleted: bool = False,
             order_by_subquery=None,
             today_first: bool = False,
+            cursor: Optional[str] = None,
+            profile: Optional[str] = None,
     ) -> List[ModelType]:
         query = db.query(self.model)
-        conditions = self.get_full_condition(
+        query = self.apply_full_condition(
+            query,
             where=where,
             include_deleted=include_deleted,
         )
-        if conditions is not None:
-            query = query.filter(conditions)
+        query = query.options(*self.profile_options(profile))
 
         # Nouveau : filtres relationnels non filtrants pour le parent
         if where_relation is not None and isinstance(where_relation, list):
             query = self.apply_where_relation(query, where_relation)
 
+        # Mode curseur : on se positionne directement après la dernière ligne
+        # de la page précédente au lieu de parcourir `skip` lignes.
+        if cursor:
+            if order_by_subquery is not None or today_first or "." in order_by:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Cursor pagination only supports ordering on a column of the model",
+                )
+            query = query.filter(
+                self.get_cursor_condition(cursor, order_by=order_by, order=order)
+            )
+            skip = 0
+
         order_function = asc
         if order == "DESC":
             order_function = desc
@@ -514,16 +528,102 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             .offset(skip)
             .limit(limit)
         )
-        if base_columns is not None and len(base_columns) > 0:
-            query = query.options(load_only(*base_columns))
-
-        if relations is not None and len(relations) > 0:
-            load_options = self.get_joined_load(relations)
-            query = query.options(*load_options)
+        if relations or base_columns:
+            query = query.options(*self.get_joined_load(relations, base_columns))
 
         result = query.all()
         return result
 
+    # -------------------------------------------------------------------------
+    # Pagination par curseur (keyset)
+    # -------------------------------------------------------------------------
+
+    def encode_cursor(self, record: ModelType, order_by: str = "id", order: str = "DESC") -> str:
+        payload = {
+            "k": order_by,
+            "o": order,
+            "v": jsonable_encoder(getattr(record, order_by)),
+            "id": record.id,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str, order_by: str = "id", order: str = "DESC") -> Dict[str, Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            last_id = int(payload["id"])
+            key = payload["k"]
+            direction = payload["o"]
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if key != order_by or direction != order:
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested order")
+        value = payload.get("v")
+        if value is not None and order_by != "id":
+            value = self._coerce_cursor_value(getattr(self.model, order_by), value)
+        return {"value": value, "id": last_id}
+
+    def _coerce_cursor_value(self, attribute, value):
+        try:
+            python_type = attribute.type.python_type
+        except (AttributeError, NotImplementedError):
+            return value
+        try:
+            if python_type is datetime:
+                return datetime.fromisoformat(value)
+            if python_type is date:
+                return date.fromisoformat(value)
+            if python_type is Decimal:
+                return Decimal(str(value))
+            if issubclass(python_type, Enum):
+                return python_type(value)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return value
+
+    def get_cursor_condition(self, cursor: str, *, order_by: str = "id", order: str = "DESC"):
+        """
+        Condition « après la dernière ligne vue » pour l'ordre
+        `order_by {order}, id DESC` utilisé par get_multi_where_array.
+        """
+        position = self.decode_cursor(cursor, order_by=order_by, order=order)
+        id_column = self.model.id
+        last_id = position["id"]
+        if order_by == "id":
+            return id_column < last_id if order == "DESC" else id_column > last_id
+
+        column = getattr(self.model, order_by)
+        value = position["value"]
+        nullable = getattr(getattr(column, "expression", None), "nullable", True)
+        # NULL est la plus petite valeur pour MySQL comme pour SQLite :
+        # en premier en ASC, en dernier en DESC.
+        if value is None:
+            if order == "DESC":
+                return and_(column.is_(None), id_column < last_id)
+            return or_(column.isnot(None), and_(column.is_(None), id_column < last_id))
+        # Valeur liée avec le type de la colonne (Boolean, Enum, DateTime...).
+        bound_value = literal(value, column.type)
+        if order == "DESC":
+            condition = tuple_(column, id_column) < tuple_(bound_value, last_id)
+            if nullable:
+                condition = or_(condition, column.is_(None))
+            return condition
+        return or_(column > bound_value, and_(column == bound_value, id_column < last_id))
+
+    def next_cursor(
+            self,
+            records: List[ModelType],
+            *,
+            limit: int,
+            order_by: str = "id",
+            order: str = "DESC",
+    ) -> Optional[str]:
+        """Curseur de la page suivante, ou None si la page est la dernière."""
+        if not records or len(records) < limit:
+            return None
+        return self.encode_cursor(records[-1], order_by=order_by, order=order)
+
     def get_order_by_subquery(self, db: Session, *, order_by_key):
         key_segments = order_by_key.split(".")
         subquery_filter = True
@@ -614,6 +714,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.commit()
         return objs_to_add
 
+    def upsert_statement(
+            self,
+            db: Session,
+            rows: List[Dict[str, Any]],
+            *,
+            index_elements: List[str],
+            update_columns: List[str],
+    ):
+        """
+        Multi-row INSERT ... ON DUPLICATE KEY UPDATE (ON CONFLICT DO UPDATE on
+        SQLite/PostgreSQL) on the unique key `index_elements`. Updated rows get
+        `update_columns` from the new values, a fresh updated_at and are restored.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect in ("mysql", "mariadb"):
+            stmt = mysql.insert(self.model).values(rows)
+            return stmt.on_duplicate_key_update(
+                **{name: stmt.inserted[name] for name in update_columns},
+                updated_at=func.now(),
+                deleted_at=None,
+            )
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(self.model).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={
+                **{name: stmt.excluded[name] for name in update_columns},
+                "updated_at": func.now(),
+                "deleted_at": None,
+            },
+        )
+
     def add_model(
             self,
             db: Session,
@@ -766,22 +898,133 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db: Session,
             where: Any = None,
             include_deleted=False,
-    ) -> int:
-        query = db.query(self.model.id)
+            strategy: Optional[Union[CountStrategyEnum, str]] = None,
+            cursor: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Nombre de lignes correspondant à `where` selon `strategy` :
+
+        * `exact` (défaut) : COUNT complet ;
+        * `none` : aucun comptage, renvoie None (défaut en mode curseur) ;
+        * `estimate` : estimation du planificateur MySQL (EXPLAIN), COUNT exact
+          sur les autres bases ;
+        * `cached` : COUNT mémorisé par filtre, invalidé par les écritures sur
+          la table et expiré après un court TTL.
+        """
+        if strategy is None:
+            strategy = CountStrategyEnum.none if cursor else CountStrategyEnum.exact
+        try:
+            strategy = CountStrategyEnum(strategy)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid count strategy {strategy}")
+
+        if strategy == CountStrategyEnum.none:
+            return None
+
+        if strategy == CountStrategyEnum.estimate:
+            conditions = self.get_full_condition(where=where, include_deleted=include_deleted)
+            estimate = self.estimate_count(db, conditions)
+            if estimate is not None:
+                return estimate
+            query = db.query(self.model.id)
+            if conditions is not None:
+                query = query.filter(conditions)
+            return query.count()
 
-        conditions = self.get_full_condition(
+        if where is None:
+            where = []
+        query = db.query(self.model.id)
+        query = self.apply_full_condition(
+            query,
             where=where,
             include_deleted=include_deleted,
         )
-        if conditions is not None:
-            query = query.filter(conditions)
+
+        if strategy == CountStrategyEnum.cached:
+            tablename = self.model.__tablename__
+            shape, values = fingerprint(where)
+            key = count_cache.make_key(tablename, shape, values, include_deleted)
+            cached = count_cache.get(key)
+            if cached is not None:
+                return cached
+            # Version lue avant le COUNT : une écriture concurrente invalide l'entrée.
+            version = table_version(tablename)
+            result = query.count()
+            count_cache.put(key, result, version)
+            return result
 
         result = query.count()
         return result
 
+    def estimate_count(self, db: Session, conditions: Any = None) -> Optional[int]:
+        """Estimation du nombre de lignes par EXPLAIN (MySQL uniquement)."""
+        dialect = db.get_bind().dialect
+        if dialect.name != "mysql":
+            return None
+        statement = select(self.model.id)
+        if conditions is not None:
+            statement = statement.where(conditions)
+        compiled = statement.compile(
+            dialect=dialect, compile_kwargs={"render_postcompile": True}
+        )
+        rows = db.connection().exec_driver_sql(
+            "EXPLAIN " + str(compiled), compiled.params
+        ).mappings().all()
+        tablename = self.model.__tablename__
+        for row in rows:
+            if row.get("table") == tablename and row.get("select_type") in ("SIMPLE", "PRIMARY"):
+                estimated = float(row.get("rows") or 0) * float(row.get("filtered") or 100) / 100
+                return int(round(estimated))
+        return None
+
+    # -------------------------------------------------------------------------
+    # READ asynchrone
+    # -------------------------------------------------------------------------
+    # Variantes pour AsyncSession : la requête est construite et exécutée par
+    # la méthode synchrone correspondante via `run_sync`, sur la connexion
+    # asynchrone, pour garder exactement les mêmes filtres et options. Les
+    # relations doivent être demandées via `relations` : un chargement paresseux
+    # hors de `run_sync` échoue.
+
+    async def get_async(self, db: AsyncSession, id: Any, **kwargs: Any) -> Optional[ModelType]:
+        return await db.run_sync(lambda session: self.get(session, id, **kwargs))
+
+    async def get_multi_where_array_async(self, db: AsyncSession, **kwargs: Any) -> List[ModelType]:
+        return await db.run_sync(lambda session: self.get_multi_where_array(session, **kwargs))
+
+    async def get_count_where_array_async(self, db: AsyncSession, **kwargs: Any) -> Optional[int]:
+        return await db.run_sync(lambda session: self.get_count_where_array(session, **kwargs))
+
     def get_full_condition(
             self, where: Any = None, include_deleted=False
     ) -> Any:
+        conditions, params = self.compile_full_condition(
+            where=where, include_deleted=include_deleted
+        )
+        if conditions is not None and params:
+            return conditions.params(params)
+        return conditions
+
+    def apply_full_condition(
+            self, query, where: Any = None, include_deleted=False
+    ):
+        """
+        Filtre `query` avec `where`. Les valeurs sont passées en paramètres
+        d'exécution pour réutiliser telle quelle l'expression du plan en cache.
+        """
+        conditions, params = self.compile_full_condition(
+            where=where, include_deleted=include_deleted
+        )
+        if conditions is None:
+            return query
+        query = query.filter(conditions)
+        if params:
+            query = query.params(**params)
+        return query
+
+    def compile_full_condition(
+            self, where: Any = None, include_deleted=False
+    ) -> Tuple[Any, Dict[str, Any]]:
         if not include_deleted:
             if not where:
                 where = []
@@ -792,30 +1035,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 }
             )
         if where is not None:
-            conditions = []
-            for parent_condition in where:
-                if isinstance(parent_condition, list):
-                    # This is an OR condition - any of the conditions in the list should be true
-                    temp_conditions = []
-                    for condition in parent_condition:
-                        filter_condition = self.get_condition_deep_multiple(
-                            condition=condition
-                        )
-                        if filter_condition is not None:
-                            temp_conditions.append(filter_condition)
-                    if temp_conditions:
-                        conditions.append(or_(*temp_conditions))
-                else:
-                    # This is a normal AND condition
-                    filter_condition = self.get_condition_deep_multiple(
-                        condition=parent_condition
-                    )
-                    if filter_condition is not None:
-                        conditions.append(filter_condition)
-
-            if conditions:
-                return and_(*conditions)
-        return None
+            # Les listes imbriquées sont des groupes OR, le reste est combiné en AND.
+            # Le plan (parsing des clés, relations, arbre SQL) est mis en cache
+            # par forme de filtre ; seules les valeurs changent d'un appel à l'autre.
+            return compile_where(self, where)
+        return None, {}
 
     def remove_where_array(
             self, db: Session, where: Any = None, commit: bool = True
@@ -836,6 +1060,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if commit:
             db.commit()
 
+    def filter_plan_stats(self) -> Dict[str, int]:
+        """Statistiques du cache de plans de filtres de ce modèle."""
+        return get_plan_cache(self.model).stats()
+
     # -------------------------------------------------------------------------
     # Date helpers
     # -------------------------------------------------------------------------
@@ -0,0 +1,72 @@
+"""
+Cache des comptages (`get_count_where_array`, stratégie `cached`).
+
+Une entrée est indexée par (table, forme du filtre, valeurs) et porte la
+version de la table au moment du calcul : toute écriture sur la table la rend
+invalide (cf. app.db.change_tracking), et elle expire de toute façon après
+`DEFAULT_COUNT_TTL` secondes pour couvrir les filtres sur des relations.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.db.change_tracking import table_version
+
+DEFAULT_COUNT_TTL = 30.0
+DEFAULT_COUNT_CACHE_SIZE = 1024
+
+
+class CountCache:
+    def __init__(self, ttl: float = DEFAULT_COUNT_TTL, maxsize: int = DEFAULT_COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tablename: str, shape: Tuple, values: Any, include_deleted: bool) -> Tuple:
+        return (tablename, shape, json.dumps(values, default=str), include_deleted)
+
+    def get(self, key: Tuple) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, expires_at, count = entry
+                if version == table_version(key[0]) and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return count
+                self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, count: int, version: int) -> None:
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+count_cache = CountCache()
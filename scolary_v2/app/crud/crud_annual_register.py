@@ -9,14 +9,25 @@ from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
 from app.models import RegisterSemester
-from app.models.annual_register import AnnualRegister
+from app.models.annual_register import AnnualRegister, PROJECTION
 from app.schemas.annual_register import AnnualRegisterCreate, AnnualRegisterUpdate
 from app.enum.register_type import RegisterTypeEnum
+from app.enum.loading_profile import LoadingProfileEnum
 import secrets
 import string
 
 
+FINANCIAL_COLUMNS = ["total_payment", "enrollment_fee_amount", "payment_status"]
+
+
 class CRUDAnnualRegister(CRUDBase[AnnualRegister, AnnualRegisterCreate, AnnualRegisterUpdate]):
+    # Sans profil, toute la projection (niveau, paiements) est chargée.
+    loading_profiles = {
+        LoadingProfileEnum.minimal: list(PROJECTION),
+        LoadingProfileEnum.list: FINANCIAL_COLUMNS + ["max_semester_journey_id", "mention_id_from_max_semester"],
+        LoadingProfileEnum.financial: ["max_semester_journey_id", "mention_id_from_max_semester"],
+    }
+
     @staticmethod
     def _generate_registration_code(length: int = 8) -> str:
         alphabet = string.ascii_letters + string.digits
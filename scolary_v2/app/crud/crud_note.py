@@ -3,17 +3,127 @@
 # end #
 
 from typing import Optional, List, Dict, Any
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.models.constituent_element_offering import ConstituentElementOffering
 from app.models.note import Note
-from app.schemas.note import NoteCreate, NoteUpdate
+from app.models.register_semester import RegisterSemester
+from app.schemas.note import NoteCreate, NoteUpdate, NoteBulkItem
+
+BULK_NOTE_CHUNK_SIZE = 500
+NOTE_KEY_COLUMNS = ("id_register_semester", "id_constituent_element_offering", "session")
 
 
 class CRUDNote(CRUDBase[Note, NoteCreate, NoteUpdate]):
     def get_by_field(self, db: Session, *, field: str, value: Any) -> Optional[Note]:
         return db.query(Note).filter(getattr(Note, field) == value).first()
 
+    def get_by_key(
+            self, db: Session, *, id_register_semester: int, id_constituent_element_offering: int,
+            session: Any,
+    ) -> Optional[Note]:
+        """Note d'une inscription pour un EC et une session, y compris supprimée (soft delete)."""
+        return db.query(Note).filter(
+            Note.id_register_semester == id_register_semester,
+            Note.id_constituent_element_offering == id_constituent_element_offering,
+            Note.session == session,
+        ).first()
+
+    def upsert_many(
+            self, db: Session, *, notes: List[NoteBulkItem], id_user: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Enregistre une feuille de notes en une seule requête multi-lignes
+        (INSERT ... ON DUPLICATE KEY UPDATE sur MySQL) et retourne, pour chaque
+        ligne, son statut : created, updated, unchanged ou error.
+        """
+        results = [
+            {
+                "index": index,
+                "id_register_semester": item.id_register_semester,
+                "id_constituent_element_offering": item.id_constituent_element_offering,
+                "session": item.session,
+                "status": None,
+                "detail": None,
+            }
+            for index, item in enumerate(notes)
+        ]
+        if not notes:
+            return results
+
+        register_semester_ids = {item.id_register_semester for item in notes}
+        offering_ids = {item.id_constituent_element_offering for item in notes}
+        known_register_semesters = {
+            row.id for row in db.query(RegisterSemester.id).filter(
+                RegisterSemester.id.in_(register_semester_ids),
+                RegisterSemester.deleted_at.is_(None),
+            )
+        }
+        known_offerings = {
+            row.id for row in db.query(ConstituentElementOffering.id).filter(
+                ConstituentElementOffering.id.in_(offering_ids),
+                ConstituentElementOffering.deleted_at.is_(None),
+            )
+        }
+
+        # La dernière occurrence d'une même clé l'emporte, comme en saisie unitaire.
+        latest = {}
+        for index, item in enumerate(notes):
+            if item.id_register_semester not in known_register_semesters:
+                results[index].update(status="error", detail="Register semester not found")
+                continue
+            if item.id_constituent_element_offering not in known_offerings:
+                results[index].update(status="error", detail="Constituent element offering not found")
+                continue
+            key = (item.id_register_semester, item.id_constituent_element_offering, item.session)
+            if key in latest:
+                results[latest[key]].update(status="error", detail="Overridden by a later row")
+            latest[key] = index
+
+        existing = {}
+        keys = list(latest)
+        for start in range(0, len(keys), BULK_NOTE_CHUNK_SIZE):
+            chunk = keys[start:start + BULK_NOTE_CHUNK_SIZE]
+            rows = db.query(
+                Note.id_register_semester, Note.id_constituent_element_offering, Note.session,
+                Note.note, Note.comment, Note.deleted_at,
+            ).filter(
+                tuple_(*[getattr(Note, name) for name in NOTE_KEY_COLUMNS]).in_(chunk)
+            )
+            for row in rows:
+                existing[(row[0], row[1], row[2])] = row
+
+        to_write = []
+        for key, index in latest.items():
+            item = notes[index]
+            current = existing.get(key)
+            if current is None:
+                results[index]["status"] = "created"
+            elif current.note == item.note and current.comment == item.comment and current.deleted_at is None:
+                results[index]["status"] = "unchanged"
+                continue
+            else:
+                results[index]["status"] = "updated"
+            to_write.append({
+                "id_register_semester": item.id_register_semester,
+                "id_constituent_element_offering": item.id_constituent_element_offering,
+                "session": item.session,
+                "note": item.note,
+                "comment": item.comment,
+                "id_user": id_user,
+            })
+
+        for start in range(0, len(to_write), BULK_NOTE_CHUNK_SIZE):
+            db.execute(self.upsert_statement(
+                db, to_write[start:start + BULK_NOTE_CHUNK_SIZE],
+                index_elements=list(NOTE_KEY_COLUMNS),
+                update_columns=["note", "comment", "id_user"],
+            ))
+        db.commit()
+        return results
+
 note = CRUDNote(Note)
 
 
@@ -2,18 +2,318 @@
 # ---write your code here--- #
 # end #
 
-from typing import Optional, List, Dict, Any
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.enum.session_type import SessionTypeEnum
+from app.models.academic_year import AcademicYear
+from app.models.annual_register import AnnualRegister
+from app.models.constituent_element import ConstituentElement
+from app.models.constituent_element_offering import ConstituentElementOffering
+from app.models.journey import Journey
+from app.models.mention import Mention
+from app.models.note import Note
+from app.models.register_semester import RegisterSemester
 from app.models.result_teaching_unit import ResultTeachingUnit
+from app.models.student import Student
+from app.models.teaching_unit import TeachingUnit
+from app.models.teaching_unit_offering import TeachingUnitOffering
 from app.schemas.result_teaching_unit import ResultTeachingUnitCreate, ResultTeachingUnitUpdate
 
+RESULT_CHUNK_SIZE = 500
+VALIDATION_THRESHOLD = 10
+
+
+def compute_teaching_unit_results(
+        register_semester_ids: Iterable[int],
+        teaching_units: Dict[int, int],
+        constituent_elements: Iterable[Tuple[int, int, float, Optional[int]]],
+        notes: Dict[Tuple[int, int], float],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Calcule les notes d'UE, crédits et validations de toute une cohorte.
+
+    * `teaching_units` : {id UE offerte: crédit}
+    * `constituent_elements` : (id EC offert, id UE offerte, poids, id groupe optionnel)
+    * `notes` : {(id register_semester, id EC offert): note}
+
+    La note d'UE est la somme des notes d'EC pondérées ; pour un groupe d'EC
+    optionnels seule la meilleure note compte, avec le poids du groupe. Une
+    note manquante vaut 0. Retourne (résultats par UE, synthèse par étudiant).
+    """
+    # Plan de calcul par UE : EC obligatoires et groupes optionnels.
+    required = defaultdict(list)
+    optional = defaultdict(lambda: defaultdict(list))
+    group_weight = {}
+    for id_ec, id_ue, weight, id_group, *_ in constituent_elements:
+        if id_ue not in teaching_units:
+            continue
+        if id_group:
+            optional[id_ue][id_group].append(id_ec)
+            group_weight[id_group] = float(weight or 0)
+        else:
+            required[id_ue].append((id_ec, float(weight or 0)))
+
+    total_credit = sum(teaching_units.values())
+    results = []
+    students = []
+    for id_rs in register_semester_ids:
+        weighted = 0.0
+        credit = 0
+        for id_ue, ue_credit in teaching_units.items():
+            note_ue = sum(weight * notes.get((id_rs, id_ec), 0.0) for id_ec, weight in required[id_ue])
+            for id_group, ecs in optional[id_ue].items():
+                note_ue += group_weight[id_group] * max(notes.get((id_rs, id_ec), 0.0) for id_ec in ecs)
+            note_ue = round(note_ue, 5)
+            is_valid = note_ue >= VALIDATION_THRESHOLD
+            if is_valid:
+                credit += ue_credit
+            weighted += note_ue * ue_credit
+            results.append({
+                "id_register_semester": id_rs,
+                "id_teaching_unit_offering": id_ue,
+                "note": note_ue,
+                "is_valid": is_valid,
+            })
+        students.append({
+            "id_register_semester": id_rs,
+            "mean": round(weighted / total_credit, 5) if total_credit else 0.0,
+            "credit": credit,
+            "total_credit": total_credit,
+        })
+    return results, students
+
 
 class CRUDResultTeachingUnit(CRUDBase[ResultTeachingUnit, ResultTeachingUnitCreate, ResultTeachingUnitUpdate]):
     def get_by_field(self, db: Session, *, field: str, value: Any) -> Optional[ResultTeachingUnit]:
         return db.query(ResultTeachingUnit).filter(getattr(ResultTeachingUnit, field) == value).first()
 
+    @staticmethod
+    def _cohort_query(db: Session, id_journey: int, semester: str, id_academic_year: int):
+        return (
+            db.query(RegisterSemester)
+            .join(AnnualRegister, RegisterSemester.id_annual_register == AnnualRegister.id)
+            .filter(
+                RegisterSemester.id_journey == id_journey,
+                RegisterSemester.semester == semester,
+                RegisterSemester.deleted_at.is_(None),
+                AnnualRegister.id_academic_year == id_academic_year,
+                AnnualRegister.deleted_at.is_(None),
+            )
+        )
+
+    @staticmethod
+    def _teaching_units_query(db: Session, id_journey: int, semester: str, id_academic_year: int):
+        return (
+            db.query(TeachingUnitOffering.id, TeachingUnitOffering.credit, TeachingUnit.name)
+            .join(TeachingUnit, TeachingUnitOffering.id_teaching_unit == TeachingUnit.id)
+            .filter(
+                TeachingUnit.id_journey == id_journey,
+                TeachingUnit.semester == semester,
+                TeachingUnit.deleted_at.is_(None),
+                TeachingUnitOffering.id_academic_year == id_academic_year,
+                TeachingUnitOffering.deleted_at.is_(None),
+            )
+            .order_by(TeachingUnitOffering.id)
+        )
+
+    @staticmethod
+    def _constituent_elements(db: Session, teaching_units: Dict[int, Any]) -> list:
+        if not teaching_units:
+            return []
+        return db.query(
+            ConstituentElementOffering.id,
+            ConstituentElementOffering.id_teching_unit_offering,
+            ConstituentElementOffering.weight,
+            ConstituentElementOffering.id_constituent_element_optional_group,
+            ConstituentElement.name,
+        ).outerjoin(
+            ConstituentElement, ConstituentElementOffering.id_constituent_element == ConstituentElement.id
+        ).filter(
+            ConstituentElementOffering.id_teching_unit_offering.in_(list(teaching_units)),
+            ConstituentElementOffering.deleted_at.is_(None),
+        ).order_by(ConstituentElementOffering.id).all()
+
+    @staticmethod
+    def _notes(
+            db: Session, register_semester_ids: List[int], constituent_elements: list, session: SessionTypeEnum,
+    ) -> Dict[Tuple[int, int], float]:
+        """Notes retenues par (register_semester, EC offert) : en rattrapage, SR remplace SN."""
+        sessions = [SessionTypeEnum.SN]
+        if session == SessionTypeEnum.SR:
+            sessions.append(SessionTypeEnum.SR)
+        notes = {}
+        if not register_semester_ids or not constituent_elements:
+            return notes
+        rows = db.query(
+            Note.id_register_semester, Note.id_constituent_element_offering, Note.session, Note.note
+        ).filter(
+            Note.id_register_semester.in_(register_semester_ids),
+            Note.id_constituent_element_offering.in_([ec.id for ec in constituent_elements]),
+            Note.session.in_(sessions),
+            Note.deleted_at.is_(None),
+        )
+        for id_rs, id_ec, note_session, value in rows:
+            if value is None:
+                continue
+            if note_session == SessionTypeEnum.SN and (id_rs, id_ec) in notes:
+                continue
+            notes[(id_rs, id_ec)] = float(value)
+        return notes
+
+    def deliberate(
+            self,
+            db: Session,
+            *,
+            id_journey: int,
+            semester: str,
+            id_academic_year: int,
+            session: SessionTypeEnum = SessionTypeEnum.SN,
+    ) -> Dict[str, Any]:
+        """
+        Délibération d'un semestre : charge en quatre requêtes la cohorte, les
+        UE/EC offerts et les notes, calcule les résultats en mémoire puis les
+        écrit en masse (une ligne ResultTeachingUnit par étudiant et par UE).
+
+        En session de rattrapage, la note SR d'un EC remplace la note SN.
+        """
+        started = time.perf_counter()
+        register_semester_ids = [
+            row.id for row in self._cohort_query(db, id_journey, semester, id_academic_year)
+            .with_entities(RegisterSemester.id)
+            .order_by(RegisterSemester.id)
+        ]
+        teaching_units = {
+            row.id: row.credit for row in self._teaching_units_query(db, id_journey, semester, id_academic_year)
+        }
+        constituent_elements = self._constituent_elements(db, teaching_units)
+        notes = self._notes(db, register_semester_ids, constituent_elements, session)
+
+        results, students = compute_teaching_unit_results(
+            register_semester_ids, teaching_units, constituent_elements, notes
+        )
+
+        now = datetime.now()
+        for row in results:
+            row.update(session=session, date_validation=now)
+        for start in range(0, len(results), RESULT_CHUNK_SIZE):
+            db.execute(self.upsert_statement(
+                db, results[start:start + RESULT_CHUNK_SIZE],
+                index_elements=["id_register_semester", "id_teaching_unit_offering", "session"],
+                update_columns=["note", "is_valid", "date_validation"],
+            ))
+        db.commit()
+
+        return {
+            "students": len(register_semester_ids),
+            "teaching_units": len(teaching_units),
+            "results": len(results),
+            "validated": sum(1 for row in results if row["is_valid"]),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "data": students,
+        }
+
+    def transcripts(
+            self,
+            db: Session,
+            *,
+            id_journey: int,
+            semester: str,
+            id_academic_year: int,
+            session: SessionTypeEnum = SessionTypeEnum.SN,
+    ) -> Dict[str, Any]:
+        """
+        Données des relevés de notes de toute une cohorte, en six requêtes
+        quel que soit le nombre d'étudiants : cohorte et identité, parcours,
+        UE, EC, notes et résultats délibérés.
+
+        Une note d'UE délibérée (ResultTeachingUnit de la session) l'emporte
+        sur la note recalculée ; la moyenne et les crédits en sont déduits.
+        Les étudiants sont triés par nom.
+        """
+        cohort = self._cohort_query(db, id_journey, semester, id_academic_year).join(
+            Student, Student.num_carte == AnnualRegister.num_carte
+        ).with_entities(
+            RegisterSemester.id, Student.num_carte, Student.last_name, Student.first_name,
+            Student.date_of_birth, Student.place_of_birth,
+        ).order_by(Student.last_name, Student.first_name, Student.num_carte).all()
+        names = db.query(Journey.name, Mention.name, AcademicYear.name).select_from(Journey).outerjoin(
+            Mention, Journey.id_mention == Mention.id
+        ).outerjoin(
+            AcademicYear, AcademicYear.id == id_academic_year
+        ).filter(Journey.id == id_journey).first()
+        teaching_units = self._teaching_units_query(db, id_journey, semester, id_academic_year).all()
+        credits = {row.id: row.credit for row in teaching_units}
+        constituent_elements = self._constituent_elements(db, credits)
+        register_semester_ids = [row.id for row in cohort]
+        notes = self._notes(db, register_semester_ids, constituent_elements, session)
+
+        results, _ = compute_teaching_unit_results(register_semester_ids, credits, constituent_elements, notes)
+        ue_notes = {(row["id_register_semester"], row["id_teaching_unit_offering"]): row["note"] for row in results}
+        if register_semester_ids and credits:
+            ue_notes.update({
+                (row.id_register_semester, row.id_teaching_unit_offering): row.note
+                for row in db.query(
+                    ResultTeachingUnit.id_register_semester,
+                    ResultTeachingUnit.id_teaching_unit_offering,
+                    ResultTeachingUnit.note,
+                ).filter(
+                    ResultTeachingUnit.id_register_semester.in_(register_semester_ids),
+                    ResultTeachingUnit.id_teaching_unit_offering.in_(list(credits)),
+                    ResultTeachingUnit.session == session,
+                    ResultTeachingUnit.deleted_at.is_(None),
+                )
+            })
+
+        elements = defaultdict(list)
+        for ec in constituent_elements:
+            elements[ec.id_teching_unit_offering].append(ec)
+        total_credit = sum(credits.values())
+        students = []
+        for row in cohort:
+            units = []
+            weighted = 0.0
+            credit = 0
+            for ue in teaching_units:
+                note_ue = ue_notes.get((row.id, ue.id), 0.0)
+                weighted += note_ue * ue.credit
+                if note_ue >= VALIDATION_THRESHOLD:
+                    credit += ue.credit
+                units.append({
+                    "name": ue.name,
+                    "note": note_ue,
+                    "credit": ue.credit,
+                    "ec": [
+                        {"name": ec.name or "", "note": notes.get((row.id, ec.id)), "weight": ec.weight}
+                        for ec in elements[ue.id]
+                    ],
+                })
+            students.append({
+                "id_register_semester": row.id,
+                "num_carte": row.num_carte,
+                "last_name": row.last_name,
+                "first_name": row.first_name,
+                "date_birth": row.date_of_birth,
+                "place_birth": row.place_of_birth,
+                "ue": units,
+                "mean": round(weighted / total_credit, 5) if total_credit else 0.0,
+                "credit": credit,
+                "total_credit": total_credit,
+            })
+        journey, mention, year = names if names else ("", "", "")
+        return {
+            "journey": journey or "",
+            "mention": mention or "",
+            "year": year or "",
+            "semester": semester,
+            "session": session.value,
+            "students": students,
+        }
+
 result_teaching_unit = CRUDResultTeachingUnit(ResultTeachingUnit)
 
 
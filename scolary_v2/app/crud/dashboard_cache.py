@@ -0,0 +1,80 @@
+"""
+Cache des réponses du tableau de bord.
+
+Une entrée est indexée par (type de réponse, année, mention, parcours, âge
+min, âge max) et porte la version des tables lues au moment du calcul : toute
+écriture sur l'une d'elles la rend invalide (cf. app.db.change_tracking). Elle
+expire de toute façon après `DASHBOARD_CACHE_TTL` secondes, pour couvrir les
+écritures faites par d'autres workers ou hors de l'application.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.db.change_tracking import table_version
+
+DEFAULT_DASHBOARD_CACHE_SIZE = 256
+
+DASHBOARD_TABLES = (
+    "student", "annual_register", "register_semester", "academic_year", "mention", "journey",
+    "nationality", "user", "role", "user_role", "teacher",
+)
+
+
+class DashboardCache:
+    def __init__(self, ttl: float, maxsize: int = DEFAULT_DASHBOARD_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, Any, Dict[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def version() -> int:
+        return table_version(*DASHBOARD_TABLES)
+
+    def get(self, key: Tuple) -> Optional[Tuple[Any, Dict[str, float]]]:
+        """Retourne (valeur, durées des requêtes qui l'ont calculée) ou None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, expires_at, value, timings = entry
+                if version == self.version() and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, timings
+                self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple, value: Any, timings: Dict[str, float], version: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value, timings)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+dashboard_cache = DashboardCache(ttl=settings.DASHBOARD_CACHE_TTL)
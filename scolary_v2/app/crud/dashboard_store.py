@@ -0,0 +1,278 @@
+"""
+Cube d'agrégats du tableau de bord (`dashboard_aggregate`).
+
+Chaque cellule compte les étudiants d'une combinaison (année, parcours,
+mention, sexe, année de naissance, nationalité, année d'entrée). La valeur 0
+de `id_academic_year` / `id_journey` signifie « toutes années » / « tous
+parcours » : un étudiant inscrit deux ans dans deux parcours n'y est compté
+qu'une fois, ce qui permet de sommer les cellules au lieu de faire des
+COUNT(DISTINCT) sur les inscriptions. Les étudiants sans inscription sont
+rangés sous l'année `UNREGISTERED`.
+
+`dashboard_member` garde la contribution de chaque étudiant : quand un
+étudiant, une inscription annuelle ou un semestre change, ses anciennes
+lignes sont retranchées du cube et les nouvelles ajoutées, dans la
+transaction de l'écriture. `rebuild()` (scripts/rebuild_dashboard_aggregates.py)
+reconstruit tout.
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import delete, event, func, inspect, insert, select, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.annual_register import AnnualRegister
+from app.models.dashboard_aggregate import DashboardAggregate
+from app.models.dashboard_member import DashboardMember
+from app.models.register_semester import RegisterSemester
+from app.models.student import Student
+
+ALL = 0
+UNREGISTERED = -1
+DIMENSIONS = (
+    "id_academic_year", "id_journey", "id_mention", "sex", "birth_year", "id_nationality", "id_enter_year",
+)
+BATCH_SIZE = 500
+
+_PENDING_KEY = "dashboard_store_pending"
+
+
+def _chunks(values: Iterable[Any], size: int = BATCH_SIZE) -> Iterable[List[Any]]:
+    values = sorted({value for value in values if value is not None})
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def member_rows(connection, student_ids: Sequence[int]) -> List[Dict[str, Any]]:
+    """Lignes `dashboard_member` des étudiants `student_ids`, d'après l'état actuel de la base."""
+    students = connection.execute(
+        select(
+            Student.id, Student.num_carte, Student.id_mention, Student.sex,
+            Student.date_of_birth, Student.id_nationality, Student.id_enter_year,
+        ).where(Student.id.in_(student_ids))
+    ).all()
+    by_num_carte = {student.num_carte: student for student in students if student.num_carte}
+    years: Dict[int, Dict[int, Set[int]]] = {student.id: {} for student in students}
+
+    registers = connection.execute(
+        select(AnnualRegister.id, AnnualRegister.num_carte, AnnualRegister.id_academic_year)
+        .where(AnnualRegister.num_carte.in_(list(by_num_carte)))
+    ).all() if by_num_carte else []
+    register_year = {}
+    for register in registers:
+        if register.id_academic_year is None:
+            continue
+        student_id = by_num_carte[register.num_carte].id
+        years[student_id].setdefault(register.id_academic_year, set())
+        register_year[register.id] = (student_id, register.id_academic_year)
+
+    if register_year:
+        semesters = connection.execute(
+            select(RegisterSemester.id_annual_register, RegisterSemester.id_journey)
+            .where(RegisterSemester.id_annual_register.in_(list(register_year)))
+        ).all()
+        for semester in semesters:
+            if semester.id_journey is not None:
+                student_id, year = register_year[semester.id_annual_register]
+                years[student_id][year].add(semester.id_journey)
+
+    rows = []
+    for student in students:
+        sex = student.sex.value if hasattr(student.sex, "value") else str(student.sex or "")
+        base = {
+            "id_student": student.id,
+            "id_mention": student.id_mention or 0,
+            "sex": sex,
+            "birth_year": student.date_of_birth.year if student.date_of_birth else 0,
+            "id_nationality": student.id_nationality or 0,
+            "id_enter_year": student.id_enter_year or 0,
+        }
+        student_years = years[student.id]
+        if not student_years:
+            cells = [(UNREGISTERED, ALL)]
+        else:
+            journeys = set().union(*student_years.values())
+            cells = [(ALL, ALL)] + [(ALL, journey) for journey in journeys]
+            for year, year_journeys in student_years.items():
+                cells += [(year, ALL)] + [(year, journey) for journey in year_journeys]
+        rows += [dict(base, id_academic_year=year, id_journey=journey) for year, journey in cells]
+    return rows
+
+
+def _cell(row) -> tuple:
+    return tuple(row[name] for name in DIMENSIONS)
+
+
+def _apply_delta(connection, delta: Counter) -> None:
+    rows = [dict(zip(DIMENSIONS, cell), count=count) for cell, count in delta.items() if count]
+    if not rows:
+        return
+    table = DashboardAggregate.__table__
+    dialect = connection.dialect.name
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted["count"])
+    else:
+        insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert_(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(DIMENSIONS), set_={"count": table.c.count + stmt.excluded["count"]}
+        )
+    connection.execute(stmt)
+    # Seules les cellules décrémentées peuvent tomber à zéro : le reste du cube n'est pas verrouillé.
+    dimensions = [table.c[name] for name in DIMENSIONS]
+    for chunk in _chunks(cell for cell, count in delta.items() if count < 0):
+        connection.execute(delete(table).where(tuple_(*dimensions).in_(chunk), table.c.count <= 0))
+
+
+def refresh_students(connection, student_ids: Iterable[int]) -> None:
+    """Recalcule la contribution des étudiants `student_ids` (supprimés compris)."""
+    member = DashboardMember.__table__
+    dimensions = [member.c[name] for name in DIMENSIONS]
+    for chunk in _chunks(student_ids):
+        delta: Counter = Counter()
+        # Verrous (FOR UPDATE) sur les étudiants puis sur leurs anciennes lignes : deux
+        # transactions qui recalculent le même étudiant ne retranchent pas deux fois sa contribution.
+        connection.execute(
+            select(Student.id).where(Student.id.in_(chunk)).order_by(Student.id).with_for_update()
+        ).all()
+        old = connection.execute(
+            select(*dimensions).where(member.c.id_student.in_(chunk)).order_by(member.c.id).with_for_update()
+        ).all()
+        for row in old:
+            delta[tuple(row)] -= 1
+        connection.execute(delete(member).where(member.c.id_student.in_(chunk)))
+
+        rows = member_rows(connection, chunk)
+        if rows:
+            connection.execute(insert(member), rows)
+        for row in rows:
+            delta[_cell(row)] += 1
+        _apply_delta(connection, delta)
+
+
+def rebuild(connection) -> int:
+    """Reconstruit `dashboard_member` puis le cube ; retourne le nombre d'étudiants."""
+    member = DashboardMember.__table__
+    aggregate = DashboardAggregate.__table__
+    connection.execute(delete(aggregate))
+    connection.execute(delete(member))
+    student_ids = connection.execute(select(Student.id)).scalars().all()
+    for chunk in _chunks(student_ids):
+        rows = member_rows(connection, chunk)
+        if rows:
+            connection.execute(insert(member), rows)
+    dimensions = [member.c[name] for name in DIMENSIONS]
+    connection.execute(
+        insert(aggregate).from_select(
+            [*DIMENSIONS, "count"], select(*dimensions, func.count()).group_by(*dimensions)
+        )
+    )
+    return len(student_ids)
+
+
+def cells(db: Session, group_by: Sequence[str], **filters: Any) -> List[Any]:
+    """
+    Somme de `count` groupée par `group_by`. Un filtre vaut une valeur ou une
+    liste de valeurs ; `id_academic_year` et `id_journey` valent ALL par défaut.
+    """
+    filters.setdefault("id_academic_year", ALL)
+    filters.setdefault("id_journey", ALL)
+    columns = [getattr(DashboardAggregate, name) for name in group_by]
+    query = select(*columns, func.sum(DashboardAggregate.count).label("count"))
+    for name, value in filters.items():
+        column = getattr(DashboardAggregate, name)
+        query = query.where(column.in_(value) if isinstance(value, (list, tuple, set)) else column == value)
+    if columns:
+        query = query.group_by(*columns)
+    return db.execute(query).all()
+
+
+# -------------------------------------------------------------------------
+# Maintenance incrémentale
+# -------------------------------------------------------------------------
+
+def _pending(session: Session) -> Dict[str, Set]:
+    return session.info.setdefault(
+        _PENDING_KEY, {"students": set(), "num_cartes": set(), "annual_registers": set()}
+    )
+
+
+def _history(obj, attribute: str) -> Set[Any]:
+    history = inspect(obj).attrs[attribute].history
+    return {value for value in (*history.unchanged, *history.added, *history.deleted) if value is not None}
+
+
+def _refresh_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not any(pending.values()):
+        return
+    connection = session.connection()
+    num_cartes = set(pending["num_cartes"])
+    for chunk in _chunks(pending["annual_registers"]):
+        num_cartes.update(connection.execute(
+            select(AnnualRegister.num_carte).where(AnnualRegister.id.in_(chunk))
+        ).scalars())
+    student_ids = set(pending["students"])
+    for chunk in _chunks(num_cartes):
+        student_ids.update(connection.execute(
+            select(Student.id).where(Student.num_carte.in_(chunk))
+        ).scalars())
+    refresh_students(connection, student_ids)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_register_changes(session: Session, flush_context, instances) -> None:
+    # Avant le flush : la clé courante peut encore être chargée si elle a expiré.
+    pending = _pending(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, AnnualRegister):
+            pending["num_cartes"].update(_history(obj, "num_carte") | {obj.num_carte})
+        elif isinstance(obj, RegisterSemester):
+            pending["annual_registers"].update(_history(obj, "id_annual_register") | {obj.id_annual_register})
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_student_changes(session: Session, flush_context) -> None:
+    pending = _pending(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Student):
+            # Les objets insérés n'ont pas encore de clé d'identité à ce stade.
+            identity = inspect(obj).identity
+            student_id = identity[0] if identity else obj.__dict__.get("id")
+            if student_id is not None:
+                pending["students"].add(student_id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_after_flush(session: Session, flush_context) -> None:
+    _refresh_pending(session)
+
+
+_BULK_KEYS = {
+    Student: ("students", Student.id),
+    AnnualRegister: ("num_cartes", AnnualRegister.num_carte),
+    RegisterSemester: ("annual_registers", RegisterSemester.id_annual_register),
+}
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _refresh_after_bulk(orm_execute_state) -> Optional[Any]:
+    # Query.update()/delete() ne passent pas par le flush.
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in _BULK_KEYS:
+        return None
+    kind, key = _BULK_KEYS[mapper.class_]
+    session = orm_execute_state.session
+    where = orm_execute_state.statement.whereclause
+    query = select(key).distinct()
+    if where is not None:
+        query = query.where(where)
+    affected = set(session.connection().execute(query).scalars())
+    result = orm_execute_state.invoke_statement()
+    _pending(session)[kind].update(affected)
+    _refresh_pending(session)
+    return result
@@ -0,0 +1,173 @@
+"""
+Parsing des paramètres de liste (`where`, `where_relation`, `relation`,
+`base_column`) envoyés en JSON par le client.
+
+Chaque chaîne brute est parsée (json.loads), sa structure vérifiée et ses
+clés résolues sur le mapper du modèle une seule fois : le résultat est gardé
+dans un cache LRU indexé par (modèle, type de paramètre, chaîne). Un filtre
+invalide est refusé d'emblée par une 400 au lieu d'échouer au fond de
+`CRUDBase.get_attrs`.
+
+Les fonctions `parse_*` retournent une copie neuve à chaque appel : CRUDBase
+ajoute la condition `deleted_at` à la liste `where` qu'il reçoit.
+"""
+import json
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, TypedDict, Union
+
+from fastapi import HTTPException
+from sqlalchemy import inspect
+
+FILTER_PARSE_CACHE_SIZE = 1024
+
+
+class WhereCondition(TypedDict, total=False):
+    key: Union[str, List[str]]
+    operator: Union[str, List[str]]
+    value: Any
+    match: str
+
+
+# Une entrée de `where` : une condition, ou un groupe OR de conditions.
+WhereItem = Union[WhereCondition, List[WhereCondition]]
+
+
+def _invalid(param: str, model, detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Invalid '{param}' for {model.__tablename__}: {detail}")
+
+
+def _relationship(model, name: str):
+    relationship = inspect(model).relationships.get(name)
+    return relationship.mapper.class_ if relationship is not None else None
+
+
+def _split_top_level(text: str) -> List[str]:
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += char == "["
+        depth -= char == "]"
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _check_key(model, key: str, param: str) -> None:
+    """Même découpage que CRUDBase.get_key_parts : `a.~b.c`, `a.[b.c,d]`, `@methode`."""
+    subpart_start = key.find(".[")
+    path = key[:subpart_start] if subpart_start >= 0 else key
+    parts = path.split(".")
+    leaves = parts if subpart_start >= 0 else parts[:-1]
+    current = model
+    for part in leaves:
+        target = _relationship(current, part.lstrip("~"))
+        if target is None:
+            raise _invalid(param, model, f"unknown relation '{part}' in '{key}'")
+        current = target
+    if subpart_start >= 0:
+        for subkey in _split_top_level(key[subpart_start + 2:-1]):
+            _check_key(current, subkey, param)
+        return
+    leaf = parts[-1]
+    if not hasattr(current, leaf.lstrip("@")):
+        raise _invalid(param, model, f"unknown column '{leaf}' in '{key}'")
+
+
+def _check_condition(model, condition: Any, param: str) -> None:
+    if not isinstance(condition, dict) or "key" not in condition or "operator" not in condition:
+        raise _invalid(param, model, "each condition needs a 'key' and an 'operator'")
+    key, operator = condition["key"], condition["operator"]
+    if isinstance(key, list):
+        if not isinstance(operator, list) or len(operator) != len(key):
+            raise _invalid(param, model, "a list of keys needs a list of operators of the same length")
+        keys = key
+    else:
+        keys = [key]
+    for item in keys:
+        if not isinstance(item, str):
+            raise _invalid(param, model, f"key must be a string, got {item!r}")
+        _check_key(model, item, param)
+
+
+def _check_relation(model, relation: Any, param: str) -> None:
+    if not isinstance(relation, str):
+        raise _invalid(param, model, f"relation must be a string, got {relation!r}")
+    current = model
+    for part in relation.split("."):
+        name, _, columns = part.partition("{")
+        target = _relationship(current, name)
+        if target is None:
+            raise _invalid(param, model, f"unknown relation '{name}' in '{relation}'")
+        for column in filter(None, columns.rstrip("}").split(",")):
+            if not hasattr(target, column):
+                raise _invalid(param, model, f"unknown column '{column}' in '{relation}'")
+        current = target
+
+
+def _check_column(model, column: Any, param: str) -> None:
+    if not isinstance(column, str) or column not in inspect(model).column_attrs:
+        raise _invalid(param, model, f"unknown column {column!r}")
+
+
+_CHECKS = {
+    "where": lambda model, item, param: (
+        [_check_condition(model, condition, param) for condition in item]
+        if isinstance(item, list) else _check_condition(model, item, param)
+    ),
+    "where_relation": _check_condition,
+    "relation": _check_relation,
+    "base_column": _check_column,
+}
+
+
+@lru_cache(maxsize=FILTER_PARSE_CACHE_SIZE)
+def _parse(model, param: str, raw: str) -> Tuple[Any, ...]:
+    try:
+        value = json.loads(raw)
+    except ValueError as exc:
+        raise _invalid(param, model, f"not valid JSON ({exc})")
+    if not isinstance(value, list):
+        raise _invalid(param, model, "expected a JSON array")
+    check = _CHECKS[param]
+    for item in value:
+        check(model, item, param)
+    return tuple(value)
+
+
+def _copy(item: Any) -> Any:
+    if isinstance(item, dict):
+        return dict(item)
+    if isinstance(item, list):
+        return [_copy(sub) for sub in item]
+    return item
+
+
+def _parsed(model, param: str, raw: Optional[Union[str, list]]) -> List[Any]:
+    if raw is None or raw == "" or raw == [] or raw == "[]":
+        return []
+    if isinstance(raw, list):
+        raw = json.dumps(raw)
+    return [_copy(item) for item in _parse(model, param, raw)]
+
+
+def parse_where(raw: Optional[Union[str, list]], model) -> List[WhereItem]:
+    return _parsed(model, "where", raw)
+
+
+def parse_where_relation(raw: Optional[Union[str, list]], model) -> List[WhereCondition]:
+    return _parsed(model, "where_relation", raw)
+
+
+def parse_relations(raw: Optional[Union[str, list]], model) -> List[str]:
+    return _parsed(model, "relation", raw)
+
+
+def parse_base_columns(raw: Optional[Union[str, list]], model) -> List[str]:
+    return _parsed(model, "base_column", raw)
+
+
+def parse_cache_info():
+    return _parse.cache_info()
@@ -0,0 +1,384 @@
+"""
+Compilation des filtres `where` de CRUDBase en plans réutilisables.
+
+Un plan est construit une seule fois par *forme* de filtre (clés, opérateurs,
+`match` et nullité des valeurs) : le parsing des clés, la résolution des
+relations et la construction de l'arbre SQLAlchemy sont faits à la
+compilation. Les valeurs sont ensuite injectées via des `bindparam`.
+
+Les opérateurs dont la forme SQL dépend de la valeur (`date`, `between_date`,
+`json.*`, `ratio`, méthodes `@...`) gardent leur attribut résolu et sont
+reconstruits au moment du binding.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, or_
+
+# Opérateurs qui ne lisent jamais la valeur.
+STATIC_OPERATORS = {"isNull", "isNotNull", "isTrue", "isFalse"}
+
+# Opérateurs dont la valeur peut être passée en paramètre lié.
+BOUND_OPERATORS = {
+    "==",
+    "!=",
+    ">",
+    "<",
+    "like",
+    "ilike",
+    "in",
+    "notIn",
+    "month",
+    "year",
+    "lower_or_equal_year",
+    "greater_or_equal_year",
+    "week",
+}
+
+# Opérateurs pour lesquels une valeur None change le SQL (IS NULL).
+NULLABLE_OPERATORS = {
+    "==",
+    "!=",
+    "month",
+    "year",
+    "lower_or_equal_year",
+    "greater_or_equal_year",
+    "week",
+}
+
+DEFAULT_PLAN_CACHE_SIZE = 256
+
+
+def split_condition_values(operator: str, value: Any) -> List[Any]:
+    """Même découpage des valeurs que CRUDBase.sub_get_condition_deep_multiple."""
+    operators = operator.split(",")
+    values = [value]
+    if len(operators) > 1 and values[0]:
+        if "[[" in values[0]:
+            values = json.loads(values[0])
+        else:
+            values = str(values[0]).split(",")
+    return values
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _condition_shape(condition: Dict[str, Any], values: List[List[Any]]) -> Tuple:
+    key = condition.get("key", None)
+    operator = condition.get("operator", None)
+    value = condition.get("value", None)
+    if isinstance(key, list):
+        subs = []
+        for i in range(len(key)):
+            sub_value = value[i] if value else None
+            subs.append(_leaf_condition_shape(key[i], operator[i], sub_value, "and", values))
+        return ("any", tuple(subs))
+    return _leaf_condition_shape(key, operator, value, condition.get("match", "and"), values)
+
+
+def _leaf_condition_shape(key, operator, value, match, values: List[List[Any]]) -> Tuple:
+    condition_values = split_condition_values(operator, value)
+    values.append(condition_values)
+    return (
+        "cond",
+        _freeze(key),
+        operator,
+        match,
+        tuple(item is None for item in condition_values),
+    )
+
+
+def fingerprint(where: List[Any]) -> Tuple[Tuple, List[List[Any]]]:
+    """
+    Sépare un `where` en (forme hashable, valeurs).
+
+    Les valeurs sont renvoyées par condition, dans l'ordre où le plan
+    compilé les consomme.
+    """
+    shape = []
+    values: List[List[Any]] = []
+    for parent_condition in where:
+        if isinstance(parent_condition, list):
+            shape.append(
+                ("or", tuple(_condition_shape(condition, values) for condition in parent_condition))
+            )
+        else:
+            shape.append(_condition_shape(parent_condition, values))
+    return tuple(shape), values
+
+
+# -----------------------------------------------------------------------------
+# Noeuds du plan
+# -----------------------------------------------------------------------------
+
+
+class _Leaf:
+    __slots__ = ("attribute", "method", "operator", "slot", "index", "kind", "param", "clause")
+
+    def __init__(self, crud, model, key: str, operator: str, slot: int, index: int, is_none: bool):
+        self.operator = operator
+        self.slot = slot
+        self.index = index
+        self.attribute = None
+        self.method = None
+        self.param = None
+        self.clause = None
+
+        if key.startswith("@"):
+            self.method = getattr(model, key.replace("@", ""))
+            self.kind = "dynamic"
+            return
+
+        self.attribute = getattr(model, key)
+        if operator in STATIC_OPERATORS or (operator in NULLABLE_OPERATORS and is_none):
+            self.kind = "static"
+            self.clause = crud.build_filter_condition(self.attribute, operator, None)
+        elif operator in BOUND_OPERATORS:
+            self.kind = "bound"
+            self.param = f"wf_{slot}_{index}"
+            param = bindparam(self.param, expanding=operator in ("in", "notIn"))
+            if operator == "like":
+                self.clause = self.attribute.like(param)
+            elif operator == "ilike":
+                self.clause = self.attribute.ilike(param)
+            else:
+                self.clause = crud.build_filter_condition(self.attribute, operator, param)
+        else:
+            self.kind = "dynamic"
+
+    def bind_value(self, value: Any) -> Any:
+        if self.operator in ("like", "ilike"):
+            return "%" + str(value) + "%"
+        return value
+
+    def render(self, crud, values: List[List[Any]]):
+        if self.kind != "dynamic":
+            return self.clause
+        value = values[self.slot][self.index]
+        attribute = self.attribute
+        if self.method is not None:
+            args = value["args"]
+            value = value["operator_value"]
+            attribute = self.method(*args)
+        return crud.build_filter_condition(attribute, self.operator, value)
+
+
+class _Group:
+    __slots__ = ("operator", "children")
+
+    def __init__(self, operator, children: List[Any]):
+        self.operator = operator
+        self.children = children
+
+    def render(self, crud, values):
+        return self.operator(*[child.render(crud, values) for child in self.children])
+
+
+class _Chain:
+    """Remonte une chaîne de relations avec has()/any() (cf. get_cond_reccur)."""
+
+    __slots__ = ("relations", "inner")
+
+    def __init__(self, relations: List[Tuple[Any, bool, bool]], inner):
+        self.relations = relations
+        self.inner = inner
+
+    def render(self, crud, values):
+        cond = self.inner.render(crud, values)
+        for attr, negate, uselist in reversed(self.relations):
+            if uselist:
+                cond = attr.any(cond)
+                if negate:
+                    cond = ~cond
+            else:
+                cond = attr.has(cond)
+        return cond
+
+
+class _AnyOf:
+    """Conditions combinées en OR, en ignorant celles qui sont None."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: List[Any]):
+        self.children = children
+
+    def render(self, crud, values):
+        conditions = [c for c in (child.render(crud, values) for child in self.children) if c is not None]
+        if not conditions:
+            return None
+        return or_(*conditions)
+
+
+class FilterPlan:
+    """Plan compilé pour une forme de `where` donnée."""
+
+    def __init__(self, crud, shape: Tuple, values: List[List[Any]]):
+        self.leaves: List[_Leaf] = []
+        self.slots = 0
+        model = crud.model
+        self.nodes = [self._compile_item(crud, model, item, values) for item in shape]
+        self.bound_leaves = [leaf for leaf in self.leaves if leaf.kind == "bound"]
+        self.is_dynamic = any(leaf.kind == "dynamic" for leaf in self.leaves)
+        # Sans feuille dynamique, l'arbre complet est figé une fois pour toutes.
+        self.clause = None if self.is_dynamic else self._render(crud, values)
+
+    def _compile_item(self, crud, model, item, values):
+        tag = item[0]
+        if tag in ("or", "any"):
+            return _AnyOf([self._compile_item(crud, model, sub, values) for sub in item[1]])
+        _, key, operator, match, _ = item
+        slot = self.slots
+        self.slots += 1
+        keys = crud.get_key_parts(key)
+        operators = operator.split(",")
+        group_operator = or_ if match == "or" else and_
+        counter = {"value": 0}
+        return self._compile_keys(
+            crud, model, keys, operators, values[slot], slot, counter, group_operator
+        )
+
+    def _compile_keys(self, crud, model, keys, operators, slot_values, slot, counter, group_operator):
+        previous_model = model
+        relations = []
+        inner = None
+        for i in range(0, len(keys)):
+            if i < len(keys) - 1:
+                key_temp = keys[i]
+                negate = False
+                if key_temp.startswith("~"):
+                    key_temp = key_temp[1:]
+                    negate = True
+                attr = getattr(previous_model, key_temp)
+                relations.append((attr, negate, bool(attr.property.uselist)))
+                previous_model = attr.property.mapper.class_
+            elif isinstance(keys[i], str):
+                idx = counter["value"]
+                inner = _Leaf(
+                    crud,
+                    previous_model,
+                    keys[i],
+                    operators[idx],
+                    slot,
+                    idx,
+                    slot_values[idx] is None,
+                )
+                self.leaves.append(inner)
+                counter["value"] = idx + 1
+            else:
+                children = [
+                    self._compile_keys(crud, previous_model, sub, operators, slot_values, slot, counter, and_)
+                    for sub in keys[i]
+                ]
+                inner = _Group(group_operator, children)
+        if not relations:
+            return inner
+        return _Chain(relations, inner)
+
+    def _render(self, crud, values):
+        conditions = []
+        for node in self.nodes:
+            condition = node.render(crud, values)
+            if condition is not None:
+                conditions.append(condition)
+        if conditions:
+            return and_(*conditions)
+        return None
+
+    def bind(self, crud, values: List[List[Any]]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Retourne (expression, paramètres) pour les valeurs de cette requête.
+
+        L'expression contient des `bindparam` nommés : les paramètres doivent
+        être passés à l'exécution (`query.params(**params)`).
+        """
+        clause = self._render(crud, values) if self.is_dynamic else self.clause
+        params = {
+            leaf.param: leaf.bind_value(values[leaf.slot][leaf.index])
+            for leaf in self.bound_leaves
+        }
+        return clause, params
+
+
+class FilterPlanCache:
+    """Cache LRU borné des plans compilés d'un modèle."""
+
+    def __init__(self, maxsize: int = DEFAULT_PLAN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: "OrderedDict[Tuple, FilterPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, shape: Tuple) -> Optional[FilterPlan]:
+        with self._lock:
+            plan = self._plans.get(shape)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(shape)
+            self.hits += 1
+            return plan
+
+    def put(self, shape: Tuple, plan: FilterPlan) -> None:
+        with self._lock:
+            self._plans[shape] = plan
+            self._plans.move_to_end(shape)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._plans),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_plan_caches: Dict[Any, FilterPlanCache] = {}
+_plan_caches_lock = threading.Lock()
+
+
+def get_plan_cache(model) -> FilterPlanCache:
+    cache = _plan_caches.get(model)
+    if cache is None:
+        with _plan_caches_lock:
+            cache = _plan_caches.setdefault(model, FilterPlanCache())
+    return cache
+
+
+def plan_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Statistiques hit/miss de tous les modèles ayant compilé au moins un filtre."""
+    return {
+        getattr(model, "__tablename__", str(model)): cache.stats()
+        for model, cache in list(_plan_caches.items())
+    }
+
+
+def compile_where(crud, where: List[Any]) -> Tuple[Any, Dict[str, Any]]:
+    """Compile (ou récupère en cache) le plan de `where` et le lie à ses valeurs."""
+    shape, values = fingerprint(where)
+    cache = get_plan_cache(crud.model)
+    try:
+        plan = cache.get(shape)
+    except TypeError:
+        # Forme non hashable (valeur exotique dans une clé) : pas de cache.
+        return FilterPlan(crud, shape, values).bind(crud, values)
+    if plan is None:
+        plan = FilterPlan(crud, shape, values)
+        cache.put(shape, plan)
+    return plan.bind(crud, values)
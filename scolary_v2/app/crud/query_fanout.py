@@ -0,0 +1,56 @@
+"""
+Exécution concurrente de requêtes de lecture indépendantes.
+
+Chaque requête reçoit sa propre AsyncSession, liée au même moteur que la
+session de la requête HTTP, et elles sont lancées ensemble avec
+asyncio.gather : les requêtes d'agrégation du tableau de bord partent ainsi
+en parallèle sur des connexions distinctes du pool. `run_queries_async`
+mesure aussi la durée de chaque requête (en millisecondes).
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+async def run_queries_async(
+        db: AsyncSession,
+        queries: Dict[str, Callable[[Session], Any]],
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Exécute `queries` (nom -> fonction(session), la session synchrone de
+    `run_sync`) et retourne (résultats par nom, durées en ms par nom). Au plus
+    DASHBOARD_QUERY_WORKERS requêtes sont en cours à la fois ; avec <= 1, tout
+    s'exécute en série sur `db`.
+    """
+    timings: Dict[str, float] = {}
+
+    def _timed(name: str, query: Callable[[Session], Any]) -> Callable[[Session], Any]:
+        def run(session: Session) -> Any:
+            start = time.perf_counter()
+            try:
+                return query(session)
+            finally:
+                timings[name] = (time.perf_counter() - start) * 1000
+        return run
+
+    if settings.DASHBOARD_QUERY_WORKERS <= 1 or len(queries) <= 1:
+        results = {}
+        for name, query in queries.items():
+            results[name] = await db.run_sync(_timed(name, query))
+        return results, timings
+
+    bind = db.bind
+    semaphore = asyncio.Semaphore(settings.DASHBOARD_QUERY_WORKERS)
+
+    async def _isolated(name: str, query: Callable[[Session], Any]) -> Any:
+        async with semaphore:
+            async with AsyncSession(bind=bind, autoflush=False) as session:
+                return await session.run_sync(_timed(name, query))
+
+    values = await asyncio.gather(*(_isolated(name, query) for name, query in queries.items()))
+    return dict(zip(queries, values)), timings
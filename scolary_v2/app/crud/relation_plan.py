@@ -0,0 +1,143 @@
+"""
+Planification du chargement des relations demandées par `relation=[...]`.
+
+Les chemins (`annual_register{id,id_academic_year}.register_semester.journey`)
+sont fusionnés en arbre : un préfixe commun n'est chargé qu'une fois et les
+colonnes demandées pour un même niveau sont réunies. Chaque saut devient :
+
+- `joinedload` pour un many-to-one (la ligne cible est jointe dans la requête
+  du parent, aucun aller-retour supplémentaire) ;
+- `selectinload` pour une collection (une requête `IN` par niveau, sans
+  multiplier les lignes du parent ni casser `LIMIT`).
+
+Sans liste de colonnes, un niveau ne charge que sa clé primaire (comme
+avant : un `user` imbriqué n'expose jamais `hashed_password`) ; avec ou sans
+liste, `load_only` y ajoute les colonnes locales des relations enfants, sans
+quoi chaque ligne déclencherait un chargement différé avant le `selectinload`.
+
+Les options sont construites une fois par (modèle, relations, colonnes de
+base) et réutilisées.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+RELATION_PLAN_CACHE_SIZE = 512
+
+
+class RelationNode:
+    __slots__ = ("prop", "columns", "children")
+
+    def __init__(self, prop) -> None:
+        self.prop = prop
+        # None : clé primaire seule ; sinon colonnes demandées, dans l'ordre
+        self.columns: Optional[List[str]] = None
+        self.children: Dict[str, "RelationNode"] = {}
+
+    @property
+    def strategy(self) -> str:
+        return "selectin" if self.prop.uselist else "joined"
+
+
+def _split_part(part: str) -> Tuple[str, List[str]]:
+    name, _, columns = part.partition("{")
+    return name, [column for column in columns.rstrip("}").split(",") if column]
+
+
+def build_tree(model, relations: Sequence[str]) -> Dict[str, RelationNode]:
+    tree: Dict[str, RelationNode] = {}
+    for relation in relations:
+        level, mapper = tree, inspect(model)
+        for part in relation.split("."):
+            name, columns = _split_part(part)
+            prop = mapper.relationships.get(name)
+            if prop is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown relation '{name}' in '{relation}' for {model.__tablename__}",
+                )
+            node = level.get(name)
+            if node is None:
+                node = level[name] = RelationNode(prop)
+            if columns:
+                node.columns = list(dict.fromkeys((node.columns or []) + columns))
+            level, mapper = node.children, prop.mapper
+    return tree
+
+
+def _local_keys(mapper, children: Dict[str, RelationNode]) -> List[str]:
+    """Attributs du parent dont les relations enfants ont besoin."""
+    keys = []
+    for node in children.values():
+        for column in node.prop.local_columns:
+            keys.append(mapper.get_property_by_column(column).key)
+    return keys
+
+
+def _keys(mapper, columns: Optional[Sequence[str]], children: Dict[str, RelationNode]) -> List[str]:
+    if columns is None:
+        columns = [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+    return list(dict.fromkeys([*columns, *_local_keys(mapper, children)]))
+
+
+def _columns(mapper, columns: Optional[Sequence[str]], children: Dict[str, RelationNode]) -> list:
+    keys = _keys(mapper, columns, children)
+    try:
+        return [getattr(mapper.class_, key) for key in keys]
+    except AttributeError as exc:
+        raise HTTPException(status_code=400, detail=f"Unknown column for {mapper.class_.__tablename__}: {exc}")
+
+
+def _option(parent, name: str, node: RelationNode):
+    attr = getattr(parent, name)
+    loader = selectinload(attr) if node.prop.uselist else joinedload(attr)
+    target = node.prop.mapper
+    sub_options = [load_only(*_columns(target, node.columns, node.children))]
+    sub_options += [_option(target.class_, child, sub) for child, sub in node.children.items()]
+    return loader.options(*sub_options)
+
+
+@lru_cache(maxsize=RELATION_PLAN_CACHE_SIZE)
+def _plan(model, relations: Tuple[str, ...], base_columns: Tuple[str, ...]) -> tuple:
+    tree = build_tree(model, relations)
+    options = []
+    if base_columns:
+        options.append(load_only(*_columns(inspect(model), base_columns, tree)))
+    options += [_option(model, name, node) for name, node in tree.items()]
+    return tuple(options)
+
+
+def loader_options(model, relations: Optional[Sequence[str]], base_columns: Optional[Sequence[str]] = None) -> list:
+    """Options de chargement pour `relations` et, si donné, `load_only` des colonnes de base."""
+    return list(_plan(model, tuple(relations or ()), tuple(base_columns or ())))
+
+
+def describe(model, relations: Sequence[str], base_columns: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Plan lisible, un niveau par ligne :
+
+        student (id, num_carte)
+          selectin annual_register -> annual_register (id, id_academic_year)
+            joined academic_year -> academic_year (id, name)
+    """
+    tree = build_tree(model, relations)
+    mapper = inspect(model)
+    root = "*" if not base_columns else ", ".join(_keys(mapper, base_columns, tree))
+    lines = [f"{model.__tablename__} ({root})"]
+
+    def walk(level: Dict[str, RelationNode], depth: int) -> None:
+        for name, node in level.items():
+            target = node.prop.mapper
+            columns = ", ".join(_keys(target, node.columns, node.children))
+            lines.append(f"{'  ' * depth}{node.strategy} {name} -> {target.class_.__tablename__} ({columns})")
+            walk(node.children, depth + 1)
+
+    walk(tree, 1)
+    return lines
+
+
+def plan_cache_info():
+    return _plan.cache_info()
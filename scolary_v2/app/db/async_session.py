@@ -0,0 +1,33 @@
+"""
+Moteur et sessions asynchrones (aiomysql ; aiosqlite pour les tests).
+
+Ils coexistent avec `app.db.session` : les endpoints de lecture les plus
+sollicités sont en `async def` et utilisent `AsyncSessionLocal` au lieu d'un
+thread du pool de FastAPI. Le pool de connexions est distinct de celui du
+moteur synchrone.
+"""
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.pool_metrics import InstrumentedAsyncAdaptedQueuePool, pool_arguments
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url) -> str:
+    """URL du pilote asynchrone équivalent à `url` (ex. mysql+pymysql -> mysql+aiomysql)."""
+    url = make_url(str(url))
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+async_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI, poolclass=InstrumentedAsyncAdaptedQueuePool, **pool_arguments()
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
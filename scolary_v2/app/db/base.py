@@ -47,3 +47,5 @@ from app.models.teacher import Teacher # noqa
 from app.models.plugged import Plugged # noqa
 from app.models.notification_template import NotificationTemplate # noqa
 from app.models.model_has_permission import ModelHasPermission # noqa
+from app.models.dashboard_member import DashboardMember # noqa
+from app.models.dashboard_aggregate import DashboardAggregate # noqa
@@ -0,0 +1,96 @@
+"""
+Compteurs de version par table, incrémentés à chaque écriture ORM.
+
+Les caches applicatifs (comptages, permissions, tableaux de bord...) comparent
+la version qu'ils ont mémorisée avec `table_version()` pour savoir si une
+entrée est encore valide, ou s'abonnent via `subscribe()`.
+
+Les événements sont branchés sur la classe Session : toutes les sessions
+(SessionLocal, sessions de test) sont couvertes.
+"""
+import threading
+from typing import Callable, Dict, Iterable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+_subscribers: List[Callable[[Set[str]], None]] = []
+
+_PENDING_KEY = "change_tracking_pending_tables"
+
+
+def table_version(*tablenames: str) -> int:
+    """Somme des versions des tables données (change dès qu'une table change)."""
+    return sum(_versions.get(name, 0) for name in tablenames)
+
+
+def bump(tablenames: Iterable[str]) -> None:
+    tables = {name for name in tablenames if name}
+    if not tables:
+        return
+    with _lock:
+        for name in tables:
+            _versions[name] = _versions.get(name, 0) + 1
+    for callback in list(_subscribers):
+        try:
+            callback(tables)
+        except Exception:
+            # Un cache défaillant ne doit jamais faire échouer une écriture.
+            pass
+
+
+def subscribe(callback: Callable[[Set[str]], None]) -> Callable[[Set[str]], None]:
+    """Enregistre `callback(tables)` appelé après chaque écriture."""
+    _subscribers.append(callback)
+    return callback
+
+
+def _tablename(obj) -> str:
+    return getattr(obj, "__tablename__", None) or getattr(type(obj), "__tablename__", None)
+
+
+def _remember(session: Session, tables: Set[str]) -> None:
+    session.info.setdefault(_PENDING_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    tables = {
+        _tablename(obj)
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+    }
+    tables.discard(None)
+    if tables:
+        bump(tables)
+        _remember(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state) -> None:
+    # Query.delete()/update() et delete(Model)/update(Model) ne passent pas par le flush.
+    if not (orm_execute_state.is_delete or orm_execute_state.is_update or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    tables = {mapper.class_.__tablename__}
+    bump(tables)
+    _remember(orm_execute_state.session, tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    # Seconde incrémentation au commit : une lecture faite entre le flush
+    # et le commit n'a pas pu mettre en cache une valeur définitive.
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        bump(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        bump(tables)
@@ -0,0 +1,172 @@
+"""
+Instrumentation des pools de connexions SQLAlchemy.
+
+Les moteurs de `app.db.session` et `app.db.async_session` utilisent les
+classes de pool ci-dessous : chaque prise de connexion (`checkout`) est
+chronométrée et rangée dans un histogramme, les dépassements de
+`pool_timeout` sont comptés, et l'occupation (connexions prêtées, overflow,
+pic) est lue sur le pool au moment de l'export.
+
+En mode adaptatif (DB_POOL_ADAPTIVE), une attente supérieure à
+DB_POOL_WAIT_ALERT_MS est journalisée et notifiée (au plus une alerte par
+minute et par pool) avec une taille de pool suggérée d'après le pic observé.
+"""
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bornes supérieures (ms) des classes de l'histogramme des attentes
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+ALERT_INTERVAL = 60.0
+
+
+class PoolMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_ms_sum = 0.0
+            self.wait_ms_max = 0.0
+            self.buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+            self.peak_in_use = 0
+            self._last_alert = 0.0
+
+    def observe(self, wait_ms: float, in_use: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_sum += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.buckets[bisect.bisect_left(CHECKOUT_BUCKETS_MS, wait_ms)] += 1
+            self.peak_in_use = max(self.peak_in_use, in_use)
+        if settings.DB_POOL_ADAPTIVE and wait_ms > settings.DB_POOL_WAIT_ALERT_MS:
+            self._alert(f"waited {wait_ms:.0f} ms for a connection")
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += 1
+            self.buckets[-1] += 1
+        if settings.DB_POOL_ADAPTIVE:
+            self._alert("timed out waiting for a connection")
+
+    def suggested_pool_size(self) -> Optional[int]:
+        """Taille couvrant le pic observé (overflow compris), ou None si inconnu."""
+        if not self.peak_in_use:
+            return None
+        return self.peak_in_use + max(1, self.peak_in_use // 4)
+
+    def _alert(self, reason: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_alert < ALERT_INTERVAL:
+                return
+            self._last_alert = now
+        snapshot = self.snapshot()
+        message = (
+            f"Database pool '{self.name}' {reason} "
+            f"(in use {snapshot['in_use']}/{snapshot['size']} + overflow {snapshot['overflow']}, "
+            f"suggested pool size {snapshot['suggested_pool_size']})"
+        )
+        logger.warning(message)
+        try:
+            from app.core.notifications import schedule_notification
+
+            schedule_notification({
+                "type": "db_pool",
+                "title": "Pool de connexions saturé",
+                "message": message,
+                "target_roles": ["admin"],
+            })
+        except Exception:
+            # L'alerte est un confort : le journal reste la référence.
+            pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        with self._lock:
+            cumulative, histogram = 0, []
+            for bound, count in zip((*CHECKOUT_BUCKETS_MS, "+Inf"), self.buckets):
+                cumulative += count
+                histogram.append({"le": bound, "count": cumulative})
+            return {
+                "name": self.name,
+                "size": pool.size() if pool is not None else 0,
+                "in_use": pool.checkedout() if pool is not None else 0,
+                "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+                "max_overflow": getattr(pool, "_max_overflow", 0),
+                "timeout": pool.timeout() if pool is not None else 0,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_sum": round(self.wait_ms_sum, 3),
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "wait_ms_histogram": histogram,
+                "suggested_pool_size": self.suggested_pool_size(),
+            }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    if name not in _registry:
+        _registry[name] = PoolMetrics(name)
+    return _registry[name]
+
+
+def all_pool_metrics() -> List[Dict[str, Any]]:
+    return [metrics.snapshot() for metrics in _registry.values()]
+
+
+class _InstrumentedPoolMixin:
+    metrics_name = "default"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # recreate() (dispose) construit un nouveau pool : les compteurs restent.
+        get_pool_metrics(self.metrics_name).pool = self
+
+    def _do_get(self):
+        metrics = get_pool_metrics(self.metrics_name)
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            metrics.observe_timeout()
+            raise
+        metrics.observe((time.perf_counter() - start) * 1000, self.checkedout())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_name = "sync"
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+def pool_arguments() -> Dict[str, Any]:
+    """Paramètres de pool communs aux moteurs, d'après Settings."""
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
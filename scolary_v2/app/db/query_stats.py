@@ -0,0 +1,155 @@
+"""
+Comptage des requêtes SQL par requête HTTP et détection des N+1.
+
+Un écouteur sur tous les moteurs (synchrones, et `sync_engine` des moteurs
+asynchrones) ajoute chaque instruction exécutée au `QueryStats` courant,
+porté par une variable de contexte : le middleware `QueryStatsMiddleware` en
+ouvre un par requête HTTP, `count_queries()` en ouvre un dans les tests.
+
+La « forme » d'une instruction est son SQL paramétré, listes IN repliées :
+une même forme exécutée au moins QUERY_REPEAT_THRESHOLD fois dans une requête
+signale en général une boucle qui charge ligne par ligne (N+1).
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\])"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(?)", statement)).strip()
+
+
+class QueryStats:
+    __slots__ = ("count", "total_ms", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Formes exécutées au moins `threshold` fois, les plus fréquentes d'abord."""
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def count_queries(max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Compte les requêtes du bloc ; échoue (AssertionError) au-delà de
+    `max_queries` requêtes ou si une forme est répétée plus de `max_repeats` fois.
+
+        with count_queries(max_queries=3):
+            client.get("/api/v1/students/")
+    """
+    with collect_queries() as stats:
+        yield stats
+    if max_queries is not None and stats.count > max_queries:
+        raise AssertionError(
+            f"{stats.count} queries executed (max {max_queries}):\n"
+            + "\n".join(f"{count} x {shape}" for shape, count in stats.shapes.most_common())
+        )
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats + 1)
+        if repeated:
+            raise AssertionError(
+                f"statements repeated more than {max_repeats} times:\n"
+                + "\n".join(f"{count} x {shape}" for shape, count in repeated)
+            )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_stats_start")
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000 if starts else 0.0
+    stats.record(statement, duration_ms)
+
+
+class QueryStatsMiddleware:
+    """
+    Ajoute à chaque réponse `X-DB-Queries: <nombre>;dur=<ms>` et, si des
+    formes sont répétées, `X-DB-Repeated: <formes>;max=<répétitions>` ;
+    journalise une ligne JSON (warning si N+1 suspecté).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as stats:
+            async def send_with_stats(message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", f"{stats.count};dur={stats.total_ms:.1f}".encode()))
+                    repeated = stats.repeated()
+                    if repeated:
+                        headers.append((b"x-db-repeated", f"{len(repeated)};max={repeated[0][1]}".encode()))
+                    message = {**message, "headers": headers}
+                    _log(scope, stats, repeated)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+
+def _log(scope, stats: QueryStats, repeated: List[Tuple[str, int]]) -> None:
+    level = logging.WARNING if repeated else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, json.dumps({
+        "event": "db_queries",
+        "method": scope.get("method"),
+        "path": scope.get("path"),
+        "queries": stats.count,
+        "db_ms": round(stats.total_ms, 1),
+        "repeated": [{"count": count, "statement": shape[:300]} for shape, count in repeated[:5]],
+    }, ensure_ascii=False))
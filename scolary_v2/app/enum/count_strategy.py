@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class CountStrategyEnum(str, Enum):
+    exact = "exact"
+    none = "none"
+    estimate = "estimate"
+    cached = "cached"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class LoadingProfileEnum(str, Enum):
+    minimal = "minimal"
+    list = "list"
+    financial = "financial"
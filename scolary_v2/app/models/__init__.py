@@ -45,3 +45,5 @@ from .teacher import Teacher
 from .plugged import Plugged
 from .notification_template import NotificationTemplate
 from .model_has_permission import ModelHasPermission
+from .dashboard_member import DashboardMember
+from .dashboard_aggregate import DashboardAggregate
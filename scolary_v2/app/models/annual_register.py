@@ -2,9 +2,11 @@
 # ---write your code here--- #
 # end #
 from app.db.base_class import Base
-from sqlalchemy import Column, ForeignKey, DateTime, func, select, case, Integer, cast, Enum
-from sqlalchemy.orm import relationship, column_property
-from sqlalchemy import String, UniqueConstraint
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import Column, ForeignKey, DateTime, func, select, case, Integer, cast, Enum, event, inspect, update
+from sqlalchemy.orm import relationship, Session
+from sqlalchemy import Float, Index, String, UniqueConstraint
 from app.enum.register_type import RegisterTypeEnum
 from app.models.enrollment_fee import EnrollmentFee
 from app.models.journey import Journey
@@ -20,6 +22,7 @@ class AnnualRegister(Base):
                          name='uq_annual_register_student_year'),
         UniqueConstraint('num_select', 'id_academic_year', 'register_type',
                          name='uq_annual_seletion_student_year'),
+        Index('ix_annual_register_year_payment_status', 'id_academic_year', 'payment_status'),
     )
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False, unique=True, index=True)
     num_carte = Column(String(255), ForeignKey('student.num_carte'))
@@ -31,6 +34,15 @@ class AnnualRegister(Base):
     verified_by = Column(Integer, ForeignKey('user.id'))
     verified_at = Column(DateTime)
 
+    # Projection maintenue par refresh_projection() (voir plus bas)
+    max_semester_number = Column(Integer)
+    level_from_semester = Column(String(10))
+    total_payment = Column(Float, default=0.0)
+    max_semester_journey_id = Column(Integer)
+    mention_id_from_max_semester = Column(Integer)
+    enrollment_fee_amount = Column(Float)
+    payment_status = Column(String(20))
+
     # default column
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -45,7 +57,10 @@ class AnnualRegister(Base):
     document = relationship('Document', back_populates='annual_register')
     user = relationship('User')
 
-# Computed properties declared after class definition to avoid mapper warnings
+# Projection : les colonnes calculées ci-dessus sont stockées dans la table et
+# recalculées à partir des expressions suivantes lorsque les semestres, les
+# paiements ou les frais d'inscription changent, au lieu d'être évaluées en
+# sous-requêtes corrélées à chaque SELECT.
 max_semester_number_expr = (
     select(
         func.max(
@@ -57,17 +72,13 @@ max_semester_number_expr = (
     .scalar_subquery()
 )
 
-AnnualRegister.max_semester_number = column_property(max_semester_number_expr)
-
-AnnualRegister.level_from_semester = column_property(
-    case(
-        (max_semester_number_expr <= 2, LevelEnum.L1.value),
-        (max_semester_number_expr <= 4, LevelEnum.L2.value),
-        (max_semester_number_expr <= 6, LevelEnum.L3.value),
-        (max_semester_number_expr <= 8, LevelEnum.M1.value),
-        (max_semester_number_expr <= 10, LevelEnum.M2.value),
-        else_="",
-    )
+level_from_semester_expr = case(
+    (max_semester_number_expr <= 2, LevelEnum.L1.value),
+    (max_semester_number_expr <= 4, LevelEnum.L2.value),
+    (max_semester_number_expr <= 6, LevelEnum.L3.value),
+    (max_semester_number_expr <= 8, LevelEnum.M1.value),
+    (max_semester_number_expr <= 10, LevelEnum.M2.value),
+    else_="",
 )
 
 total_payment_expr = (
@@ -77,8 +88,6 @@ total_payment_expr = (
     .scalar_subquery()
 )
 
-AnnualRegister.total_payment = column_property(total_payment_expr)
-
 max_semester_journey_id_expr = (
     select(RegisterSemester.id_journey)
     .where(
@@ -90,9 +99,7 @@ max_semester_journey_id_expr = (
     .scalar_subquery()
 )
 
-AnnualRegister.max_semester_journey_id = column_property(max_semester_journey_id_expr)
-
-AnnualRegister.mention_id_from_max_semester = column_property(
+mention_id_from_max_semester_expr = (
     select(Journey.id_mention)
     .where(Journey.id == max_semester_journey_id_expr)
     .correlate_except(Journey)
@@ -102,22 +109,143 @@ AnnualRegister.mention_id_from_max_semester = column_property(
 enrollment_fee_amount_expr = (
     select(EnrollmentFee.price)
     .where(
-        EnrollmentFee.level == AnnualRegister.level_from_semester,
+        EnrollmentFee.level == level_from_semester_expr,
         EnrollmentFee.id_academic_year == AnnualRegister.id_academic_year,
-        EnrollmentFee.id_mention == AnnualRegister.mention_id_from_max_semester,
+        EnrollmentFee.id_mention == mention_id_from_max_semester_expr,
     )
     .limit(1)
     .correlate_except(EnrollmentFee)
     .scalar_subquery()
 )
 
-AnnualRegister.enrollment_fee_amount = column_property(enrollment_fee_amount_expr)
-
-AnnualRegister.payment_status = column_property(
-    case(
-        (enrollment_fee_amount_expr.is_(None), "not_applicable"),
-        (total_payment_expr >= enrollment_fee_amount_expr, "complete"),
-        (total_payment_expr == 0, "none"),
-        else_="partial",
-    )
+payment_status_expr = case(
+    (enrollment_fee_amount_expr.is_(None), "not_applicable"),
+    (total_payment_expr >= enrollment_fee_amount_expr, "complete"),
+    (total_payment_expr == 0, "none"),
+    else_="partial",
 )
+
+PROJECTION = {
+    "max_semester_number": max_semester_number_expr,
+    "level_from_semester": level_from_semester_expr,
+    "total_payment": total_payment_expr,
+    "max_semester_journey_id": max_semester_journey_id_expr,
+    "mention_id_from_max_semester": mention_id_from_max_semester_expr,
+    "enrollment_fee_amount": enrollment_fee_amount_expr,
+    "payment_status": payment_status_expr,
+}
+
+REFRESH_BATCH_SIZE = 500
+
+
+def refresh_projection(
+        connection,
+        ids: Optional[Iterable[int]] = None,
+        academic_year_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Recalcule la projection des inscriptions `ids`, de celles des années
+    `academic_year_ids`, ou de toutes si aucun filtre n'est donné.
+    Retourne le nombre de lignes mises à jour.
+    """
+    table = AnnualRegister.__table__
+    # updated_at inchangé : un paiement ne modifie pas l'inscription elle-même.
+    statement = update(table).values(updated_at=table.c.updated_at, **PROJECTION)
+    if ids is None and academic_year_ids is None:
+        return connection.execute(statement).rowcount
+    count = 0
+    for column, values in ((table.c.id, ids), (table.c.id_academic_year, academic_year_ids)):
+        values = sorted({value for value in values or () if value is not None})
+        for start in range(0, len(values), REFRESH_BATCH_SIZE):
+            chunk = values[start:start + REFRESH_BATCH_SIZE]
+            count += connection.execute(statement.where(column.in_(chunk))).rowcount
+    return count
+
+
+_PENDING_KEY = "annual_register_projection_pending"
+_SOURCES = {RegisterSemester: "id_annual_register", Payment: "id_annual_register"}
+
+
+def _pending(session: Session):
+    return session.info.setdefault(_PENDING_KEY, (set(), set()))
+
+
+def _keys(obj, attribute: str) -> Set[int]:
+    history = inspect(obj).attrs[attribute].history
+    return {value for value in (*history.unchanged, *history.added, *history.deleted) if value is not None}
+
+
+def _registers_of_journeys(session: Session, journey_ids: Set[int]) -> Set[int]:
+    # Inscriptions dont la mention projetée vient de ces parcours (Journey.id_mention).
+    if not journey_ids:
+        return set()
+    return set(session.connection().execute(
+        select(AnnualRegister.id).where(AnnualRegister.max_semester_journey_id.in_(journey_ids))
+    ).scalars())
+
+
+def _refresh_pending(session: Session) -> None:
+    ids, years = session.info.pop(_PENDING_KEY, (set(), set()))
+    if not ids and not years:
+        return
+    refresh_projection(session.connection(), ids=ids, academic_year_ids=years)
+    for obj in list(session.identity_map.values()):
+        if not isinstance(obj, AnnualRegister):
+            continue
+        loaded = inspect(obj).dict
+        if loaded.get("id") in ids or loaded.get("id_academic_year") in years:
+            session.expire(obj, list(PROJECTION))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_projection_changes(session: Session, flush_context) -> None:
+    ids, years = _pending(session)
+    journeys = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, AnnualRegister):
+            if obj not in session.deleted:
+                ids.add(obj.id)
+        elif isinstance(obj, EnrollmentFee):
+            years.update(_keys(obj, "id_academic_year"))
+        elif isinstance(obj, Journey):
+            if obj in session.deleted or inspect(obj).attrs.id_mention.history.has_changes():
+                journeys.add(obj.id)
+        elif type(obj) in _SOURCES:
+            ids.update(_keys(obj, _SOURCES[type(obj)]))
+    ids.update(_registers_of_journeys(session, journeys))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_after_flush(session: Session, flush_context) -> None:
+    _refresh_pending(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _refresh_after_bulk(orm_execute_state):
+    # Query.update()/delete() sur les tables sources ne passent pas par le flush.
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model is EnrollmentFee:
+        key = EnrollmentFee.id_academic_year
+    elif model is Journey:
+        key = Journey.id
+    elif model in _SOURCES:
+        key = getattr(model, _SOURCES[model])
+    else:
+        return None
+    session = orm_execute_state.session
+    where = orm_execute_state.statement.whereclause
+    query = select(key).distinct()
+    if where is not None:
+        query = query.where(where)
+    affected = set(session.connection().execute(query).scalars())
+    result = orm_execute_state.invoke_statement()
+    ids, years = _pending(session)
+    if model is Journey:
+        ids.update(_registers_of_journeys(session, affected))
+    else:
+        (years if model is EnrollmentFee else ids).update(affected)
+    _refresh_pending(session)
+    return result
@@ -0,0 +1,24 @@
+# begin #
+# ---write your code here--- #
+# end #
+
+from app.db.base_class import Base
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+
+
+class DashboardAggregate(Base):
+    """Nombre d'étudiants par cellule (année, parcours, mention, sexe, naissance, nationalité, entrée)."""
+    __tablename__ = 'dashboard_aggregate'
+    __table_args__ = (
+        UniqueConstraint('id_academic_year', 'id_journey', 'id_mention', 'sex', 'birth_year',
+                         'id_nationality', 'id_enter_year', name='uq_dashboard_aggregate_cell'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True, nullable=False, unique=True, index=True)
+    id_academic_year = Column(Integer, nullable=False, default=0)
+    id_journey = Column(Integer, nullable=False, default=0)
+    id_mention = Column(Integer, nullable=False, default=0)
+    sex = Column(String(20), nullable=False, default="")
+    birth_year = Column(Integer, nullable=False, default=0)
+    id_nationality = Column(Integer, nullable=False, default=0)
+    id_enter_year = Column(Integer, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,25 @@
+# begin #
+# ---write your code here--- #
+# end #
+
+from app.db.base_class import Base
+from sqlalchemy import Column, Integer, String
+
+
+class DashboardMember(Base):
+    """
+    Contribution d'un étudiant au cube du tableau de bord : une ligne par
+    (année, parcours) où il est inscrit, plus les lignes « toutes années » /
+    « tous parcours » (valeur 0). Permet de retirer son ancienne contribution
+    de `dashboard_aggregate` quand il change.
+    """
+    __tablename__ = 'dashboard_member'
+    id = Column(Integer, primary_key=True, autoincrement=True, nullable=False, unique=True, index=True)
+    id_student = Column(Integer, nullable=False, index=True)
+    id_academic_year = Column(Integer, nullable=False, default=0)
+    id_journey = Column(Integer, nullable=False, default=0)
+    id_mention = Column(Integer, nullable=False, default=0)
+    sex = Column(String(20), nullable=False, default="")
+    birth_year = Column(Integer, nullable=False, default=0)
+    id_nationality = Column(Integer, nullable=False, default=0)
+    id_enter_year = Column(Integer, nullable=False, default=0)
@@ -3,7 +3,7 @@
 # end #
 
 from app.db.base_class import Base
-from sqlalchemy import Column, ForeignKey, DateTime, func, select, case, or_, and_
+from sqlalchemy import Column, ForeignKey, DateTime, func, select, case, or_, and_, UniqueConstraint
 from sqlalchemy.orm import relationship, column_property, aliased
 from sqlalchemy import Enum, Text, Integer, Float
 from app.enum.session_type import SessionTypeEnum
@@ -11,6 +11,10 @@ from app.enum.session_type import SessionTypeEnum
 
 class Note(Base):
     __tablename__ = 'note'
+    __table_args__ = (
+        UniqueConstraint('id_register_semester', 'id_constituent_element_offering', 'session',
+                         name='uq_register_semester_offering_session_note'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False, unique=True, index=True)
     id_register_semester = Column(Integer, ForeignKey('register_semester.id'))
     id_constituent_element_offering = Column(Integer, ForeignKey('constituent_element_offering.id'))
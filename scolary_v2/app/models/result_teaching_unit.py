@@ -3,15 +3,22 @@
 # end #
 
 from app.db.base_class import Base
-from sqlalchemy import Column, ForeignKey, DateTime, func, select, case, or_, and_
+from sqlalchemy import Column, ForeignKey, DateTime, func, select, case, or_, and_, UniqueConstraint
 from sqlalchemy.orm import relationship, column_property, aliased
-from sqlalchemy import Boolean, Integer, Float, DateTime, Text
+from sqlalchemy import Boolean, Enum, Integer, Float, DateTime, Text
+from app.enum.session_type import SessionTypeEnum
 
 
 class ResultTeachingUnit(Base):
     __tablename__ = 'result_teaching_unit'
+    __table_args__ = (
+        UniqueConstraint('id_register_semester', 'id_teaching_unit_offering', 'session',
+                         name='uq_register_semester_teaching_unit_session_result'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False, unique=True, index=True)
     id_register_semester = Column(Integer, ForeignKey('register_semester.id'))
+    id_teaching_unit_offering = Column(Integer, ForeignKey('teaching_unit_offering.id'))
+    session = Column(Enum(SessionTypeEnum))
     note = Column(Float, nullable=False)
     is_valid = Column(Boolean)
     date_validation = Column(DateTime, nullable=False)
@@ -24,6 +31,7 @@ class ResultTeachingUnit(Base):
 
     # Relations
     student_year = relationship('RegisterSemester', foreign_keys=[id_register_semester])
+    teaching_unit_offering = relationship('TeachingUnitOffering', foreign_keys=[id_teaching_unit_offering])
 
 
 # begin #
@@ -8,8 +8,11 @@ from math import cos, pi, radians, sin, tan
 
 from fpdf import FPDF, util
 
+from app.pdf.assets import CachedAssetsMixin
+from app.pdf.templates import PageTemplatesMixin
 
-class AlphaFPDF(FPDF):
+
+class AlphaFPDF(PageTemplatesMixin, CachedAssetsMixin, FPDF):
     _extgstates = {}
 
     # alpha: real value from 0 (transparent) to 1 (opaque)
@@ -67,31 +67,40 @@ class PDFMark(AlphaFPDF):
 
     def _mark(self, text_data):
         if len(text_data) != 0:
-            # store current x, y coordinates
-            old_X, old_y = self.get_x(), self.get_y()
-
+            # same mark on every page: drawn once per document as a template
+            key = ("mark", repr(text_data), self.w, self.h)
+            self.use_template(key, lambda pdf: pdf._draw_mark(text_data))
+            # pages drawn after the mark have always inherited its font and color
             self.set_font(text_data[6], text_data[8], text_data[7])
             r, g, b = text_data[5]
             self.set_text_color(r, g, b)
-            self.set_alpha(text_data[4])
 
-            text = text_data[0]
-            stringWidth = self.get_string_width(text) / 2
-            x, y = text_data[1], text_data[2]
+    def _draw_mark(self, text_data):
+        # store current x, y coordinates
+        old_X, old_y = self.get_x(), self.get_y()
+
+        self.set_font(text_data[6], text_data[8], text_data[7])
+        r, g, b = text_data[5]
+        self.set_text_color(r, g, b)
+        self.set_alpha(text_data[4])
+
+        text = text_data[0]
+        stringWidth = self.get_string_width(text) / 2
+        x, y = text_data[1], text_data[2]
 
-            if x == None:
-                x = self.w / 2 - stringWidth
-            if y == None:
-                y = self.h / 2
+        if x == None:
+            x = self.w / 2 - stringWidth
+        if y == None:
+            y = self.h / 2
 
-            # rotate and print text
-            with self.rotation(text_data[3], x + stringWidth, y):
-                self.text(x, y, text)
+        # rotate and print text
+        with self.rotation(text_data[3], x + stringWidth, y):
+            self.text(x, y, text)
 
-                # set alpha back to opaque
-            self.set_alpha(1)
-            # store old coordinates
-            self.set_xy(old_X, old_y)
+            # set alpha back to opaque
+        self.set_alpha(1)
+        # store old coordinates
+        self.set_xy(old_X, old_y)
 
     def header(self):
         super().header()
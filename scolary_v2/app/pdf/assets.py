@@ -0,0 +1,185 @@
+"""
+Process-wide cache of the fonts and images embedded in generated PDFs.
+
+Every generator registers the same fonts (`font/Algerian.ttf`...) and places
+the same logos, signatures and backgrounds on every page of every document.
+fpdf2 only de-duplicates them within one document, so each request re-reads
+the files, re-parses the TrueType tables and re-compresses the images.
+
+Here the parsed font metrics and the decoded/compressed image streams are
+kept per process, keyed by absolute path + mtime + size (a replaced file is
+picked up on the next document). `CachedAssetsMixin` plugs the cache into
+`FPDF.image()`/`FPDF.add_font()`; it is used by `AlphaFPDF` (hence `PDFMark`)
+and `CachedFPDF`, the base of the generators that do not need `PDFMark`.
+
+The font part relies on fpdf2 2.7 internals (`TTFFont`, `SubsetMap`), the
+version pinned in requirements.txt.
+"""
+import copy
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_FONT_DIR
+from fpdf.enums import TextEmphasis
+from fpdf.fonts import CORE_FONTS, SubsetMap, TTFFont
+from fpdf.image_parsing import get_img_info
+
+from app.pdf.templates import PageTemplatesMixin
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+FONT_EXTENSIONS = (".otf", ".otc", ".ttf", ".ttc")
+
+
+def _file_key(path: Path) -> Optional[Tuple[str, int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+class AssetCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._images: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._fonts: Dict[Tuple, Tuple[TTFFont, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def image_info(self, name: str, image_filter: str = "AUTO"):
+        """Parsed image (fpdf2 RasterImageInfo) of a local file, or None if not cacheable."""
+        key = _file_key(Path(name))
+        if key is None:
+            return None
+        key = key + (image_filter,)
+        with self._lock:
+            entry = self._images.get(key)
+            if entry is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        info = get_img_info(name, None, image_filter)
+        size = len(info.get("data") or b"") + len(info.get("smask") or b"")
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = (info, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes and len(self._images) > 1:
+                _, (_, evicted) = self._images.popitem(last=False)
+                self._bytes -= evicted
+        return info
+
+    def font(self, fpdf: FPDF, path: Path, fontkey: str, style: str) -> TTFFont:
+        """TTFFont for `fpdf`, sharing the parsed metrics of the cached prototype."""
+        key = _file_key(path) + (style,)
+        with self._lock:
+            entry = self._fonts.get(key)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is None:
+            # The prototype itself is never handed to a document.
+            entry = (TTFFont(fpdf, path, fontkey, style), path.read_bytes())
+            with self._lock:
+                entry = self._fonts.setdefault(key, entry)
+        prototype, data = entry
+        font = copy.copy(prototype)
+        font.i = len(fpdf.fonts) + 1
+        font.fontkey = fontkey
+        font.emphasis = TextEmphasis.coerce(style)
+        # The TrueType tables are subset in place at output time: one per document.
+        font.ttfont = ttLib.TTFont(BytesIO(data), recalcTimestamp=False, fontNumber=0, lazy=True)
+        font.missing_glyphs = []
+        sbarr = "\x00 \r\n"
+        if fpdf.str_alias_nb_pages:
+            sbarr += "0123456789" + fpdf.str_alias_nb_pages
+        font.subset = SubsetMap(font, [ord(char) for char in sbarr])
+        return font
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._fonts.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "images": len(self._images),
+                "fonts": len(self._fonts),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+asset_cache = AssetCache()
+
+
+def _resolve_font_path(fname) -> Optional[Path]:
+    for parent in (".", FPDF_FONT_DIR):
+        if parent and (Path(parent) / fname).exists():
+            return Path(parent) / fname
+    return None
+
+
+class CachedAssetsMixin:
+    """Serves `image()` and `add_font()` of local files from `asset_cache`."""
+
+    def image(self, name, *args, **kwargs):
+        if (
+                isinstance(name, (str, Path))
+                and not kwargs.get("dims")
+                and not str(name).startswith(("http://", "https://", "data"))
+                and not str(name).endswith(".svg")
+        ):
+            name = str(name)
+            if name not in self.image_cache.images:
+                info = asset_cache.image_info(name, self.image_cache.image_filter)
+                if info is not None:
+                    self._register_cached_image(name, info)
+        return super().image(name, *args, **kwargs)
+
+    def _register_cached_image(self, name: str, info) -> None:
+        image_cache = self.image_cache
+        info = copy.copy(info)
+        info["i"] = len(image_cache.images) + 1
+        # preload_image() finds the entry and counts this first use.
+        info["usages"] = 0
+        info["iccp_i"] = None
+        iccp = info.get("iccp")
+        if iccp:
+            if iccp not in image_cache.icc_profiles:
+                image_cache.icc_profiles[iccp] = len(image_cache.icc_profiles)
+            info["iccp_i"] = image_cache.icc_profiles[iccp]
+            info["iccp"] = None
+        image_cache.images[name] = info
+
+    def add_font(self, family=None, style="", fname=None, uni="DEPRECATED"):
+        path = _resolve_font_path(fname) if fname else None
+        style = "".join(sorted(style.upper()))
+        if path is None or os.path.splitext(str(path))[1].lower() not in FONT_EXTENSIONS \
+                or any(letter not in "BI" for letter in style):
+            return super().add_font(family, style, fname, uni)
+        fontkey = f"{(family or path.stem).lower()}{style}"
+        # Generators register their fonts once per card/page: ignore repeats silently.
+        if fontkey in self.fonts or fontkey in CORE_FONTS:
+            return None
+        self.fonts[fontkey] = asset_cache.font(self, path, fontkey, style)
+        return None
+
+
+class CachedFPDF(PageTemplatesMixin, CachedAssetsMixin, FPDF):
+    pass
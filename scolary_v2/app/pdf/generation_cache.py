@@ -0,0 +1,161 @@
+"""
+Cache of generated documents, keyed by what they are generated from.
+
+The key is the SHA-256 of the generator name, its template version and the
+exact input rows (students, titles, university letterhead...). A list printed
+again while its registrations have not changed is served from
+`files/pdf/cache/<key>/<filename>` without rendering; any changed row, or a
+bumped template version, gives another key and a fresh render. Hashing the
+rows rather than using `table_version()` keeps keys valid across worker
+processes and restarts.
+
+Entries are evicted least recently used first once the cache holds more than
+PDF_CACHE_MAX_BYTES. Hits, misses and evictions are exported on `/metrics`.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.pdf.output_store import FILES_DIR, write_atomic
+
+
+def _encode(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
+class GenerationCache:
+    def __init__(self, root: Union[str, Path], max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Key -> size in bytes, least recently used first; read from disk on first use.
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(generator: str, version: int, inputs: Any) -> str:
+        payload = json.dumps([generator, version, inputs], default=_encode, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def render(self, generator: str, version: int, inputs: Any, filename: str,
+               render: Callable[[], bytes]) -> Path:
+        """Path of the cached document, calling `render()` only when no entry matches the inputs."""
+        return self._get(generator, version, inputs, filename, render, keep_open=False)[0]
+
+    def open(self, generator: str, version: int, inputs: Any, filename: str,
+             render: Callable[[], bytes]) -> BinaryIO:
+        """
+        Like `render`, but returns the document opened for reading. The handle
+        is taken under the lock, so a concurrent eviction cannot remove the file
+        before it is streamed.
+        """
+        return self._get(generator, version, inputs, filename, render, keep_open=True)[1]
+
+    def _get(self, generator: str, version: int, inputs: Any, filename: str,
+             render: Callable[[], bytes], keep_open: bool) -> Tuple[Path, Optional[BinaryIO]]:
+        key = self.make_key(generator, version, inputs)
+        target = self.root / key / filename
+        with self._lock:
+            self._load()
+            try:
+                size = target.stat().st_size
+                handle = open(target, "rb") if keep_open else None
+            except FileNotFoundError:
+                # Absent, or evicted by another worker since the lookup.
+                self._forget(key)
+            else:
+                self.hits += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                else:
+                    # Written by another worker after this process indexed the cache.
+                    self._entries[key] = size
+                    self._size += size
+                try:
+                    # Last use survives restarts: entries are reloaded by mtime.
+                    os.utime(target.parent)
+                except OSError:
+                    pass
+                self._evict()
+                return target, handle
+            self.misses += 1
+        content = render()
+        write_atomic(target, content)
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(content)
+            self._size += len(content)
+            try:
+                handle = open(target, "rb") if keep_open else None
+            except FileNotFoundError:
+                handle = io.BytesIO(content)
+            self._evict()
+        return target, handle
+
+    def _forget(self, key: str) -> None:
+        self._size -= self._entries.pop(key, 0)
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        entries = []
+        try:
+            directories = list(os.scandir(self.root))
+        except OSError:
+            return
+        for entry in directories:
+            try:
+                size = sum(file.stat().st_size for file in os.scandir(entry.path))
+                entries.append((entry.stat().st_mtime, entry.name, size))
+            except OSError:
+                continue
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+
+    def _evict(self) -> None:
+        # The entry just written is kept even when it alone exceeds the bound.
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+pdf_cache = GenerationCache(FILES_DIR / "pdf" / "cache", settings.PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,174 @@
+"""
+Delivery of generated documents: stored once on disk, or streamed.
+
+Stored (default): `output_store.put(content, filename)` writes the bytes, or
+copies a file object such as a spooled ZIP, under
+`files/pdf/store/<digest>/<filename>`, where `<digest>` is the SHA-256 of the
+content. The same document rendered twice is written once, two users printing
+different lists never overwrite each other's file, and the client downloads
+it through the `/files` mount as before (`PdfFileResponse`).
+
+Streamed (`stream=true` on the endpoints): `stream_response()` sends the
+rendered bytes, or a spooled temporary file for large archives, in a
+`StreamingResponse`. Nothing is written under `files/`, and the client does
+not need a second request.
+
+Expiry is done by a janitor thread started with the application
+(`start_janitor`). It removes stored documents that have not been written or
+reused for PDF_OUTPUT_MAX_AGE seconds, and old files in the legacy output
+folders. Requests no longer walk the output directories.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Union
+from urllib.parse import quote
+
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+
+FILES_DIR = Path("files")
+CHUNK_SIZE = 64 * 1024
+# Archives up to this size stay in memory before spilling to a temporary file.
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+MEDIA_TYPES = {".pdf": "application/pdf", ".zip": "application/zip"}
+
+
+def _relative(path: Path) -> str:
+    return path.relative_to(FILES_DIR).as_posix() if path.is_relative_to(FILES_DIR) else path.as_posix()
+
+
+def file_reference(path: Path) -> Dict[str, str]:
+    """{path, filename} of a file under `files/`, as expected by `PdfFileResponse`."""
+    return {"path": f"{_relative(path.parent)}/", "filename": path.name}
+
+
+def write_atomic(target: Path, content: Union[bytes, BinaryIO]) -> None:
+    """Write bytes, or copy a file object, through a temporary file, so readers never see a partial document."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=target.parent, suffix=".part")
+    with os.fdopen(descriptor, "wb") as file:
+        if isinstance(content, (bytes, bytearray)):
+            file.write(content)
+        else:
+            content.seek(0)
+            shutil.copyfileobj(content, file, CHUNK_SIZE)
+    os.replace(temporary, target)
+
+
+def _digest(content: Union[bytes, BinaryIO]) -> str:
+    if isinstance(content, (bytes, bytearray)):
+        return hashlib.sha256(content).hexdigest()[:32]
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in iter(lambda: content.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+class OutputStore:
+    def __init__(self, root: Union[str, Path], max_age: float, legacy_dirs: Iterable[Union[str, Path]] = ()) -> None:
+        self.root = Path(root)
+        self.max_age = max_age
+        self.legacy_dirs = [Path(directory) for directory in legacy_dirs]
+        self._janitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def put(self, content: Union[bytes, BinaryIO], filename: str) -> Dict[str, str]:
+        """
+        Store `content` as `filename` (once per distinct content) and return its
+        {path, filename}. A file object is hashed and copied in chunks, never read whole.
+        """
+        directory = self.root / _digest(content)
+        target = directory / filename
+        # The directory mtime is the last use: refreshed before the janitor can find it expired.
+        try:
+            os.utime(directory)
+        except FileNotFoundError:
+            pass
+        if not target.exists():
+            write_atomic(target, content)
+        return file_reference(target)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove expired stored documents and legacy outputs; returns the number of entries removed."""
+        deadline = (now or time.time()) - self.max_age
+        removed = 0
+        for base in (self.root, *self.legacy_dirs):
+            try:
+                entries = list(os.scandir(base))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime >= deadline:
+                        continue
+                    if entry.is_dir():
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def start_janitor(self, interval: float) -> None:
+        if self._janitor is not None or interval <= 0:
+            return
+        self._stop.clear()
+        self._janitor = threading.Thread(target=self._run_janitor, args=(interval,), name="pdf-janitor", daemon=True)
+        self._janitor.start()
+
+    def stop_janitor(self) -> None:
+        self._stop.set()
+        if self._janitor is not None:
+            self._janitor.join(timeout=5)
+            self._janitor = None
+
+    def _run_janitor(self, interval: float) -> None:
+        while not self._stop.is_set():
+            self.sweep()
+            self._stop.wait(interval)
+
+
+def _chunks(source: Union[bytes, bytearray, BinaryIO]) -> Iterator[bytes]:
+    if isinstance(source, (bytes, bytearray)):
+        view = memoryview(source)
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield bytes(view[start:start + CHUNK_SIZE])
+        return
+    try:
+        source.seek(0)
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        source.close()
+
+
+def spooled_file() -> BinaryIO:
+    """Buffer for a generator that writes its output (e.g. a ZIP) before it is streamed."""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+
+def stream_response(source: Union[bytes, bytearray, BinaryIO], filename: str) -> StreamingResponse:
+    """Send rendered bytes, or a file object (closed once sent), as a download."""
+    fallback = filename.encode("ascii", "replace").decode().replace("?", "_").replace('"', "_")
+    headers = {"Content-Disposition": f"inline; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"}
+    if isinstance(source, (bytes, bytearray)):
+        headers["Content-Length"] = str(len(source))
+    media_type = MEDIA_TYPES.get(Path(filename).suffix.lower(), "application/octet-stream")
+    return StreamingResponse(_chunks(source), media_type=media_type, headers=headers)
+
+
+output_store = OutputStore(
+    FILES_DIR / "pdf" / "store", settings.PDF_OUTPUT_MAX_AGE, legacy_dirs=[FILES_DIR / "pdf" / "list"],
+)
@@ -0,0 +1,103 @@
+"""
+QR codes of the cards and badges, cached on disk by content.
+
+The payload of a student card (`num_carte|key`) does not change during an
+academic year, so each QR code is encoded once and saved as a 1-bit PNG under
+`files/qr_codes/`, named after the hash of the payload and the encoding
+parameters. Reprinting a mention then only reads files, which `asset_cache`
+(app.pdf.assets) keeps decoded in memory.
+
+`encode_many` fills the cache for a whole cohort in a process pool before the
+cards are rendered.
+"""
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_M
+
+QR_CACHE_DIR = Path("files/qr_codes")
+QR_BOX_SIZE = 6
+QR_BORDER = 2
+# En dessous, encoder sur place coûte moins que démarrer un pool.
+MIN_POOL_BATCH = 64
+
+
+def qr_payload(payload: Any) -> str:
+    if isinstance(payload, (list, tuple)):
+        return "|".join(map(str, payload))
+    return str(payload)
+
+
+def qr_path(payload: Any, cache_dir: Path = QR_CACHE_DIR) -> Path:
+    """Chemin du PNG (existant ou non) du QR code de `payload`."""
+    text = qr_payload(payload)
+    digest = hashlib.sha1(
+        f"{ERROR_CORRECT_M}:{QR_BOX_SIZE}:{QR_BORDER}:{text}".encode("utf-8")
+    ).hexdigest()
+    return Path(cache_dir) / digest[:2] / f"{digest}.png"
+
+
+def _encode(text: str, path: str) -> str:
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=ERROR_CORRECT_M,
+        box_size=QR_BOX_SIZE,
+        border=QR_BORDER,
+    )
+    qr.add_data(text)
+    qr.make(fit=True)
+    # Image 1 bit ("1") : fpdf l'intègre telle quelle en DeviceGray 1 bpc.
+    img = qr.make_image(fill_color="black", back_color="white").get_image()
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Fichier temporaire propre à cet appel : deux threads peuvent encoder le même code.
+    descriptor, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(descriptor, "wb") as file:
+        img.save(file, format="PNG", optimize=True)
+    os.replace(tmp, target)
+    return path
+
+
+def qr_image(payload: Any, cache_dir: Path = QR_CACHE_DIR) -> str:
+    """Chemin du PNG 1 bit du QR code de `payload`, encodé au premier appel."""
+    path = qr_path(payload, cache_dir)
+    if not path.exists():
+        _encode(qr_payload(payload), str(path))
+    return path.as_posix()
+
+
+def encode_many(
+        payloads: Iterable[Any],
+        *,
+        cache_dir: Path = QR_CACHE_DIR,
+        max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Encode en parallèle les QR codes absents du cache et retourne
+    `{payload: chemin}` pour tous les `payloads`.
+    """
+    paths: Dict[str, str] = {}
+    missing: List[tuple] = []
+    for payload in payloads:
+        text = qr_payload(payload)
+        if text in paths:
+            continue
+        path = qr_path(text, cache_dir)
+        paths[text] = path.as_posix()
+        if not path.exists():
+            missing.append((text, path.as_posix()))
+
+    workers = min(max_workers or os.cpu_count() or 1, len(missing) // MIN_POOL_BATCH)
+    if workers <= 1:
+        for text, path in missing:
+            _encode(text, path)
+    elif missing:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            texts, targets = zip(*missing)
+            list(executor.map(_encode, texts, targets, chunksize=MIN_POOL_BATCH))
+    return paths
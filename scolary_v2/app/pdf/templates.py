@@ -0,0 +1,133 @@
+"""
+Page templates: static parts of a layout recorded once per document as a
+PDF form XObject, then stamped on every page that needs them.
+
+Transcripts, certificates and lists draw the same frames, ministry header,
+watermark and table headings on every page through dozens of `cell`/`rect`
+calls. With `use_template(key, draw)` the first call runs `draw(pdf)` into a
+separate content stream (fonts, images and glyph subsets are registered on
+the document as usual); every call then writes a single `q /TPLn Do Q`, so
+the layout is computed once and stored once in the file.
+
+A template is positional: it is drawn at absolute page coordinates and,
+after stamping, the cursor and margins that `draw` moved are left where it
+left them; those it did not touch keep the caller's values.
+`draw` must fit on the current page and must not depend on per-page data
+other than what is part of `key`. The graphics state (font, colors, line
+width) of the caller is untouched.
+
+The output part relies on fpdf2 2.7 internals (`OutputProducer`,
+`PDFResources`), the version pinned in requirements.txt.
+"""
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fpdf.output import OutputProducer
+from fpdf.syntax import Name, PDFContentStream
+from fpdf.syntax import create_dictionary_string as pdf_dict
+from fpdf.syntax import iobj_ref as pdf_ref
+
+
+class PageTemplate:
+    __slots__ = ("name", "contents", "end_state", "usages")
+
+    def __init__(self, name: str, contents: bytes, end_state: Tuple[Optional[float], ...]) -> None:
+        self.name = name
+        self.contents = contents
+        self.end_state = end_state
+        self.usages = 0
+
+
+class PDFFormXObject(PDFContentStream):
+    def __init__(self, contents: bytes, size: float, compress: bool) -> None:
+        super().__init__(contents=contents, compress=compress)
+        self.type = Name("XObject")
+        self.subtype = Name("Form")
+        # Square box: the same form can be stamped on portrait and landscape pages.
+        self.b_box = f"[0 0 {size:.2f} {size:.2f}]"
+        self.resources = None
+
+
+class TemplateOutputProducer(OutputProducer):
+    """Adds the recorded templates as form XObjects sharing the page resources."""
+
+    def _add_resources_dict(self, font_objs_per_index, img_objs_per_index, gfxstate_objs_per_name):
+        resources_obj = super()._add_resources_dict(
+            font_objs_per_index, img_objs_per_index, gfxstate_objs_per_name
+        )
+        fpdf = self.fpdf
+        x_objects = {f"/I{index}": pdf_ref(img_obj.id) for index, img_obj in sorted(img_objs_per_index.items())}
+        size = max(max(page.dimensions()) for page in fpdf.pages.values())
+        for template in fpdf.page_templates.values():
+            if not template.usages:
+                continue
+            form_obj = PDFFormXObject(template.contents, size, fpdf.compress)
+            form_obj.resources = resources_obj
+            self._add_pdf_obj(form_obj, "templates")
+            x_objects[f"/{template.name}"] = pdf_ref(form_obj.id)
+        if x_objects:
+            resources_obj.x_object = pdf_dict(x_objects)
+        return resources_obj
+
+
+class PageTemplatesMixin:
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.page_templates: Dict[Hashable, PageTemplate] = {}
+
+    def use_template(self, key: Hashable, draw: Callable[[Any], None]) -> PageTemplate:
+        """Stamp the template `key` on the current page, recording it with `draw` on first use."""
+        template = self.page_templates.get(key)
+        if template is None:
+            template = self._record_template(f"TPL{len(self.page_templates) + 1}", draw)
+            self.page_templates[key] = template
+        self._out(f"q /{template.name} Do Q")
+        template.usages += 1
+        self._apply_end_state(template.end_state)
+        return template
+
+    def _record_template(self, name: str, draw: Callable[[Any], None]) -> PageTemplate:
+        contents = self.pages[self.page].contents
+        start = len(contents)
+        auto_page_break = self.auto_page_break
+        self.auto_page_break = False
+        self._push_local_stack()
+        try:
+            # The form must not rely on whatever state the first page happened to be in.
+            if self.current_font:
+                self._out(f"BT /F{self.current_font.i} {self.font_size_pt:.2f} Tf ET")
+            self._out(self.draw_color.serialize().upper())
+            self._out(self.fill_color.serialize().lower())
+            self._out(f"{self.line_width * self.k:.2f} w")
+            start_state = self._layout_state()
+            draw(self)
+            # None: left untouched by `draw`, the caller's value is kept when stamping.
+            end_state = tuple(
+                None if end == start else end for start, end in zip(start_state, self._layout_state())
+            )
+        finally:
+            recorded = bytes(contents[start:])
+            del contents[start:]
+            self._pop_local_stack()
+            self.auto_page_break = auto_page_break
+        return PageTemplate(name, recorded, end_state)
+
+    def _layout_state(self) -> Tuple[float, ...]:
+        return (self.l_margin, self.r_margin, self.t_margin, self.x, self.y)
+
+    def _apply_end_state(self, end_state: Tuple[Optional[float], ...]) -> None:
+        l_margin, r_margin, t_margin, x, y = end_state
+        if l_margin is not None:
+            self.l_margin = l_margin
+        if r_margin is not None:
+            self.r_margin = r_margin
+        if t_margin is not None:
+            self.t_margin = t_margin
+        if x is not None:
+            self.x = x
+        if y is not None:
+            self.y = y
+
+    def output(self, name="", dest="", linearize=False, output_producer_class=None):
+        if output_producer_class is None:
+            output_producer_class = TemplateOutputProducer if not linearize else OutputProducer
+        return super().output(name, dest, linearize, output_producer_class)
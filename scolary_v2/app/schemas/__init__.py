@@ -57,7 +57,10 @@ from .result_teaching_unit import (
     ResultTeachingUnit,
     ResultTeachingUnitCreate,
     ResultTeachingUnitUpdate,
-    ResponseResultTeachingUnit
+    ResponseResultTeachingUnit,
+    DeliberationCreate,
+    DeliberationStudent,
+    ResponseDeliberation
 )
 from .subscription import (
     Subscription,
@@ -200,7 +203,11 @@ from .note import (
     Note,
     NoteCreate,
     NoteUpdate,
-    ResponseNote
+    NoteBulkItem,
+    NoteBulkCreate,
+    NoteBulkResult,
+    ResponseNote,
+    ResponseNoteBulk
 )
 from .nationality import (
     Nationality,
@@ -209,7 +216,8 @@ from .nationality import (
     ResponseNationality
 )
 from .card_asset import CardAsset, CardAssetCreate
-from .pdf_file import PdfFileResponse
+from .pdf_file import PdfFileResponse, PdfJob
+from .pool_metrics import PoolMetrics, PoolWaitBucket
 from .document import (
     Document,
     DocumentCreate,
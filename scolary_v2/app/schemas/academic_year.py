@@ -41,8 +41,9 @@ class AcademicYearInDB(AcademicYearInDBBase):
 
 
 class ResponseAcademicYear(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[AcademicYearWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
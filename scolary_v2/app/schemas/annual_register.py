@@ -58,8 +58,9 @@ class AnnualRegisterInDB(AnnualRegisterInDBBase):
 
 
 class ResponseAnnualRegister(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[AnnualRegisterWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
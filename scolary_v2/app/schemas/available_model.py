@@ -41,8 +41,9 @@ class AvailableModelInDB(AvailableModelInDBBase):
 
 
 class ResponseAvailableModel(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[AvailableModelWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -39,8 +39,9 @@ class AvailableServiceInDB(AvailableServiceInDBBase):
 
 
 class ResponseAvailableService(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[AvailableServiceWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
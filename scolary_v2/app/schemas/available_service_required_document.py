@@ -45,8 +45,9 @@ class AvailableServiceRequiredDocumentInDB(AvailableServiceRequiredDocumentInDBB
 
 
 class ResponseAvailableServiceRequiredDocument(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[AvailableServiceRequiredDocumentWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -41,8 +41,9 @@ class BaccalaureateSerieInDB(BaccalaureateSerieInDBBase):
 
 
 class ResponseBaccalaureateSerie(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[BaccalaureateSerieWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -41,8 +41,9 @@ class ClassroomInDB(ClassroomInDBBase):
 
 
 class ResponseClassroom(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ClassroomWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
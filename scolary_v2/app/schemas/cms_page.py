@@ -42,8 +42,9 @@ class CmsPageInDB(CmsPageInDBBase):
 
 
 class ResponseCmsPage(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[CmsPageWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
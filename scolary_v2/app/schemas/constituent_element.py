@@ -44,8 +44,9 @@ class ConstituentElementInDB(ConstituentElementInDBBase):
 
 
 class ResponseConstituentElement(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ConstituentElementWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
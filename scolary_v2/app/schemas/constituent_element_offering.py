@@ -59,8 +59,9 @@ class ConstituentElementOfferingInDB(ConstituentElementOfferingInDBBase):
 
 
 class ResponseConstituentElementOffering(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ConstituentElementOfferingWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
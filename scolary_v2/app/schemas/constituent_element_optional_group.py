@@ -43,8 +43,9 @@ class ConstituentElementOptionalGroupInDB(ConstituentElementOptionalGroupInDBBas
 
 
 class ResponseConstituentElementOptionalGroup(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ConstituentElementOptionalGroupWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
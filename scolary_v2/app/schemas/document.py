@@ -45,5 +45,6 @@ class DocumentInDB(DocumentInDBBase):
 
 
 class ResponseDocument(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[DocumentWithRelation]]
+    next_cursor: Optional[str] = None
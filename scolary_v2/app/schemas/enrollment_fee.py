@@ -51,8 +51,9 @@ class EnrollmentFeeInDB(EnrollmentFeeInDBBase):
 
 
 class ResponseEnrollmentFee(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[EnrollmentFeeWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
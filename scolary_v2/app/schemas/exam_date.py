@@ -59,8 +59,9 @@ class ExamDateInDB(ExamDateInDBBase):
 
 
 class ResponseExamDate(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ExamDateWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
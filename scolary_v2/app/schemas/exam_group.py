@@ -59,8 +59,9 @@ class ExamGroupInDB(ExamGroupInDBBase):
 
 
 class ResponseExamGroup(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ExamGroupWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -40,8 +40,9 @@ class FeatureInDB(FeatureInDBBase):
 
 
 class ResponseFeature(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[FeatureWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -35,5 +35,6 @@ class FileAsset(FileAssetBase):
 
 
 class ResponseFileAsset(BaseModel):
-  count: int
+  count: Optional[int]
   data: Optional[List[FileAsset]]
+  next_cursor: Optional[str] = None
@@ -56,8 +56,9 @@ class GroupInDB(GroupInDBBase):
 
 
 class ResponseGroup(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[GroupWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
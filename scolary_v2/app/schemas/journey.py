@@ -47,8 +47,9 @@ class JourneyInDB(JourneyInDBBase):
 
 
 class ResponseJourney(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[JourneyWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -42,8 +42,9 @@ class JourneySemesterInDB(JourneySemesterInDBBase):
 
 
 class ResponseJourneySemester(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[JourneySemesterWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -49,8 +49,9 @@ class MentionInDB(MentionInDBBase):
 
 
 class ResponseMention(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[MentionWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -53,8 +53,9 @@ class ModelHasPermissionInDB(ModelHasPermissionInDBBase):
 
 
 class ResponseModelHasPermission(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ModelHasPermissionWithRelation]]
+    next_cursor: Optional[str] = None
 
 # begin #
 # ---write your code here--- #
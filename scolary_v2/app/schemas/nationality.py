@@ -39,8 +39,9 @@ class NationalityInDB(NationalityInDBBase):
 
 
 class ResponseNationality(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[NationalityWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
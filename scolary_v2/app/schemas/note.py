@@ -30,6 +30,27 @@ class NoteUpdate(NoteBase):
     pass
 
 
+class NoteBulkItem(BaseModel):
+    id_register_semester: int
+    id_constituent_element_offering: int
+    session: SessionTypeEnum
+    note: Optional[float] = None
+    comment: Optional[str] = None
+
+
+class NoteBulkCreate(BaseModel):
+    notes: List[NoteBulkItem]
+
+
+class NoteBulkResult(BaseModel):
+    index: int
+    id_register_semester: int
+    id_constituent_element_offering: int
+    session: SessionTypeEnum
+    status: str
+    detail: Optional[str] = None
+
+
 class NoteInDBBase(NoteBase):
     id: Optional[int]
     id_register_semester: Optional[int]
@@ -54,8 +75,17 @@ class NoteInDB(NoteInDBBase):
 
 
 class ResponseNote(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[NoteWithRelation]]
+    next_cursor: Optional[str] = None
+
+
+class ResponseNoteBulk(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
+    errors: int
+    data: List[NoteBulkResult]
 
 
 # begin #
@@ -59,8 +59,9 @@ class PaymentInDB(PaymentInDBBase):
 
 
 class ResponsePayment(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[PaymentWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
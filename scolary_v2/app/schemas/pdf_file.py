@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
 from pydantic import BaseModel
 
 
@@ -5,3 +8,14 @@ class PdfFileResponse(BaseModel):
     path: str
     filename: str
     url: str
+
+
+class PdfJob(BaseModel):
+    id: str
+    kind: str
+    status: str
+    id_user: Optional[int] = None
+    result: Optional[List[PdfFileResponse]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
@@ -42,8 +42,9 @@ class PermissionInDB(PermissionInDBBase):
 
 
 class ResponsePermission(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[PermissionWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -36,8 +36,9 @@ class PluggedInDB(PluggedInDBBase):
 
 
 class ResponsePlugged(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[PluggedWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
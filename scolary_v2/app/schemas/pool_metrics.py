@@ -0,0 +1,24 @@
+from typing import List, Optional, Union
+
+from pydantic import BaseModel
+
+
+class PoolWaitBucket(BaseModel):
+    le: Union[float, str]
+    count: int
+
+
+class PoolMetrics(BaseModel):
+    name: str
+    size: int
+    in_use: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    peak_in_use: int
+    checkouts: int
+    timeouts: int
+    wait_ms_sum: float
+    wait_ms_max: float
+    wait_ms_histogram: List[PoolWaitBucket]
+    suggested_pool_size: Optional[int] = None
@@ -52,8 +52,9 @@ class RegisterSemesterInDB(RegisterSemesterInDBBase):
 
 
 class ResponseRegisterSemester(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[RegisterSemesterWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
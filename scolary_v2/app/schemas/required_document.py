@@ -38,8 +38,9 @@ class RequiredDocumentInDB(RequiredDocumentInDBBase):
 
 
 class ResponseRequiredDocument(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[RequiredDocumentWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
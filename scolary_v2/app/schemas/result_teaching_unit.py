@@ -7,11 +7,14 @@ from typing import Any
 from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, field_validator
 from pydantic import field_validator
+from app.enum.session_type import SessionTypeEnum
 from .register_semester import RegisterSemester
 
 
 class ResultTeachingUnitBase(BaseModel):
     id_register_semester: Optional[int] = None
+    id_teaching_unit_offering: Optional[int] = None
+    session: Optional[SessionTypeEnum] = None
     note: Optional[float] = None
     is_valid: Optional[bool] = None
     date_validation: Optional[datetime] = None
@@ -60,8 +63,32 @@ class ResultTeachingUnitInDB(ResultTeachingUnitInDBBase):
 
 
 class ResponseResultTeachingUnit(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[ResultTeachingUnitWithRelation]]
+    next_cursor: Optional[str] = None
+
+
+class DeliberationCreate(BaseModel):
+    id_journey: int
+    semester: str
+    id_academic_year: int
+    session: SessionTypeEnum = SessionTypeEnum.SN
+
+
+class DeliberationStudent(BaseModel):
+    id_register_semester: int
+    mean: float
+    credit: int
+    total_credit: int
+
+
+class ResponseDeliberation(BaseModel):
+    students: int
+    teaching_units: int
+    results: int
+    validated: int
+    elapsed_ms: float
+    data: List[DeliberationStudent]
 
 
 # begin #
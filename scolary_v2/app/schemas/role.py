@@ -43,8 +43,9 @@ class RoleInDB(RoleInDBBase):
 
 
 class ResponseRole(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[RoleWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -45,8 +45,9 @@ class RolePermissionInDB(RolePermissionInDBBase):
 
 
 class ResponseRolePermission(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[RolePermissionWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -131,8 +131,9 @@ class StudentInDB(StudentInDBBase):
 
 
 class ResponseStudent(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[StudentWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -45,8 +45,9 @@ class StudentSubscriptionInDB(StudentSubscriptionInDBBase):
 
 
 class ResponseStudentSubscription(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[StudentSubscriptionWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -39,8 +39,9 @@ class SubscriptionInDB(SubscriptionInDBBase):
 
 
 class ResponseSubscription(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[SubscriptionWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -45,8 +45,9 @@ class SubscriptionFeatureInDB(SubscriptionFeatureInDBBase):
 
 
 class ResponseSubscriptionFeature(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[SubscriptionFeatureWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -45,8 +45,9 @@ class TeacherInDB(TeacherInDBBase):
 
 
 class ResponseTeacher(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[TeacherWithRelation]]
+    next_cursor: Optional[str] = None
 
 # begin #
 # ---write your code here--- #
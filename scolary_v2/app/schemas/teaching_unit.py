@@ -44,8 +44,9 @@ class TeachingUnitInDB(TeachingUnitInDBBase):
 
 
 class ResponseTeachingUnit(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[TeachingUnitWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -50,8 +50,9 @@ class TeachingUnitOfferingInDB(TeachingUnitOfferingInDBBase):
 
 
 class ResponseTeachingUnitOffering(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[TeachingUnitOfferingWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -44,8 +44,9 @@ class TeachingUnitOptionalGroupInDB(TeachingUnitOptionalGroupInDBBase):
 
 
 class ResponseTeachingUnitOptionalGroup(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[TeachingUnitOptionalGroupWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -68,8 +68,9 @@ class UniversityInDB(UniversityInDBBase):
 
 
 class ResponseUniversity(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[UniversityWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -55,8 +55,9 @@ class UserInDB(UserInDBBase):
 
 
 class ResponseUser(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[UserWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -46,8 +46,9 @@ class UserMentionInDB(UserMentionInDBBase):
 
 
 class ResponseUserMention(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[UserMentionWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
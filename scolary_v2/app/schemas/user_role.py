@@ -46,8 +46,9 @@ class UserRoleInDB(UserRoleInDBBase):
 
 
 class ResponseUserRole(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[UserRoleWithRelation]]
+    next_cursor: Optional[str] = None
 
 
 # begin #
@@ -88,8 +88,9 @@ class WorkingTimeInDB(WorkingTimeInDBBase):
 
 
 class ResponseWorkingTime(BaseModel):
-    count: int
+    count: Optional[int]
     data: Optional[List[WorkingTimeWithRelation]]
+    next_cursor: Optional[str] = None
 
 # begin #
 # ---write your code here--- #
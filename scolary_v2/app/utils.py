@@ -631,50 +631,6 @@ def create_model(interactions: List[Any]):
     return result
 
 
-def calcul_mean_and_credit(optional: List, required: List):
-    summ = 0
-    mean = 0
-    total = (
-        max(optional[0]["value"], optional[1]["value"]) * optional[0]["credit"]
-        if len(optional) > 0
-        else 0
-    )
-    credit = (
-        get_credit(
-            max(optional[0]["value"], optional[1]["value"]), optional[0]["credit"]
-        )
-        if len(optional) > 0
-        else 0
-    )
-    for ue in required:
-        total += ue["value"] * ue["credit"]
-        credit += get_credit(ue["value"], ue["credit"])
-        summ += ue["credit"]
-    if summ > 0:
-        mean = format(total / summ, ".5f")
-    return [float(mean), int(credit), summ]
-
-
-def precompute_ec_optional_status(db: Session, list_ec: List[Dict], id_year: int) -> Dict:
-    """
-    Precompute the optional status for all ECs in the list.
-
-    Args:
-        db (Session): Database session.
-        list_ec (list): List of ECs to check.
-        id_year (int): Academic year ID.
-
-    Returns:
-        dict: A mapping of EC IDs to their optional status.
-    """
-    return {
-        ec["id"]: crud.constituent_element_optional.get_by_id_ec(
-            db=db, id_ec=ec["id"], id_year=id_year
-        )
-        for ec in list_ec
-    }
-
-
 def replace_nan_with_zero(value):
     if type(value) == type(''):
         return value
@@ -683,50 +639,6 @@ def replace_nan_with_zero(value):
     return value
 
 
-def calcul_note_ue(list_ec: List[Dict], note, optional_status_map: Dict) -> float:
-    """
-    Calculate the note for a UE.
-
-    Args:
-        list_ec (list): List of ECs in the UE.
-        note (object): Note object containing student data.
-        optional_status_map (dict): Precomputed optional status for ECs.
-
-    Returns:
-        float: Calculated UE note.
-    """
-    note_ue = 0
-    note_ec_optional = []
-    weight_optional = 0.0
-    new_ec = []
-    note_ue_opt = 0
-
-    for ec in list_ec:
-        is_optional = optional_status_map.get(ec["id"], None)
-        if is_optional:
-            for note_ec in note.ec:
-                if ec["name"] == note_ec.name:
-                    if ec["id"] in {is_optional.optional_id, is_optional.optional_with_id}:
-                        ec_note = convert_to_float(note_ec.note)
-                        value_ec_note = ec_note[0]
-                        note_ec_optional.append(value_ec_note)
-                        weight_optional = ec["weight"]
-        else:
-            new_ec.append(ec)
-
-    if weight_optional > 0:
-        note_ue_opt = float(max(note_ec_optional)) * float(weight_optional)
-
-    for ec in new_ec:
-        for note_ec in note.ec:
-            if ec["only_value"] == note_ec.only_value:
-                ec_note = convert_to_float(replace_nan_with_zero(note_ec.note))
-                value_ec_note = ec_note[0]
-                note_ec.note = ec_note[1]
-                note_ue = note_ue + value_ec_note * float(ec["weight"])
-    return note_ue + note_ue_opt
-
-
 def convert_to_float(value_number: str):
     try:
         value = float(value_number)
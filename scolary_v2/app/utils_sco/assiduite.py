@@ -1,6 +1,6 @@
 from typing import Any
 
-from fpdf import FPDF
+from app.pdf.assets import CachedFPDF as FPDF
 
 from app.utils import convert_date
 
@@ -2,9 +2,8 @@ import os
 import datetime
 from typing import Any
 
-import qrcode
-
 from app.pdf.PDFMark import PDFMark as FPDF
+from app.pdf.qr import qr_image
 from app.utils import clear_name, convert_date, is_begin_with_vowel
 
 
@@ -34,7 +33,7 @@ def create_badge(
         two_user = 2*two_user
     while i < n:
         identification = f"{name_depart[0]}{actual}{two_user[i]['id']}"
-        qr = qrcode.make(f"{identification}")
+        qr = qr_image(identification)
         pdf.set_font("Times", "", 8.0)
 
         if i == 0:
@@ -47,7 +46,7 @@ def create_badge(
             pdf.set_text_color(255, 255, 255)
             pdf.cell(1 * value, 0.25 * value, txt=identification, border=0, fill=True, align="C")
             pdf.rect(pos_init_x, pos_init_y, w=long_init_x, h=long_init_y)
-            pdf.image(qr.get_image(),
+            pdf.image(qr,
                       x=pos_init_x + pdf.w / margin + center_x / 2 - value,
                       y=pos_init_y + long_init_y - 0.95 * value, w=0.9 * value, h=0.9 * value)
 
@@ -65,7 +64,7 @@ def create_badge(
             pdf.set_text_color(255, 255, 255)
             pdf.cell(1 * value, 0.25 * value, txt=identification, border=0, fill=True, align="C")
             pdf.rect(pos_init_x, pos_init_y, w=long_init_x, h=long_init_y)
-            pdf.image(qr.get_image(),
+            pdf.image(qr,
                       x=pos_init_x + pdf.w / margin + center_x / 2 - value,
                       y=pos_init_y + long_init_y - 0.95 * value, w=0.9 * value, h=0.9 * value)
 
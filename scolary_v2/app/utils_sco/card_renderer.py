@@ -0,0 +1,95 @@
+"""
+Rendu des cartes étudiant par lots (shards) dans un pool de processus.
+
+Une promotion est découpée en lots alignés sur les pages (8 cartes par page),
+chaque lot est rendu en PDF par un processus, puis les pages sont fusionnées
+dans l'ordre : le document final est identique au rendu séquentiel.
+
+Les données communes (université, année, mention...) sont transmises une
+seule fois par processus via l'initializer du pool ; seules les listes
+d'étudiants circulent avec chaque lot.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+from pypdf import PdfWriter
+
+CARDS_PER_PAGE = 8
+# En dessous, le coût de démarrage du pool dépasse le gain.
+MIN_SHARD_PAGES = 4
+
+_worker_context: Dict[str, Any] = {}
+
+
+def _build_pdf(side: str, students: list, data: Any, university: Any):
+    from app.utils_sco import heads_card, tails_card
+
+    if side == "heads":
+        return heads_card.build_pdf(students, data, university)
+    return tails_card.build_pdf(students, data)
+
+
+def _init_worker(side: str, data: Any, university: Any) -> None:
+    _worker_context.update(side=side, data=data, university=university)
+
+
+def _render_shard(students: list) -> bytes:
+    context = _worker_context
+    return bytes(_build_pdf(context["side"], students, context["data"], context["university"]).output())
+
+
+def split_shards(students: list, workers: int, min_pages: int = MIN_SHARD_PAGES) -> List[list]:
+    """Découpe en au plus `workers` lots d'un nombre entier de pages."""
+    pages = math.ceil(len(students) / CARDS_PER_PAGE)
+    pages_per_shard = max(min_pages, math.ceil(pages / max(workers, 1)))
+    size = pages_per_shard * CARDS_PER_PAGE
+    return [students[start:start + size] for start in range(0, len(students), size)] or [[]]
+
+
+def merge_pdfs(parts: List[bytes]) -> bytes:
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(BytesIO(part))
+    # Les logos, fonds et polices de chaque lot ne sont gardés qu'une fois.
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def render_cards(
+        side: str,
+        students: list,
+        data: Any,
+        university: Any = None,
+        *,
+        max_workers: Optional[int] = None,
+) -> bytes:
+    """
+    Rend le recto (`heads`) ou le verso (`tails`) des cartes et retourne le PDF.
+    `max_workers=1` force le rendu séquentiel (ex. depuis un job déjà en pool).
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if side == "heads" and students:
+        # Les QR codes absents du cache sont encodés en une passe, avant le rendu.
+        from app.pdf.qr import encode_many
+
+        encode_many(
+            ([student["num_carte"], data["key"]] for student in students), max_workers=workers
+        )
+    shards = split_shards(students, workers)
+    if len(shards) == 1:
+        return bytes(_build_pdf(side, students, data, university).output())
+
+    if university is not None and hasattr(university, "_sa_instance_state"):
+        from app.core.pdf_jobs import snapshot
+
+        university = snapshot(university)
+    with ProcessPoolExecutor(
+            max_workers=len(shards), initializer=_init_worker, initargs=(side, data, university)
+    ) as executor:
+        parts = list(executor.map(_render_shard, shards))
+    return merge_pdfs(parts)
@@ -2,12 +2,11 @@ import os
 import tempfile
 from pathlib import Path
 from typing import Any
-from io import BytesIO
-
-import qrcode
 
 from app.pdf.PDFMark import PDFMark as FPDF
+from app.pdf.qr import qr_image
 from app.utils import clear_name, convert_date, is_begin_with_vowel
+from app.utils_sco.card_renderer import render_cards
 
 
 def create_carte(
@@ -32,29 +31,6 @@ def create_carte(
         candidate = Path("files") / cleaned
         return candidate.as_posix() if candidate.exists() else "images/no_image.png"
 
-    def build_qr_image(num_carte: str, payload: Any) -> BytesIO:
-        """Generate a QR code image in memory and return a BytesIO."""
-        from qrcode.constants import ERROR_CORRECT_M
-
-        payload_str = (
-            "|".join(map(str, payload))
-            if isinstance(payload, (list, tuple, set))
-            else str(payload)
-        )
-        qr = qrcode.QRCode(
-            version=None,
-            error_correction=ERROR_CORRECT_M,
-            box_size=6,
-            border=2
-        )
-        qr.add_data(payload_str)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer
-
     logo_univ = build_asset_path(university.logo_university)
     logo_depart = build_asset_path(university.logo_departement)
     signature = build_asset_path(university.admin_signature)
@@ -108,7 +84,7 @@ def create_carte(
         info_ += f"Mention: {data['mention']}\n"
 
         data_et = [deux_et[i]["num_carte"], data["key"]]
-        qr_buffer = build_qr_image(deux_et[i]["num_carte"], data_et)
+        qr_code = qr_image(data_et)
 
         pdf.set_font("Times", "", 8.0)
 
@@ -193,12 +169,11 @@ def create_carte(
         qr_y = pos_init_y + ordon + 1.82 * value
         pdf.rect(qr_x, qr_y, qr_size, qr_size)
         pdf.image(
-            qr_buffer,
+            qr_code,
             x=qr_x,
             y=qr_y,
             w=qr_size,
             h=qr_size,
-            type="PNG"
         )
 
         pdf.set_font("Times", "BI", 9)
@@ -240,7 +215,7 @@ def boucle_carte(pdf, huit_student: list, data: Any, university):
         n += 1
 
 
-def parcourir_et(student: list, data: Any, university):
+def build_pdf(student: list, data: Any, university):
     pdf = MyPDF("P")
 
     # pdf = MyPDF()
@@ -255,9 +230,15 @@ def parcourir_et(student: list, data: Any, university):
         boucle_carte(pdf, student[l: l + 8], data, university)
         k += 1
         l += 8
+    return pdf
+
 
-    pdf.output(f"files/pdf/carte/card_heads_{data['mention'].replace(' ', '_')}.pdf", "F")
-    return {"path": f"pdf/carte/", "filename": f"card_heads_{data['mention'].replace(' ', '_')}.pdf"}
+def parcourir_et(student: list, data: Any, university, max_workers: int = None):
+    filename = f"card_heads_{data['mention'].replace(' ', '_')}.pdf"
+    content = render_cards("heads", student, data, university, max_workers=max_workers)
+    with open(f"files/pdf/carte/{filename}", "wb") as file:
+        file.write(content)
+    return {"path": f"pdf/carte/", "filename": filename}
 
 
 class MyPDF(FPDF):
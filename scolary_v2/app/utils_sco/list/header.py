@@ -1,62 +1,125 @@
-import os
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
-from app.pdf.PDFMark import PDFMark as FPDF
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.change_tracking import table_version
 from app.db.session import SessionLocal
+from app.pdf.PDFMark import PDFMark as FPDF
 from app import models
 from app.utils import is_begin_with_vowel
 
 
-def header(pdf: FPDF, orientation: str = "P"):
+@dataclass(frozen=True)
+class UniversityContext:
+    """En-tête des documents, résolu une fois : logos et lignes de texte prêts à poser."""
+    logo_univ: str
+    logo_depart: str
+    title: str
+    department: str
+    address: str
+    contact: str
 
-    db = SessionLocal()
-    university = db.query(models.University).first()
-    if not university:
-        db.close()
-        return
 
-    def build_asset_path(raw: str) -> str:
-        if not raw:
-            return "images/no_image.png"
-        cleaned = str(raw).lstrip("/")
-        if cleaned.startswith("../"):
-            cleaned = cleaned.replace("../", "", 1)
-        if cleaned.startswith("files/"):
-            cleaned = cleaned[len("files/"):]
-        candidate = Path("files") / cleaned
-        return candidate.as_posix() if candidate.exists() else "images/no_image.png"
+def build_asset_path(raw: str) -> str:
+    if not raw:
+        return "images/no_image.png"
+    cleaned = str(raw).lstrip("/")
+    if cleaned.startswith("../"):
+        cleaned = cleaned.replace("../", "", 1)
+    if cleaned.startswith("files/"):
+        cleaned = cleaned[len("files/"):]
+    candidate = Path("files") / cleaned
+    return candidate.as_posix() if candidate.exists() else "images/no_image.png"
 
-    logo_univ = build_asset_path(university.logo_university)
-    logo_depart = build_asset_path(university.logo_departement)
 
+def build_university_context(university: models.University) -> UniversityContext:
     apostroth = "'"
-    titre4 = f"Université d{'e ' if not is_begin_with_vowel(str(university.province)) else apostroth}{str(university.province).capitalize()} \n"
-    titre5 = f"{university.department_name.upper()}"
-
-    title6 = f"{university.department_address}"
+    province = str(university.province)
     raw_phone = str(university.phone_number or "").strip()
     phone_parts = [part.strip() for part in raw_phone.replace(",", ";").split(";") if part.strip()]
     phone_display = " ou ".join(phone_parts) if phone_parts else ""
-    title7 = f"email: {university.email}-Téléphone: {phone_display}"
+    return UniversityContext(
+        logo_univ=build_asset_path(university.logo_university),
+        logo_depart=build_asset_path(university.logo_departement),
+        title=f"Université d{'e ' if not is_begin_with_vowel(province) else apostroth}{province.capitalize()} \n".upper(),
+        department=f"{university.department_name.upper()}",
+        address=f"{university.department_address}",
+        contact=f"email: {university.email}-Téléphone: {phone_display}",
+    )
+
+
+# (version de la table university, expiration, contexte)
+_cached: Optional[tuple] = None
+_cache_lock = threading.Lock()
+
+
+def university_context(db: Optional[Session] = None) -> Optional[UniversityContext]:
+    """
+    Contexte de l'université, partagé par tout le processus.
 
+    Rechargé après une écriture sur `university` dans ce processus (PUT
+    /universitys/) et au plus tard après PDF_UNIVERSITY_CACHE_TTL secondes,
+    pour les workers de génération et les autres processus.
+    """
+    global _cached
+    version = table_version("university")
+    now = time.monotonic()
+    cached = _cached
+    if cached is not None and cached[0] == version and cached[1] > now:
+        return cached[2]
+    with _cache_lock:
+        cached = _cached
+        if cached is not None and cached[0] == version and cached[1] > now:
+            return cached[2]
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            university = db.query(models.University).first()
+            context = build_university_context(university) if university else None
+        finally:
+            if own_session:
+                db.close()
+        _cached = (version, now + settings.PDF_UNIVERSITY_CACHE_TTL, context)
+        return context
+
+
+def clear_university_context() -> None:
+    global _cached
+    with _cache_lock:
+        _cached = None
+
+
+def header(pdf: FPDF, orientation: str = "P", context: Optional[UniversityContext] = None):
+    context = context or university_context()
+    if not context:
+        return
+
+    # Police enregistrée une fois par document (appels suivants ignorés).
     pdf.add_font("alger", "", "font/Algerian.ttf", uni=True)
+    # Même en-tête sur chaque page : logos et textes dessinés une seule fois
+    # par document (gabarit), puis tamponnés.
+    pdf.use_template(("university-header", context, pdf.w), lambda page: _draw_header(page, context))
+    # Les pages reprennent la police laissée par l'en-tête.
+    pdf.set_font("arial", "", 8)
+
 
+def _draw_header(pdf: FPDF, context: UniversityContext):
     margin = 15
     pdf.set_xy(0, 9)
     image_width = 30
     image_height = 30
-    if orientation != "P":
-        pdf.image(logo_univ, x=margin, y=6, w=image_width, h=image_height)
-        pdf.image(logo_depart, x=pdf.w - image_width - margin, y=6, w=image_width, h=image_height)
-    else:
-        pdf.image(logo_univ, x=margin, y=6, w=image_width, h=image_height)
-        pdf.image(logo_depart, x=pdf.w - image_width - margin, y=6, w=image_width, h=image_height)
+    pdf.image(context.logo_univ, x=margin, y=6, w=image_width, h=image_height)
+    pdf.image(context.logo_depart, x=pdf.w - image_width - margin, y=6, w=image_width, h=image_height)
 
     pdf.set_font("arial", "", 10)
     pdf.cell(0, 1, txt="", ln=1, align="C")
-    pdf.cell(0, 6, txt=titre4.upper(), ln=1, align="C")
-    pdf.cell(0, 6, txt=titre5, ln=1, align="C")
+    pdf.cell(0, 6, txt=context.title, ln=1, align="C")
+    pdf.cell(0, 6, txt=context.department, ln=1, align="C")
     pdf.set_font("arial", "", 8)
-    pdf.cell(0, 5, txt=title6, ln=1, align="C")
-    pdf.cell(0, 5, txt=title7, ln=1, align="C")
-    db.close()
+    pdf.cell(0, 5, txt=context.address, ln=1, align="C")
+    pdf.cell(0, 5, txt=context.contact, ln=1, align="C")
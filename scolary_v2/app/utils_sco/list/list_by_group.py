@@ -4,6 +4,9 @@ from app.pdf.PDFMark import PDFMark as FPDF
 from .header import header
 from app.utils import clear_name
 
+# À incrémenter quand la mise en page change : invalide les PDF en cache.
+TEMPLATE_VERSION = 1
+
 
 def add_title(pdf: FPDF, data: Any, sems: str, title: str):
     pdf.add_font("alger", "", "font/Algerian.ttf", uni=True)
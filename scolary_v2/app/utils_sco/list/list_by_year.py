@@ -5,6 +5,9 @@ from app.pdf.PDFMark import PDFMark as FPDF
 from .header import header
 from app.utils import clear_name
 
+# À incrémenter quand la mise en page change : invalide les PDF en cache.
+TEMPLATE_VERSION = 1
+
 
 def _sanitize_filename(value: str) -> str:
     safe = re.sub(r"[^a-zA-Z0-9_-]+", "_", value.strip())
@@ -15,6 +18,16 @@ def create_list_registered_by_year(
     year_label: str,
     students: List[Dict[str, Any]]
 ) -> Dict[str, str]:
+    filename = list_registered_by_year_filename(year_label)
+    build_list_registered_by_year(year_label, students).output(f"files/pdf/list/{filename}", "F")
+    return {"path": "pdf/list/", "filename": filename}
+
+
+def list_registered_by_year_filename(year_label: str) -> str:
+    return f"list_register_{_sanitize_filename(year_label)}.pdf"
+
+
+def build_list_registered_by_year(year_label: str, students: List[Dict[str, Any]]) -> FPDF:
     pdf = FPDF("P", "mm", "a4")
     pdf.add_page()
     header(pdf)
@@ -44,7 +57,4 @@ def create_list_registered_by_year(
         pdf.cell(105, 7, txt=full_name, border=1)
         pdf.cell(30, 7, txt=level, border=1, align="C")
 
-    filename_suffix = _sanitize_filename(year_label)
-    filename = f"list_register_{filename_suffix}.pdf"
-    pdf.output(f"files/pdf/list/{filename}", "F")
-    return {"path": "pdf/list/", "filename": filename}
+    return pdf
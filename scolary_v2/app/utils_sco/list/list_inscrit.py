@@ -4,6 +4,9 @@ from app.pdf.PDFMark import PDFMark as FPDF
 from .header import header
 from app.utils import clear_name
 
+# À incrémenter quand la mise en page change : invalide les PDF en cache.
+TEMPLATE_VERSION = 1
+
 
 def add_title(pdf: FPDF, data: Any, sems: str, title: str):
     pdf.add_font("alger", "", "font/Algerian.ttf", uni=True)
@@ -47,14 +50,7 @@ def add_title(pdf: FPDF, data: Any, sems: str, title: str):
     pdf.cell(0, 8, txt=anne_univ, ln=1)
 
 
-def create_list_registered(
-    sems: str,
-    journey: str,
-    data: Any,
-    students: Any,
-    university,
-    start_number: int = 1
-):
+def build_list_registered(sems: str, data: Any, students: Any, university, start_number: int = 1) -> FPDF:
     pdf = FPDF("P", "mm", "a4")
     pdf.watermark(f"{str(university.department_name).capitalize()}", y=175, font_style="BI")
     pdf.add_page()
@@ -87,7 +83,4 @@ def create_list_registered(
         pdf.set_font("arial", "I", 10)
         pdf.cell(138, 5, txt=name, border=1, ln=0, align="L")
         num_ += 1
-    pdf.output(
-        f"files/pdf/list/list_register_{sems}_{journey}.pdf", "F"
-    )
-    return {"path": f"pdf/list/", "filename": f"list_register_{sems}_{journey}.pdf"}
+    return pdf
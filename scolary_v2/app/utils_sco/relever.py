@@ -1,5 +1,7 @@
 from typing import Any, Dict
 
+from fpdf.enums import XPos, YPos
+
 from app.pdf.PDFMark import PDFMark as FPDF
 from app.utils import convert_date, is_begin_with_vowel
 
@@ -19,24 +21,19 @@ def relever_note(num_carte: str, date: str, data: Any, note: Any, university) ->
 
     # set watermark prior to calling add_page()
     pdf.watermark(f"{str(university.department_name).capitalize()}", y=175, font_style="BI")
-    pdf.add_page()
-    pdf.l_margin = 0
-    pdf.rect(3, 3, 204, 291)
-    pdf.rect(2, 2, 206, 293)
-    pdf.l_margin = 8
-    apostroth = "'"
-    titre1 = "REPOBLIKAN'I MADAGASIKARA"
-    titre1_2 = f"Université d{'e ' if not is_begin_with_vowel(str(university.province)) else apostroth}{str(university.province).capitalize()}"
+    draw_relever(pdf, num_carte, date, data, note, university)
 
-    titre2 = "Fitiavana - Tanindrazana - Fandrosoana"
-    titre2_1 = f"{str(university.department_name).capitalize()}"
-    titre3 = "Ministère de l'Enseignement Supérieur"
-    titre3_1 = "Service scolarité"
-    titre4 = "et de la recherche scientifique"
-    titre4_1 = f"Année universitaire {data['year']}"
-    titre5 = "releve de note"
-    titre6 = f"N° ___/{date}/UF/FAC.S/S.SCO"
+    pdf.output(f"files/pdf/relever/{num_carte}_relever.pdf", "F")
 
+    return {"path": f"pdf/relever/", "filename": f"{num_carte}_relever.pdf"}
+
+
+def draw_relever(pdf: FPDF, num_carte: str, date: str, data: Any, note: Any, university) -> None:
+    """Ajoute le relevé d'un étudiant (une ou plusieurs pages) à `pdf`."""
+    pdf.add_page()
+    # Un relevé ajouté à la suite d'un autre repart des marges d'un document neuf.
+    pdf.set_margins(10, 10, 10)
+    pdf.set_xy(10, 10)
     pdf.set_text_color(0, 0, 0)
     nom = "Nom et prénom:"
     nom_etudiant = f"{data['last_name']} {data['first_name'] if data['first_name'] != 'None' else ''} "
@@ -53,11 +50,6 @@ def relever_note(num_carte: str, date: str, data: Any, note: Any, university) ->
     sessionetudiant = f"{data['session'].title()}"
     validation_et = f"{data['validation']}"
 
-    titre_1 = "Les unité d'enseignements"
-    titre_2 = "Notes(/20)"
-    titre_3 = "Coéfficients"
-    titre_4 = "Crédits"
-    titre_5 = "Status de l'UE"
     text_6 = "Décision du jury:"
     text_7 = f"{str(university.province).capitalize()}, le"
     moyenne = "moyenne générale"
@@ -65,210 +57,241 @@ def relever_note(num_carte: str, date: str, data: Any, note: Any, university) ->
     pdf.add_font("alger", "", "font/Algerian.ttf", uni=True)
     pdf.add_font("aparaj", "", "font/aparaj.ttf", uni=True)
 
-    pdf.set_font("arial", "B", 10)
-    pdf.cell(9, 5, txt="", ln=0, align="L")
-    pdf.cell(120, 5, txt=titre1, ln=0, align="L")
-
-    pdf.set_font("arial", "B", 10)
-    pdf.cell(0, 5, txt=titre1_2.upper(), ln=1)
-
-    pdf.set_font("arial", "", 8)
-    pdf.cell(13, 5, txt="", ln=0, align="L")
-    pdf.cell(125, 5, txt=titre2, ln=0, align="L")
-
-    pdf.set_font("arial", "B", 10)
-    pdf.cell(0, 5, txt=titre2_1.upper(), ln=1)
-
-    pdf.set_font("arial", "B", 10)
-    pdf.cell(142, 5, txt=titre3.upper(), ln=0, align="L")
-
-    pdf.set_font("arial", "B", 10)
-    pdf.cell(0, 5, txt=titre3_1.upper(), ln=1)
-
-    pdf.set_font("arial", "B", 10)
-    pdf.cell(6, 5, txt="", ln=0, align="L")
-    pdf.cell(130, 5, txt=titre4.upper(), ln=0, align="L")
-
-    pdf.set_font("arial", "", 10)
-    pdf.cell(0, 5, txt=titre4_1, ln=1)
-
-    pdf.set_font("arial", "B", 10)
-    pdf.ln(1)
-    pdf.cell(193, 5, txt=titre5.upper(), ln=1, align="C")
-    pdf.cell(193, 5, txt=titre6.upper(), ln=1, align="C")
-
-    pdf.l_margin = 0
-    pdf.ln(3)
-    pdf.rect(12, 42, 188, 23)
+    # Cadre, titres et en-tête du tableau : identiques pour toute une promotion,
+    # dessinés une fois par document puis tamponnés (gabarits).
+    head_key = ("relever-head", str(university.province), str(university.department_name), data["year"], date)
+    pdf.use_template(head_key, lambda page: _draw_head(page, university, data["year"], date))
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(32, 5, txt=nom, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(32, 5, text=nom, align="L")
 
     pdf.set_font("aparaj", "", 11)
-    pdf.cell(100, 5, txt=nom_etudiant, ln=1)
+    pdf.cell(100, 5, text=nom_etudiant, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(21, 5, txt=naiss, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(21, 5, text=naiss, align="L")
     pdf.set_font("aparaj", "", 12)
-    pdf.cell(100, 5, txt=naiss_etudiant, ln=0)
+    pdf.cell(100, 5, text=naiss_etudiant)
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(21, 5, txt=numero, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(21, 5, text=numero, align="L")
     pdf.set_font("aparaj", "", 12)
-    pdf.cell(0, 5, txt=num_carte, ln=1)
+    pdf.cell(0, 5, text=num_carte, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(21, 5, txt=journey, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(21, 5, text=journey, align="L")
     pdf.set_font("aparaj", "", 12)
-    pdf.cell(100, 5, txt=journey_etudiant, ln=0)
+    pdf.cell(100, 5, text=journey_etudiant)
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(21, 5, txt=semester, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(21, 5, text=semester, align="L")
     pdf.set_font("aparaj", "", 12)
-    pdf.cell(0, 5, txt=semester_etudiant, ln=1)
+    pdf.cell(0, 5, text=semester_etudiant, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(21, 5, txt=mention, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(21, 5, text=mention, align="L")
     pdf.set_font("aparaj", "", 12)
-    pdf.cell(100, 5, txt=mention_etudiant, ln=0)
+    pdf.cell(100, 5, text=mention_etudiant)
 
     pdf.set_font("arial", "BI", 11)
-    pdf.cell(18, 5, txt="", ln=0, align="L")
-    pdf.cell(21, 5, txt=session, ln=0, align="L")
+    pdf.cell(18, 5, text="", align="L")
+    pdf.cell(21, 5, text=session, align="L")
     pdf.set_font("aparaj", "", 12)
-    pdf.cell(0, 5, txt=sessionetudiant, ln=1)
+    pdf.cell(0, 5, text=sessionetudiant, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     # debut de creation du tableau
-    pdf.cell(30, 2, txt="", ln=1)
-    pdf.set_font("arial", "I", 10)
-    pdf.cell(12, 2, txt="", ln=0)
-
-    pdf.set_fill_color(210, 210, 210)
-    pdf.cell(98, 5, txt=titre_1.upper(), border=1, ln=0, align="C", fill=True)
-
-    pdf.cell(20, 5, txt=titre_2, border=1, ln=0, align="C", fill=True)
-
-    pdf.cell(25, 5, txt=titre_3, border=1, ln=0, align="C", fill=True)
-
-    pdf.cell(15, 5, txt=titre_4, border=1, ln=0, align="C", fill=True)
-
-    pdf.cell(30, 5, txt=titre_5, border=1, ln=1, align="C", fill=True)
+    pdf.use_template(("relever-table-header", round(pdf.y, 2)), _draw_table_header)
 
     for index_ue, value_ue in enumerate(note["ue"]):
         pdf.set_top_margin(20)
-        pdf.cell(30, 1, txt="", ln=1)
-        pdf.cell(12, 2, txt="", ln=0)
+        pdf.cell(30, 1, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(12, 2, text="")
         pdf.set_font("arial", "BI", 9)
         pdf.cell(
             98,
             5,
-            txt=f"U.E-{index_ue + 1}: {value_ue['name']}",
+            text=f"U.E-{index_ue + 1}: {value_ue['name']}",
             border=1,
-            ln=0,
             align="C",
         )
         pdf.set_font("arial", "I", 11)
-        pdf.cell(1, 1, txt="", ln=0)
-        pdf.cell(19, 5, txt="", border=1, ln=0, align="C")
-        pdf.cell(1, 1, txt="", ln=0)
-        pdf.cell(24, 5, txt="", border=1, ln=0, align="C")
-        pdf.cell(1, 1, txt="", ln=0)
-        pdf.cell(14, 5, txt="", border=1, ln=0, align="C")
-        pdf.cell(1, 1, txt="", ln=0)
-        pdf.cell(29, 5, txt="", border=1, ln=1, align="C")
+        pdf.cell(1, 1, text="")
+        pdf.cell(19, 5, text="", border=1, align="C")
+        pdf.cell(1, 1, text="")
+        pdf.cell(24, 5, text="", border=1, align="C")
+        pdf.cell(1, 1, text="")
+        pdf.cell(14, 5, text="", border=1, align="C")
+        pdf.cell(1, 1, text="")
+        pdf.cell(29, 5, text="", border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
         for index, value in enumerate(value_ue["ec"]):
             pdf.set_top_margin(20)
-            pdf.cell(30, 1, txt="", ln=1)
-            pdf.cell(12, 2, txt="", ln=0)
+            pdf.cell(30, 1, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(12, 2, text="")
             pdf.set_font("arial", "I", 9)
             pdf.cell(
                 98,
                 5,
-                txt=f"E.C-{index + 1}: {value['name']}",
+                text=f"E.C-{index + 1}: {value['name']}",
                 border=1,
-                ln=0,
                 align="L",
             )
             pdf.set_font("arial", "I", 11)
-            pdf.cell(1, 1, txt="", ln=0)
-            pdf.cell(19, 5, txt=str(value["note"]) if value["note"] else "Absent", border=1, ln=0, align="C")
-            pdf.cell(1, 1, txt="", ln=0)
-            pdf.cell(24, 5, txt=str(value["weight"]), border=1, ln=0, align="C")
-            pdf.cell(1, 1, txt="", ln=0)
-            pdf.cell(14, 5, txt="", border=1, ln=0, align="C")
-            pdf.cell(1, 1, txt="", ln=0)
-            pdf.cell(29, 5, txt="", border=1, ln=1, align="C")
+            pdf.cell(1, 1, text="")
+            pdf.cell(19, 5, text=str(value["note"]) if value["note"] else "Absent", border=1, align="C")
+            pdf.cell(1, 1, text="")
+            pdf.cell(24, 5, text=str(value["weight"]), border=1, align="C")
+            pdf.cell(1, 1, text="")
+            pdf.cell(14, 5, text="", border=1, align="C")
+            pdf.cell(1, 1, text="")
+            pdf.cell(29, 5, text="", border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
         pdf.set_top_margin(20)
-        pdf.cell(30, 1, txt="", ln=1)
-        pdf.cell(12, 2, txt="", ln=0)
+        pdf.cell(30, 1, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(12, 2, text="")
         pdf.set_font("arial", "BI", 9)
         pdf.cell(
-            98, 5, txt=f"NOTE SOUS TOTAL U.E-{index_ue + 1}", border=1, ln=0, align="C"
+            98, 5, text=f"NOTE SOUS TOTAL U.E-{index_ue + 1}", border=1, align="C"
         )
         pdf.set_font("arial", "I", 9)
-        pdf.cell(1, 1, txt="", ln=0)
+        pdf.cell(1, 1, text="")
         pdf.cell(
-            19, 5, txt=str(format(value_ue["note"], ".2f")), border=1, ln=0, align="C"
+            19, 5, text=str(format(value_ue["note"], ".2f")), border=1, align="C"
         )
-        pdf.cell(1, 1, txt="", ln=0)
-        pdf.cell(24, 5, txt="", border=1, ln=0, align="C")
-        pdf.cell(1, 1, txt="", ln=0)
-        pdf.cell(14, 5, txt=str(value_ue["credit"]), border=1, ln=0, align="C")
-        pdf.cell(1, 1, txt="", ln=0)
+        pdf.cell(1, 1, text="")
+        pdf.cell(24, 5, text="", border=1, align="C")
+        pdf.cell(1, 1, text="")
+        pdf.cell(14, 5, text=str(value_ue["credit"]), border=1, align="C")
+        pdf.cell(1, 1, text="")
         pdf.set_font("alger", "", 9)
         pdf.cell(
             29,
             5,
-            txt=validation(value_ue["note"], data["code"]),
+            text=validation(value_ue["note"], data["code"]),
             border=1,
-            ln=1,
+            new_x=XPos.LMARGIN, new_y=YPos.NEXT,
             align="C",
         )
 
     pdf.set_top_margin(20)
-    pdf.cell(30, 1, txt="", ln=1)
-    pdf.cell(12, 2, txt="", ln=0)
+    pdf.cell(30, 1, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(12, 2, text="")
     pdf.set_font("arial", "BI", 9)
-    pdf.cell(98, 6, txt=moyenne.upper(), border=1, ln=0, align="C")
+    pdf.cell(98, 6, text=moyenne.upper(), border=1, align="C")
     pdf.set_font("arial", "I", 10)
-    pdf.cell(1, 1, txt="", ln=0)
-    pdf.cell(19, 6, txt=str(format(note["mean"], ".2f")), border=1, ln=0, align="C")
-    pdf.cell(1, 1, txt="", ln=0)
-    pdf.cell(24, 5, txt="", ln=0)
-    pdf.cell(1, 1, txt="", ln=0)
-    pdf.cell(14, 5, txt="", ln=0)
-    pdf.cell(1, 1, txt="", ln=0)
-    pdf.cell(29, 5, txt="", ln=1)
+    pdf.cell(1, 1, text="")
+    pdf.cell(19, 6, text=str(format(note["mean"], ".2f")), border=1, align="C")
+    pdf.cell(1, 1, text="")
+    pdf.cell(24, 5, text="")
+    pdf.cell(1, 1, text="")
+    pdf.cell(14, 5, text="")
+    pdf.cell(1, 1, text="")
+    pdf.cell(29, 5, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     pdf.set_font("Times", "Bui", 10)
-    pdf.cell(40, 10, txt="", ln=0)
-    pdf.cell(28, 10, txt=text_6, ln=0)
+    pdf.cell(40, 10, text="")
+    pdf.cell(28, 10, text=text_6)
     pdf.set_font("Times", "i", 10)
-    pdf.cell(0, 10, txt=validation_et, ln=1)
+    pdf.cell(0, 10, text=validation_et, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.set_font("arial", "I", 10)
-    pdf.cell(130, 1, txt="", ln=1)
-    pdf.cell(130, 8, txt="", ln=0)
-    pdf.cell(0, 8, txt=text_7, ln=1)
+    pdf.cell(130, 1, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(130, 8, text="")
+    pdf.cell(0, 8, text=text_7, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
     pdf.l_margin = 8
 
-    pdf.output(f"files/pdf/relever/{num_carte}_relever.pdf", "F")
 
-    return {"path": f"pdf/relever/", "filename": f"{num_carte}_relever.pdf"}
+def _draw_head(pdf: FPDF, university, year: str, date: str) -> None:
+    pdf.l_margin = 0
+    pdf.rect(3, 3, 204, 291)
+    pdf.rect(2, 2, 206, 293)
+    pdf.l_margin = 8
+    apostroth = "'"
+    titre1 = "REPOBLIKAN'I MADAGASIKARA"
+    titre1_2 = f"Université d{'e ' if not is_begin_with_vowel(str(university.province)) else apostroth}{str(university.province).capitalize()}"
+
+    titre2 = "Fitiavana - Tanindrazana - Fandrosoana"
+    titre2_1 = f"{str(university.department_name).capitalize()}"
+    titre3 = "Ministère de l'Enseignement Supérieur"
+    titre3_1 = "Service scolarité"
+    titre4 = "et de la recherche scientifique"
+    titre4_1 = f"Année universitaire {year}"
+    titre5 = "releve de note"
+    titre6 = f"N° ___/{date}/UF/FAC.S/S.SCO"
+
+    pdf.set_font("arial", "B", 10)
+    pdf.cell(9, 5, text="", align="L")
+    pdf.cell(120, 5, text=titre1, align="L")
+
+    pdf.set_font("arial", "B", 10)
+    pdf.cell(0, 5, text=titre1_2.upper(), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.set_font("arial", "", 8)
+    pdf.cell(13, 5, text="", align="L")
+    pdf.cell(125, 5, text=titre2, align="L")
+
+    pdf.set_font("arial", "B", 10)
+    pdf.cell(0, 5, text=titre2_1.upper(), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.set_font("arial", "B", 10)
+    pdf.cell(142, 5, text=titre3.upper(), align="L")
+
+    pdf.set_font("arial", "B", 10)
+    pdf.cell(0, 5, text=titre3_1.upper(), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.set_font("arial", "B", 10)
+    pdf.cell(6, 5, text="", align="L")
+    pdf.cell(130, 5, text=titre4.upper(), align="L")
+
+    pdf.set_font("arial", "", 10)
+    pdf.cell(0, 5, text=titre4_1, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.set_font("arial", "B", 10)
+    pdf.ln(1)
+    pdf.cell(193, 5, text=titre5.upper(), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+    pdf.cell(193, 5, text=titre6.upper(), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+
+    pdf.l_margin = 0
+    pdf.ln(3)
+    pdf.rect(12, 42, 188, 23)
+
+
+def _draw_table_header(pdf: FPDF) -> None:
+    titre_1 = "Les unité d'enseignements"
+    titre_2 = "Notes(/20)"
+    titre_3 = "Coéfficients"
+    titre_4 = "Crédits"
+    titre_5 = "Status de l'UE"
+
+    pdf.cell(30, 2, text="", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("arial", "I", 10)
+    pdf.cell(12, 2, text="")
+
+    pdf.set_fill_color(210, 210, 210)
+    pdf.cell(98, 5, text=titre_1.upper(), border=1, align="C", fill=True)
+
+    pdf.cell(20, 5, text=titre_2, border=1, align="C", fill=True)
+
+    pdf.cell(25, 5, text=titre_3, border=1, align="C", fill=True)
+
+    pdf.cell(15, 5, text=titre_4, border=1, align="C", fill=True)
+
+    pdf.cell(30, 5, text=titre_5, border=1, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C", fill=True)
 
 
 class PDF(FPDF):
     def footer(self) -> None:
+        self.use_template(("relever-footer", self.w, self.h, self.l_margin), PDF._draw_footer)
+
+    def _draw_footer(self) -> None:
         self.set_y(-12)
         self.set_font("arial", "", 9)
         self.cell(
-            1, 4, txt="N.B: Ce relevé de Notes ne doit être en aucun cas remis", ln=1
+            1, 4, text="N.B: Ce relevé de Notes ne doit être en aucun cas remis", new_x=XPos.LMARGIN, new_y=YPos.NEXT
         )
-        self.cell(12, 6, txt="", ln=0)
-        self.cell(1, 6, txt="à l'intéressé sous peine d'annulation.", ln=0)
+        self.cell(12, 6, text="")
+        self.cell(1, 6, text="à l'intéressé sous peine d'annulation.")
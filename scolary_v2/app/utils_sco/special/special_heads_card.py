@@ -2,9 +2,8 @@ import os
 from pathlib import Path
 from typing import Any
 
-import qrcode
-
 from app.pdf.PDFMark import PDFMark as FPDF
+from app.pdf.qr import qr_image
 from app.utils import clear_name, convert_date, is_begin_with_vowel, get_level_and_journey
 
 
@@ -76,11 +75,7 @@ def create_carte(
         info_ += f"Mention: {deux_et[i]['mention']['title']}\n"
 
         data_et = [deux_et[i]["num_carte"], data["key"]]
-        qr_dir = Path("files/qr_codes")
-        qr_dir.mkdir(parents=True, exist_ok=True)
-        qr_path = qr_dir / f"qr_{deux_et[i]['num_carte']}.png"
-        qr = qrcode.make(f"{data_et}")
-        qr.save(qr_path, format="PNG")
+        qr_path = qr_image(f"{data_et}")
 
         pdf.set_font("Times", "", 8.0)
 
@@ -1,6 +1,7 @@
 from typing import Any
 
 from app.pdf.PDFMark import PDFMark as FPDF
+from app.utils_sco.card_renderer import render_cards
 
 def create_carte(
         pdf, pos_init_y: int, long_init_y: int, deux_et: list,
@@ -109,7 +110,7 @@ def boucle_carte(pdf, huit_student: Any):
         n += 1
 
 
-def parcourir_et(student: list, data):
+def build_pdf(student: list, data=None):
     pdf = MyPDF("P")
     if len(student) % 8 == 0:
         nbr = len(student) // 8
@@ -122,9 +123,15 @@ def parcourir_et(student: list, data):
         boucle_carte(pdf, student[l: l + 8])
         k += 1
         l += 8
+    return pdf
 
-    pdf.output(f"files/pdf/carte/card_tails_{data['mention'].replace(' ', '_')}.pdf", "F")
-    return {"path": f"pdf/carte/", "filename": f"card_tails_{data['mention'].replace(' ', '_')}.pdf"}
+
+def parcourir_et(student: list, data, max_workers: int = None):
+    filename = f"card_tails_{data['mention'].replace(' ', '_')}.pdf"
+    content = render_cards("tails", student, data, max_workers=max_workers)
+    with open(f"files/pdf/carte/{filename}", "wb") as file:
+        file.write(content)
+    return {"path": f"pdf/carte/", "filename": filename}
 
 
 class MyPDF(FPDF):
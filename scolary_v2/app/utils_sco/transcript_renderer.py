@@ -0,0 +1,175 @@
+"""
+Relevés de notes d'une cohorte entière (parcours, semestre, session).
+
+Les données viennent de `crud.result_teaching_unit.transcripts` (six requêtes
+pour toute la cohorte). Le rendu est découpé en lots d'étudiants rendus dans
+un pool de processus ; les lots reviennent dans l'ordre de la cohorte :
+
+- `pdf` : un seul document, lots fusionnés. Dans un lot, le cadre, les titres
+  et l'en-tête du tableau sont des gabarits enregistrés une seule fois ;
+- `zip` : un PDF par étudiant (`{num_carte}_relever.pdf`, comme
+  `relever_note`), écrit dans l'archive au fur et à mesure que les lots
+  arrivent, sans garder toute la cohorte en mémoire.
+
+Les données communes (cohorte, date, université) sont transmises une seule
+fois par processus via l'initializer du pool, comme pour les cartes.
+"""
+import math
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from app.pdf.output_store import output_store, spooled_file
+from app.utils_sco.card_renderer import merge_pdfs
+
+# En dessous, le coût de démarrage du pool dépasse le gain.
+MIN_SHARD_STUDENTS = 25
+# Lots plus petits pour l'archive : les premiers fichiers arrivent plus tôt.
+ZIP_SHARD_STUDENTS = 50
+
+_worker_context: Dict[str, Any] = {}
+
+
+def transcript_data(cohort: Dict[str, Any], student: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """`data` et `note` attendus par `relever.draw_relever` pour un étudiant de la cohorte."""
+    from app.utils import validation_semester
+
+    decision = validation_semester(
+        student["mean"] >= 10, student["credit"], student["total_credit"], cohort["year"]
+    )
+    data = {
+        "year": cohort["year"],
+        "last_name": student["last_name"],
+        "first_name": str(student["first_name"]),
+        "date_birth": student["date_birth"],
+        "place_birth": student["place_birth"],
+        "semester": cohort["semester"],
+        "mention": cohort["mention"],
+        "journey": cohort["journey"],
+        "session": cohort["session"],
+        "validation": decision["status"],
+        "code": decision["code"],
+    }
+    return data, {"ue": student["ue"], "mean": student["mean"]}
+
+
+def build_pdf(students: List[Dict[str, Any]], cohort: Dict[str, Any], date: str, university: Any):
+    from app.utils_sco.relever import PDF, draw_relever
+
+    pdf = PDF()
+    pdf.watermark(f"{str(university.department_name).capitalize()}", y=175, font_style="BI")
+    for student in students:
+        data, note = transcript_data(cohort, student)
+        draw_relever(pdf, student["num_carte"], date, data, note, university)
+    return pdf
+
+
+def _init_worker(cohort: Dict[str, Any], date: str, university: Any) -> None:
+    _worker_context.update(cohort=cohort, date=date, university=university)
+
+
+def _render_merged(students: list) -> bytes:
+    context = _worker_context
+    return bytes(build_pdf(students, context["cohort"], context["date"], context["university"]).output())
+
+
+def _render_each(students: list) -> List[Tuple[str, bytes]]:
+    context = _worker_context
+    return [
+        (f"{student['num_carte']}_relever.pdf", bytes(
+            build_pdf([student], context["cohort"], context["date"], context["university"]).output()
+        ))
+        for student in students
+    ]
+
+
+def split_shards(students: list, workers: int, min_size: int = MIN_SHARD_STUDENTS,
+                 max_size: Optional[int] = None) -> List[list]:
+    """Découpe en lots d'au moins `min_size` étudiants, un par processus (ou de `max_size` au plus)."""
+    size = max(min_size, math.ceil(len(students) / max(workers, 1)))
+    if max_size:
+        size = min(size, max_size)
+    return [students[start:start + size] for start in range(0, len(students), size)] or [[]]
+
+
+def _map_shards(function, shards: List[list], cohort, date: str, university, workers: int) -> Iterator[Any]:
+    if university is not None and hasattr(university, "_sa_instance_state"):
+        from app.core.pdf_jobs import snapshot
+
+        university = snapshot(university)
+    if len(shards) == 1 or workers == 1:
+        _init_worker(cohort, date, university)
+        yield from map(function, shards)
+        return
+    with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)), initializer=_init_worker, initargs=(cohort, date, university)
+    ) as executor:
+        yield from executor.map(function, shards)
+
+
+def iter_transcripts(
+        cohort: Dict[str, Any],
+        date: str,
+        university: Any,
+        *,
+        max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, bytes]]:
+    """(nom de fichier, PDF) de chaque étudiant, dans l'ordre de la cohorte, dès que son lot est rendu."""
+    workers = max_workers or os.cpu_count() or 1
+    shards = split_shards(cohort["students"], workers, min_size=1, max_size=ZIP_SHARD_STUDENTS)
+    for files in _map_shards(_render_each, shards, cohort, date, university, workers):
+        yield from files
+
+
+def render_transcripts(
+        cohort: Dict[str, Any],
+        date: str,
+        university: Any,
+        *,
+        max_workers: Optional[int] = None,
+) -> bytes:
+    """Un seul PDF avec les relevés de toute la cohorte."""
+    workers = max_workers or os.cpu_count() or 1
+    shards = split_shards(cohort["students"], workers)
+    parts = list(_map_shards(_render_merged, shards, cohort, date, university, workers))
+    return parts[0] if len(parts) == 1 else merge_pdfs(parts)
+
+
+def transcripts_filename(cohort: Dict[str, Any], output: str = "pdf") -> str:
+    name = f"releves_{cohort['journey']}_{cohort['year']}_{cohort['semester']}_{cohort['session']}"
+    return "".join(char if char.isalnum() or char in "-_" else "_" for char in name) + f".{output}"
+
+
+def write_zip(
+        cohort: Dict[str, Any],
+        date: str,
+        university: Any,
+        file: BinaryIO,
+        *,
+        max_workers: Optional[int] = None,
+) -> None:
+    """Écrit l'archive des relevés individuels dans `file` (fichier, tampon...)."""
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in iter_transcripts(cohort, date, university, max_workers=max_workers):
+            archive.writestr(name, content)
+
+
+def print_transcripts(
+        cohort: Dict[str, Any],
+        date: str,
+        university: Any,
+        output: str = "pdf",
+        *,
+        max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Range les relevés de la cohorte (PDF fusionné ou ZIP) dans `output_store` :
+    un dossier par contenu, deux cohortes ne s'écrasent jamais.
+    """
+    filename = transcripts_filename(cohort, output)
+    if output != "zip":
+        return output_store.put(render_transcripts(cohort, date, university, max_workers=max_workers), filename)
+    with spooled_file() as file:
+        write_zip(cohort, date, university, file, max_workers=max_workers)
+        return output_store.put(file, filename)
@@ -1,11 +1,24 @@
+import asyncio
+import hmac
+
 import uvicorn
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.orm import Session
 from starlette.middleware.cors import CORSMiddleware
 
+from app import crud
+from app.api import deps
+
 from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.notifications import bind_event_loop
+from app.core.pdf_jobs import job_manager
+from app.pdf.output_store import output_store
+from app.db.query_stats import QueryStatsMiddleware
 from backend_pre_start import main
 
 app = FastAPI(
@@ -20,7 +33,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Repeated", "Server-Timing"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 files_dir = Path("files")
 files_dir.mkdir(parents=True, exist_ok=True)
@@ -29,6 +45,34 @@ app.mount("/files", StaticFiles(directory=files_dir), name="files")
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request, db: Session = Depends(deps.get_db)) -> PlainTextResponse:
+    # Internal: the scraper's METRICS_TOKEN or a superuser's access token, denied otherwise.
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if not (settings.METRICS_TOKEN and hmac.compare_digest(token, settings.METRICS_TOKEN)):
+        if not crud.user.is_superuser(deps.get_current_user(db=db, token=token)):
+            raise HTTPException(status_code=403, detail="Forbidden")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.on_event("startup")
+async def bind_notification_loop() -> None:
+    bind_event_loop(asyncio.get_running_loop())
+
+
+@app.on_event("startup")
+def start_pdf_janitor() -> None:
+    output_store.start_janitor(settings.PDF_OUTPUT_JANITOR_INTERVAL)
+
+
+@app.on_event("shutdown")
+def stop_pdf_jobs() -> None:
+    job_manager.shutdown(wait=False)
+    output_store.stop_janitor()
+
+
 if __name__ == "__main__":
     main()
     uvicorn.run("main:app", port=8080, log_level="info", reload=True)
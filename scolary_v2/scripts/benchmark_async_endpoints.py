@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Load benchmark: sync (threadpool + SessionLocal) vs async (AsyncSessionLocal) list paths.
+
+Starts a throw-away uvicorn server exposing the same student/note listing
+twice: once as a `def` handler on the synchronous engine, once as an
+`async def` handler on the async engine (what /students/ and /notes/ use).
+Authentication is left out so only the database path is measured. Each
+path is hit by `--concurrency` clients for `--requests` requests in total;
+requests/sec, p50 and p99 latencies are reported.
+
+Usage: python scripts/benchmark_async_endpoints.py [--requests 2000] [--concurrency 64] [--limit 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.db import base  # noqa: E402,F401
+from app.db.async_session import AsyncSessionLocal  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+
+PORT = 8765
+
+
+def build_app(limit: int) -> FastAPI:
+    app = FastAPI()
+
+    for name, crud_obj in (("students", crud.student), ("notes", crud.note)):
+        def sync_list(crud_obj=crud_obj):
+            db = SessionLocal()
+            try:
+                rows = crud_obj.get_multi_where_array(db=db, limit=limit, where=[])
+                return {"count": crud_obj.get_count_where_array(db=db, where=[]), "data": jsonable_encoder(rows)}
+            finally:
+                db.close()
+
+        async def async_list(crud_obj=crud_obj):
+            async with AsyncSessionLocal() as db:
+                rows = await crud_obj.get_multi_where_array_async(db=db, limit=limit, where=[])
+                count = await crud_obj.get_count_where_array_async(db=db, where=[])
+                return {"count": count, "data": jsonable_encoder(rows)}
+
+        app.add_api_route(f"/sync/{name}", sync_list, methods=["GET"])
+        app.add_api_route(f"/async/{name}", async_list, methods=["GET"])
+    return app
+
+
+async def load(url: str, total: int, concurrency: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    remaining = iter(range(total))
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async list endpoints.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--limit", type=int, default=20)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    server = uvicorn.Server(uvicorn.Config(build_app(args.limit), port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    print(f"{'path':<18} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for name in ("students", "notes"):
+        for mode in ("sync", "async"):
+            url = f"http://127.0.0.1:{PORT}/{mode}/{name}"
+            asyncio.run(load(url, min(50, args.requests), args.concurrency))  # échauffement
+            elapsed, latencies = asyncio.run(load(url, args.requests, args.concurrency))
+            percentiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{mode + '/' + name:<18} {len(latencies) / elapsed:>10.1f} "
+                f"{percentiles[49]:>10.1f} {percentiles[98]:>10.1f}"
+            )
+    server.should_exit = True
+    thread.join()
+
+
+if __name__ == "__main__":
+    main()
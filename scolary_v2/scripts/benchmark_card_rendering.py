@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark: sequential vs sharded rendering of student cards.
+
+Renders the front side (`heads`, QR code + photo + logos for every student)
+of `--students` synthetic cards with each worker count of `--workers` and
+prints the wall time and the speedup over one worker. No database is needed:
+the university is a plain namespace without logos, as for a fresh install.
+
+Usage: python scripts/benchmark_card_rendering.py [--students 2000] [--workers 1 2 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+os.chdir(ROOT)
+
+from app.utils_sco.card_renderer import render_cards  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sharded card rendering.")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    warnings.simplefilter("ignore")
+    university = SimpleNamespace(
+        logo_university=None, logo_departement=None, admin_signature=None,
+        province="Fianarantsoa", department_name="Faculté des Sciences",
+    )
+    data = {"mention": "Benchmark", "year": "2025-2026", "supperadmin": "Admin", "key": "2025",
+            "level": "L1", "img_carte": ""}
+    students = [
+        {"name": "Informatique", "abbreviation": "INF", "num_carte": f"{i:07d}", "last_name": "Rakoto",
+         "first_name": "Jean", "date_birth": "2000-01-01", "place_birth": "Fianarantsoa",
+         "num_cin": None, "date_cin": None, "place_cin": None, "photo": None, "level": "L1"}
+        for i in range(args.students)
+    ]
+
+    print(f"{args.students} cards, {os.cpu_count()} CPU")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    for workers in sorted(set(args.workers)):
+        start = time.perf_counter()
+        render_cards("heads", students, data, university, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
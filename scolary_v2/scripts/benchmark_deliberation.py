@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark: full semester deliberation with crud.result_teaching_unit.deliberate.
+
+Seeds one journey semester with `--students` register semesters, `--units`
+teaching units of `--elements` constituent elements each (the last two of
+every unit form an optional group) and one normal-session note per student
+and element, then times a first deliberation (inserts) and a second one
+(updates). Target: under a second for 500 students.
+
+The database defaults to a throw-away SQLite file; pass the MySQL URL of a
+scratch database with --database-url to measure the real round-trips.
+
+Usage: python scripts/benchmark_deliberation.py [--students 500] [--units 6] [--elements 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, models  # noqa: E402
+from app.db import base  # noqa: E402,F401
+from app.db.base_class import Base  # noqa: E402
+from app.enum.repeat_status import RepeatStatusEnum  # noqa: E402
+from app.enum.session_type import SessionTypeEnum  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark semester deliberation.")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--units", type=int, default=6)
+    parser.add_argument("--elements", type=int, default=4)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def seed(db, students: int, units: int, elements: int):
+    suffix = uuid.uuid4().hex[:8]
+    year = models.AcademicYear(name=f"Y{suffix}", code=f"Y{suffix}")
+    journey = models.Journey(name=f"J{suffix}", abbreviation=f"J{suffix}")
+    db.add_all([year, journey])
+    db.flush()
+
+    ec_ids = []
+    for u in range(units):
+        teaching_unit = models.TeachingUnit(name=f"UE{u}-{suffix}", semester="S1", id_journey=journey.id)
+        db.add(teaching_unit)
+        db.flush()
+        ue = models.TeachingUnitOffering(id_teaching_unit=teaching_unit.id, credit=5, id_academic_year=year.id)
+        db.add(ue)
+        db.flush()
+        group = models.ConstituentElementOptionalGroup(id_teaching_unit_offering=ue.id, name=f"G{u}")
+        db.add(group)
+        db.flush()
+        weight = 1 / (elements - 1)
+        for e in range(elements):
+            ec = models.ConstituentElementOffering(
+                weight=weight, id_academic_year=year.id, id_teching_unit_offering=ue.id,
+                id_constituent_element_optional_group=group.id if e >= elements - 2 else None,
+            )
+            db.add(ec)
+            db.flush()
+            ec_ids.append(ec.id)
+
+    db.execute(insert(models.AnnualRegister), [
+        {"id_academic_year": year.id, "semester_count": 1} for _ in range(students)
+    ])
+    annual_ids = [row.id for row in db.query(models.AnnualRegister.id).filter(
+        models.AnnualRegister.id_academic_year == year.id)]
+    db.execute(insert(models.RegisterSemester), [
+        {"id_annual_register": id_ar, "semester": "S1", "repeat_status": RepeatStatusEnum.PASSING,
+         "id_journey": journey.id}
+        for id_ar in annual_ids
+    ])
+    rs_ids = [row.id for row in db.query(models.RegisterSemester.id).filter(
+        models.RegisterSemester.id_annual_register.in_(annual_ids))]
+    db.execute(insert(models.Note), [
+        {"id_register_semester": id_rs, "id_constituent_element_offering": id_ec,
+         "session": SessionTypeEnum.SN, "note": round(random.uniform(4, 18), 2)}
+        for id_rs in rs_ids for id_ec in ec_ids
+    ])
+    db.commit()
+    return {"id_journey": journey.id, "semester": "S1", "id_academic_year": year.id}
+
+
+def main() -> None:
+    args = parse_args()
+    tmp_path = None
+    url = args.database_url
+    if url is None:
+        fd, tmp_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{tmp_path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        params = seed(db, args.students, args.units, args.elements)
+        notes = args.students * args.units * args.elements
+        print(f"{args.students} students, {args.units} UE, {notes} notes on {engine.dialect.name}")
+        for label in ("insert", "update"):
+            start = time.perf_counter()
+            summary = crud.result_teaching_unit.deliberate(db=db, **params)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<8} {elapsed:>8.3f}s  results={summary['results']} validated={summary['validated']}")
+    finally:
+        db.close()
+        engine.dispose()
+        if tmp_path:
+            os.remove(tmp_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: `ast.literal_eval` vs app.crud.filter_dsl for list parameters.
+
+The raw strings are the JSON documents sent by the React client for
+`where`, `where_relation`, `relation` and `base_column` (students,
+re-registration and notes screens). `literal_eval` cannot read JSON
+`null`/`true`/`false`, so those shapes are benchmarked with the parser only.
+"cold" clears the LRU cache on every iteration (parse + mapper validation),
+"warm" is the steady state of repeated list requests.
+
+Usage: python scripts/benchmark_filter_parsing.py [--iterations 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app import crud  # noqa: E402
+from app.crud import filter_dsl  # noqa: E402
+
+SHAPES = [
+    (crud.student, filter_dsl.parse_where, [
+        {"key": "annual_register.id_academic_year", "operator": "==", "value": 1},
+        {"key": "annual_register.register_semester.id_journey", "operator": "in", "value": [1, 2, 3]},
+        {"key": ["first_name", "last_name", "num_carte", "num_select"],
+         "operator": ["like", "like", "like", "like"], "value": ["rak", "rak", "rak", "rak"]},
+    ]),
+    (crud.student, filter_dsl.parse_where, [
+        [{"key": "num_carte", "operator": "isNull", "value": ""},
+         {"key": "num_select", "operator": "isNotNull", "value": None}],
+        {"key": "mean", "operator": ">=", "value": 10, "match": "and"},
+        {"key": "deleted_at", "operator": "isNull", "value": None},
+    ]),
+    (crud.student, filter_dsl.parse_where_relation, [
+        {"key": "annual_register.id_academic_year", "operator": "==", "value": 1},
+    ]),
+    (crud.student, filter_dsl.parse_relations, [
+        "nationality{id,name}", "annual_register{id,id_academic_year}.register_semester",
+    ]),
+    (crud.student, filter_dsl.parse_base_columns, ["id", "num_carte", "first_name", "last_name"]),
+    (crud.note, filter_dsl.parse_where, [
+        {"key": "register_semester.annual_register.id_academic_year", "operator": "==", "value": 1},
+        {"key": "session", "operator": "==", "value": "normal"},
+    ]),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark filter parameter parsing.")
+    parser.add_argument("--iterations", type=int, default=5000)
+    return parser.parse_args()
+
+
+def timed(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'model':<10} {'param':<22} {'literal_eval us':>16} {'cold us':>10} {'warm us':>10}")
+    for crud_obj, parse, value in SHAPES:
+        raw = json.dumps(value)
+        model = crud_obj.model
+        try:
+            ast.literal_eval(raw)
+            literal = f"{timed(lambda: ast.literal_eval(raw), args.iterations):.1f}"
+        except ValueError:
+            literal = "n/a (JSON)"
+
+        def cold() -> None:
+            filter_dsl._parse.cache_clear()
+            parse(raw, model)
+
+        cold_us = timed(cold, args.iterations)
+        warm_us = timed(lambda: parse(raw, model), args.iterations)
+        print(f"{model.__tablename__:<10} {parse.__name__:<22} {literal:>16} {cold_us:>10.1f} {warm_us:>10.1f}")
+    print(filter_dsl.parse_cache_info())
+
+
+if __name__ == "__main__":
+    main()
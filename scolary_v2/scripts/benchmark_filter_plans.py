@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: cold vs warm compilation of CRUDBase `where` filters.
+
+The filter shapes are the ones exercised by the test suite (default
+`deleted_at` filter of every get_multi_where_array call, the `id ==` lookup
+done by deps.get_current_user and the shapes of tests/test_crud_filter_plan.py).
+No database connection is needed: only the SQLAlchemy expression is built,
+as done by CRUDBase.apply_full_condition on every list/count call.
+
+Usage: python scripts/benchmark_filter_plans.py [--iterations 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app import crud  # noqa: E402
+from app.crud.filter_plan import get_plan_cache  # noqa: E402
+
+FILTER_SHAPES = [
+    (crud.student, []),
+    (crud.user, [{"key": "id", "operator": "==", "value": 1}]),
+    (crud.user, [{"key": "last_name", "operator": "like", "value": "abc"}]),
+    (crud.user, [{"key": "id", "operator": "in", "value": [1, 2, 3]}]),
+    (crud.user, [{"key": "user_role.role.name", "operator": "==", "value": "admin"}]),
+    (crud.user, [{"key": "~user_role.role.name", "operator": "==", "value": "admin"}]),
+    (crud.user, [[{"key": "id", "operator": "==", "value": 1},
+                  {"key": "id", "operator": "==", "value": 2}]]),
+    (crud.user, [{"key": ["email", "email"], "operator": ["==", "=="], "value": ["a", "b"]}]),
+    (crud.note, [{"key": "register_semester.annual_register.id_academic_year", "operator": "==", "value": 1},
+                 {"key": "session", "operator": "==", "value": "normal"}]),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cached filter plans.")
+    parser.add_argument("--iterations", type=int, default=2000)
+    return parser.parse_args()
+
+
+def run(crud_obj, where, iterations: int, cold: bool) -> float:
+    cache = get_plan_cache(crud_obj.model)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+        # compile_full_condition appends the deleted_at filter to the list.
+        crud_obj.compile_full_condition(where=list(where))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{'model':<12} {'shape':<60} {'cold us':>10} {'warm us':>10} {'speedup':>8}")
+    for crud_obj, where in FILTER_SHAPES:
+        run(crud_obj, where, 10, cold=False)
+        cold = run(crud_obj, where, args.iterations, cold=True)
+        warm = run(crud_obj, where, args.iterations, cold=False)
+        label = str([c.get("key") if isinstance(c, dict) else "or" for c in where]) or "[]"
+        print(
+            f"{crud_obj.model.__tablename__:<12} {label[:60]:<60} "
+            f"{cold / args.iterations * 1e6:>10.1f} {warm / args.iterations * 1e6:>10.1f} "
+            f"{cold / warm:>7.1f}x"
+        )
+    for crud_obj in {c for c, _ in FILTER_SHAPES}:
+        print(crud_obj.model.__tablename__, crud_obj.filter_plan_stats())
+
+
+if __name__ == "__main__":
+    main()
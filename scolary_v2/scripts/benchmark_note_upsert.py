@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark: per-row `POST /notes/` path vs bulk `crud.note.upsert_many`.
+
+A grade sheet of `--students` register semesters x `--elements` constituent
+element offerings is written twice with each strategy: a first pass that
+creates every note, then a second pass that changes half of them (the usual
+correction round during exam week). The per-row path mirrors the endpoint:
+one `crud.note.create` / `crud.note.update` (commit + refresh) per note.
+
+The database defaults to a throw-away SQLite file; pass the MySQL URL of a
+scratch database with --database-url to measure the real round-trips.
+
+Usage: python scripts/benchmark_note_upsert.py [--students 300] [--elements 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud, models, schemas  # noqa: E402
+from app.db import base  # noqa: E402,F401
+from app.db.base_class import Base  # noqa: E402
+from app.enum.repeat_status import RepeatStatusEnum  # noqa: E402
+from app.enum.session_type import SessionTypeEnum  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark bulk note upsert.")
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--elements", type=int, default=8)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def seed(db, students: int, elements: int):
+    register_semesters = [
+        models.RegisterSemester(semester="S1", repeat_status=RepeatStatusEnum.PASSING)
+        for _ in range(students)
+    ]
+    offerings = [models.ConstituentElementOffering(weight=1) for _ in range(elements)]
+    db.add_all(register_semesters + offerings)
+    db.commit()
+    return [rs.id for rs in register_semesters], [offering.id for offering in offerings]
+
+
+def sheet(register_semester_ids, offering_ids, round_: int):
+    return [
+        schemas.NoteBulkItem(
+            id_register_semester=rs_id,
+            id_constituent_element_offering=offering_id,
+            session=SessionTypeEnum.SN,
+            note=float((rs_id + offering_id) % 20) + (round_ if i % 2 else 0),
+        )
+        for i, (rs_id, offering_id) in enumerate(
+            (rs_id, offering_id) for rs_id in register_semester_ids for offering_id in offering_ids
+        )
+    ]
+
+
+def per_row(db, items) -> None:
+    for item in items:
+        existing = db.query(models.Note).filter(
+            models.Note.id_register_semester == item.id_register_semester,
+            models.Note.id_constituent_element_offering == item.id_constituent_element_offering,
+            models.Note.session == item.session,
+        ).first()
+        if existing is None:
+            crud.note.create(db=db, obj_in=schemas.NoteCreate(**item.model_dump()))
+        else:
+            crud.note.update(db=db, db_obj=existing, obj_in={"note": item.note})
+
+
+def bulk(db, items) -> None:
+    crud.note.upsert_many(db=db, notes=items)
+
+
+def measure(session_factory, strategy, students: int, elements: int):
+    db = session_factory()
+    try:
+        register_semester_ids, offering_ids = seed(db, students, elements)
+        timings = []
+        for round_ in (0, 1):
+            items = sheet(register_semester_ids, offering_ids, round_)
+            start = time.perf_counter()
+            strategy(db, items)
+            timings.append(time.perf_counter() - start)
+        return timings
+    finally:
+        db.close()
+
+
+def main() -> None:
+    args = parse_args()
+    tmp_path = None
+    url = args.database_url
+    if url is None:
+        fd, tmp_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{tmp_path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    rows = args.students * args.elements
+    print(f"{rows} notes ({args.students} students x {args.elements} elements) on {engine.dialect.name}")
+    print(f"{'strategy':<10} {'insert s':>10} {'update s':>10} {'rows/s':>10}")
+    try:
+        for name, strategy in (("per-row", per_row), ("bulk", bulk)):
+            insert_s, update_s = measure(session_factory, strategy, args.students, args.elements)
+            print(f"{name:<10} {insert_s:>10.3f} {update_s:>10.3f} {2 * rows / (insert_s + update_s):>10.0f}")
+    finally:
+        engine.dispose()
+        if tmp_path:
+            os.remove(tmp_path)
+
+
+if __name__ == "__main__":
+    main()
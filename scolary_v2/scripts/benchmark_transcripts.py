@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark: cohort transcripts as one merged PDF and as a ZIP of per-student PDFs.
+
+Renders `--students` synthetic transcripts (`--units` teaching units of
+`--elements` constituent elements each) with each worker count of `--workers`
+and prints the wall time per output mode, plus the time of the historical
+path (one `relever_note` document per student) for comparison. No database
+is needed: the cohort has the shape returned by
+`crud.result_teaching_unit.transcripts`.
+
+Usage: python scripts/benchmark_transcripts.py [--students 1000] [--workers 1 2 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+os.chdir(ROOT)
+
+from app.utils_sco.transcript_renderer import (  # noqa: E402
+    build_pdf, iter_transcripts, render_transcripts,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark cohort transcript rendering.")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--units", type=int, default=6)
+    parser.add_argument("--elements", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--skip-legacy", action="store_true", help="do not time one document per student")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    warnings.simplefilter("ignore")
+    university = SimpleNamespace(province="Fianarantsoa", department_name="Faculté des Sciences")
+    units = [
+        {"name": f"UE {unit}", "note": 11.5, "credit": 5, "ec": [
+            {"name": f"EC {unit}.{element}", "note": 12.0, "weight": round(1 / args.elements, 2)}
+            for element in range(args.elements)
+        ]}
+        for unit in range(args.units)
+    ]
+    students = [
+        {"num_carte": f"{i:07d}", "last_name": "Rakoto", "first_name": "Jean",
+         "date_birth": datetime.date(2000, 1, 1), "place_birth": "Fianarantsoa", "ue": units,
+         "mean": 11.5, "credit": 5 * args.units, "total_credit": 5 * args.units}
+        for i in range(args.students)
+    ]
+    cohort = {"journey": "Informatique", "mention": "Mathématiques", "year": "2025-2026",
+              "semester": "S1", "session": "Normal", "students": students}
+    # Imports and font parsing are not part of the measure.
+    build_pdf(students[:1], cohort, "2025", university).output()
+
+    print(f"{args.students} transcripts, {os.cpu_count()} CPU")
+    if not args.skip_legacy:
+        start = time.perf_counter()
+        for student in students:
+            build_pdf([student], cohort, "2025", university).output()
+        print(f"one document per student, sequential: {time.perf_counter() - start:.2f}s")
+    print(f"{'workers':>8} {'merged':>9} {'zip':>9}")
+    for workers in sorted(set(args.workers)):
+        start = time.perf_counter()
+        render_transcripts(cohort, "2025", university, max_workers=workers)
+        merged = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in iter_transcripts(cohort, "2025", university, max_workers=workers):
+            pass
+        print(f"{workers:>8} {merged:>8.2f}s {time.perf_counter() - start:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
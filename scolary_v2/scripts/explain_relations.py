@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Show how a `relation=[...]` request is loaded, EXPLAIN-style.
+
+Prints the loading plan (joinedload / selectinload per hop, columns loaded
+at each level) and the SQL statements actually emitted by an equivalent
+get_multi_where_array call.
+
+Usage: python scripts/explain_relations.py student \\
+    'annual_register.register_semester.journey{id,name}' [--limit 20] [--database-url URL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import crud  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Explain relation loading for a CRUD object.")
+    parser.add_argument("crud", help="name of the CRUD object in app.crud (student, note, ...)")
+    parser.add_argument("relations", nargs="+")
+    parser.add_argument("--base-column", action="append", default=None)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.db.session import engine
+
+    crud_obj = getattr(crud, args.crud)
+    with Session(engine) as db:
+        report = crud_obj.explain_relations(
+            db, args.relations, base_columns=args.base_column, limit=args.limit
+        )
+    print("\n".join(report["plan"]))
+    print(f"\n{report['round_trips']} round-trip(s)")
+    for statement in report["statements"]:
+        print(f"\n-- {statement['count']} x\n{statement['statement']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Rebuild the materialized payment/level projection of annual_register.
+
+The projection columns (max_semester_number, level_from_semester,
+total_payment, enrollment_fee_amount, payment_status...) are maintained on
+every ORM write to register_semester, payment and enrollment_fee. Run this
+after imports or manual SQL that bypass the application.
+
+Usage: python scripts/rebuild_annual_register_projection.py [--academic-year ID ...] [--database-url URL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.db import base  # noqa: E402,F401
+from app.models.annual_register import refresh_projection  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the annual_register projection.")
+    parser.add_argument("--academic-year", type=int, nargs="+", default=None,
+                        help="Only rebuild the registrations of these academic years.")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.db.session import engine
+
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        count = refresh_projection(connection, academic_year_ids=args.academic_year)
+    print(f"{count} annual registers refreshed in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
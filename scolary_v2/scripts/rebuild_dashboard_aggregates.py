@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Rebuild the dashboard aggregate store (dashboard_member, dashboard_aggregate).
+
+The store is maintained on every ORM write to student, annual_register and
+register_semester. Run this after imports or manual SQL that bypass the
+application.
+
+Usage: python scripts/rebuild_dashboard_aggregates.py [--database-url URL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.db import base  # noqa: E402,F401
+from app.crud.dashboard_store import rebuild  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the dashboard aggregate store.")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from app.db.session import engine
+
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        count = rebuild(connection)
+    print(f"{count} students aggregated in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,15 @@ from typing import Generator
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 from main import app
 from app.db.base_class import Base
 from app.db.session import SessionLocal
 from app.db import session as db_session
+from app.db import async_session as db_async_session
 from app.db import base
 from app.api import deps
 
@@ -22,8 +25,16 @@ engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Même base pour les endpoints asynchrones (aiosqlite). NullPool : chaque
+# TestClient a sa propre boucle d'événements, les connexions n'y survivent pas.
+async_engine = create_async_engine(db_async_session.to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # 2. Patch global
 db_session.SessionLocal = TestingSessionLocal
+db_async_session.AsyncSessionLocal = TestingAsyncSessionLocal
 
 # Create tables
 Base.metadata.create_all(bind=engine)
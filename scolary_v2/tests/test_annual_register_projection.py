@@ -0,0 +1,123 @@
+import datetime
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.enum.level import LevelEnum
+from app.enum.repeat_status import RepeatStatusEnum
+from app.models.annual_register import refresh_projection
+"""Tests for the materialized payment/level projection of AnnualRegister."""
+
+
+def _seed(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    year = models.AcademicYear(name=f"Y{suffix}", code=f"Y{suffix}")
+    mention = models.Mention(name=f"M{suffix}", slug=f"m-{suffix}", abbreviation="M")
+    db.add_all([year, mention])
+    db.flush()
+    journey = models.Journey(name=f"J{suffix}", abbreviation="J", id_mention=mention.id)
+    annual_register = models.AnnualRegister(id_academic_year=year.id, semester_count=1)
+    db.add_all([journey, annual_register])
+    db.flush()
+    db.add(models.RegisterSemester(
+        id_annual_register=annual_register.id, semester="S3",
+        repeat_status=RepeatStatusEnum.PASSING, id_journey=journey.id,
+    ))
+    db.commit()
+    return year, mention, annual_register
+
+
+def _payment(annual_register, payed):
+    return models.Payment(
+        id_annual_register=annual_register.id, payed=payed,
+        num_receipt=uuid.uuid4().hex, date_receipt=datetime.date.today(),
+    )
+
+
+def test_projection_follows_semesters_fees_and_payments(db: Session):
+    year, mention, annual_register = _seed(db)
+    assert annual_register.max_semester_number == 3
+    assert annual_register.level_from_semester == "L2"
+    assert annual_register.mention_id_from_max_semester == mention.id
+    assert annual_register.total_payment == 0
+    assert annual_register.payment_status == "not_applicable"
+
+    fee = models.EnrollmentFee(level=LevelEnum.L2, price=100, id_mention=mention.id, id_academic_year=year.id)
+    db.add(fee)
+    db.commit()
+    assert annual_register.enrollment_fee_amount == 100
+    assert annual_register.payment_status == "none"
+
+    db.add(_payment(annual_register, 40))
+    db.commit()
+    assert (annual_register.total_payment, annual_register.payment_status) == (40, "partial")
+
+    payment = _payment(annual_register, 60)
+    db.add(payment)
+    db.commit()
+    assert annual_register.payment_status == "complete"
+
+    db.query(models.Payment).filter(models.Payment.id == payment.id).delete(synchronize_session=False)
+    db.commit()
+    assert (annual_register.total_payment, annual_register.payment_status) == (40, "partial")
+
+    fee.price = 40
+    db.commit()
+    assert annual_register.payment_status == "complete"
+
+
+def test_projection_follows_journey_moving_to_another_mention(db: Session):
+    year, mention, annual_register = _seed(db)
+    journey = db.get(models.Journey, annual_register.max_semester_journey_id)
+    other = models.Mention(name=f"Other{uuid.uuid4().hex[:8]}", slug=f"o-{uuid.uuid4().hex[:8]}", abbreviation="O")
+    db.add(other)
+    db.commit()
+
+    journey.id_mention = other.id
+    db.commit()
+    assert annual_register.mention_id_from_max_semester == other.id
+
+    db.query(models.Journey).filter(models.Journey.id == journey.id).update({"id_mention": mention.id})
+    db.commit()
+    db.refresh(annual_register)
+    assert annual_register.mention_id_from_max_semester == mention.id
+
+
+def test_rebuild_restores_stale_rows(db: Session):
+    year, _, annual_register = _seed(db)
+    db.execute(
+        models.AnnualRegister.__table__.update()
+        .where(models.AnnualRegister.__table__.c.id == annual_register.id)
+        .values(max_semester_number=None, payment_status=None)
+    )
+    db.commit()
+
+    assert refresh_projection(db.connection(), academic_year_ids=[year.id]) == 1
+    db.commit()
+    db.refresh(annual_register)
+    assert annual_register.max_semester_number == 3
+    assert annual_register.payment_status == "not_applicable"
+
+
+def test_loading_profiles_defer_projection_columns(db: Session):
+    annual_register_id = _seed(db)[2].id
+    db.expunge_all()
+    where = [{"key": "id", "operator": "==", "value": annual_register_id}]
+
+    minimal = crud.annual_register.get_first_where_array(db=db, where=where, profile="minimal")
+    assert "payment_status" not in minimal.__dict__ and "level_from_semester" not in minimal.__dict__
+    db.expunge_all()
+
+    listed = crud.annual_register.get_multi_where_array(db=db, where=where, profile="list")[0]
+    assert listed.__dict__["level_from_semester"] == "L2"
+    assert "total_payment" not in listed.__dict__
+    db.expunge_all()
+
+    financial = crud.annual_register.get(db=db, id=annual_register_id, profile="financial")
+    assert financial.__dict__["payment_status"] == "not_applicable"
+
+    with pytest.raises(HTTPException):
+        crud.annual_register.get(db=db, id=annual_register_id, profile="full")
@@ -0,0 +1,28 @@
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from app.utils_sco.card_renderer import CARDS_PER_PAGE, render_cards, split_shards
+"""Tests for the sharded student card renderer."""
+
+
+def test_shards_are_page_aligned():
+    students = list(range(2000))
+    shards = split_shards(students, workers=3)
+    assert [len(shard) % CARDS_PER_PAGE for shard in shards[:-1]] == [0] * (len(shards) - 1)
+    assert sum(shards, []) == students
+    assert len(shards) == 3
+
+    assert split_shards(list(range(10)), workers=8) == [list(range(10))]
+    assert split_shards([], workers=4) == [[]]
+
+
+def test_sharded_render_matches_sequential_pages():
+    students = [{"num_carte": str(i)} for i in range(5 * CARDS_PER_PAGE)]
+    data = {"mention": "Test"}
+
+    sequential = PdfReader(BytesIO(render_cards("tails", students, data, max_workers=1)))
+    sharded = PdfReader(BytesIO(render_cards("tails", students, data, max_workers=2)))
+
+    assert len(sharded.pages) == len(sequential.pages) == 5
+    assert sharded.pages[4].extract_text() == sequential.pages[4].extract_text()
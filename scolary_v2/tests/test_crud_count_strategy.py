@@ -0,0 +1,56 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.crud.count_cache import count_cache
+"""Tests for the count strategies of CRUDBase.get_count_where_array."""
+
+
+def _seed(db: Session, count: int = 3) -> str:
+    suffix = uuid.uuid4().hex[:8]
+    for i in range(count):
+        db.add(models.Role(name=f"count-{suffix}-{i}", use_for_card=False))
+    db.commit()
+    return suffix
+
+
+def _where(suffix):
+    return [{"key": "name", "operator": "like", "value": f"count-{suffix}"}]
+
+
+def test_exact_none_and_estimate_strategies(db: Session):
+    suffix = _seed(db)
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix)) == 3
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), strategy="exact") == 3
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), strategy="none") is None
+    # Pas d'EXPLAIN sur SQLite : l'estimation retombe sur un COUNT exact.
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), strategy="estimate") == 3
+
+
+def test_cursor_mode_skips_count_by_default(db: Session):
+    suffix = _seed(db)
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), cursor="abc") is None
+    assert crud.role.get_count_where_array(
+        db=db, where=_where(suffix), cursor="abc", strategy="exact"
+    ) == 3
+
+
+def test_cached_count_is_invalidated_by_writes(db: Session):
+    suffix = _seed(db)
+    count_cache.clear()
+
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), strategy="cached") == 3
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), strategy="cached") == 3
+    assert count_cache.stats()["hits"] == 1
+
+    db.add(models.Role(name=f"count-{suffix}-new", use_for_card=False))
+    db.commit()
+    assert crud.role.get_count_where_array(db=db, where=_where(suffix), strategy="cached") == 4
+
+
+def test_invalid_strategy_is_rejected(db: Session):
+    with pytest.raises(HTTPException):
+        crud.role.get_count_where_array(db=db, strategy="bogus")
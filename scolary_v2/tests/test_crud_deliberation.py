@@ -0,0 +1,103 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.crud.crud_result_teaching_unit import compute_teaching_unit_results
+from app.enum.repeat_status import RepeatStatusEnum
+from app.enum.session_type import SessionTypeEnum
+"""Tests for the set-based deliberation engine (crud.result_teaching_unit.deliberate)."""
+
+
+def test_compute_results_uses_best_optional_note():
+    teaching_units = {10: 4, 20: 2}
+    constituent_elements = [
+        (1, 10, 0.5, None),
+        (2, 10, 0.5, 7),
+        (3, 10, 0.5, 7),
+        (4, 20, 1.0, None),
+        (5, 99, 1.0, None),
+    ]
+    notes = {(100, 1): 12, (100, 2): 6, (100, 3): 14, (100, 4): 8, (101, 1): 10}
+
+    results, students = compute_teaching_unit_results([100, 101], teaching_units, constituent_elements, notes)
+
+    assert [(r["id_register_semester"], r["id_teaching_unit_offering"], r["note"], r["is_valid"])
+            for r in results] == [
+        (100, 10, 13.0, True), (100, 20, 8.0, False),
+        (101, 10, 5.0, False), (101, 20, 0.0, False),
+    ]
+    assert students[0] == {
+        "id_register_semester": 100, "mean": round((13 * 4 + 8 * 2) / 6, 5), "credit": 4, "total_credit": 6,
+    }
+    assert students[1]["credit"] == 0
+
+
+def _seed(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    year = models.AcademicYear(name=f"Y{suffix}", code=f"Y{suffix}")
+    journey = models.Journey(name=f"J{suffix}", abbreviation=f"J{suffix}")
+    db.add_all([year, journey])
+    db.flush()
+    teaching_unit = models.TeachingUnit(name=f"UE{suffix}", semester="S1", id_journey=journey.id)
+    db.add(teaching_unit)
+    db.flush()
+    ue = models.TeachingUnitOffering(id_teaching_unit=teaching_unit.id, credit=5, id_academic_year=year.id)
+    db.add(ue)
+    db.flush()
+    ecs = [
+        models.ConstituentElementOffering(weight=0.5, id_academic_year=year.id, id_teching_unit_offering=ue.id)
+        for _ in range(2)
+    ]
+    register_semesters = []
+    for _ in range(2):
+        annual_register = models.AnnualRegister(id_academic_year=year.id, semester_count=1)
+        db.add(annual_register)
+        db.flush()
+        register_semesters.append(models.RegisterSemester(
+            id_annual_register=annual_register.id, semester="S1",
+            repeat_status=RepeatStatusEnum.PASSING, id_journey=journey.id,
+        ))
+    db.add_all(ecs + register_semesters)
+    db.flush()
+    rs1, rs2 = register_semesters
+    db.add_all([
+        models.Note(id_register_semester=rs1.id, id_constituent_element_offering=ecs[0].id,
+                    session=SessionTypeEnum.SN, note=14),
+        models.Note(id_register_semester=rs1.id, id_constituent_element_offering=ecs[1].id,
+                    session=SessionTypeEnum.SN, note=10),
+        models.Note(id_register_semester=rs2.id, id_constituent_element_offering=ecs[0].id,
+                    session=SessionTypeEnum.SN, note=6),
+        models.Note(id_register_semester=rs2.id, id_constituent_element_offering=ecs[0].id,
+                    session=SessionTypeEnum.SR, note=12),
+        models.Note(id_register_semester=rs2.id, id_constituent_element_offering=ecs[1].id,
+                    session=SessionTypeEnum.SN, note=9),
+    ])
+    db.commit()
+    return year, journey, ue, rs1, rs2
+
+
+def _results(db: Session, ue, session):
+    return {
+        row.id_register_semester: (row.note, row.is_valid)
+        for row in db.query(models.ResultTeachingUnit).filter(
+            models.ResultTeachingUnit.id_teaching_unit_offering == ue.id,
+            models.ResultTeachingUnit.session == session,
+        )
+    }
+
+
+def test_deliberate_writes_results_per_session(db: Session):
+    year, journey, ue, rs1, rs2 = _seed(db)
+    params = dict(id_journey=journey.id, semester="S1", id_academic_year=year.id)
+
+    summary = crud.result_teaching_unit.deliberate(db=db, **params)
+    assert (summary["students"], summary["teaching_units"], summary["results"]) == (2, 1, 2)
+    assert _results(db, ue, SessionTypeEnum.SN) == {rs1.id: (12.0, True), rs2.id: (7.5, False)}
+
+    crud.result_teaching_unit.deliberate(db=db, session=SessionTypeEnum.SR, **params)
+    assert _results(db, ue, SessionTypeEnum.SR) == {rs1.id: (12.0, True), rs2.id: (10.5, True)}
+
+    # Une seconde délibération met à jour les lignes au lieu de les dupliquer.
+    crud.result_teaching_unit.deliberate(db=db, **params)
+    assert len(_results(db, ue, SessionTypeEnum.SN)) == 2
@@ -0,0 +1,125 @@
+import uuid
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.crud.filter_plan import fingerprint, get_plan_cache
+"""Tests for the compiled filter plans used by CRUDBase.get_full_condition."""
+
+
+def _legacy_condition(crud_obj, where):
+    conditions = []
+    for parent_condition in where:
+        if isinstance(parent_condition, list):
+            temp = [crud_obj.get_condition_deep_multiple(condition=c) for c in parent_condition]
+            temp = [c for c in temp if c is not None]
+            if temp:
+                conditions.append(or_(*temp))
+        else:
+            condition = crud_obj.get_condition_deep_multiple(condition=parent_condition)
+            if condition is not None:
+                conditions.append(condition)
+    return and_(*conditions)
+
+
+def _ids(db: Session, model, condition):
+    return sorted(row.id for row in db.query(model.id).filter(condition).all())
+
+
+def _seed_users(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    role = models.Role(name=f"plan-role-{suffix}", use_for_card=False)
+    db.add(role)
+    users = []
+    for i in range(3):
+        user = models.User(
+            email=f"plan{i}-{suffix}@example.com",
+            last_name=f"Plan{i}{suffix}",
+            hashed_password="x",
+            is_active=i != 2,
+        )
+        db.add(user)
+        users.append(user)
+    db.flush()
+    db.add(models.UserRole(id_user=users[0].id, id_role=role.id))
+    db.commit()
+    return suffix, role, users
+
+
+def test_fingerprint_ignores_values():
+    where_a = [{"key": "email", "operator": "==", "value": "a@example.com"}]
+    where_b = [{"key": "email", "operator": "==", "value": "b@example.com"}]
+    shape_a, values_a = fingerprint(where_a)
+    shape_b, values_b = fingerprint(where_b)
+    assert shape_a == shape_b
+    assert values_a == [["a@example.com"]]
+    assert values_b == [["b@example.com"]]
+
+    shape_none, _ = fingerprint([{"key": "email", "operator": "==", "value": None}])
+    assert shape_none != shape_a
+
+
+def test_compiled_plan_matches_legacy_conditions(db: Session):
+    suffix, role, users = _seed_users(db)
+    wheres = [
+        [{"key": "last_name", "operator": "like", "value": suffix}],
+        [{"key": "id", "operator": "in", "value": [users[0].id, users[2].id]}],
+        [{"key": "id", "operator": "notIn", "value": [users[0].id]},
+         {"key": "last_name", "operator": "ilike", "value": suffix}],
+        [{"key": "is_active", "operator": "isTrue"},
+         {"key": "last_name", "operator": "like", "value": suffix}],
+        [{"key": "user_role.role.name", "operator": "==", "value": role.name}],
+        [{"key": "~user_role.role.name", "operator": "==", "value": role.name},
+         {"key": "last_name", "operator": "like", "value": suffix}],
+        [[{"key": "id", "operator": "==", "value": users[1].id},
+          {"key": "id", "operator": "==", "value": users[2].id}]],
+        [{"key": ["email", "email"], "operator": ["==", "=="],
+          "value": [users[0].email, users[1].email]}],
+        [{"key": "last_name", "operator": "like", "value": suffix},
+         {"key": "first_name", "operator": "==", "value": None}],
+        [{"key": "created_at", "operator": "between_date", "value": "2000-01-01,2999-01-01"},
+         {"key": "last_name", "operator": "like", "value": suffix}],
+    ]
+    for where in wheres:
+        legacy = _legacy_condition(crud.user, [dict(c) if isinstance(c, dict) else c for c in where])
+        compiled = crud.user.get_full_condition(where=list(where), include_deleted=True)
+        assert _ids(db, models.User, compiled) == _ids(db, models.User, legacy), where
+
+
+def test_plan_cache_hits_on_repeated_shape(db: Session):
+    suffix, role, users = _seed_users(db)
+    count = crud.user.get_count_where_array(
+        db=db, where=[{"key": "user_role.role.name", "operator": "==", "value": role.name}]
+    )
+    assert count == 1
+
+    cache = get_plan_cache(models.User)
+    cache.clear()
+
+    for user in users:
+        where = [{"key": "email", "operator": "==", "value": user.email}]
+        records = crud.user.get_multi_where_array(db=db, where=where)
+        assert [record.id for record in records] == [user.id]
+
+    stats = crud.user.filter_plan_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == len(users) - 1
+    assert stats["size"] == 1
+
+
+def test_plan_cache_is_bounded():
+    cache = get_plan_cache(models.Role)
+    cache.clear()
+    previous = cache.maxsize
+    cache.maxsize = 2
+    try:
+        for name in ("name", "id", "use_for_card"):
+            crud.role.get_full_condition(
+                where=[{"key": name, "operator": "==", "value": 1}], include_deleted=True
+            )
+        assert cache.stats()["size"] == 2
+        assert cache.stats()["misses"] == 3
+    finally:
+        cache.maxsize = previous
+        cache.clear()
@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, models
+"""Tests for cursor (keyset) pagination in CRUDBase.get_multi_where_array."""
+
+
+def _seed_roles(db: Session, count: int = 7):
+    suffix = uuid.uuid4().hex[:8]
+    roles = []
+    for i in range(count):
+        # Two roles share each use_for_card value to exercise the id tiebreak.
+        role = models.Role(name=f"keyset-{suffix}-{i}", use_for_card=bool(i % 2))
+        db.add(role)
+        roles.append(role)
+    db.commit()
+    return suffix
+
+
+def _walk(db: Session, where, limit: int, **kwargs):
+    seen = []
+    cursor = None
+    # Borne de sécurité : un curseur qui n'avance pas doit faire échouer le test.
+    for _ in range(20):
+        page = crud.role.get_multi_where_array(
+            db=db, where=list(where), limit=limit, cursor=cursor, **kwargs
+        )
+        seen.extend(role.id for role in page)
+        cursor = crud.role.next_cursor(page, limit=limit, **kwargs)
+        if cursor is None:
+            return seen
+    raise AssertionError(f"cursor pagination did not terminate, ids seen: {seen}")
+
+
+# created_at n'est pas testé ici : SQLite stocke func.now() sans microsecondes
+# alors que le type DateTime lie '...:15.000000', ce qui fausse la comparaison
+# textuelle (MySQL compare de vrais DATETIME).
+@pytest.mark.parametrize(
+    "order_by,order",
+    [("id", "DESC"), ("id", "ASC"), ("name", "DESC"), ("name", "ASC"), ("use_for_card", "DESC"),
+     ("use_for_card", "ASC")],
+)
+def test_cursor_pages_match_offset_pages(db: Session, order_by, order):
+    suffix = _seed_roles(db)
+    where = [{"key": "name", "operator": "like", "value": f"keyset-{suffix}"}]
+    expected = [
+        role.id
+        for role in crud.role.get_multi_where_array(
+            db=db, where=list(where), limit=100, order_by=order_by, order=order
+        )
+    ]
+    assert len(expected) == 7
+    assert _walk(db, where, 3, order_by=order_by, order=order) == expected
+
+
+def test_cursor_must_match_order(db: Session):
+    suffix = _seed_roles(db, count=3)
+    where = [{"key": "name", "operator": "like", "value": f"keyset-{suffix}"}]
+    page = crud.role.get_multi_where_array(db=db, where=list(where), limit=2)
+    cursor = crud.role.next_cursor(page, limit=2)
+    assert cursor is not None
+
+    with pytest.raises(HTTPException):
+        crud.role.get_multi_where_array(
+            db=db, where=list(where), limit=2, cursor=cursor, order_by="name"
+        )
+    with pytest.raises(HTTPException):
+        crud.role.get_multi_where_array(db=db, where=list(where), limit=2, cursor="not-a-cursor")
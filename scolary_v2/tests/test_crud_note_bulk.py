@@ -0,0 +1,104 @@
+import datetime
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.core import security
+from app.enum.repeat_status import RepeatStatusEnum
+from app.enum.session_type import SessionTypeEnum
+"""Tests for the bulk grade sheet upsert (crud.note.upsert_many)."""
+
+
+def _seed(db: Session):
+    register_semesters = [
+        models.RegisterSemester(semester="S1", repeat_status=RepeatStatusEnum.PASSING)
+        for _ in range(2)
+    ]
+    offering = models.ConstituentElementOffering(weight=2)
+    db.add_all(register_semesters + [offering])
+    db.commit()
+    return register_semesters, offering
+
+
+def _item(register_semester, offering, note, session=SessionTypeEnum.SN, comment=None):
+    return schemas.NoteBulkItem(
+        id_register_semester=register_semester.id,
+        id_constituent_element_offering=offering.id,
+        session=session,
+        note=note,
+        comment=comment,
+    )
+
+
+def test_upsert_many_reports_per_row_status(db: Session):
+    (rs1, rs2), offering = _seed(db)
+
+    first = crud.note.upsert_many(db=db, notes=[
+        _item(rs1, offering, 12),
+        _item(rs2, offering, 8),
+        _item(rs1, offering, 7, session=SessionTypeEnum.SR),
+    ])
+    assert [row["status"] for row in first] == ["created", "created", "created"]
+
+    second = crud.note.upsert_many(db=db, notes=[
+        _item(rs1, offering, 12),
+        _item(rs2, offering, 10.5),
+        _item(rs1, offering, 9, session=SessionTypeEnum.SR),
+        _item(rs1, offering, 11, session=SessionTypeEnum.SR),
+    ])
+    assert [row["status"] for row in second] == ["unchanged", "updated", "error", "updated"]
+
+    notes = {
+        (note.id_register_semester, note.session): note.note
+        for note in db.query(models.Note).filter(
+            models.Note.id_constituent_element_offering == offering.id
+        )
+    }
+    assert notes == {
+        (rs1.id, SessionTypeEnum.SN): 12,
+        (rs2.id, SessionTypeEnum.SN): 10.5,
+        (rs1.id, SessionTypeEnum.SR): 11,
+    }
+
+
+def test_upsert_many_rejects_unknown_references(db: Session):
+    (rs1, _), offering = _seed(db)
+    missing = models.ConstituentElementOffering(id=offering.id + 10_000, weight=1)
+
+    results = crud.note.upsert_many(db=db, notes=[
+        _item(rs1, missing, 10),
+        _item(rs1, offering, 10),
+    ])
+    assert results[0]["status"] == "error"
+    assert results[0]["detail"] == "Constituent element offering not found"
+    assert results[1]["status"] == "created"
+
+
+def test_single_create_restores_deleted_note_and_rejects_duplicates(client, db: Session):
+    (register_semester, _), offering = _seed(db)
+    admin = crud.user.create(db, obj_in=schemas.UserCreate(
+        email=f"note-admin-{uuid.uuid4().hex[:8]}@scolary.com", last_name="Admin", password="Secret1",
+        is_superuser=True, is_active=True,
+    ))
+    db.commit()
+    token = security.create_access_token(sub={"id": str(admin.id), "email": admin.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = {
+        "id_register_semester": register_semester.id,
+        "id_constituent_element_offering": offering.id,
+        "session": SessionTypeEnum.SN.value,
+        "note": 12,
+    }
+
+    created = client.post("/api/v1/notes/", json=payload, headers=headers)
+    assert created.status_code == 200, created.text
+    assert client.post("/api/v1/notes/", json=payload, headers=headers).status_code == 409
+
+    db.query(models.Note).filter(models.Note.id == created.json()["id"]).update(
+        {"deleted_at": datetime.datetime.now()}
+    )
+    db.commit()
+    restored = client.post("/api/v1/notes/", json={**payload, "note": 15}, headers=headers)
+    assert restored.status_code == 200, restored.text
+    assert restored.json()["id"] == created.json()["id"] and restored.json()["note"] == 15
@@ -0,0 +1,109 @@
+import datetime
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.core import security
+from app.db.base_class import Base
+from app.enum.enrollment_status import EnrollmentStatusEnum
+from app.enum.marital_status import MaritalStatusEnum
+from app.enum.sex import SexEnum
+from app.crud.relation_plan import build_tree, describe
+from app.db.query_stats import count_queries
+"""Tests for the relation loading planner used by CRUDBase.get_joined_load."""
+
+
+def _seed_user_with_role(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    role = models.Role(name=f"relplan-{suffix}", use_for_card=False)
+    user = models.User(email=f"relplan-{suffix}@example.com", last_name=f"Rel{suffix}", hashed_password="x")
+    db.add_all([role, user])
+    db.flush()
+    db.add(models.UserRole(id_user=user.id, id_role=role.id))
+    db.commit()
+    user_id, role_name = user.id, role.name
+    db.expunge_all()
+    return user_id, role_name
+
+
+def test_shared_prefixes_are_merged_and_columns_unioned():
+    tree = build_tree(models.User, ["user_role{id_role}.role{name}", "user_role{id}", "user_role.role"])
+    assert list(tree) == ["user_role"]
+    assert tree["user_role"].strategy == "selectin"
+    assert tree["user_role"].columns == ["id_role", "id"]
+    assert tree["user_role"].children["role"].strategy == "joined"
+
+
+def test_describe_lists_strategies_and_columns():
+    assert describe(models.User, ["user_role{id}.role{name}"], ["email"]) == [
+        "user (email, id)",
+        "  selectin user_role -> user_role (id, id_role)",
+        "    joined role -> role (name)",
+    ]
+
+
+def test_many_to_one_hop_is_joined_into_collection_query(db: Session):
+    user_id, role_name = _seed_user_with_role(db)
+    where = [{"key": "id", "operator": "==", "value": user_id}]
+    with count_queries(max_queries=2):
+        users = crud.user.get_multi_where_array(db, where=where, relations=["user_role{id_role}.role{name}"])
+        assert [user_role.role.name for user_role in users[0].user_role] == [role_name]
+
+
+def test_explain_relations_reports_round_trips(db: Session):
+    user_id, _ = _seed_user_with_role(db)
+    report = crud.user.explain_relations(
+        db, ["user_role.role"], where=[{"key": "id", "operator": "==", "value": user_id}]
+    )
+    assert report["plan"][1:] == ["  selectin user_role -> user_role (id, id_role)", "    joined role -> role (id)"]
+    assert report["round_trips"] == 2
+    assert len(report["statements"]) == 2
+
+
+def test_hops_without_columns_load_only_their_keys():
+    # Tout chemin vers `user` sans liste de colonnes, quel que soit l'endpoint.
+    for mapper in Base.registry.mappers:
+        for prop in mapper.relationships:
+            if prop.mapper.class_ is models.User:
+                assert describe(mapper.class_, [prop.key])[-1].endswith("-> user (id)")
+
+
+def test_nested_user_does_not_expose_password(client: TestClient, db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    user = crud.user.create(db, obj_in=schemas.UserCreate(
+        email=f"relplan-{suffix}@example.com", last_name="Rel", password="Secret1", is_superuser=True, is_active=True,
+    ))
+    student = models.Student(
+        num_carte=f"RP-{suffix}", last_name="Doe", date_of_birth=datetime.date(2001, 5, 4),
+        place_of_birth="City", address="Street", sex=SexEnum.FEMALE, martial_status=MaritalStatusEnum.SINGLE,
+        num_of_baccalaureate=f"BAC-{suffix}", center_of_baccalaureate="Center", job="Job",
+        enrollment_status=EnrollmentStatusEnum.pending,
+    )
+    db.add(student)
+    db.flush()
+    db.add(models.AnnualRegister(num_carte=student.num_carte, semester_count=1, verified_by=user.id))
+    db.commit()
+    token = security.create_access_token(sub={"id": str(user.id), "email": user.email})
+
+    response = client.get(
+        "/api/v1/students/",
+        headers={"Authorization": f"Bearer {token}"},
+        params={
+            "relation": json.dumps(["annual_register.user"]),
+            "where": json.dumps([{"key": "id", "operator": "==", "value": student.id}]),
+        },
+    )
+    assert response.status_code == 200
+    nested = response.json()["data"][0]["annual_register"][0]["user"]
+    assert nested["id"] == user.id and "hashed_password" not in nested
+
+
+def test_unknown_relation_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        crud.user.get_joined_load(["user_role.unknown"])
+    assert exc_info.value.status_code == 400
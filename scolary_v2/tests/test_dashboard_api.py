@@ -84,3 +84,29 @@ def test_dashboard_summary_counts(client, db):
     assert payload['total_mentions'] == _count(models.Mention)
     assert payload['total_journeys'] == _count(models.Journey)
     assert payload['total_users'] == _count(models.User)
+
+
+def test_dashboard_charts_cached_until_write(client, db):
+    """Chart responses are cached per filter and invalidated by writes."""
+    admin = crud.user.create(db, obj_in=schemas.UserCreate(
+        email=f'dashboard_cache_{random.randint(1, 10000)}@example.com',
+        last_name='Admin',
+        password='Secret1',
+        is_superuser=True,
+        is_active=True,
+    ))
+    db.commit()
+    headers = {"Authorization": f"Bearer {security.create_access_token(sub={'id': str(admin.id), 'email': admin.email})}"}
+    url = '/api/v1/dashboard/charts?min_age=18&max_age=19'
+
+    first = client.get(url, headers=headers)
+    assert first.status_code == status.HTTP_200_OK, first.text
+    assert 'age_distribution;dur=' in first.headers['Server-Timing']
+    assert client.get(url, headers=headers).headers['X-Dashboard-Cache'] == 'hit'
+
+    suffix = random.randint(1, 10000)
+    db.add(models.Mention(name=f'Mention {suffix}', slug=f'mention-cache-{suffix}', abbreviation='MENT'))
+    db.commit()
+    refreshed = client.get(url, headers=headers)
+    assert refreshed.headers['X-Dashboard-Cache'] == 'miss'
+    assert len(refreshed.json()['mention_counts']) == len(first.json()['mention_counts']) + 1
@@ -0,0 +1,99 @@
+import datetime
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.crud import dashboard_store
+from app.enum.enrollment_status import EnrollmentStatusEnum
+from app.enum.marital_status import MaritalStatusEnum
+from app.enum.repeat_status import RepeatStatusEnum
+from app.enum.sex import SexEnum
+"""Tests for the incrementally maintained dashboard aggregate store."""
+
+
+def _student(mention, num_carte, sex=SexEnum.FEMALE):
+    suffix = uuid.uuid4().hex[:8]
+    return models.Student(
+        num_carte=num_carte, last_name="Doe", date_of_birth=datetime.date(2001, 5, 4),
+        place_of_birth="City", address="Street", sex=sex, martial_status=MaritalStatusEnum.SINGLE,
+        num_of_baccalaureate=f"BAC-{suffix}", center_of_baccalaureate="Center", job="Job",
+        enrollment_status=EnrollmentStatusEnum.pending, id_mention=mention.id,
+    )
+
+
+def _seed(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    year = models.AcademicYear(name=f"Y{suffix}", code=f"Y{suffix}")
+    mention = models.Mention(name=f"M{suffix}", slug=f"m-{suffix}", abbreviation="M")
+    db.add_all([year, mention])
+    db.flush()
+    journey = models.Journey(name=f"J{suffix}", abbreviation="J", id_mention=mention.id)
+    student = _student(mention, f"NC-{suffix}")
+    db.add_all([journey, student])
+    db.commit()
+    return year, mention, journey, student
+
+
+def _count(db: Session, **filters) -> int:
+    return sum(row.count or 0 for row in dashboard_store.cells(db, [], **filters))
+
+
+def _snapshot(db: Session):
+    table = models.DashboardAggregate.__table__
+    columns = [table.c[name] for name in (*dashboard_store.DIMENSIONS, "count")]
+    return sorted(db.execute(select(*columns)).all())
+
+
+def test_store_follows_student_register_and_semester_writes(db: Session):
+    year, mention, journey, student = _seed(db)
+    unregistered = dict(id_academic_year=dashboard_store.UNREGISTERED, id_mention=mention.id)
+    assert _count(db, **unregistered) == 1
+
+    annual_register = models.AnnualRegister(num_carte=student.num_carte, id_academic_year=year.id, semester_count=1)
+    db.add(annual_register)
+    db.flush()
+    db.add(models.RegisterSemester(
+        id_annual_register=annual_register.id, semester="S1",
+        repeat_status=RepeatStatusEnum.PASSING, id_journey=journey.id,
+    ))
+    db.commit()
+    assert _count(db, **unregistered) == 0
+    assert _count(db, id_academic_year=year.id, id_mention=mention.id) == 1
+    assert _count(db, id_academic_year=year.id, id_journey=journey.id, sex=SexEnum.FEMALE.value) == 1
+
+    student.sex = SexEnum.MALE
+    db.commit()
+    assert _count(db, id_academic_year=year.id, id_journey=journey.id, sex=SexEnum.FEMALE.value) == 0
+    assert _count(db, id_academic_year=year.id, id_journey=journey.id, sex=SexEnum.MALE.value) == 1
+    # La cellule vidée est supprimée, pas laissée à 0.
+    assert not dashboard_store.cells(db, ["sex"], id_academic_year=year.id, id_journey=journey.id,
+                                     sex=SexEnum.FEMALE.value)
+
+    db.query(models.RegisterSemester).filter(
+        models.RegisterSemester.id_annual_register == annual_register.id
+    ).delete(synchronize_session=False)
+    db.commit()
+    assert _count(db, id_academic_year=year.id, id_journey=journey.id) == 0
+    assert _count(db, id_academic_year=year.id, id_mention=mention.id) == 1
+
+    db.delete(annual_register)
+    db.commit()
+    assert _count(db, **unregistered) == 1
+
+    db.delete(student)
+    db.commit()
+    assert _count(db, id_mention=mention.id, id_academic_year=[dashboard_store.ALL, dashboard_store.UNREGISTERED]) == 0
+
+
+def test_rebuild_matches_incremental_state(db: Session):
+    year, mention, journey, student = _seed(db)
+    db.add(models.AnnualRegister(num_carte=student.num_carte, id_academic_year=year.id, semester_count=1))
+    db.add(_student(mention, f"NC-{uuid.uuid4().hex[:8]}", sex=SexEnum.MALE))
+    db.commit()
+    incremental = _snapshot(db)
+
+    assert dashboard_store.rebuild(db.connection()) == db.query(models.Student).count()
+    db.commit()
+    assert _snapshot(db) == incremental
@@ -0,0 +1,97 @@
+import time
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.api import deps
+"""Tests for the route table trie and the versioned permission map cache in deps."""
+
+
+def _seed(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    user = models.User(email=f"perm-{suffix}@example.com", last_name=f"Perm{suffix}",
+                       hashed_password="x", is_active=True)
+    role = models.Role(name=f"perm-role-{suffix}", use_for_card=False)
+    permission = models.Permission(name=f"perm-{suffix}")
+    parent = models.AvailableModel(name=f"Parent{suffix}", route_api=f"p{suffix}", route_ui="/p")
+    child = models.AvailableModel(name=f"Child{suffix}", route_api=f"p{suffix}/child", route_ui="/c")
+    db.add_all([user, role, permission, parent, child])
+    db.flush()
+    db.add_all([
+        models.UserRole(id_user=user.id, id_role=role.id),
+        models.RolePermission(id_role=role.id, id_permission=permission.id),
+        models.ModelHasPermission(
+            id_permission=permission.id, id_available_model=parent.id, method_get=True
+        ),
+    ])
+    db.commit()
+    return suffix, user, permission, child
+
+
+def _count_queries(db: Session, fn):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    return result, len(statements)
+
+
+def test_route_trie_resolves_longest_prefix(db: Session):
+    suffix, _, _, _ = _seed(db)
+    deps.clear_auth_caches()
+    prefix = deps.settings.API_V1_STR
+
+    assert deps._resolve_model_from_path(db, f"{prefix}/p{suffix}/child/12") == f"p{suffix}/child"
+    assert deps._resolve_model_from_path(db, f"{prefix}/p{suffix}/12") == f"p{suffix}"
+    assert deps._resolve_model_from_path(db, f"{prefix}/p{suffix}children") == f"p{suffix}children"
+
+
+def test_permission_map_is_cached_until_permissions_change(db: Session):
+    suffix, user, permission, child = _seed(db)
+    deps.clear_auth_caches()
+
+    first, cold_queries = _count_queries(db, lambda: deps._build_permission_map(db, user.id))
+    assert first[f"p{suffix}"]["get"] is True
+    assert cold_queries > 0
+
+    second, warm_queries = _count_queries(db, lambda: deps._build_permission_map(db, user.id))
+    assert second is first
+    assert warm_queries == 0
+    _, route_queries = _count_queries(
+        db, lambda: deps._resolve_model_from_path(db, f"/p{suffix}/child")
+    )
+    assert route_queries == 0
+
+    db.add(models.ModelHasPermission(
+        id_permission=permission.id, id_available_model=child.id, method_post=True
+    ))
+    db.commit()
+
+    third = deps._build_permission_map(db, user.id)
+    assert third[f"p{suffix}/child"]["post"] is True
+
+
+def test_permission_map_expires_for_changes_made_elsewhere(db: Session, monkeypatch):
+    suffix, user, permission, child = _seed(db)
+    deps.clear_auth_caches()
+    first = deps._build_permission_map(db, user.id)
+
+    # Écriture d'un autre worker : aucune version locale n'est incrémentée.
+    db.execute(models.ModelHasPermission.__table__.insert().values(
+        id_permission=permission.id, id_available_model=child.id, method_post=True
+    ))
+    db.commit()
+    assert deps._build_permission_map(db, user.id) is first
+
+    later = time.monotonic() + deps.settings.PERMISSION_CACHE_TTL + 1
+    monkeypatch.setattr(deps.time, "monotonic", lambda: later)
+    assert deps._build_permission_map(db, user.id)[f"p{suffix}/child"]["post"] is True
@@ -0,0 +1,85 @@
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import crud, models, schemas
+from app.core import security
+from app.crud import filter_dsl
+"""Tests for the JSON filter parser shared by the list endpoints."""
+
+
+def test_empty_values_parse_to_empty_lists():
+    for raw in (None, "", "[]", []):
+        assert filter_dsl.parse_where(raw, models.Student) == []
+        assert filter_dsl.parse_relations(raw, models.Student) == []
+
+
+def test_where_with_relations_or_groups_and_key_lists():
+    where = [
+        {"key": "annual_register.id_academic_year", "operator": "==", "value": 1},
+        {"key": "~annual_register.register_semester.id_journey", "operator": "in", "value": [1, 2]},
+        [{"key": "num_carte", "operator": "isNull", "value": None},
+         {"key": "mean", "operator": ">=", "value": 10}],
+        {"key": ["first_name", "last_name"], "operator": ["like", "like"], "value": ["a", "a"]},
+    ]
+    assert filter_dsl.parse_where(json.dumps(where), models.Student) == where
+
+
+def test_results_are_fresh_copies():
+    raw = json.dumps([{"key": "num_carte", "operator": "==", "value": "x"}])
+    first = filter_dsl.parse_where(raw, models.Student)
+    first.append({"key": "deleted_at", "operator": "isNull"})
+    first[0]["value"] = "changed"
+    assert filter_dsl.parse_where(raw, models.Student) == [{"key": "num_carte", "operator": "==", "value": "x"}]
+
+
+def test_cache_is_keyed_by_model():
+    raw = json.dumps([{"key": "num_carte", "operator": "==", "value": "x"}])
+    filter_dsl.parse_where(raw, models.Student)
+    hits = filter_dsl.parse_cache_info().hits
+    filter_dsl.parse_where(raw, models.Student)
+    assert filter_dsl.parse_cache_info().hits == hits + 1
+    with pytest.raises(HTTPException):
+        filter_dsl.parse_where(raw, models.Mention)
+
+
+def test_relations_and_base_columns_are_validated():
+    assert filter_dsl.parse_relations('["mention{id,name}", "annual_register.register_semester"]', models.Student) == [
+        "mention{id,name}", "annual_register.register_semester",
+    ]
+    assert filter_dsl.parse_base_columns('["id", "num_carte"]', models.Student) == ["id", "num_carte"]
+    with pytest.raises(HTTPException):
+        filter_dsl.parse_relations('["mention{id,unknown}"]', models.Student)
+    with pytest.raises(HTTPException):
+        filter_dsl.parse_base_columns('["mention"]', models.Student)
+
+
+@pytest.mark.parametrize("raw", [
+    "[{'key': 'id', 'operator': '==', 'value': 1}]",
+    '{"key": "id", "operator": "==", "value": 1}',
+    '[{"key": "id", "value": 1}]',
+    '[{"key": "unknown", "operator": "==", "value": 1}]',
+    '[{"key": "nationality.unknown", "operator": "==", "value": 1}]',
+    '[{"key": ["id", "num_carte"], "operator": "==", "value": [1, "x"]}]',
+])
+def test_invalid_where_is_rejected(raw):
+    with pytest.raises(HTTPException) as exc_info:
+        filter_dsl.parse_where(raw, models.Student)
+    assert exc_info.value.status_code == 400
+
+
+def test_list_endpoint_rejects_unknown_key(client: TestClient, db):
+    user = crud.user.create(db, obj_in=schemas.UserCreate(
+        email=f"filter-dsl-{uuid.uuid4().hex[:8]}@example.com", last_name="Filter", password="x", is_superuser=True, is_active=True,
+    ))
+    db.commit()
+    token = security.create_access_token(sub={"id": str(user.id), "email": user.email})
+    response = client.get(
+        "/api/v1/nationalitys/",
+        headers={"Authorization": f"Bearer {token}"},
+        params={"where": json.dumps([{"key": "unknown", "operator": "==", "value": 1}])},
+    )
+    assert response.status_code == 400
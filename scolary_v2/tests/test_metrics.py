@@ -0,0 +1,52 @@
+import uuid
+
+from app import crud, schemas
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import Histogram
+"""Tests for the Prometheus metrics registry and endpoint."""
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("job_seconds", "Job durations.", ("kind",), buckets=(1, 5))
+    for value in (0.5, 2, 7):
+        histogram.observe(value, "cards")
+
+    lines = histogram.render()
+    assert 'job_seconds_bucket{kind="cards",le="1"} 1' in lines
+    assert 'job_seconds_bucket{kind="cards",le="5"} 2' in lines
+    assert 'job_seconds_bucket{kind="cards",le="+Inf"} 3' in lines
+    assert 'job_seconds_count{kind="cards"} 3' in lines
+    assert 'job_seconds_sum{kind="cards"} 9.5' in lines
+
+
+def _token(db, is_superuser):
+    user = crud.user.create(db, obj_in=schemas.UserCreate(
+        email=f"metrics-{uuid.uuid4().hex[:8]}@scolary.com", last_name="Metrics", password="Secret1",
+        is_superuser=is_superuser, is_active=True,
+    ))
+    db.commit()
+    return security.create_access_token(sub={'id': str(user.id), 'email': user.email})
+
+
+def test_metrics_endpoint_is_denied_by_default(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer '}).status_code == 403
+    headers = {'Authorization': f'Bearer {_token(db, False)}'}
+    assert client.get('/metrics', headers=headers).status_code == 403
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+
+def test_metrics_endpoint_reports_routes(client, db):
+    headers = {'Authorization': f'Bearer {_token(db, True)}'}
+    client.get('/metrics', headers=headers)
+    resp = client.get('/metrics', headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers['content-type'].startswith('text/plain')
+    assert 'http_requests_total{method="GET",route="/metrics",status="200"}' in resp.text
+    assert 'http_requests_in_flight 1' in resp.text
+    assert 'websocket_connections 0' in resp.text
@@ -0,0 +1,56 @@
+import os
+import warnings
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from app.pdf.assets import AssetCache, CachedFPDF, asset_cache
+"""Tests for the process-wide PDF font/image cache."""
+
+
+def _render(text: str) -> bytes:
+    pdf = CachedFPDF("P", "mm", "a4")
+    pdf.add_page()
+    pdf.add_font("algerian", "", "font/Algerian.ttf")
+    pdf.add_font("algerian", "", "font/Algerian.ttf")
+    pdf.set_font("algerian", "", 12)
+    pdf.cell(0, 10, text)
+    pdf.image("images/profil.png", x=10, y=20, w=20)
+    pdf.image("images/profil.png", x=40, y=20, w=20)
+    return bytes(pdf.output())
+
+
+def test_documents_share_parsed_assets():
+    asset_cache.clear()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        first = _render("Premier")
+    second = _render("Second document")
+
+    stats = asset_cache.stats()
+    assert stats["fonts"] == 1 and stats["images"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 2
+    for content, text in ((first, "Premier"), (second, "Second document")):
+        page = PdfReader(BytesIO(content)).pages[0]
+        assert text in page.extract_text()
+        assert len(page.images) == 1
+
+
+def test_modified_file_is_reloaded(tmp_path):
+    cache = AssetCache()
+    path = tmp_path / "logo.png"
+    path.write_bytes(open("images/profil.png", "rb").read())
+    first = cache.image_info(str(path))
+    assert cache.image_info(str(path)) is first
+
+    os.utime(path, ns=(0, 0))
+    assert cache.image_info(str(path)) is not first
+    assert cache.image_info(str(tmp_path / "missing.png")) is None
+
+
+def test_images_are_evicted_beyond_budget(tmp_path):
+    cache = AssetCache(max_bytes=1)
+    for name in ("a.png", "b.png"):
+        (tmp_path / name).write_bytes(open("images/profil.png", "rb").read())
+        cache.image_info(str(tmp_path / name))
+    assert cache.stats()["images"] == 1
@@ -0,0 +1,91 @@
+import os
+import shutil
+import time
+
+from app.pdf.generation_cache import GenerationCache
+from app.utils_sco.list.header import UniversityContext
+"""Tests for the cache of generated documents keyed by their inputs."""
+
+STUDENTS = [{"num_carte": "001", "last_name": "Rabe", "first_name": "Aina"}]
+
+
+def _renderer(calls, content=b"%PDF list"):
+    def render():
+        calls.append(content)
+        return content
+    return render
+
+
+def test_same_inputs_are_rendered_once(tmp_path):
+    cache = GenerationCache(tmp_path, max_bytes=1024)
+    calls = []
+
+    first = cache.render("list_registered", 1, ["S1", STUDENTS], "list.pdf", _renderer(calls))
+    again = cache.render("list_registered", 1, ["S1", [dict(row) for row in STUDENTS]], "list.pdf", _renderer(calls))
+
+    assert first == again and first.read_bytes() == b"%PDF list"
+    assert len(calls) == 1
+    assert cache.stats() == {"entries": 1, "bytes": 9, "max_bytes": 1024, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_changed_rows_or_template_version_render_again(tmp_path):
+    cache = GenerationCache(tmp_path, max_bytes=1024)
+    calls = []
+    university = UniversityContext("a.png", "b.png", "UNIVERSITÉ", "SCIENCES", "Rue", "email")
+    renamed = [{**STUDENTS[0], "last_name": "Rakoto"}]
+
+    paths = {
+        cache.render("list_registered", 1, ["S1", STUDENTS, university], "list.pdf", _renderer(calls)),
+        cache.render("list_registered", 1, ["S1", renamed, university], "list.pdf", _renderer(calls)),
+        cache.render("list_registered", 2, ["S1", STUDENTS, university], "list.pdf", _renderer(calls)),
+        cache.render("students_list", 1, ["S1", STUDENTS, university], "list.pdf", _renderer(calls)),
+    }
+    assert len(paths) == 4 and len(calls) == 4
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = GenerationCache(tmp_path, max_bytes=25)
+    calls = []
+    first = cache.render("list", 1, ["a"], "a.pdf", _renderer(calls, b"a" * 10))
+    second = cache.render("list", 1, ["b"], "b.pdf", _renderer(calls, b"b" * 10))
+    cache.render("list", 1, ["a"], "a.pdf", _renderer(calls))
+    third = cache.render("list", 1, ["c"], "c.pdf", _renderer(calls, b"c" * 10))
+
+    assert first.exists() and third.exists() and not second.parent.exists()
+    assert cache.stats()["bytes"] == 20 and cache.stats()["evictions"] == 1
+
+    # Un nouveau processus retrouve les entrées sur disque, dans l'ordre de dernière utilisation.
+    past = time.time() - 60
+    os.utime(third.parent, (past, past))
+    reloaded = GenerationCache(tmp_path, max_bytes=25)
+    assert reloaded.stats()["entries"] == 2
+    reloaded.render("list", 1, ["d"], "d.pdf", _renderer(calls, b"d" * 10))
+    assert first.exists() and not third.parent.exists()
+
+
+def test_entries_written_by_another_worker_are_indexed_on_hit(tmp_path):
+    cache = GenerationCache(tmp_path, max_bytes=1024)
+    other_worker = GenerationCache(tmp_path, max_bytes=1024)
+    calls = []
+    assert cache.stats()["entries"] == 0
+
+    path = other_worker.render("list", 1, ["a"], "a.pdf", _renderer(calls))
+    assert cache.render("list", 1, ["a"], "a.pdf", _renderer(calls)) == path
+    assert len(calls) == 1
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 9
+
+
+def test_open_survives_an_eviction_by_another_worker(tmp_path):
+    cache = GenerationCache(tmp_path, max_bytes=1024)
+    calls = []
+    path = cache.render("list", 1, ["a"], "a.pdf", _renderer(calls))
+
+    # Un autre worker évince l'entrée : elle est rendue à nouveau au lieu d'échouer.
+    shutil.rmtree(path.parent)
+    with cache.open("list", 1, ["a"], "a.pdf", _renderer(calls)) as file:
+        assert file.read() == b"%PDF list"
+    assert len(calls) == 2 and cache.stats()["entries"] == 1
+
+    with cache.open("list", 1, ["a"], "a.pdf", _renderer(calls)) as file:
+        shutil.rmtree(path.parent)
+        assert file.read() == b"%PDF list"
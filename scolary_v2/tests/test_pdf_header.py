@@ -0,0 +1,31 @@
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db.query_stats import count_queries
+from app.utils_sco.list.header import clear_university_context, university_context
+"""Tests for the process-wide university context used by the PDF headers."""
+
+
+def test_context_is_loaded_once_and_reloaded_after_update(db: Session):
+    db.query(models.University).delete()
+    university = models.University(
+        province="antsiranana", department_name="Sciences", department_address="BP 0",
+        email=f"header-{uuid.uuid4().hex[:8]}@example.com", phone_number="032 00; 034 00",
+    )
+    db.add(university)
+    db.commit()
+    clear_university_context()
+
+    with count_queries(max_queries=1):
+        first = university_context(db)
+        for _ in range(40):
+            assert university_context(db) is first
+    assert first.title == "UNIVERSITÉ D'ANTSIRANANA \n"
+    assert first.contact.endswith("Téléphone: 032 00 ou 034 00")
+
+    university.department_name = "Lettres"
+    db.commit()
+    assert university_context(db).department == "LETTRES"
+    clear_university_context()
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import crud, models, schemas
+from app.core import notifications, pdf_jobs, security
+from app.core.pdf_jobs import PdfJobManager, PdfJobStore
+"""Tests for the background PDF job subsystem (app.core.pdf_jobs)."""
+
+
+def _render_ok(name):
+    return [{"path": "pdf/test/", "filename": f"{name}.pdf"}, f"files/pdf/test/{name}_tails.pdf"]
+
+
+def _render_fail(name):
+    raise RuntimeError(f"cannot render {name}")
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setitem(pdf_jobs.JOB_HANDLERS, "test_ok", _render_ok)
+    monkeypatch.setitem(pdf_jobs.JOB_HANDLERS, "test_fail", _render_fail)
+    notifications = []
+    monkeypatch.setattr(PdfJobManager, "_notify", lambda self, job: notifications.append(job))
+    manager = PdfJobManager(
+        PdfJobStore(str(tmp_path / "jobs.sqlite3")),
+        executor_factory=lambda: ThreadPoolExecutor(max_workers=2),
+    )
+    manager.notifications = notifications
+    yield manager
+    manager.shutdown()
+
+
+def _wait(manager, job_id):
+    manager.executor.shutdown(wait=True)
+    return manager.get(job_id)
+
+
+def test_job_runs_and_notifies(manager):
+    job = manager.submit("test_ok", {"name": "cards"}, id_user=7)
+    assert job["status"] in (pdf_jobs.JOB_QUEUED, pdf_jobs.JOB_RUNNING, pdf_jobs.JOB_DONE)
+
+    done = _wait(manager, job["id"])
+    assert done["status"] == pdf_jobs.JOB_DONE
+    assert done["result"] == [
+        {"path": "pdf/test/", "filename": "cards.pdf", "url": "/files/pdf/test/cards.pdf"},
+        {"path": "pdf/test/", "filename": "cards_tails.pdf", "url": "/files/pdf/test/cards_tails.pdf"},
+    ]
+    assert [n["id"] for n in manager.notifications] == [job["id"]]
+    assert manager.notifications[0]["id_user"] == 7
+
+
+def test_failed_job_reports_error(manager):
+    job = manager.submit("test_fail", {"name": "list"})
+    failed = _wait(manager, job["id"])
+    assert failed["status"] == pdf_jobs.JOB_FAILED
+    assert failed["error"] == "cannot render list"
+
+
+def test_job_stays_queued_until_a_worker_starts_it(manager, monkeypatch):
+    started = threading.Semaphore(0)
+    release = threading.Event()
+    observed = []
+    monkeypatch.setattr(pdf_jobs.pdf_generation_duration, "observe",
+                        lambda value, *labels: observed.append((value, labels)))
+
+    def _render_slow(name):
+        started.release()
+        release.wait(5)
+        return _render_ok(name)
+
+    monkeypatch.setitem(pdf_jobs.JOB_HANDLERS, "test_slow", _render_slow)
+    busy = [manager.submit("test_slow", {"name": f"busy{index}"}) for index in range(2)]
+    waiting = manager.submit("test_ok", {"name": "waiting"})
+    assert started.acquire(timeout=5) and started.acquire(timeout=5)
+    # Les deux workers sont occupés : le troisième job attend sans être "running".
+    assert manager.get(waiting["id"])["status"] == pdf_jobs.JOB_QUEUED
+    assert [manager.get(job["id"])["status"] for job in busy] == [pdf_jobs.JOB_RUNNING] * 2
+
+    time.sleep(0.2)
+    release.set()
+    assert _wait(manager, waiting["id"])["status"] == pdf_jobs.JOB_DONE
+    # La durée du job en attente n'inclut pas son temps passé dans la file.
+    durations = sorted(value for value, _ in observed)
+    assert len(durations) == 3 and durations[0] < 0.2 <= durations[-1]
+
+
+def test_unknown_kind_and_orphan_jobs(manager):
+    with pytest.raises(ValueError):
+        manager.submit("nope", {})
+
+    # Job laissé "running" par un processus disparu.
+    manager.store.insert("orphan", "test_ok", None)
+    manager.store.update("orphan", status=pdf_jobs.JOB_RUNNING, pid=2 ** 22 + os.getpid())
+    assert manager.get("orphan")["status"] == pdf_jobs.JOB_FAILED
+
+
+def test_notification_reaches_only_the_job_owner(tmp_path, monkeypatch):
+    sent = []
+    monkeypatch.setattr(notifications, "schedule_notification", sent.append)
+    manager = PdfJobManager(PdfJobStore(str(tmp_path / "jobs.sqlite3")))
+    manager._notify({"id": "j1", "kind": "cards", "status": pdf_jobs.JOB_DONE,
+                     "result": [{"url": "/files/pdf/secret.pdf"}], "id_user": 7})
+    assert sent[0]["target_users"] == [7] and "result" not in sent[0]
+
+    class Socket:
+        def __init__(self):
+            self.messages = []
+
+        async def accept(self):
+            pass
+
+        async def send_json(self, message):
+            self.messages.append(message)
+
+    owner, other, anonymous = Socket(), Socket(), Socket()
+    hub = notifications.NotificationManager()
+
+    async def deliver():
+        await hub.connect(owner, ["user"], user_id=7)
+        await hub.connect(other, ["admin"], user_id=8)
+        await hub.connect(anonymous, [])
+        await hub.broadcast(sent[0])
+
+    asyncio.run(deliver())
+    assert (len(owner.messages), len(other.messages), len(anonymous.messages)) == (1, 0, 0)
+
+
+def test_job_is_readable_by_its_owner_only(client, db, monkeypatch):
+    def headers(is_superuser):
+        user = crud.user.create(db, obj_in=schemas.UserCreate(
+            email=f"job-{uuid.uuid4().hex[:8]}@scolary.com", last_name="Job", password="Secret1",
+            is_superuser=is_superuser, is_active=True,
+        ))
+        db.commit()
+        token = security.create_access_token(sub={"id": str(user.id), "email": user.email})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    owner, owner_headers = headers(False)
+    other, other_headers = headers(False)
+    # Les deux utilisateurs ont le droit de lire les jobs : seul le propriétaire voit le sien.
+    suffix = uuid.uuid4().hex[:8]
+    role = models.Role(name=f"jobs-{suffix}", use_for_card=False)
+    permission = models.Permission(name=f"jobs-{suffix}")
+    route = db.query(models.AvailableModel).filter(models.AvailableModel.route_api == "pdf_jobs").first() \
+        or models.AvailableModel(name="PdfJob", route_api="pdf_jobs", route_ui="/pdf_jobs")
+    db.add_all([role, permission, route])
+    db.flush()
+    db.add_all([
+        models.UserRole(id_user=owner.id, id_role=role.id),
+        models.UserRole(id_user=other.id, id_role=role.id),
+        models.RolePermission(id_role=role.id, id_permission=permission.id),
+        models.ModelHasPermission(id_permission=permission.id, id_available_model=route.id, method_get=True),
+    ])
+    db.commit()
+    _, admin_headers = headers(True)
+    job = {"id": "job-1", "kind": "cards", "status": pdf_jobs.JOB_DONE, "result": [], "error": None,
+           "id_user": owner.id, "created_at": "2026-01-01T00:00:00"}
+    monkeypatch.setattr(pdf_jobs.job_manager, "get", lambda job_id: dict(job) if job_id == "job-1" else None)
+
+    assert client.get("/api/v1/pdf_jobs/job-1", headers=owner_headers).status_code == 200
+    assert client.get("/api/v1/pdf_jobs/job-1", headers=other_headers).status_code == 404
+    assert client.get("/api/v1/pdf_jobs/job-1", headers=admin_headers).status_code == 200
@@ -0,0 +1,86 @@
+import os
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.pdf.output_store import CHUNK_SIZE, OutputStore, spooled_file, stream_response
+"""Tests for the content-addressed PDF store and streamed responses."""
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = OutputStore(tmp_path / "store", max_age=60)
+
+    first = store.put(b"%PDF-1 a", "list.pdf")
+    again = store.put(b"%PDF-1 a", "list.pdf")
+    other = store.put(b"%PDF-1 b", "list.pdf")
+
+    assert first == again and first["filename"] == "list.pdf"
+    assert other["path"] != first["path"]
+    assert len(list((tmp_path / "store").iterdir())) == 2
+    stored = Path(first["path"]) / "list.pdf"
+    assert stored.read_bytes() == b"%PDF-1 a"
+    assert not list(stored.parent.glob("*.part"))
+
+
+def test_file_objects_are_stored_in_chunks(tmp_path):
+    store = OutputStore(tmp_path / "store", max_age=60)
+    content = b"PK" * 100000
+    file = spooled_file()
+    file.write(content)
+    sizes = []
+    read = file.read
+    file.read = lambda size=-1: sizes.append(size) or read(size)
+
+    stored = store.put(file, "releves.zip")
+    assert stored == store.put(content, "releves.zip")
+    assert (Path(stored["path"]) / "releves.zip").read_bytes() == content
+    # Jamais de lecture entière de l'archive.
+    assert sizes and all(0 < size <= CHUNK_SIZE for size in sizes)
+
+
+def test_sweep_removes_expired_outputs(tmp_path):
+    legacy = tmp_path / "list"
+    legacy.mkdir()
+    store = OutputStore(tmp_path / "store", max_age=60, legacy_dirs=[legacy])
+    old = store.put(b"old", "old.pdf")
+    recent = store.put(b"recent", "recent.pdf")
+    (legacy / "list_register_S1_INF.pdf").write_bytes(b"old")
+    past = time.time() - 3600
+    os.utime(old["path"], (past, past))
+    os.utime(legacy / "list_register_S1_INF.pdf", (past, past))
+
+    assert store.sweep() == 2
+    assert list((tmp_path / "store").iterdir()) == [Path(recent["path"])]
+    assert not list(legacy.iterdir())
+
+    # Réutiliser un document le garde en vie.
+    os.utime(recent["path"], (past, past))
+    store.put(b"recent", "recent.pdf")
+    assert store.sweep() == 0
+
+
+def test_stream_response_sends_bytes_and_files():
+    app = FastAPI()
+
+    @app.get("/bytes")
+    def send_bytes():
+        return stream_response(b"%PDF" * 40000, "liste inscrits é.pdf")
+
+    @app.get("/file")
+    def send_file():
+        file = spooled_file()
+        file.write(b"PK" * 10)
+        return stream_response(file, "releves.zip")
+
+    with TestClient(app) as client:
+        response = client.get("/bytes")
+        assert response.content == b"%PDF" * 40000
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.headers["content-length"] == str(160000)
+        assert "filename*=UTF-8''liste%20inscrits%20%C3%A9.pdf" in response.headers["content-disposition"]
+
+        response = client.get("/file")
+        assert response.content == b"PK" * 10
+        assert response.headers["content-type"] == "application/zip"
@@ -0,0 +1,44 @@
+from PIL import Image
+
+from app.pdf import qr
+from app.pdf.qr import encode_many, qr_image, qr_path
+"""Tests for the on-disk QR code cache."""
+
+
+def test_qr_image_is_cached_as_one_bit_png(tmp_path, monkeypatch):
+    calls = []
+    encode = qr._encode
+    monkeypatch.setattr(qr, "_encode", lambda text, path: calls.append(text) or encode(text, path))
+
+    path = qr_image(["0012345", "2025"], cache_dir=tmp_path)
+    assert qr_image(["0012345", "2025"], cache_dir=tmp_path) == path
+    assert calls == ["0012345|2025"]
+    assert path == qr_path("0012345|2025", tmp_path).as_posix()
+    with Image.open(path) as img:
+        assert img.mode == "1"
+
+
+def test_encode_many_only_encodes_missing_payloads(tmp_path, monkeypatch):
+    payloads = [[f"{i:07d}", "2025"] for i in range(5)]
+    first = encode_many(payloads[:3], cache_dir=tmp_path)
+
+    calls = []
+    monkeypatch.setattr(qr, "_encode", lambda text, path: calls.append(text))
+    paths = encode_many(payloads + payloads, cache_dir=tmp_path, max_workers=1)
+
+    assert sorted(calls) == ["0000003|2025", "0000004|2025"]
+    assert len(paths) == 5
+    assert {k: paths[k] for k in first} == first
+
+
+def test_concurrent_encodes_of_the_same_code_do_not_collide(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = qr_path("0012345|2025", tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: qr._encode("0012345|2025", str(path)), range(32)))
+
+    assert [file.name for file in path.parent.iterdir()] == [path.name]
+    with Image.open(path) as img:
+        img.load()
+        assert img.mode == "1"
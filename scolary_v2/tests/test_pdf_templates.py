@@ -0,0 +1,49 @@
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from app.pdf.PDFMark import PDFMark
+from app.utils_sco.list.header import UniversityContext, header
+"""Tests for the page templates (form XObjects) shared by repeated layouts."""
+
+CONTEXT = UniversityContext(
+    logo_univ="images/profil.png", logo_depart="images/profil.png", title="UNIVERSITÉ DE TEST \n",
+    department="SCIENCES", address="BP 0", contact="email: test@example.com-Téléphone: 032 00",
+)
+
+
+def _render(pages: int) -> bytes:
+    pdf = PDFMark("P", "mm", "a4")
+    pdf.watermark("Sciences", y=175, font_style="BI")
+    for index in range(pages):
+        pdf.add_page()
+        header(pdf, context=CONTEXT)
+        pdf.cell(0, 8, txt=f"Ligne {index}", ln=1)
+    return bytes(pdf.output())
+
+
+def test_layout_is_recorded_once_and_stamped_on_every_page():
+    reader = PdfReader(BytesIO(_render(6)))
+    form_ids = set()
+    for index, page in enumerate(reader.pages):
+        x_objects = page["/Resources"]["/XObject"]
+        form_ids.add(x_objects.raw_get("/TPL1").idnum)
+        assert x_objects["/TPL1"]["/Subtype"] == "/Form"
+        assert page.get_contents().get_data().count(b"Do") == 2
+        text = page.extract_text()
+        assert "SCIENCES" in text and "Sciences" in text and f"Ligne {index}" in text
+    assert len(form_ids) == 1
+    # Both logos are the same image, drawn only inside the template.
+    assert len(reader.pages[0]["/Resources"]["/XObject"]) == 3
+
+
+def test_cursor_and_font_follow_the_header():
+    pdf = PDFMark("P", "mm", "a4")
+    pdf.add_page()
+    header(pdf, context=CONTEXT)
+    first = (pdf.x, pdf.y, pdf.font_family, pdf.font_size_pt)
+    pdf.add_page()
+    header(pdf, context=CONTEXT)
+    assert (pdf.x, pdf.y, pdf.font_family, pdf.font_size_pt) == first
+    assert pdf.y > 30
+    assert len(pdf.page_templates) == 1
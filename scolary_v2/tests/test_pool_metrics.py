@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db import pool_metrics
+from app.db.pool_metrics import InstrumentedQueuePool
+
+
+class _TestPool(InstrumentedQueuePool):
+    metrics_name = "test"
+
+
+def test_checkouts_and_timeouts_are_recorded():
+    engine = create_engine("sqlite:///./test.db", poolclass=_TestPool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    metrics = pool_metrics.get_pool_metrics("test")
+    metrics.reset()
+
+    held = engine.connect()
+    held.execute(text("SELECT 1"))
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    held.close()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["in_use"] == 0
+    assert snapshot["peak_in_use"] == 1
+    assert snapshot["wait_ms_histogram"][-1] == {"le": "+Inf", "count": 2}
+    assert snapshot["suggested_pool_size"] == 2
+    engine.dispose()
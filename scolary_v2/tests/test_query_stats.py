@@ -0,0 +1,43 @@
+import random
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.core import security
+from app.db.query_stats import count_queries, statement_shape
+"""Tests for the per-request query counter and N+1 detection."""
+
+
+def test_statement_shape_folds_in_lists():
+    assert statement_shape("SELECT id FROM t WHERE id IN (?, ?, ?)") == "SELECT id FROM t WHERE id IN (?)"
+    assert statement_shape("SELECT id\n  FROM t WHERE id = %(id_1)s") == "SELECT id FROM t WHERE id = %(id_1)s"
+
+
+def test_count_queries_flags_repeated_statements(db: Session):
+    ids = [user.id for user in db.query(models.User.id).limit(3).all()]
+
+    with count_queries(max_queries=1) as stats:
+        db.query(models.User).filter(models.User.id.in_(ids)).all()
+    assert stats.count == 1
+
+    with pytest.raises(AssertionError, match="repeated more than 1 times"):
+        with count_queries(max_repeats=1):
+            for _ in range(2):
+                db.query(models.User).filter(models.User.id == -1).first()
+
+
+def test_response_reports_query_count(client, db: Session):
+    admin = crud.user.create(db, obj_in=schemas.UserCreate(
+        email=f'query_stats_{random.randint(1, 100000)}@example.com',
+        last_name='Admin',
+        password='Secret1',
+        is_superuser=True,
+        is_active=True,
+    ))
+    db.commit()
+    token = security.create_access_token(sub={'id': str(admin.id), 'email': admin.email})
+
+    resp = client.get('/api/v1/mentions/', headers={"Authorization": f"Bearer {token}"})
+    count, duration = resp.headers['X-DB-Queries'].split(';dur=')
+    assert int(count) > 0 and float(duration) >= 0
@@ -0,0 +1,141 @@
+import datetime
+import types
+import uuid
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+from pypdf import PdfReader
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.db.query_stats import count_queries
+from app.enum.enrollment_status import EnrollmentStatusEnum
+from app.enum.marital_status import MaritalStatusEnum
+from app.enum.repeat_status import RepeatStatusEnum
+from app.enum.session_type import SessionTypeEnum
+from app.enum.sex import SexEnum
+from app.pdf.output_store import output_store
+from app.utils_sco import transcript_renderer
+"""Tests for the cohort transcript pipeline (data loading and batch rendering)."""
+
+UNIVERSITY = types.SimpleNamespace(province="Fianarantsoa", department_name="Sciences")
+
+
+def _seed(db: Session):
+    suffix = uuid.uuid4().hex[:8]
+    year = models.AcademicYear(name=f"Y{suffix}", code=f"Y{suffix}")
+    mention = models.Mention(name=f"M{suffix}", slug=f"m-{suffix}", abbreviation="M")
+    db.add_all([year, mention])
+    db.flush()
+    journey = models.Journey(name=f"J{suffix}", abbreviation="J", id_mention=mention.id)
+    db.add(journey)
+    db.flush()
+    teaching_unit = models.TeachingUnit(name="Analyse", semester="S1", id_journey=journey.id)
+    elements = [
+        models.ConstituentElement(name=f"{name} {suffix}", semester="S1", id_journey=journey.id)
+        for name in ("Suites", "Séries")
+    ]
+    db.add_all([teaching_unit, *elements])
+    db.flush()
+    ue = models.TeachingUnitOffering(id_teaching_unit=teaching_unit.id, credit=5, id_academic_year=year.id)
+    db.add(ue)
+    db.flush()
+    ecs = [
+        models.ConstituentElementOffering(
+            weight=0.5, id_academic_year=year.id, id_teching_unit_offering=ue.id, id_constituent_element=element.id,
+        )
+        for element in elements
+    ]
+    register_semesters = {}
+    for last_name in ("Rabe", "Andry"):
+        num_carte = f"NC-{uuid.uuid4().hex[:8]}"
+        db.add(models.Student(
+            num_carte=num_carte, last_name=last_name, first_name="Aina", date_of_birth=datetime.date(2001, 5, 4),
+            place_of_birth="City", address="Street", sex=SexEnum.FEMALE, martial_status=MaritalStatusEnum.SINGLE,
+            num_of_baccalaureate=f"BAC-{num_carte}", center_of_baccalaureate="Center", job="Job",
+            enrollment_status=EnrollmentStatusEnum.pending, id_mention=mention.id,
+        ))
+        annual_register = models.AnnualRegister(num_carte=num_carte, id_academic_year=year.id, semester_count=1)
+        db.add(annual_register)
+        db.flush()
+        register_semesters[last_name] = models.RegisterSemester(
+            id_annual_register=annual_register.id, semester="S1",
+            repeat_status=RepeatStatusEnum.PASSING, id_journey=journey.id,
+        )
+    db.add_all(ecs + list(register_semesters.values()))
+    db.flush()
+    rabe, andry = register_semesters["Rabe"], register_semesters["Andry"]
+    db.add_all([
+        models.Note(id_register_semester=rabe.id, id_constituent_element_offering=ecs[0].id,
+                    session=SessionTypeEnum.SN, note=14),
+        models.Note(id_register_semester=rabe.id, id_constituent_element_offering=ecs[1].id,
+                    session=SessionTypeEnum.SN, note=10),
+        models.Note(id_register_semester=andry.id, id_constituent_element_offering=ecs[0].id,
+                    session=SessionTypeEnum.SN, note=6),
+    ])
+    db.commit()
+    return dict(id_journey=journey.id, semester="S1", id_academic_year=year.id), ue.id, andry.id
+
+
+def test_cohort_is_loaded_in_a_fixed_number_of_queries(db: Session):
+    params, id_ue, id_andry = _seed(db)
+
+    with count_queries(max_queries=6):
+        cohort = crud.result_teaching_unit.transcripts(db=db, **params)
+
+    assert cohort["semester"] == "S1" and cohort["session"] == "Normal"
+    andry, rabe = cohort["students"]
+    assert (andry["last_name"], rabe["last_name"]) == ("Andry", "Rabe")
+    assert [ec["note"] for ec in rabe["ue"][0]["ec"]] == [14.0, 10.0]
+    assert [ec["note"] for ec in andry["ue"][0]["ec"]] == [6.0, None]
+    assert (rabe["ue"][0]["name"], rabe["ue"][0]["note"], rabe["credit"]) == ("Analyse", 12.0, 5)
+    assert (andry["mean"], andry["credit"], andry["total_credit"]) == (3.0, 0, 5)
+
+    # Une note d'UE délibérée puis corrigée l'emporte sur le calcul.
+    crud.result_teaching_unit.deliberate(db=db, **params)
+    db.query(models.ResultTeachingUnit).filter(
+        models.ResultTeachingUnit.id_register_semester == id_andry,
+        models.ResultTeachingUnit.id_teaching_unit_offering == id_ue,
+    ).update({"note": 10.5})
+    db.commit()
+    andry = crud.result_teaching_unit.transcripts(db=db, **params)["students"][0]
+    assert (andry["ue"][0]["note"], andry["mean"], andry["credit"]) == (10.5, 10.5, 5)
+
+
+def test_cohort_renders_as_one_pdf_or_a_zip(db: Session, tmp_path, monkeypatch):
+    params, _, _ = _seed(db)
+    cohort = crud.result_teaching_unit.transcripts(db=db, **params)
+    monkeypatch.setattr(output_store, "root", tmp_path)
+
+    result = transcript_renderer.print_transcripts(cohort, "2024", UNIVERSITY, max_workers=1)
+    assert result["filename"] == f"releves_{cohort['journey']}_{cohort['year']}_S1_Normal.pdf"
+    reader = PdfReader(Path(result["path"]) / result["filename"])
+    assert len(reader.pages) == 2
+    assert "Andry" in reader.pages[0].extract_text() and "Rabe" in reader.pages[1].extract_text()
+    # Le cadre et les titres sont enregistrés une fois et tamponnés sur chaque relevé.
+    assert reader.pages[0]["/Resources"]["/XObject"].raw_get("/TPL2").idnum == \
+        reader.pages[1]["/Resources"]["/XObject"].raw_get("/TPL2").idnum
+
+    result = transcript_renderer.print_transcripts(cohort, "2024", UNIVERSITY, "zip", max_workers=1)
+    with zipfile.ZipFile(Path(result["path"]) / result["filename"]) as archive:
+        names = archive.namelist()
+        assert names == [f"{student['num_carte']}_relever.pdf" for student in cohort["students"]]
+        first = PdfReader(BytesIO(archive.read(names[0])))
+        assert len(first.pages) == 1 and "Andry" in first.pages[0].extract_text()
+
+    # Une autre année du même parcours ne réutilise ni le nom ni l'emplacement.
+    other_year = transcript_renderer.print_transcripts(
+        {**cohort, "year": "2030-2031"}, "2024", UNIVERSITY, max_workers=1
+    )
+    assert other_year["filename"] != transcript_renderer.transcripts_filename(cohort)
+    assert (Path(result["path"]) / result["filename"]).exists()
+
+
+def test_shards_keep_the_cohort_order():
+    students = list(range(230))
+    shards = transcript_renderer.split_shards(students, workers=4)
+    assert sum(shards, []) == students and len(shards) == 4
+    assert transcript_renderer.split_shards(list(range(10)), workers=4) == [list(range(10))]
+    assert [len(shard) for shard in transcript_renderer.split_shards(students, 2, min_size=1, max_size=50)] == \
+        [50, 50, 50, 50, 30]